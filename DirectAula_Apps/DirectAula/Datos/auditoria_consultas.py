@@ -0,0 +1,299 @@
+"""
+Auditoría de planes de consulta (herramienta de desarrollo).
+
+Extrae todas las consultas SQL escritas en Datos/dao.py, ejecuta
+EXPLAIN QUERY PLAN sobre cada una contra una base de datos real y falla
+(código de salida 1) si alguna hace un recorrido completo (SCAN) de una
+tabla que supera el umbral de filas, o si EXPLAIN no puede analizar alguna
+(consulta inválida o tabla inexistente). Las tablas temporales que crea
+dao.py (CREATE TEMP ...) se crean antes en la conexión de la auditoría.
+Las consultas sin WHERE (listados
+completos) y las marcadas en dao.py con MARCA_RECORRIDO en las dos líneas
+anteriores (mantenimiento que recorre toda la tabla a propósito) se
+muestran pero no cuentan como fallo.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python -m Datos.auditoria_consultas --db directaula.db --umbral 1000
+"""
+import argparse
+import ast
+import os
+import re
+import sqlite3
+import sys
+
+RUTA_DAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dao.py")
+PREFIJOS_CONSULTA = ("SELECT", "INSERT", "REPLACE", "UPDATE", "DELETE", "WITH")
+PREFIJOS_TEMPORALES = ("CREATE TEMP", "CREATE INDEX TEMP.")
+_PATRON_SCAN = re.compile(r"^SCAN (\w+)")
+# FTS5 con MATCH: el plan dice SCAN, pero la búsqueda usa el índice de texto (idxStr con M)
+_PATRON_FTS = re.compile(r"VIRTUAL TABLE INDEX \d+:M")
+MARCA_RECORRIDO = "auditoría: recorrido completo intencional"
+
+
+def extraer_consultas(ruta=RUTA_DAO, prefijos=PREFIJOS_CONSULTA):
+    """
+    Retorna [(linea, consulta), ...] con cada literal SQL (DML, o lo que empiece con `prefijos`) del archivo.
+    Las f-strings se auditan completas: cada {expresión} se sustituye por un
+    valor representativo (ver _ArmadorFString); las que recorren un ciclo
+    sobre una lista o diccionario literal se arman una vez por elemento.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        arbol = ast.parse(f.read(), ruta)
+    armador = _ArmadorFString(arbol)
+    # Los fragmentos de texto de una f-string no son consultas por sí solos
+    fragmentos = {id(parte) for nodo in ast.walk(arbol) if isinstance(nodo, ast.JoinedStr) for parte in nodo.values}
+    consultas = []
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Constant) and isinstance(nodo.value, str) and id(nodo) not in fragmentos:
+            textos = [nodo.value]
+        elif isinstance(nodo, ast.JoinedStr):
+            textos = armador.armar(nodo)
+        else:
+            continue
+        for texto in dict.fromkeys(t.strip() for t in textos):
+            # Se descartan palabras sueltas como ("SELECT", "PRAGMA") usadas en comparaciones
+            if texto.upper().startswith(prefijos) and len(texto.split()) > 1:
+                consultas.append((nodo.lineno, texto))
+    return sorted(consultas)
+
+
+class _ArmadorFString:
+    """
+    Arma el texto de una f-string de dao.py con un valor representativo de cada {expresión}:
+      - un nombre: la última asignación antes de la consulta en su función (o en las
+        que la contienen), también desempacando tuplas (filtro, params = ...);
+      - "x if condición else y": la rama verdadera (la que agrega el filtro);
+      - una llamada a una función del archivo (p. ej. self._filtro_grupo): su return;
+      - ", ".join(...): el primer texto del argumento ("?" en una lista IN (?, ?, ...));
+      - una variable de un ciclo sobre una lista o un diccionario literal: cada elemento.
+    Cualquier otra expresión se sustituye por "?".
+    """
+
+    PROFUNDIDAD_MAXIMA = 10
+
+    def __init__(self, arbol):
+        self._funciones = {}  # nombre -> FunctionDef
+        self._contexto = {}   # id(JoinedStr) -> ([funciones, de la más interna a la externa], [ciclos For])
+        self._registrar(arbol, [], [])
+
+    def _registrar(self, nodo, funciones, ciclos):
+        for hijo in ast.iter_child_nodes(nodo):
+            if isinstance(hijo, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._funciones.setdefault(hijo.name, hijo)
+                self._registrar(hijo, [hijo] + funciones, ciclos)
+            elif isinstance(hijo, ast.For):
+                self._registrar(hijo, funciones, ciclos + [hijo])
+            else:
+                if isinstance(hijo, ast.JoinedStr):
+                    self._contexto[id(hijo)] = (funciones, ciclos)
+                self._registrar(hijo, funciones, ciclos)
+
+    def armar(self, nodo):
+        """Retorna [texto, ...]: uno por cada combinación de elementos de los ciclos que la rodean."""
+        funciones, ciclos = self._contexto.get(id(nodo), ([], []))
+        entornos = [{}]
+        for ciclo in ciclos:
+            elementos = self._elementos(ciclo.iter, funciones, ciclo.lineno)
+            if elementos:
+                entornos = [dict(entorno, **self._enlazar(ciclo.target, elemento))
+                            for entorno in entornos for elemento in elementos]
+        return [self._texto(nodo, funciones, entorno, nodo.lineno, 0) for entorno in entornos]
+
+    def _texto(self, expr, funciones, entorno, linea, profundidad):
+        if profundidad > self.PROFUNDIDAD_MAXIMA:
+            return "?"
+        siguiente = profundidad + 1
+        if isinstance(expr, ast.Constant):
+            return str(expr.value)
+        if isinstance(expr, ast.JoinedStr):
+            return "".join(self._texto(parte, funciones, entorno, linea, siguiente) for parte in expr.values)
+        if isinstance(expr, ast.FormattedValue):
+            return self._texto(expr.value, funciones, entorno, linea, siguiente)
+        if isinstance(expr, ast.IfExp):
+            return self._texto(expr.body, funciones, entorno, linea, siguiente)
+        if isinstance(expr, ast.Name):
+            if expr.id in entorno:
+                return self._texto(entorno[expr.id], funciones, entorno, linea, siguiente)
+            valor = self._valor_asignado(expr.id, funciones, linea)
+            if valor is not None:
+                return self._texto(valor, funciones, entorno, linea, siguiente)
+        if isinstance(expr, ast.Call):
+            funcion = expr.func
+            if isinstance(funcion, ast.Attribute) and funcion.attr == "join" and isinstance(funcion.value, ast.Constant):
+                texto = next((n for arg in expr.args for n in ast.walk(arg)
+                              if isinstance(n, ast.Constant) and isinstance(n.value, str)), None)
+                if texto is not None:
+                    return texto.value
+            retorno = self._retorno(funcion)
+            if retorno is not None:
+                return self._texto(retorno, funciones, entorno, linea, siguiente)
+        return "?"
+
+    def _retorno(self, funcion):
+        """Expresión del primer return de una función del archivo (llamada como f() o self.f())."""
+        nombre = funcion.attr if isinstance(funcion, ast.Attribute) else getattr(funcion, "id", None)
+        definicion = self._funciones.get(nombre)
+        if definicion is None:
+            return None
+        return next((n.value for n in ast.walk(definicion) if isinstance(n, ast.Return) and n.value is not None), None)
+
+    def _valor_asignado(self, nombre, funciones, linea):
+        """Valor de la última asignación a `nombre` antes de `linea` (desempacando tuplas)."""
+        for funcion in funciones:
+            asignaciones = [
+                (n.lineno, valor)
+                for n in ast.walk(funcion) if isinstance(n, ast.Assign) and n.lineno < linea
+                for objetivo in n.targets
+                for valor in [self._desempacar(objetivo, n.value, nombre)] if valor is not None
+            ]
+            if asignaciones:
+                return max(asignaciones, key=lambda a: a[0])[1]
+        return None
+
+    def _desempacar(self, objetivo, valor, nombre):
+        """Parte de `valor` que recibe `nombre` en la asignación `objetivo = valor`, o None."""
+        if isinstance(objetivo, ast.Name):
+            return valor if objetivo.id == nombre else None
+        if not isinstance(objetivo, ast.Tuple):
+            return None
+        posicion = next((i for i, n in enumerate(objetivo.elts) if isinstance(n, ast.Name) and n.id == nombre), None)
+        if posicion is None:
+            return None
+        for _ in range(self.PROFUNDIDAD_MAXIMA):
+            if isinstance(valor, ast.IfExp):
+                valor = valor.body
+            elif isinstance(valor, ast.Call) and self._retorno(valor.func) is not None:
+                valor = self._retorno(valor.func)
+            else:
+                break
+        if isinstance(valor, ast.Tuple) and posicion < len(valor.elts):
+            return valor.elts[posicion]
+        return None
+
+    def _elementos(self, iterable, funciones, linea):
+        """Elementos de un ciclo sobre una lista, tupla o diccionario literal (.items() da pares)."""
+        pares = isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Attribute) and iterable.func.attr == "items"
+        if pares:
+            iterable = iterable.func.value
+        if isinstance(iterable, ast.Name):
+            iterable = self._valor_asignado(iterable.id, funciones, linea)
+        if isinstance(iterable, ast.Dict):
+            if pares:
+                return [ast.Tuple(elts=[clave, valor]) for clave, valor in zip(iterable.keys, iterable.values)]
+            return list(iterable.keys)
+        if isinstance(iterable, (ast.List, ast.Tuple)):
+            return list(iterable.elts)
+        return []
+
+    def _enlazar(self, objetivo, elemento):
+        """{nombre: expresión} de la variable (o tupla de variables) de un ciclo."""
+        if isinstance(objetivo, ast.Name):
+            return {objetivo.id: elemento}
+        if isinstance(objetivo, ast.Tuple) and isinstance(elemento, ast.Tuple) and len(objetivo.elts) == len(elemento.elts):
+            enlaces = {}
+            for parte, valor in zip(objetivo.elts, elemento.elts):
+                enlaces.update(self._enlazar(parte, valor))
+            return enlaces
+        return {}
+
+
+def contar_filas(con):
+    """Retorna {tabla: número de filas} de todas las tablas de la base de datos."""
+    tablas = [t for (t,) in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    return {t: con.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0] for t in tablas}
+
+
+def _alias_de_tablas(consulta, tablas):
+    """Mapea alias -> tabla (p. ej. 'A' -> 'alumnos' en 'FROM alumnos A')."""
+    alias = {t: t for t in tablas}
+    for tabla, nombre in re.findall(r"(?:FROM|JOIN|INTO|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", consulta, re.I):
+        if tabla in tablas and nombre and nombre.upper() not in ("ON", "WHERE", "SET", "ORDER", "GROUP", "LEFT", "JOIN", "VALUES", "SELECT"):
+            alias[nombre] = tabla
+    return alias
+
+
+def _recorridos_intencionales(ruta=RUTA_DAO):
+    """Líneas de dao.py con MARCA_RECORRIDO en alguna de las dos líneas anteriores."""
+    with open(ruta, encoding="utf-8") as f:
+        lineas = f.read().splitlines()
+    return {i + offset for i, texto in enumerate(lineas, start=1) if MARCA_RECORRIDO in texto for offset in (1, 2)}
+
+
+def auditar(con, umbral, consultas=None):
+    """
+    Retorna (resultados, fallos). Cada resultado es (linea, consulta, [detalle del plan]);
+    cada fallo es (linea, tabla, filas, detalle), con tabla y filas None si EXPLAIN falló.
+    """
+    filas = contar_filas(con)
+    intencionales = _recorridos_intencionales()
+    resultados, fallos = [], []
+    # Las tablas temporales solo existen en la conexión que las crea (p. ej. la importación)
+    for linea, sentencia in extraer_consultas(prefijos=PREFIJOS_TEMPORALES):
+        try:
+            con.execute(sentencia)
+        except sqlite3.Error as e:
+            fallos.append((linea, None, None, f"ERROR: {e}"))
+
+    for linea, consulta in consultas or extraer_consultas():
+        parametros = [None] * consulta.count("?")
+        try:
+            plan = [fila[3] for fila in con.execute("EXPLAIN QUERY PLAN " + consulta, parametros)]
+        except sqlite3.Error as e:
+            plan = [f"ERROR: {e}"]
+            fallos.append((linea, None, None, plan[0]))
+        resultados.append((linea, consulta, plan))
+
+        # Las consultas sin WHERE (p. ej. listar todos los grupos) recorren la tabla a propósito
+        if not re.search(r"\bWHERE\b", consulta, re.I) or linea in intencionales:
+            continue
+
+        alias = _alias_de_tablas(consulta, filas)
+        for detalle in plan:
+            coincidencia = _PATRON_SCAN.match(detalle)
+            if not coincidencia or _PATRON_FTS.search(detalle):
+                continue
+            tabla = alias.get(coincidencia.group(1))
+            if tabla and filas.get(tabla, 0) > umbral:
+                fallos.append((linea, tabla, filas[tabla], detalle))
+    return resultados, fallos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="directaula.db", help="Base de datos a auditar")
+    parser.add_argument("--umbral", type=int, default=1000,
+                        help="Filas a partir de las cuales un SCAN completo se considera un fallo")
+    parser.add_argument("--detalle", action="store_true", help="Muestra el plan de todas las consultas")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Error: No existe la base de datos {args.db}")
+        return 2
+
+    con = sqlite3.connect(args.db)
+    try:
+        resultados, fallos = auditar(con, args.umbral)
+    finally:
+        con.close()
+
+    if args.detalle:
+        for linea, consulta, plan in resultados:
+            print(f"dao.py:{linea}  {' '.join(consulta.split())[:90]}")
+            for detalle in plan:
+                print(f"    {detalle}")
+
+    errores = 0
+    for linea, tabla, num_filas, detalle in fallos:
+        if tabla is None:
+            errores += 1
+            print(f"FALLO dao.py:{linea}: EXPLAIN no pudo analizar la consulta ({detalle})")
+        else:
+            print(f"FALLO dao.py:{linea}: '{detalle}' recorre {tabla} completa ({num_filas} filas > {args.umbral})")
+    print(f"{len(resultados)} consultas auditadas, {len(fallos) - errores} recorridos completos sobre tablas grandes, "
+          f"{errores} con error de EXPLAIN.")
+    return 1 if fallos else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
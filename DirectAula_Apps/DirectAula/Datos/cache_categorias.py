@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+from Datos.conexion import conexiones
+
+# ====================================================
+# CACHÉ DE PONDERACIONES POR GRUPO (lectura a través de caché)
+# ====================================================
+# CategoriaEvaluacionDAO.obtener_categorias se consulta al abrir la ponderación
+# y el registro de calificaciones, y en cada recálculo de promedios (también los
+# que dispara la asistencia). La ponderación de un grupo casi nunca cambia: se
+# guarda aquí la primera vez y guardar_categorias (o la ponderación inicial,
+# BR.3) invalida solo el grupo afectado. Igual que Datos/cache_roster.py, es
+# compartida por todo el proceso, y los cambios de otra instancia abierta sobre
+# la misma base se detectan con PRAGMA data_version antes de responder.
+
+CAPACIDAD_PREDETERMINADA = 64 # Grupos en memoria; se descarta el usado hace más tiempo
+
+
+class CacheCategorias:
+    """Ponderación (lista de CategoriaEvaluacion) por (db_file, grupo_id) con desalojo LRU y contadores."""
+
+    def __init__(self, capacidad=CAPACIDAD_PREDETERMINADA):
+        self._capacidad = capacidad
+        self._categorias = OrderedDict() # (db_file, grupo_id) -> [CategoriaEvaluacion, ...]
+        self._lock = threading.Lock() # Se usa desde el hilo de la interfaz y el de trabajo
+        # Cambia con cada invalidación: una lectura que empezó antes de guardar la
+        # ponderación no debe dejar en caché la anterior.
+        self._generacion = 0
+        self.aciertos = 0 # Cada acierto es una consulta SELECT evitada
+        self.fallos = 0
+        self.invalidaciones_externas = 0 # Veces que otra conexión cambió la base
+
+    def _validar(self, db_file):
+        """Descarta las ponderaciones de db_file si otra conexión cambió la base desde la última consulta."""
+        if not conexiones.hubo_cambios_externos(self, db_file):
+            return
+        with self._lock:
+            self._generacion += 1
+            self.invalidaciones_externas += 1
+            for clave in [clave for clave in self._categorias if clave[0] == db_file]:
+                del self._categorias[clave]
+
+    def obtener(self, db_file, grupo_id, cargar):
+        """
+        Retorna una copia de la ponderación del grupo. Si no está en caché se llama a
+        cargar() (la consulta del DAO); un resultado False (error SQL) no se guarda.
+        Las CategoriaEvaluacion son inmutables: basta copiar la lista.
+        """
+        self._validar(db_file)
+        clave = (db_file, grupo_id)
+        with self._lock:
+            categorias = self._categorias.get(clave)
+            if categorias is not None:
+                self._categorias.move_to_end(clave)
+                self.aciertos += 1
+                return list(categorias)
+            self.fallos += 1
+            generacion = self._generacion
+
+        categorias = cargar()
+        if categorias is False:
+            return False
+
+        with self._lock:
+            if generacion == self._generacion:
+                self._categorias[clave] = list(categorias)
+                while len(self._categorias) > self._capacidad:
+                    self._categorias.popitem(last=False)
+        return list(categorias)
+
+    def invalidar_grupo(self, db_file, grupo_id):
+        with self._lock:
+            self._generacion += 1
+            self._categorias.pop((db_file, grupo_id), None)
+
+    def limpiar(self):
+        with self._lock:
+            self._generacion += 1
+            self._categorias.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 3) if consultas else 0.0,
+                "consultas_evitadas": self.aciertos,
+                "grupos_en_cache": len(self._categorias),
+                "invalidaciones_externas": self.invalidaciones_externas,
+                "capacidad": self._capacidad,
+            }
+
+    def reiniciar_estadisticas(self):
+        with self._lock:
+            self.aciertos = 0
+            self.fallos = 0
+            self.invalidaciones_externas = 0
+
+
+# Instancia compartida por todos los DAO del proceso
+cache_categorias = CacheCategorias()
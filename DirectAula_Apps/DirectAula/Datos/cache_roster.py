@@ -0,0 +1,138 @@
+import threading
+from collections import OrderedDict
+
+from Datos.conexion import conexiones
+
+# ====================================================
+# CACHÉ DE ROSTERS POR GRUPO (lectura a través de caché)
+# ====================================================
+# AlumnoDAO.obtener_alumnos_por_grupo se consulta desde varios lugares (BR.2 al
+# eliminar un grupo, recarga de la ventana de alumnos, promedios de asistencia...).
+# El roster de cada grupo se guarda aquí la primera vez y las siguientes lecturas
+# no tocan SQLite. Las escrituras de AlumnoDAO invalidan solo el grupo afectado.
+#
+# La caché es compartida por todos los DAO y gestores del proceso (igual que
+# `conexiones`). Las escrituras de esta instancia de la aplicación invalidan solo
+# su grupo; las de otra instancia abierta sobre la misma base (o de otra conexión)
+# se detectan con PRAGMA data_version antes de responder y descartan los rosters
+# de esa base (ver AdministradorConexiones.hubo_cambios_externos).
+
+CAPACIDAD_PREDETERMINADA = 64 # Grupos en memoria; se descarta el usado hace más tiempo
+
+
+class CacheRoster:
+    """Roster por (db_file, grupo_id) con desalojo LRU y contadores de aciertos y fallos."""
+
+    def __init__(self, capacidad=CAPACIDAD_PREDETERMINADA):
+        self._capacidad = capacidad
+        self._rosters = OrderedDict() # (db_file, grupo_id) -> (filas, {matriculas})
+        self._grupo_de_matricula = {} # (db_file, matricula) -> grupo_id, para invalidar por matrícula
+        self._lock = threading.Lock() # Se usa desde el hilo de la interfaz y el de trabajo
+        # Cambia con cada invalidación: una lectura que empezó antes de una escritura
+        # no debe guardar un roster que ya quedó viejo.
+        self._generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones_externas = 0 # Veces que otra conexión cambió la base
+
+    def _validar(self, db_file):
+        """Descarta los rosters de db_file si otra conexión cambió la base desde la última consulta."""
+        if not conexiones.hubo_cambios_externos(self, db_file):
+            return
+        with self._lock:
+            self._generacion += 1
+            self.invalidaciones_externas += 1
+            for clave in [clave for clave in self._rosters if clave[0] == db_file]:
+                self._descartar(clave)
+
+    def obtener(self, db_file, grupo_id, cargar):
+        """
+        Retorna una copia del roster del grupo. Si no está en caché se llama a
+        cargar() (la consulta del DAO); un resultado False (error SQL) no se guarda.
+        """
+        self._validar(db_file)
+        clave = (db_file, grupo_id)
+        with self._lock:
+            entrada = self._rosters.get(clave)
+            if entrada is not None:
+                self._rosters.move_to_end(clave)
+                self.aciertos += 1
+                return list(entrada[0])
+            self.fallos += 1
+            generacion = self._generacion
+
+        filas = cargar()
+        if filas is False:
+            return False
+
+        with self._lock:
+            if generacion == self._generacion:
+                self._guardar(clave, list(filas))
+        return list(filas)
+
+    def contiene(self, db_file, grupo_id, matricula):
+        """True/False si el roster del grupo está en caché; None si hay que consultar la base."""
+        self._validar(db_file)
+        with self._lock:
+            entrada = self._rosters.get((db_file, grupo_id))
+            if entrada is None:
+                return None
+            self.aciertos += 1
+            return matricula in entrada[1]
+
+    def _guardar(self, clave, filas):
+        db_file = clave[0]
+        matriculas = {fila[0] for fila in filas}
+        self._rosters[clave] = (filas, matriculas)
+        for matricula in matriculas:
+            self._grupo_de_matricula[(db_file, matricula)] = clave[1]
+        while len(self._rosters) > self._capacidad:
+            self._descartar(next(iter(self._rosters)))
+
+    def _descartar(self, clave):
+        entrada = self._rosters.pop(clave, None)
+        if entrada is None:
+            return
+        for matricula in entrada[1]:
+            self._grupo_de_matricula.pop((clave[0], matricula), None)
+
+    def invalidar_grupo(self, db_file, grupo_id):
+        with self._lock:
+            self._generacion += 1
+            self._descartar((db_file, grupo_id))
+
+    def invalidar_matricula(self, db_file, matricula):
+        """Invalida solo el grupo en caché que contiene la matrícula (si alguno la contiene)."""
+        with self._lock:
+            self._generacion += 1
+            grupo_id = self._grupo_de_matricula.get((db_file, matricula))
+            if grupo_id is not None:
+                self._descartar((db_file, grupo_id))
+
+    def limpiar(self):
+        with self._lock:
+            self._generacion += 1
+            self._rosters.clear()
+            self._grupo_de_matricula.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 3) if consultas else 0.0,
+                "grupos_en_cache": len(self._rosters),
+                "invalidaciones_externas": self.invalidaciones_externas,
+                "capacidad": self._capacidad,
+            }
+
+    def reiniciar_estadisticas(self):
+        with self._lock:
+            self.aciertos = 0
+            self.fallos = 0
+            self.invalidaciones_externas = 0
+
+
+# Instancia compartida por todos los DAO del proceso
+cache_roster = CacheRoster()
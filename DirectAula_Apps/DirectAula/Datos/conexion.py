@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+import time
+
+from Datos.migraciones import aplicar_migraciones
+
+# ====================================================
+# PERFIL DE ALMACENAMIENTO (PRAGMAs de cada conexión)
+# ====================================================
+DB_FILE_PREDETERMINADO = 'directaula.db'
+
+
+class PerfilAlmacenamiento:
+    """
+    Configuración de SQLite aplicada a cada conexión nueva.
+    El perfil predeterminado usa WAL para que varias instancias de la aplicación
+    (p. ej. dos docentes en el laboratorio) puedan leer mientras otra escribe.
+    """
+
+    def __init__(self, journal_mode="WAL", synchronous="NORMAL", busy_timeout_ms=5000,
+                 cache_size_kb=20000, mmap_size=256 * 1024 * 1024, temp_store="MEMORY",
+                 reintentos=5, espera_reintento_s=0.05):
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.temp_store = temp_store
+        # Reintentos (con espera exponencial) cuando la base sigue ocupada tras busy_timeout
+        self.reintentos = reintentos
+        self.espera_reintento_s = espera_reintento_s
+
+    def sentencias(self):
+        """PRAGMAs a ejecutar al abrir la conexión (no aceptan parámetros '?')."""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode};",
+            f"PRAGMA synchronous = {self.synchronous};",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)};",
+            f"PRAGMA cache_size = {-int(self.cache_size_kb)};",  # Negativo = tamaño en KiB
+            f"PRAGMA mmap_size = {int(self.mmap_size)};",
+            f"PRAGMA temp_store = {self.temp_store};",
+        ]
+
+
+# WAL no funciona en carpetas de red compartidas: para esos casos usar el perfil compatible.
+PERFIL_PREDETERMINADO = PerfilAlmacenamiento()
+PERFIL_COMPATIBLE = PerfilAlmacenamiento(journal_mode="DELETE", synchronous="FULL", mmap_size=0)
+
+
+def es_error_ocupada(error):
+    """True si el error corresponde a SQLITE_BUSY / SQLITE_LOCKED (otra conexión escribe)."""
+    mensaje = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in mensaje or "busy" in mensaje)
+
+
+# ====================================================
+# ADMINISTRADOR DE CONEXIONES (Conexión persistente por hilo)
+# ====================================================
+
+
+class AdministradorConexiones:
+    """
+    Mantiene UNA conexión SQLite de larga duración por hilo y por archivo de base de datos.
+    La conexión se configura una sola vez (PRAGMAs) y la comparten todos los DAO,
+    en lugar de abrir un sqlite3.connect nuevo en cada consulta.
+    """
+
+    def __init__(self, db_file=DB_FILE_PREDETERMINADO, perfil=PERFIL_PREDETERMINADO):
+        self._db_file = db_file
+        self._perfil = perfil
+        self._local = threading.local()  # {db_file: conexión} propio de cada hilo
+        self._lock = threading.Lock()
+        self._todas = []  # Todas las conexiones abiertas (para cerrarlas al salir)
+        self._migradas = set()  # Archivos cuyo esquema ya fue migrado en este proceso
+
+    def get_db_file(self):
+        return self._db_file
+
+    def configurar_db_file(self, db_file):
+        """Cambia la base de datos predeterminada (útil para benchmarks o pruebas)."""
+        self._db_file = db_file
+
+    def get_perfil(self):
+        return self._perfil
+
+    def configurar_perfil(self, perfil):
+        """Cambia el perfil de almacenamiento; aplica a las conexiones que se abran después."""
+        self._perfil = perfil
+
+    def esperar_reintento(self, intento):
+        """Espera exponencial antes de reintentar una operación con la base ocupada."""
+        time.sleep(self._perfil.espera_reintento_s * (2 ** intento))
+
+    def obtener(self, db_file=None):
+        """Retorna la conexión del hilo actual para db_file, creándola si no existe."""
+        db_file = db_file or self._db_file
+        conexiones = getattr(self._local, "conexiones", None)
+        if conexiones is None:
+            conexiones = self._local.conexiones = {}
+
+        con = conexiones.get(db_file)
+        if con is None:
+            con = self._abrir(db_file)
+            conexiones[db_file] = con
+        return con
+
+    def hubo_cambios_externos(self, observador, db_file=None):
+        """
+        True si otra conexión (otro hilo u otra instancia de la aplicación abierta sobre
+        la misma base) confirmó cambios desde la última vez que `observador` preguntó
+        en este hilo, o si nunca había preguntado. Usa PRAGMA data_version, que no
+        cuenta los cambios de la propia conexión. Las cachés de Datos/ lo consultan
+        antes de responder para descartar lo que pudo quedar viejo.
+        """
+        db_file = db_file or self._db_file
+        try:
+            version = self.obtener(db_file).execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return True
+        versiones = getattr(self._local, "versiones", None)
+        if versiones is None:
+            versiones = self._local.versiones = {}  # (observador, db_file) -> data_version
+        clave = (observador, db_file)
+        anterior = versiones.get(clave)
+        versiones[clave] = version
+        return anterior != version
+
+    def _abrir(self, db_file):
+        # check_same_thread=False solo para poder cerrarla desde cerrar_todas();
+        # cada hilo usa exclusivamente su propia conexión.
+        perfil = self._perfil
+        con = sqlite3.connect(db_file, check_same_thread=False, timeout=perfil.busy_timeout_ms / 1000)
+        con.execute("PRAGMA foreign_keys = ON;")  # Permite la integridad referencial
+        for sentencia in perfil.sentencias():
+            self._con_reintentos(con.execute, sentencia)
+        with self._lock:
+            # Las migraciones del esquema se aplican una sola vez por archivo y proceso,
+            # con la primera conexión (ver Datos/migraciones.py).
+            if db_file not in self._migradas:
+                self._con_reintentos(aplicar_migraciones, con)
+                self._migradas.add(db_file)
+            self._todas.append(con)
+        return con
+
+    def _con_reintentos(self, funcion, *args):
+        for intento in range(self._perfil.reintentos + 1):
+            try:
+                return funcion(*args)
+            except sqlite3.OperationalError as e:
+                if not es_error_ocupada(e) or intento == self._perfil.reintentos:
+                    raise
+                self.esperar_reintento(intento)
+
+    def cerrar_hilo_actual(self):
+        """Cierra las conexiones del hilo actual (p. ej. al terminar un hilo de trabajo)."""
+        conexiones = getattr(self._local, "conexiones", None) or {}
+        for con in conexiones.values():
+            with self._lock:
+                if con in self._todas:
+                    self._todas.remove(con)
+            con.close()
+        conexiones.clear()
+        # data_version es propio de cada conexión: una conexión nueva empieza de cero
+        getattr(self._local, "versiones", {}).clear()
+
+    def cerrar_todas(self):
+        """Cierra todas las conexiones abiertas por cualquier hilo (al salir de la aplicación)."""
+        with self._lock:
+            todas, self._todas = self._todas, []
+            self._migradas.clear()
+        for con in todas:
+            try:
+                con.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+# Instancia compartida por todos los DAO
+conexiones = AdministradorConexiones()
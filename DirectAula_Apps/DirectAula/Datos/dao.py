@@ -3,112 +3,129 @@ from datetime import date
 import sqlite3
 # Asegúrate que las tres entidades del modelo estén importadas
 from model import Alumno, Asistencia, Calificacion, CategoriaEvaluacion, Grupo
+from Datos.conexion import conexiones, es_error_ocupada
+from Datos.cache_roster import cache_roster
+from Datos.cache_categorias import cache_categorias
+from Datos.unidad_trabajo import UnidadDeTrabajo, unidad_actual
+
+def fabrica_filas(entidad):
+    """
+    row_factory de sqlite3 que construye cada fila directamente como `entidad`
+    (una NamedTuple de model.py), sin pasar por una lista de tuplas intermedia.
+    Las columnas del SELECT deben ir en el orden (y número) de los campos de la entidad.
+    """
+    # tuple.__new__ reutiliza los valores de la fila: no hay una llamada a Python por campo
+    crear = tuple.__new__
+    return lambda cursor, fila: crear(entidad, fila)
 
 # ====================================================
-# BASE DAO (Manejo de Conexión y Creación de Tablas)
+# BASE DAO (Manejo de Conexión)
 # ====================================================
+# El esquema (tablas e índices) se crea y actualiza con las migraciones
+# versionadas de Datos/migraciones.py al abrir la primera conexión, por lo
+# que construir un DAO no ejecuta ninguna sentencia.
 class BaseDAO:
-    def __init__(self):
-        self._db_file = 'directaula.db'
-        self._con = None
-        self.inicializar_tablas() # Llama a la función para crear o verificar tablas
-        
-    def inicializar_tablas(self):
-        """Asegura que todas las tablas necesarias existan (Grupos, Alumnos, Asistencia)."""
-        # Creación de la tabla GRUPOS (CU1)
-        self.ejecutar_query("""
-            CREATE TABLE IF NOT EXISTS grupos (
-                grupo_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                ciclo_escolar TEXT NOT NULL
-            );
-        """)
-        # Creación de la tabla ALUMNOS (CU2)
-        # 💡 La columna 'email' debe estar aquí para evitar errores.
-        self.ejecutar_query("""
-            CREATE TABLE IF NOT EXISTS alumnos (
-                matricula TEXT PRIMARY KEY,
-                nombre_completo TEXT NOT NULL,
-                datos_contacto TEXT,
-                email TEXT,
-                grupo_id INTEGER,
-                FOREIGN KEY (grupo_id) REFERENCES grupos(grupo_id)
-            );
-        """)
-
-        # Creación de la tabla PONDERACIONES (CU3)
-        self.ejecutar_query("""
-            CREATE TABLE IF NOT EXISTS categorias_evaluacion (
-                grupo_id INTEGER NOT NULL,
-                nombre_categoria TEXT NOT NULL,
-                peso_porcentual REAL NOT NULL,
-                max_items INTEGER NOT NULL DEFAULT 1, -- Total de Tareas a considerar para categorías múltiples
-                PRIMARY KEY (grupo_id, nombre_categoria),
-                FOREIGN KEY (grupo_id) REFERENCES grupos(grupo_id) ON DELETE CASCADE
-            );
-        """)
-
-        # Creación de la tabla ASISTENCIA (CU4)
-        self.ejecutar_query("""
-            CREATE TABLE IF NOT EXISTS asistencia (
-                matricula TEXT NOT NULL,
-                fecha TEXT NOT NULL,
-                estado TEXT NOT NULL,
-                PRIMARY KEY (matricula, fecha),
-                FOREIGN KEY (matricula) REFERENCES alumnos(matricula)
-            );
-        """)
-
-        # Creación de la tabla CALIFICACIONES (CU5)
-        self.ejecutar_query("""
-            CREATE TABLE IF NOT EXISTS calificaciones (
-                matricula TEXT NOT NULL,
-                categoria TEXT NOT NULL,
-                fecha TEXT NOT NULL,
-                valor REAL NOT NULL,
-                PRIMARY KEY (matricula, categoria, fecha),
-                FOREIGN KEY (matricula) REFERENCES alumnos(matricula) ON DELETE CASCADE
-            );
-        """)
-        
+    def __init__(self, db_file=None):
+        self._db_file = db_file or conexiones.get_db_file()
+
+    # La conexión y el cursor son variables locales de cada operación, nunca atributos
+    # del DAO: la ventana y el hilo de trabajo pueden usar el mismo DAO a la vez y
+    # cada hilo debe usar solo su propia conexión (ver Datos/conexion.py).
     def _conectar(self):
-        self._con = sqlite3.connect(self._db_file)
-        self._con.execute("PRAGMA foreign_keys = ON;") # Permite la integridad referencial
-        self.cursor = self._con.cursor()
-        return self._con
-
-    def _desconectar(self, conn=None):
-        connection = conn or self._con
-        if connection:
-            connection.close()
-            if conn is None:
-                self._con = None
-
-    def ejecutar_query(self, query, params=()):
-        try:
-            self._conectar()
-            self.cursor.execute(query, params)
-            self._con.commit()
-            if query.strip().upper().startswith(("SELECT", "PRAGMA")):
-                return self.cursor.fetchall()
-            return True
-        except sqlite3.Error as e:
-            # 💡 Esto es útil para el debugging de errores SQL.
-            print(f"Error al ejecutar consulta: {e}") 
-            return False
+        """Retorna la conexión persistente del hilo actual."""
+        return conexiones.obtener(self._db_file)
+
+    def _desconectar(self, con):
+        # La conexión compartida NO se cierra; se cierran todas juntas con
+        # conexiones.cerrar_todas() al salir.
+        pass
+
+    def _ejecutar_en_transaccion(self, operacion, mensaje_error="Error al ejecutar consulta"):
+        """
+        Ejecuta operacion(cursor) y confirma la transacción. Si otra instancia de la
+        aplicación tiene la base ocupada (SQLITE_BUSY) se reintenta según el perfil
+        de almacenamiento. Retorna el resultado de la operación, o False si hubo un error.
+        Dentro de una UnidadDeTrabajo (Datos/unidad_trabajo.py) la operación se suma a
+        la transacción de la unidad y no se confirma aquí.
+        """
+        unidad = unidad_actual(self._db_file)
+        if unidad is not None:
+            return unidad.ejecutar(operacion, mensaje_error)
+
+        reintentos = conexiones.get_perfil().reintentos
+        for intento in range(reintentos + 1):
+            con = self._conectar()
+            cursor = con.cursor()
+            try:
+                resultado = operacion(cursor)
+                con.commit()
+                return resultado
+            except sqlite3.Error as e:
+                # La conexión es compartida: no dejar una transacción a medias abierta.
+                con.rollback()
+                if es_error_ocupada(e) and intento < reintentos:
+                    conexiones.esperar_reintento(intento)
+                    continue
+                # 💡 Esto es útil para el debugging de errores SQL.
+                print(f"{mensaje_error}: {e}")
+                return False
+            finally:
+                cursor.close()
+                self._desconectar(con)
+
+    def _despues_de_escribir(self, funcion):
+        """
+        Ejecuta funcion() (p. ej. invalidar una caché) tras una escritura. Dentro de una
+        UnidadDeTrabajo se repite al terminarla: otro hilo pudo leer los datos anteriores
+        mientras la transacción seguía abierta.
+        """
+        funcion()
+        unidad = unidad_actual(self._db_file)
+        if unidad is not None:
+            unidad.al_terminar(funcion)
+
+    def ejecutar_query(self, query, params=(), fabrica=None):
+        """Ejecuta una sentencia. Las filas de un SELECT se construyen con `fabrica` (ver fabrica_filas) si se indica."""
+        es_lectura = query.strip().upper().startswith(("SELECT", "PRAGMA"))
+
+        def operacion(cursor):
+            # El cursor es de esta operación: la fábrica no afecta otras consultas de la conexión
+            cursor.row_factory = fabrica
+            cursor.execute(query, params)
+            return cursor.fetchall() if es_lectura else True
+
+        return self._ejecutar_en_transaccion(operacion)
+
     def ejecutar_queries_multiples(self, query: str, params_list: list[tuple]):
-        """Ejecuta una sola query varias veces con diferentes parámetros en una transacción."""
-        try:
-            self._conectar()
-            self.cursor.executemany(query, params_list)
-            self._con.commit()
+        """
+        Ejecuta una sola query varias veces con diferentes parámetros en una transacción.
+        Las entidades de model.py son tuplas: se pasan tal cual, sin convertirlas.
+        """
+        def operacion(cursor):
+            cursor.executemany(query, params_list)
             return True
-        except sqlite3.Error as e:
-            print(f"Error al ejecutar múltiples queries: {e}")
-            self._con.rollback()
-            return False
+
+        return self._ejecutar_en_transaccion(operacion, "Error al ejecutar múltiples queries")
+
+    def iterar_query(self, query, params=(), tamano_bloque=500):
+        """
+        Generador de filas de una consulta SELECT leídas por bloques con fetchmany:
+        el resultado nunca se materializa completo en memoria (p. ej. reportes).
+        Los errores (sqlite3.Error) se propagan a quien itera: a diferencia de
+        ejecutar_query, aquí un error a medio camino dejaría un resultado incompleto
+        que no se distingue de uno completo.
+        """
+        # Cursor propio: la iteración puede intercalarse con otras consultas del mismo DAO
+        cursor = conexiones.obtener(self._db_file).cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                bloque = cursor.fetchmany(tamano_bloque)
+                if not bloque:
+                    break
+                yield from bloque
         finally:
-            self._desconectar()
+            cursor.close()
 
 # ====================================================
 # 1. GRUPO DAO (CASO DE USO 1) 
@@ -118,12 +135,12 @@ class GrupoDAO(BaseDAO):
 
     def crear_grupo(self, grupo: Grupo):
         query = "INSERT INTO grupos (nombre, ciclo_escolar) VALUES (?, ?)"
-        params = (grupo.get_nombre(), grupo.get_ciclo())
+        params = (grupo.nombre, grupo.ciclo_escolar)
         return self.ejecutar_query(query, params)
 
     def obtener_grupos(self):
         query = "SELECT grupo_id, nombre, ciclo_escolar FROM grupos ORDER BY ciclo_escolar, nombre"
-        return self.ejecutar_query(query)
+        return self.ejecutar_query(query, fabrica=fabrica_filas(Grupo))
 
     def buscar_grupo_por_nombre_ciclo(self, nombre, ciclo_escolar):
         query = "SELECT grupo_id FROM grupos WHERE nombre = ? AND ciclo_escolar = ?"
@@ -132,37 +149,163 @@ class GrupoDAO(BaseDAO):
 
     def actualizar_grupo(self, grupo: Grupo):
         query = "UPDATE grupos SET nombre = ?, ciclo_escolar = ? WHERE grupo_id = ?"
-        params = (grupo.get_nombre(), grupo.get_ciclo(), grupo.get_id())
+        params = (grupo.nombre, grupo.ciclo_escolar, grupo.grupo_id)
         return self.ejecutar_query(query, params)
 
     def eliminar_grupo(self, grupo_id):
         query = "DELETE FROM grupos WHERE grupo_id = ?"
-        return self.ejecutar_query(query, (grupo_id,))
+        resultado = self.ejecutar_query(query, (grupo_id,))
+        self._despues_de_escribir(lambda: cache_roster.invalidar_grupo(self._db_file, grupo_id))
+        # Sus categorías se borran en cascada
+        self._despues_de_escribir(lambda: cache_categorias.invalidar_grupo(self._db_file, grupo_id))
+        return resultado
 
 
 # ====================================================
 # 2. ALUMNO DAO (CASO DE USO 2)
 # ====================================================
 class AlumnoDAO(BaseDAO):
-    """Maneja las operaciones CRUD para la entidad Alumno."""
+    """
+    Maneja las operaciones CRUD para la entidad Alumno.
+    Los rosters se leen a través de la caché compartida (Datos/cache_roster.py);
+    cada escritura invalida el grupo afectado.
+    """
 
     def crear_alumno(self, alumno: Alumno, grupo_id):
         query = "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, ?, ?, ?)"
-        params = (alumno.get_matricula(), alumno.get_nombre_completo(), alumno.get_datos_contacto(), alumno.get_email(), grupo_id)
-        return self.ejecutar_query(query, params)
+        params = (*alumno, grupo_id)
+        resultado = self.ejecutar_query(query, params)
+        # Se invalida DESPUÉS de escribir: una lectura concurrente no puede volver a guardar el roster viejo
+        self._despues_de_escribir(lambda: cache_roster.invalidar_grupo(self._db_file, grupo_id))
+        return resultado
 
     def obtener_alumnos_por_grupo(self, grupo_id):
         query = "SELECT matricula, nombre_completo, datos_contacto, email FROM alumnos WHERE grupo_id = ? ORDER BY nombre_completo"
-        return self.ejecutar_query(query, (grupo_id,))
+        # [Alumno, ...]: se leen también por posición (fila[0] es la matrícula)
+        return cache_roster.obtener(
+            self._db_file, grupo_id, lambda: self.ejecutar_query(query, (grupo_id,), fabrica_filas(Alumno))
+        )
 
     def actualizar_alumno(self, alumno: Alumno):
         query = "UPDATE alumnos SET nombre_completo = ?, datos_contacto = ?, email = ? WHERE matricula = ?"
-        params = (alumno.get_nombre_completo(), alumno.get_datos_contacto(), alumno.get_email(), alumno.get_matricula())
-        return self.ejecutar_query(query, params)
+        params = (alumno.nombre_completo, alumno.datos_contacto, alumno.email, alumno.matricula)
+        resultado = self.ejecutar_query(query, params)
+        matricula = alumno.matricula
+        self._despues_de_escribir(lambda: cache_roster.invalidar_matricula(self._db_file, matricula))
+        return resultado
 
     def eliminar_alumno(self, matricula):
         query = "DELETE FROM alumnos WHERE matricula = ?"
-        return self.ejecutar_query(query, (matricula,))
+        resultado = self.ejecutar_query(query, (matricula,))
+        self._despues_de_escribir(lambda: cache_roster.invalidar_matricula(self._db_file, matricula))
+        return resultado
+
+    def buscar_alumnos_global(self, expresion, limite=50):
+        """
+        Búsqueda en todos los grupos y ciclos con el índice FTS5 (migración 5).
+        `expresion` es una consulta MATCH de FTS5 (ver Logica/busqueda_global.py).
+        Retorna [(matricula, nombre, email, grupo_id, grupo, ciclo_escolar), ...]
+        de la coincidencia más relevante a la menos relevante.
+        """
+        # bm25 con pesos por columna: una coincidencia en la matrícula pesa más que en el email.
+        # Se ordena y limita dentro del índice; solo los mejores resultados se unen con alumnos y grupos.
+        query = """
+            SELECT A.matricula, A.nombre_completo, A.email, A.grupo_id, G.nombre, G.ciclo_escolar
+            FROM (
+                SELECT rowid, bm25(alumnos_fts, 10.0, 5.0, 1.0) AS puntaje
+                FROM alumnos_fts
+                WHERE alumnos_fts MATCH ?
+                ORDER BY puntaje
+                LIMIT ?
+            ) F
+            JOIN alumnos A ON A.rowid = F.rowid
+            LEFT JOIN grupos G ON G.grupo_id = A.grupo_id
+            ORDER BY F.puntaje, G.ciclo_escolar DESC, A.nombre_completo
+        """
+        return self.ejecutar_query(query, (expresion, limite))
+
+    def existe_matricula_en_grupo(self, matricula, grupo_id):
+        # Si el roster del grupo está en caché se responde sin consultar la base
+        en_cache = cache_roster.contiene(self._db_file, grupo_id, matricula)
+        if en_cache is not None:
+            return en_cache
+        # Búsqueda por llave primaria: no se trae el roster completo
+        query = "SELECT 1 FROM alumnos WHERE matricula = ? AND grupo_id = ?"
+        return bool(self.ejecutar_query(query, (matricula, grupo_id)))
+
+    def importar_alumnos(self, grupo_id, bloques):
+        """
+        Importación masiva del roster (CU2).
+        `bloques` es un iterable de listas [(fila, matricula, nombre, contacto, email), ...]
+        que se cargan en una tabla temporal; la validación se hace con consultas sobre
+        esa tabla y los alumnos válidos se insertan en una sola transacción.
+        Retorna (importados, [(fila, matricula, codigo_error), ...]) o False si hubo un error.
+        Códigos: 'BR.4' (faltan matrícula o nombre), 'FE.2' (ya existe en el grupo),
+        'OTRO_GRUPO' (la matrícula pertenece a otro grupo), 'DUPLICADA' (repetida en el archivo).
+        """
+        # 1. Carga en la tabla temporal (esquema temp de esta conexión: nunca espera
+        #    el bloqueo de la base, por lo que no hace falta reintentarla).
+        def cargar(cursor):
+            cursor.execute("DROP TABLE IF EXISTS temp.importacion_alumnos")
+            cursor.execute("""
+                CREATE TEMP TABLE importacion_alumnos (
+                    fila INTEGER PRIMARY KEY,
+                    matricula TEXT, nombre_completo TEXT, datos_contacto TEXT, email TEXT
+                )
+            """)
+            for bloque in bloques:
+                cursor.executemany("INSERT INTO temp.importacion_alumnos VALUES (?, ?, ?, ?, ?)", bloque)
+            cursor.execute("CREATE INDEX temp.idx_importacion_matricula ON importacion_alumnos (matricula, fila)")
+            return True
+
+        # 2. Validación por conjuntos + inserción (puede reintentarse si la base está ocupada)
+        def validar_e_insertar(cursor):
+            errores = cursor.execute("""
+                SELECT I.fila, I.matricula,
+                    CASE
+                        WHEN COALESCE(I.matricula, '') = '' OR COALESCE(I.nombre_completo, '') = '' THEN 'BR.4'
+                        WHEN A.grupo_id = ? THEN 'FE.2'
+                        WHEN A.matricula IS NOT NULL THEN 'OTRO_GRUPO'
+                        ELSE 'DUPLICADA'
+                    END
+                FROM temp.importacion_alumnos I
+                LEFT JOIN alumnos A ON A.matricula = I.matricula
+                WHERE COALESCE(I.matricula, '') = '' OR COALESCE(I.nombre_completo, '') = ''
+                   OR A.matricula IS NOT NULL
+                   OR EXISTS (
+                       SELECT 1 FROM temp.importacion_alumnos P
+                       WHERE P.matricula = I.matricula AND P.fila < I.fila
+                         AND COALESCE(P.nombre_completo, '') <> ''
+                   )
+                ORDER BY I.fila
+            """, (grupo_id,)).fetchall()
+
+            filas_con_error = [(fila,) for fila, _, _ in errores]
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS importacion_errores (fila INTEGER PRIMARY KEY)")
+            cursor.execute("DELETE FROM temp.importacion_errores")
+            cursor.executemany("INSERT INTO temp.importacion_errores VALUES (?)", filas_con_error)
+
+            cursor.execute("""
+                INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id)
+                SELECT matricula, nombre_completo, datos_contacto, email, ?
+                FROM temp.importacion_alumnos
+                WHERE fila NOT IN (SELECT fila FROM temp.importacion_errores)
+                ORDER BY fila
+            """, (grupo_id,))
+            return cursor.rowcount, errores
+
+        def limpiar(cursor):
+            cursor.execute("DROP TABLE IF EXISTS temp.importacion_alumnos")
+            cursor.execute("DROP TABLE IF EXISTS temp.importacion_errores")
+            return True
+
+        try:
+            if not self._ejecutar_en_transaccion(cargar, "Error al leer el archivo de alumnos"):
+                return False
+            return self._ejecutar_en_transaccion(validar_e_insertar, "Error al importar alumnos")
+        finally:
+            self._ejecutar_en_transaccion(limpiar, "Error al limpiar la importación")
+            self._despues_de_escribir(lambda: cache_roster.invalidar_grupo(self._db_file, grupo_id))
 
 
 # ====================================================
@@ -173,21 +316,41 @@ class AlumnoDAO(BaseDAO):
 class AsistenciaDAO(BaseDAO):
     """Maneja las operaciones CRUD para el registro de Asistencia."""
 
+    MAX_MATRICULAS_FILTRO = 500 # Matrículas por consulta en obtener_resumen_por_alumno
+
     def registrar_asistencia(self, matricula, fecha=None, estado="Presente"):
         # Permite llamadas con solo la matrícula; usa la fecha de hoy si no se proporciona.
-        # También acepta un objeto Asistencia y extrae sus atributos para no pasar
-        # el objeto entero como parámetro a sqlite3 (causa: "type 'Asistencia' is not supported").
+        # También acepta un objeto Asistencia (una tupla con los mismos tres campos).
         if isinstance(matricula, Asistencia):
-            asistencia_obj = matricula
-            matricula = asistencia_obj.get_matricula()
-            fecha = asistencia_obj.get_fecha() or date.today().isoformat()
-            estado = asistencia_obj.get_estado() or "Presente"
+            matricula, fecha, estado = matricula
+            fecha = fecha or date.today().isoformat()
+            estado = estado or "Presente"
         else:
             if fecha is None:
                 fecha = date.today().isoformat()
         query = "REPLACE INTO asistencia (matricula, fecha, estado) VALUES (?, ?, ?)"
         params = (matricula, fecha, estado)
         return self.ejecutar_query(query, params)
+
+    def registrar_asistencia_grupo(self, grupo_id, fecha=None, estado="Asistencia"):
+        """
+        Registra el mismo estado para TODOS los alumnos de un grupo en una sola
+        sentencia (INSERT ... SELECT) y una sola transacción.
+        Retorna el número de registros escritos, o False si hubo un error.
+        """
+        if fecha is None:
+            fecha = date.today().isoformat()
+        query = """
+            REPLACE INTO asistencia (matricula, fecha, estado)
+            SELECT matricula, ?, ? FROM alumnos WHERE grupo_id = ?
+        """
+
+        def operacion(cursor):
+            cursor.execute(query, (fecha, estado, grupo_id))
+            return cursor.rowcount
+
+        return self._ejecutar_en_transaccion(operacion, "Error al registrar asistencia del grupo")
+
     def obtener_asistencia_del_dia(self, fecha, grupo_id):
         """
         Retorna la lista de todos los alumnos de un grupo junto con su estado de
@@ -206,67 +369,192 @@ class AsistenciaDAO(BaseDAO):
             WHERE A.grupo_id = ?
             ORDER BY A.nombre_completo;
         """
-        try:
-            self._conectar()
-            # 💡 PARÁMETROS: (fecha, grupo_id)
-            self.cursor.execute(query, (fecha, grupo_id)) 
-            return self.cursor.fetchall()
-        except Exception as e:
-            print(f"Error al obtener asistencia: {e}")
-            # Si hay un error SQL, devuelve una lista vacía para evitar un crash.
-            return []
-        finally:
-            self._desconectar()
+        # 💡 PARÁMETROS: (fecha, grupo_id)
+        resultado = self._ejecutar_en_transaccion(
+            lambda cursor: cursor.execute(query, (fecha, grupo_id)).fetchall(),
+            "Error al obtener asistencia"
+        )
+        # Si hay un error SQL, devuelve una lista vacía para evitar un crash.
+        return resultado if resultado is not False else []
+
+    def registrar_asistencias(self, registros):
+        """Guarda varios registros [(matricula, fecha, estado), ...] o [Asistencia, ...] en una sola transacción."""
+        query = "REPLACE INTO asistencia (matricula, fecha, estado) VALUES (?, ?, ?)"
+        return self.ejecutar_queries_multiples(query, registros)
+
+    def obtener_asistencia_rango(self, grupo_id, desde, hasta):
+        """
+        Matriz alumnos × fechas de un rango en UNA consulta (ver Logica/matriz_asistencia.py).
+        Retorna [(matricula, nombre, fecha, estado), ...] ordenado por alumno; los alumnos
+        sin registros en el rango aparecen una vez con fecha y estado en NULL.
+        """
+        query = """
+            SELECT A.matricula, A.nombre_completo, S.fecha, S.estado
+            FROM alumnos A
+            LEFT JOIN asistencia S ON S.matricula = A.matricula AND S.fecha BETWEEN ? AND ?
+            WHERE A.grupo_id = ?
+            ORDER BY A.nombre_completo, A.matricula
+        """
+        resultado = self._ejecutar_en_transaccion(
+            lambda cursor: cursor.execute(query, (desde, hasta, grupo_id)).fetchall(),
+            "Error al obtener asistencia del rango"
+        )
+        return resultado if resultado is not False else []
+
+    # --- Consultas de analítica (Logica/analitica_asistencia.py) ---
+    # Todas reciben un rango de fechas inclusivo en formato ISO ('YYYY-MM-DD')
+    # y se resuelven con una sola pasada GROUP BY sobre el índice de asistencia.
+
+    def obtener_fechas_clase(self, grupo_id, desde, hasta):
+        """Fechas del rango en las que se pasó lista al grupo (días de clase)."""
+        query = """
+            SELECT DISTINCT S.fecha
+            FROM alumnos A
+            JOIN asistencia S ON S.matricula = A.matricula AND S.fecha BETWEEN ? AND ?
+            WHERE A.grupo_id = ?
+            ORDER BY S.fecha
+        """
+        return [fecha for (fecha,) in self.ejecutar_query(query, (desde, hasta, grupo_id)) or []]
+
+    def obtener_resumen_por_alumno(self, grupo_id, desde, hasta, matriculas=None):
+        """
+        Retorna [(matricula, nombre, presentes, retardos, ausentes, justificados, registros), ...]
+        de todos los alumnos del grupo (también los que no tienen registros en el rango),
+        o solo de `matriculas` si se indican (p. ej. al actualizar unas celdas de asistencia).
+        """
+        filtro, params = "", (desde, hasta, grupo_id)
+        # Con demasiadas matrículas (límite de variables de SQLite) se lee todo el grupo
+        if matriculas is not None and len(matriculas) <= self.MAX_MATRICULAS_FILTRO:
+            filtro = f"AND A.matricula IN ({', '.join('?' * len(matriculas))})"
+            params += tuple(matriculas)
+        query = f"""
+            SELECT A.matricula, A.nombre_completo,
+                COALESCE(SUM(S.estado IN ('Asistencia', 'Presente')), 0),
+                COALESCE(SUM(S.estado = 'Retardo'), 0),
+                COALESCE(SUM(S.estado = 'Ausente'), 0),
+                COALESCE(SUM(S.estado = 'Justificado'), 0),
+                COUNT(S.fecha)
+            FROM alumnos A
+            LEFT JOIN asistencia S ON S.matricula = A.matricula AND S.fecha BETWEEN ? AND ?
+            WHERE A.grupo_id = ? {filtro}
+            GROUP BY A.matricula
+            ORDER BY A.nombre_completo
+        """
+        return self.ejecutar_query(query, params) or []
+
+    def obtener_resumen_por_fecha(self, grupo_id, desde, hasta):
+        """Retorna [(fecha, presentes, retardos, ausentes, justificados, registros), ...]."""
+        query = """
+            SELECT S.fecha,
+                SUM(S.estado IN ('Asistencia', 'Presente')),
+                SUM(S.estado = 'Retardo'),
+                SUM(S.estado = 'Ausente'),
+                SUM(S.estado = 'Justificado'),
+                COUNT(*)
+            FROM alumnos A
+            JOIN asistencia S ON S.matricula = A.matricula AND S.fecha BETWEEN ? AND ?
+            WHERE A.grupo_id = ?
+            GROUP BY S.fecha
+            ORDER BY S.fecha
+        """
+        return self.ejecutar_query(query, (desde, hasta, grupo_id)) or []
+
+    def iterar_registros_grupo(self, grupo_id, desde, hasta):
+        """Filas (matricula, fecha, estado) del grupo ordenadas por alumno y fecha (para rachas)."""
+        query = """
+            SELECT S.matricula, S.fecha, S.estado
+            FROM alumnos A
+            JOIN asistencia S ON S.matricula = A.matricula AND S.fecha BETWEEN ? AND ?
+            WHERE A.grupo_id = ?
+            ORDER BY S.matricula, S.fecha
+        """
+        return self.iterar_query(query, (desde, hasta, grupo_id))
 
 # ====================================================
 # 4. CATEGORIAEVALUACION DAO (Ponderación flexible - CU3)
 # ====================================================
 class CategoriaEvaluacionDAO(BaseDAO):
-    """Maneja las categorías de evaluación flexibles por Grupo."""
-    
-    # BR.3 (Ponderación inicial por defecto) ahora se maneja insertando múltiples registros
+    """
+    Maneja las categorías de evaluación flexibles por Grupo.
+    La ponderación se lee a través de la caché compartida (Datos/cache_categorias.py);
+    guardar_categorias y la ponderación inicial invalidan el grupo afectado.
+    """
+
+    # BR.3: Ponderación inicial por defecto (grupo_id se agrega al insertar)
+    CATEGORIAS_BASE = [
+        ("Asistencia", 10.0, 1),
+        ("Examen Final", 40.0, 1),
+        ("Participación", 10.0, 5), # Total 5 participaciones
+        ("Tareas", 40.0, 10)        # Total 10 tareas
+    ]
+
     def crear_ponderacion_inicial(self, grupo_id):
-        # La ponderación inicial por defecto (si se desea mantener una base)
-        categorias_base = [
-            (grupo_id, "Asistencia", 10.0, 1),
-            (grupo_id, "Examen Final", 40.0, 1),
-            (grupo_id, "Participación", 10.0, 5), # Total 5 participaciones
-            (grupo_id, "Tareas", 40.0, 10)      # Total 10 tareas
-        ]
-        query = "INSERT OR IGNORE INTO categorias_evaluacion (grupo_id, nombre_categoria, peso_porcentual, max_items) VALUES (?, ?, ?, ?)"
-        
-        for cat in categorias_base:
-            self.ejecutar_query(query, cat)
-        return True
+        """
+        Crea la ponderación por defecto SOLO si el grupo aún no tiene categorías:
+        una sentencia (INSERT ... SELECT) y una transacción. Una ponderación ya
+        personalizada no se toca (antes se le volvían a agregar las categorías base
+        que el docente había quitado). Retorna el número de categorías creadas
+        (0 si el grupo ya tenía), o False si hubo un error.
+        """
+        valores = ", ".join(["(?, ?, ?)"] * len(self.CATEGORIAS_BASE))
+        query = f"""
+            INSERT INTO categorias_evaluacion (grupo_id, nombre_categoria, peso_porcentual, max_items)
+            SELECT ?, column1, column2, column3 FROM (VALUES {valores})
+            WHERE NOT EXISTS (SELECT 1 FROM categorias_evaluacion WHERE grupo_id = ?)
+        """
+        params = (grupo_id, *(dato for categoria in self.CATEGORIAS_BASE for dato in categoria), grupo_id)
+
+        def operacion(cursor):
+            cursor.execute(query, params)
+            return cursor.rowcount
+
+        creadas = self._ejecutar_en_transaccion(operacion, "Error al crear la ponderación inicial")
+        if creadas:
+            self._despues_de_escribir(lambda: cache_categorias.invalidar_grupo(self._db_file, grupo_id))
+        return creadas
 
     def obtener_categorias(self, grupo_id):
-        query = "SELECT nombre_categoria, peso_porcentual, max_items FROM categorias_evaluacion WHERE grupo_id = ?"
-        resultados = self.ejecutar_query(query, (grupo_id,))
-        
-        if not resultados:
-            # Si no hay categorías, crear las iniciales y reintentar
-            self.crear_ponderacion_inicial(grupo_id)
-            return self.obtener_categorias(grupo_id)
-            
-        # Retornamos objetos del modelo
-        lista_categorias = [
-            CategoriaEvaluacion(grupo_id, nombre, peso, items) 
-            for nombre, peso, items in resultados
-        ]
-        return lista_categorias 
+        """[CategoriaEvaluacion, ...] del grupo; si no tiene, se crea primero la ponderación inicial (BR.3)."""
+        return cache_categorias.obtener(self._db_file, grupo_id, lambda: self._leer_categorias(grupo_id))
+
+    def obtener_categorias_sin_crear(self, grupo_id):
+        """
+        Como obtener_categorias, pero sin escribir: si el grupo aún no tiene
+        ponderación se retorna la inicial (BR.3) solo en memoria. Para lecturas
+        que no deben modificar la base (p. ej. la exportación de reportes).
+        """
+        resultados = self._leer_categorias(grupo_id, crear_inicial=False)
+        if resultados == []:
+            return [CategoriaEvaluacion(grupo_id, *categoria) for categoria in self.CATEGORIAS_BASE]
+        return resultados
+
+    def _leer_categorias(self, grupo_id, crear_inicial=True):
+        query = """
+            SELECT grupo_id, nombre_categoria, peso_porcentual, max_items
+            FROM categorias_evaluacion WHERE grupo_id = ?
+        """
+        # Retornamos objetos del modelo, construidos directo de las filas
+        resultados = self.ejecutar_query(query, (grupo_id,), fabrica_filas(CategoriaEvaluacion))
+
+        if resultados == [] and crear_inicial:
+            # Si no hay categorías, crear las iniciales y volver a leerlas
+            if self.crear_ponderacion_inicial(grupo_id) is False:
+                return False
+            resultados = self.ejecutar_query(query, (grupo_id,), fabrica_filas(CategoriaEvaluacion))
+
+        return resultados
 
     def guardar_categorias(self, categorias: list[CategoriaEvaluacion], grupo_id):
-        # 1. Eliminar las categorías existentes para ese grupo
-        self.ejecutar_query("DELETE FROM categorias_evaluacion WHERE grupo_id = ?", (grupo_id,))
-        
-        # 2. Insertar las nuevas categorías
-        query = "INSERT INTO categorias_evaluacion (grupo_id, nombre_categoria, peso_porcentual, max_items) VALUES (?, ?, ?, ?)"
-        
-        params_list = [
-            (cat.get_grupo_id(), cat.get_nombre_categoria(), cat.get_peso_porcentual(), cat.get_max_items())
-            for cat in categorias
-        ]
-        return self.ejecutar_queries_multiples(query, params_list)
+        # Borrar e insertar en UNA transacción: si algo falla, el grupo conserva su ponderación anterior
+        with UnidadDeTrabajo(self._db_file) as unidad:
+            # 1. Eliminar las categorías existentes para ese grupo
+            self.ejecutar_query("DELETE FROM categorias_evaluacion WHERE grupo_id = ?", (grupo_id,))
+
+            # 2. Insertar las nuevas categorías (cada CategoriaEvaluacion ya es la tupla de parámetros)
+            query = "INSERT INTO categorias_evaluacion (grupo_id, nombre_categoria, peso_porcentual, max_items) VALUES (?, ?, ?, ?)"
+            self.ejecutar_queries_multiples(query, categorias)
+        self._despues_de_escribir(lambda: cache_categorias.invalidar_grupo(self._db_file, grupo_id))
+        return unidad.exitosa
 
 # ====================================================
 # 5. CALIFICACION DAO (CASO DE USO 5)
@@ -274,18 +562,24 @@ class CategoriaEvaluacionDAO(BaseDAO):
 class CalificacionDAO(BaseDAO):
     """Maneja las operaciones CRUD para las Calificaciones de Alumnos."""
 
+    # Columnas en el orden de los campos de Calificacion: la entidad se pasa como parámetros.
+    # Sin fecha se usa la de hoy (hora local, como date.today()). La llave es
+    # (matricula, categoria, numero_item): volver a capturar un elemento lo reemplaza.
+    _REGISTRAR_CALIFICACION = """
+        REPLACE INTO calificaciones (matricula, categoria, valor, fecha, numero_item)
+        VALUES (?, ?, ?, COALESCE(?, date('now', 'localtime')), ?)
+    """
+
     def registrar_calificacion(self, calificacion: Calificacion):
         # Usamos REPLACE INTO para insertar o actualizar (FA.1: Modificar calificación existente)
-        query = "REPLACE INTO calificaciones (matricula, categoria, fecha, valor) VALUES (?, ?, ?, ?)"
-        params = (
-            calificacion.get_matricula(), 
-            calificacion.get_categoria(), 
-            calificacion.get_fecha() or date.today().isoformat(), 
-            calificacion.get_valor()
-        )
-        return self.ejecutar_query(query, params)
+        return self.ejecutar_query(self._REGISTRAR_CALIFICACION, calificacion)
+
+    def registrar_calificaciones(self, calificaciones: list[Calificacion]):
+        """Registra varias calificaciones en una sola transacción (escritura diferida de la UI)."""
+        return self.ejecutar_queries_multiples(self._REGISTRAR_CALIFICACION, calificaciones)
     
-    def obtener_calificaciones_por_grupo_categoria(self, grupo_id, categoria):
+    def obtener_calificaciones_por_grupo_categoria(self, grupo_id, categoria, numero_item=1):
+        """[(matricula, nombre, valor), ...]: una fila por alumno con la nota de UN elemento."""
         query = """
             SELECT 
                 A.matricula, 
@@ -293,13 +587,40 @@ class CalificacionDAO(BaseDAO):
                 C.valor
             FROM alumnos A
             LEFT JOIN calificaciones C 
-            ON A.matricula = C.matricula AND C.categoria = ?
+            ON A.matricula = C.matricula AND C.categoria = ? AND C.numero_item = ?
             WHERE A.grupo_id = ?
             ORDER BY A.nombre_completo;
         """
+        return self.ejecutar_query(query, (categoria, numero_item, grupo_id))
+
+    def obtener_elementos_por_grupo_categoria(self, grupo_id, categoria):
+        """
+        Todas las notas de una categoría para la cuadrícula alumnos × elementos.
+        Retorna [(matricula, nombre, numero_item, valor), ...] ordenado por alumno y
+        elemento; los alumnos sin notas aparecen una vez con numero_item y valor en NULL.
+        """
+        query = """
+            SELECT A.matricula, A.nombre_completo, C.numero_item, C.valor
+            FROM alumnos A
+            LEFT JOIN calificaciones C ON C.matricula = A.matricula AND C.categoria = ?
+            WHERE A.grupo_id = ?
+            ORDER BY A.nombre_completo, A.matricula, C.numero_item
+        """
         return self.ejecutar_query(query, (categoria, grupo_id))
     
+    def obtener_valores_alumno_categoria(self, matricula, categoria):
+        """Retorna la lista de notas de un alumno en una categoría (todos sus elementos)."""
+        query = "SELECT valor FROM calificaciones WHERE matricula = ? AND categoria = ?"
+        resultados = self.ejecutar_query(query, (matricula, categoria))
+        return [fila[0] for fila in resultados] if resultados else []
+
     def obtener_todas_calificaciones_por_grupo(self, grupo_id):
+        """
+        [(matricula, categoria, valor), ...]: todas las notas del grupo, una fila por elemento.
+        Las `max_items` mejores de cada celda se eligen en la pasada única de
+        Logica/motor_calificaciones.py (más rápido que ROW_NUMBER() en SQL, que ordena
+        todas las notas en un árbol temporal; ver benchmarks/verificar_calificaciones_elementos.py).
+        """
         query = """
             SELECT A.matricula, C.categoria, C.valor
             FROM alumnos A
@@ -307,4 +628,292 @@ class CalificacionDAO(BaseDAO):
             ON A.matricula = C.matricula
             WHERE A.grupo_id = ?
         """
-        return self.ejecutar_query(query, (grupo_id,))
\ No newline at end of file
+        return self.ejecutar_query(query, (grupo_id,))
+
+
+# ====================================================
+# 6. PROMEDIO DAO (Promedios materializados - BR.14 / BR.15)
+# ====================================================
+class PromedioDAO(BaseDAO):
+    """Mantiene las tablas precalculadas promedios_finales y promedios_categoria."""
+
+    def actualizar_subtotales(self, grupo_id, subtotales):
+        """
+        Actualiza la aportación de las categorías indicadas [(matricula, categoria, subtotal), ...]
+        y recalcula solo el promedio final de esos alumnos, en una sola transacción.
+        """
+        matriculas = sorted({matricula for matricula, _, _ in subtotales})
+
+        def operacion(cursor):
+            cursor.executemany(
+                "REPLACE INTO promedios_categoria (matricula, categoria, subtotal) VALUES (?, ?, ?)",
+                subtotales
+            )
+            cursor.executemany("""
+                REPLACE INTO promedios_finales (matricula, grupo_id, promedio_final)
+                SELECT ?, ?, COALESCE(SUM(subtotal), 0) FROM promedios_categoria WHERE matricula = ?
+            """, [(matricula, grupo_id, matricula) for matricula in matriculas])
+            return True
+
+        return self._ejecutar_en_transaccion(operacion, "Error al actualizar el promedio")
+
+    def actualizar_subtotal(self, matricula, grupo_id, categoria, subtotal):
+        """Actualiza UNA categoría de UN alumno y su promedio final."""
+        return self.actualizar_subtotales(grupo_id, [(matricula, categoria, subtotal)])
+
+    def reemplazar_promedios_grupo(self, grupo_id, resultado):
+        """
+        Refresco completo de un grupo (p. ej. tras cambiar la ponderación):
+        borra y reinserta todos sus promedios en una sola transacción.
+        `resultado` es un ResultadoPromedios (Logica/motor_calificaciones.py).
+        """
+        filas_finales = [(m, grupo_id, final) for m, final in zip(resultado.matriculas, resultado.finales)]
+        filas_categoria = [
+            (m, categoria, subtotal)
+            for m, fila in zip(resultado.matriculas, resultado.subtotales)
+            for categoria, subtotal in zip(resultado.categorias, fila)
+            if subtotal
+        ]
+        def operacion(cursor):
+            cursor.execute("""
+                DELETE FROM promedios_categoria WHERE matricula IN
+                    (SELECT matricula FROM alumnos WHERE grupo_id = ?)
+            """, (grupo_id,))
+            cursor.execute("DELETE FROM promedios_finales WHERE grupo_id = ?", (grupo_id,))
+            cursor.executemany(
+                "INSERT OR REPLACE INTO promedios_finales (matricula, grupo_id, promedio_final) VALUES (?, ?, ?)",
+                filas_finales
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO promedios_categoria (matricula, categoria, subtotal) VALUES (?, ?, ?)",
+                filas_categoria
+            )
+            return True
+
+        return self._ejecutar_en_transaccion(operacion, "Error al refrescar los promedios del grupo")
+
+    def existen_promedios_grupo(self, grupo_id):
+        resultado = self.ejecutar_query("SELECT 1 FROM promedios_finales WHERE grupo_id = ? LIMIT 1", (grupo_id,))
+        return bool(resultado)
+
+    def obtener_promedios_por_grupo(self, grupo_id):
+        """Retorna [(matricula, nombre_completo, promedio_final), ...] de todo el grupo."""
+        query = """
+            SELECT A.matricula, A.nombre_completo, COALESCE(P.promedio_final, 0)
+            FROM alumnos A
+            LEFT JOIN promedios_finales P ON P.matricula = A.matricula
+            WHERE A.grupo_id = ?
+            ORDER BY A.nombre_completo;
+        """
+        return self.ejecutar_query(query, (grupo_id,))
+
+    def obtener_subtotales_por_grupo(self, grupo_id):
+        """Retorna [(matricula, categoria, subtotal), ...] de todo el grupo."""
+        query = """
+            SELECT P.matricula, P.categoria, P.subtotal
+            FROM alumnos A
+            JOIN promedios_categoria P ON P.matricula = A.matricula
+            WHERE A.grupo_id = ?
+        """
+        return self.ejecutar_query(query, (grupo_id,))
+
+
+# ====================================================
+# 7. REPORTE DAO (CU6: Generar Reportes)
+# ====================================================
+# Las consultas de reportes se recorren con iterar_query (fetchmany) y vienen
+# ordenadas por grupo y alumno, en el orden del índice idx_alumnos_grupo_nombre,
+# para que la capa de lógica arme cada renglón del reporte sin guardar los demás.
+class ReporteDAO(BaseDAO):
+    """Consultas de solo lectura para exportar reportes por grupo o de toda la escuela."""
+
+    @staticmethod
+    def _filtro_grupo(grupo_id):
+        # Sin grupo: toda la escuela
+        return ("WHERE A.grupo_id = ?", (grupo_id,)) if grupo_id is not None else ("", ())
+
+    def contar_alumnos(self, grupo_id=None):
+        filtro, params = self._filtro_grupo(grupo_id)
+        resultado = self.ejecutar_query(f"SELECT COUNT(*) FROM alumnos A {filtro}", params)
+        return resultado[0][0] if resultado else 0
+
+    def iterar_roster(self, grupo_id=None):
+        """Filas (grupo, ciclo, matricula, nombre, contacto, email)."""
+        filtro, params = self._filtro_grupo(grupo_id)
+        query = f"""
+            SELECT G.nombre, G.ciclo_escolar, A.matricula, A.nombre_completo, A.datos_contacto, A.email
+            FROM alumnos A
+            JOIN grupos G ON G.grupo_id = A.grupo_id
+            {filtro}
+            ORDER BY A.grupo_id, A.nombre_completo
+        """
+        return self.iterar_query(query, params)
+
+    def obtener_fechas_asistencia(self, grupo_id=None):
+        """Fechas con asistencia registrada (una columna del reporte por fecha)."""
+        filtro, params = self._filtro_grupo(grupo_id)
+        query = f"""
+            SELECT DISTINCT S.fecha
+            FROM asistencia S
+            JOIN alumnos A ON A.matricula = S.matricula
+            {filtro}
+            ORDER BY S.fecha
+        """
+        return [fecha for (fecha,) in self.ejecutar_query(query, params) or []]
+
+    def iterar_asistencia(self, grupo_id=None, fecha_inicio=None, fecha_fin=None):
+        """
+        Filas (grupo, ciclo, matricula, nombre, fecha, estado), varias por alumno y
+        consecutivas; fecha y estado son None si el alumno no tiene registros en el rango.
+        """
+        filtro, params = self._filtro_grupo(grupo_id)
+        rango, params_rango = "", ()
+        if fecha_inicio is not None and fecha_fin is not None:
+            rango, params_rango = "AND S.fecha BETWEEN ? AND ?", (fecha_inicio, fecha_fin)
+        query = f"""
+            SELECT G.nombre, G.ciclo_escolar, A.matricula, A.nombre_completo, S.fecha, S.estado
+            FROM alumnos A
+            JOIN grupos G ON G.grupo_id = A.grupo_id
+            LEFT JOIN asistencia S ON S.matricula = A.matricula {rango}
+            {filtro}
+            ORDER BY A.grupo_id, A.nombre_completo, A.matricula
+        """
+        return self.iterar_query(query, params_rango + params)
+
+    def obtener_nombres_categorias(self, grupo_id=None):
+        """
+        Nombres (ordenados) de las categorías de la ponderación de los grupos. Si algún
+        grupo con alumnos aún no tiene ponderación se agregan los de la inicial (BR.3),
+        con la que se exportan sus promedios (ver CategoriaEvaluacionDAO.obtener_categorias_sin_crear).
+        """
+        filtro, params = ("WHERE grupo_id = ?", (grupo_id,)) if grupo_id is not None else ("", ())
+        query = f"SELECT DISTINCT nombre_categoria FROM categorias_evaluacion {filtro}"
+        nombres = {nombre for (nombre,) in self.ejecutar_query(query, params) or []}
+
+        filtro, params = ("AND G.grupo_id = ?", (grupo_id,)) if grupo_id is not None else ("", ())
+        query = f"""
+            SELECT EXISTS (
+                SELECT 1 FROM grupos G
+                WHERE NOT EXISTS (SELECT 1 FROM categorias_evaluacion C WHERE C.grupo_id = G.grupo_id)
+                  AND EXISTS (SELECT 1 FROM alumnos A WHERE A.grupo_id = G.grupo_id)
+                  {filtro}
+            )
+        """
+        resultado = self.ejecutar_query(query, params)
+        if resultado and resultado[0][0]:
+            nombres.update(nombre for nombre, _, _ in CategoriaEvaluacionDAO.CATEGORIAS_BASE)
+        return sorted(nombres)
+
+    def obtener_grupos_sin_promedios(self, grupo_id=None):
+        """grupo_id de los grupos con alumnos pero sin promedios materializados."""
+        filtro, params = self._filtro_grupo(grupo_id)
+        query = f"""
+            SELECT DISTINCT A.grupo_id
+            FROM alumnos A
+            {filtro}
+            {"AND" if filtro else "WHERE"} A.grupo_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM promedios_finales P WHERE P.grupo_id = A.grupo_id
+            )
+        """
+        return [g for (g,) in self.ejecutar_query(query, params) or []]
+
+    def iterar_promedios(self, grupo_id=None):
+        """
+        Filas (grupo_id, grupo, ciclo, matricula, nombre, promedio_final, categoria, subtotal),
+        una por categoría de cada alumno y consecutivas (los alumnos de un grupo también).
+        """
+        filtro, params = self._filtro_grupo(grupo_id)
+        query = f"""
+            SELECT A.grupo_id, G.nombre, G.ciclo_escolar, A.matricula, A.nombre_completo,
+                   COALESCE(F.promedio_final, 0), C.categoria, C.subtotal
+            FROM alumnos A
+            JOIN grupos G ON G.grupo_id = A.grupo_id
+            LEFT JOIN promedios_finales F ON F.matricula = A.matricula
+            LEFT JOIN promedios_categoria C ON C.matricula = A.matricula
+            {filtro}
+            ORDER BY A.grupo_id, A.nombre_completo, A.matricula
+        """
+        return self.iterar_query(query, params)
+
+
+# ====================================================
+# 8. HISTORIAL DAO (Aclaraciones de calificaciones y asistencia)
+# ====================================================
+# Las tablas de historial se llenan solas con los triggers de la migración 7:
+# ningún DAO escribe en ellas. Aquí solo se leen por celda (con el índice
+# (llave de la celda, cambio_id), del cambio más reciente al más antiguo) y se
+# depuran según la PoliticaHistorial de Datos/historial.py.
+class HistorialDAO(BaseDAO):
+    """Consulta y depuración del historial de cambios (solo agregado)."""
+
+    def obtener_historial_calificacion(self, matricula, categoria, numero_item=1):
+        """[(momento, valor_anterior, valor_nuevo, fecha), ...] de una nota, del cambio más reciente al más antiguo."""
+        query = """
+            SELECT momento, valor_anterior, valor_nuevo, fecha
+            FROM historial_calificaciones
+            WHERE matricula = ? AND categoria = ? AND numero_item = ?
+            ORDER BY cambio_id DESC
+        """
+        return self.ejecutar_query(query, (matricula, categoria, numero_item)) or []
+
+    def obtener_historial_alumno(self, matricula):
+        """[(momento, categoria, numero_item, valor_anterior, valor_nuevo), ...]: todas las notas de un alumno."""
+        query = """
+            SELECT momento, categoria, numero_item, valor_anterior, valor_nuevo
+            FROM historial_calificaciones
+            WHERE matricula = ?
+            ORDER BY cambio_id DESC
+        """
+        return self.ejecutar_query(query, (matricula,)) or []
+
+    def obtener_historial_asistencia(self, matricula, fecha):
+        """[(momento, estado_anterior, estado_nuevo), ...] de un día de un alumno, del más reciente al más antiguo."""
+        query = """
+            SELECT momento, estado_anterior, estado_nuevo
+            FROM historial_asistencia
+            WHERE matricula = ? AND fecha = ?
+            ORDER BY cambio_id DESC
+        """
+        return self.ejecutar_query(query, (matricula, fecha)) or []
+
+    def compactar(self, dias_retencion=None, max_cambios_por_celda=None):
+        """
+        Borra del historial los cambios con más de `dias_retencion` días y, de cada celda,
+        los que excedan los `max_cambios_por_celda` más recientes (None: sin límite).
+        El valor vigente no se pierde: vive en calificaciones y asistencia.
+        Retorna {"calificaciones": borrados, "asistencia": borrados}, o False si hubo un error.
+        """
+        tablas = {
+            "calificaciones": ("historial_calificaciones", "matricula, categoria, numero_item"),
+            "asistencia": ("historial_asistencia", "matricula, fecha"),
+        }
+
+        def operacion(cursor):
+            borrados = {}
+            for nombre, (tabla, celda) in tablas.items():
+                total = 0
+                if dias_retencion is not None:
+                    # Mismo formato que la columna momento: se compara como texto.
+                    # auditoría: recorrido completo intencional (mantenimiento de todo el historial)
+                    cursor.execute(
+                        f"DELETE FROM {tabla} WHERE momento < strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime', ?)",
+                        (f"-{int(dias_retencion)} days",)
+                    )
+                    total += cursor.rowcount
+                if max_cambios_por_celda is not None:
+                    # auditoría: recorrido completo intencional (numera los cambios de cada celda)
+                    cursor.execute(f"""
+                        DELETE FROM {tabla} WHERE cambio_id IN (
+                            SELECT cambio_id FROM (
+                                SELECT cambio_id,
+                                       ROW_NUMBER() OVER (PARTITION BY {celda} ORDER BY cambio_id DESC) AS posicion
+                                FROM {tabla}
+                            )
+                            WHERE posicion > ?
+                        )
+                    """, (int(max_cambios_por_celda),))
+                    total += cursor.rowcount
+                borrados[nombre] = total
+            return borrados
+
+        return self._ejecutar_en_transaccion(operacion, "Error al compactar el historial")
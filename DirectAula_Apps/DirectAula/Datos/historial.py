@@ -0,0 +1,86 @@
+"""
+Retención del historial de cambios de calificaciones y asistencia (migración 7).
+
+El historial solo crece: cada alta, cambio o baja de una nota o de un registro
+de asistencia agrega una fila (ver los triggers en Datos/migraciones.py). La
+PoliticaHistorial decide cuánto se conserva; con la política PERMANENTE (la
+predeterminada, para poder atender aclaraciones) nunca se borra nada. Con otra
+política, app.py compacta el historial al salir, y también se puede compactar
+a mano:
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python -m Datos.historial --db directaula.db --dias 730 --max-cambios 50
+"""
+import argparse
+import sys
+
+from Datos.conexion import conexiones
+from Datos.dao import HistorialDAO
+
+
+class PoliticaHistorial:
+    """Cuánto historial se conserva. None en ambos límites: se conserva todo."""
+
+    def __init__(self, dias_retencion=None, max_cambios_por_celda=None):
+        # Cambios con más días que este límite se borran
+        self.dias_retencion = dias_retencion
+        # De cada nota (o día de asistencia) solo se conservan los N cambios más recientes
+        self.max_cambios_por_celda = max_cambios_por_celda
+
+    def es_permanente(self):
+        return self.dias_retencion is None and self.max_cambios_por_celda is None
+
+
+PERMANENTE = PoliticaHistorial()
+# Dos ciclos escolares y un tope para celdas editadas una y otra vez
+DOS_CICLOS = PoliticaHistorial(dias_retencion=730, max_cambios_por_celda=50)
+
+_politica = PERMANENTE
+
+
+def get_politica():
+    return _politica
+
+
+def configurar_politica(politica):
+    """Cambia la política usada por compactar_historial() (p. ej. al salir de la aplicación)."""
+    global _politica
+    _politica = politica
+
+
+def compactar_historial(politica=None, db_file=None):
+    """
+    Aplica la política (la configurada si no se indica) en una sola transacción.
+    Retorna {"calificaciones": borrados, "asistencia": borrados}, False si hubo un
+    error, o None si la política es permanente (no se abre la base de datos).
+    """
+    politica = politica or _politica
+    if politica.es_permanente():
+        return None
+    return HistorialDAO(db_file).compactar(politica.dias_retencion, politica.max_cambios_por_celda)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="directaula.db", help="Base de datos a compactar")
+    parser.add_argument("--dias", type=int, help="Borra los cambios con más de estos días")
+    parser.add_argument("--max-cambios", type=int, help="Cambios más recientes a conservar por celda")
+    args = parser.parse_args(argv)
+
+    politica = PoliticaHistorial(args.dias, args.max_cambios)
+    if politica.es_permanente():
+        print("Sin --dias ni --max-cambios no hay nada que compactar.")
+        return 0
+    conexiones.configurar_db_file(args.db)
+    try:
+        borrados = compactar_historial(politica)
+    finally:
+        conexiones.cerrar_todas()
+    if borrados is False:
+        return 1
+    print(f"Cambios borrados del historial: {borrados}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
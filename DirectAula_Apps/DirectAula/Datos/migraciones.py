@@ -0,0 +1,350 @@
+"""
+Migraciones versionadas del esquema de DirectAula.
+
+La versión del esquema se guarda en PRAGMA user_version del propio archivo
+.db. Al abrir la primera conexión a un archivo se aplican, en orden y una
+sola vez, las migraciones con número mayor a esa versión. Así las bases de
+datos de las escuelas reciben nuevas tablas e índices sin perder datos.
+
+Para cambiar el esquema: agregar una Migracion al FINAL de MIGRACIONES con
+el siguiente número. Nunca modificar una migración ya publicada.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python -m Datos.migraciones --db directaula.db
+"""
+import argparse
+import sqlite3
+import sys
+
+
+class Migracion:
+    """Un paso numerado del esquema: lista de sentencias SQL aplicadas juntas."""
+
+    def __init__(self, version, descripcion, sentencias, en_transaccion=True):
+        self.version = version
+        self.descripcion = descripcion
+        self.sentencias = sentencias
+        # Algunas PRAGMA (p. ej. journal_mode) no se pueden ejecutar dentro de una transacción
+        self.en_transaccion = en_transaccion
+
+
+MIGRACIONES = [
+    # Las tablas usan IF NOT EXISTS porque las bases de datos anteriores a las
+    # migraciones (user_version = 0) ya las tienen.
+    Migracion(1, "Esquema base (CU1-CU5)", [
+        # Creación de la tabla GRUPOS (CU1)
+        """
+        CREATE TABLE IF NOT EXISTS grupos (
+            grupo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            ciclo_escolar TEXT NOT NULL
+        );
+        """,
+        # Creación de la tabla ALUMNOS (CU2)
+        """
+        CREATE TABLE IF NOT EXISTS alumnos (
+            matricula TEXT PRIMARY KEY,
+            nombre_completo TEXT NOT NULL,
+            datos_contacto TEXT,
+            email TEXT,
+            grupo_id INTEGER,
+            FOREIGN KEY (grupo_id) REFERENCES grupos(grupo_id)
+        );
+        """,
+        # Creación de la tabla PONDERACIONES (CU3)
+        """
+        CREATE TABLE IF NOT EXISTS categorias_evaluacion (
+            grupo_id INTEGER NOT NULL,
+            nombre_categoria TEXT NOT NULL,
+            peso_porcentual REAL NOT NULL,
+            max_items INTEGER NOT NULL DEFAULT 1, -- Total de Tareas a considerar para categorías múltiples
+            PRIMARY KEY (grupo_id, nombre_categoria),
+            FOREIGN KEY (grupo_id) REFERENCES grupos(grupo_id) ON DELETE CASCADE
+        );
+        """,
+        # Creación de la tabla ASISTENCIA (CU4)
+        """
+        CREATE TABLE IF NOT EXISTS asistencia (
+            matricula TEXT NOT NULL,
+            fecha TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            PRIMARY KEY (matricula, fecha),
+            FOREIGN KEY (matricula) REFERENCES alumnos(matricula)
+        );
+        """,
+        # Creación de la tabla CALIFICACIONES (CU5)
+        """
+        CREATE TABLE IF NOT EXISTS calificaciones (
+            matricula TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            fecha TEXT NOT NULL,
+            valor REAL NOT NULL,
+            PRIMARY KEY (matricula, categoria, fecha),
+            FOREIGN KEY (matricula) REFERENCES alumnos(matricula) ON DELETE CASCADE
+        );
+        """,
+    ]),
+
+    # Índices secundarios para las consultas frecuentes (BR.1 por nombre/ciclo,
+    # roster por grupo, asistencia por fecha y calificaciones por categoría)
+    Migracion(2, "Índices secundarios", [
+        "CREATE INDEX IF NOT EXISTS idx_grupos_nombre_ciclo ON grupos (nombre, ciclo_escolar);",
+        "CREATE INDEX IF NOT EXISTS idx_alumnos_grupo_nombre ON alumnos (grupo_id, nombre_completo);",
+        "CREATE INDEX IF NOT EXISTS idx_asistencia_fecha_matricula ON asistencia (fecha, matricula);",
+        "CREATE INDEX IF NOT EXISTS idx_calificaciones_categoria_matricula ON calificaciones (categoria, matricula);",
+    ]),
+
+    # Tablas materializadas de PROMEDIOS (BR.14 / BR.15),
+    # mantenidas de forma incremental al registrar calificaciones.
+    Migracion(3, "Promedios materializados", [
+        """
+        CREATE TABLE IF NOT EXISTS promedios_finales (
+            matricula TEXT PRIMARY KEY,
+            grupo_id INTEGER NOT NULL,
+            promedio_final REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY (matricula) REFERENCES alumnos(matricula) ON DELETE CASCADE
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_promedios_finales_grupo ON promedios_finales (grupo_id);",
+        """
+        CREATE TABLE IF NOT EXISTS promedios_categoria (
+            matricula TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            subtotal REAL NOT NULL, -- Aportación ponderada de la categoría al promedio final
+            PRIMARY KEY (matricula, categoria),
+            FOREIGN KEY (matricula) REFERENCES alumnos(matricula) ON DELETE CASCADE
+        );
+        """,
+    ]),
+
+    # Índice que cubre (matricula, fecha, estado): la analítica de asistencia por
+    # rango de fechas se resuelve solo con el índice, sin leer la tabla.
+    Migracion(4, "Índice de cobertura para analítica de asistencia", [
+        "CREATE INDEX IF NOT EXISTS idx_asistencia_matricula_fecha_estado ON asistencia (matricula, fecha, estado);",
+    ]),
+
+    # Búsqueda global de alumnos (todas las generaciones y grupos) con FTS5.
+    # Tabla de contenido externo: el texto vive solo en `alumnos` y los triggers
+    # mantienen el índice al día. Sin acentos ("nunez" encuentra "Núñez") y con
+    # índices de prefijo para buscar mientras se escribe.
+    Migracion(5, "Índice de texto completo de alumnos (FTS5)", [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS alumnos_fts USING fts5(
+            matricula, nombre_completo, email,
+            content='alumnos', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS alumnos_fts_insertar AFTER INSERT ON alumnos BEGIN
+            INSERT INTO alumnos_fts (rowid, matricula, nombre_completo, email)
+            VALUES (new.rowid, new.matricula, new.nombre_completo, new.email);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS alumnos_fts_eliminar AFTER DELETE ON alumnos BEGIN
+            INSERT INTO alumnos_fts (alumnos_fts, rowid, matricula, nombre_completo, email)
+            VALUES ('delete', old.rowid, old.matricula, old.nombre_completo, old.email);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS alumnos_fts_actualizar AFTER UPDATE OF matricula, nombre_completo, email ON alumnos BEGIN
+            INSERT INTO alumnos_fts (alumnos_fts, rowid, matricula, nombre_completo, email)
+            VALUES ('delete', old.rowid, old.matricula, old.nombre_completo, old.email);
+            INSERT INTO alumnos_fts (rowid, matricula, nombre_completo, email)
+            VALUES (new.rowid, new.matricula, new.nombre_completo, new.email);
+        END;
+        """,
+        # Indexa los alumnos que ya existían
+        "INSERT INTO alumnos_fts (alumnos_fts) VALUES ('rebuild');",
+    ]),
+
+    # Calificaciones por elemento (Tarea 1, Tarea 2, ...): la llave deja de ser la
+    # fecha de captura, que sobrescribía la nota del mismo día y duplicaba la de
+    # días distintos. Las notas existentes se numeran por fecha dentro de cada
+    # (alumno, categoría). La fecha se conserva como fecha de captura.
+    Migracion(6, "Número de elemento en calificaciones", [
+        """
+        CREATE TABLE calificaciones_por_elemento (
+            matricula TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            numero_item INTEGER NOT NULL DEFAULT 1 CHECK (numero_item >= 1),
+            fecha TEXT NOT NULL,
+            valor REAL NOT NULL,
+            PRIMARY KEY (matricula, categoria, numero_item),
+            FOREIGN KEY (matricula) REFERENCES alumnos(matricula) ON DELETE CASCADE
+        );
+        """,
+        """
+        INSERT INTO calificaciones_por_elemento (matricula, categoria, numero_item, fecha, valor)
+        SELECT matricula, categoria,
+               ROW_NUMBER() OVER (PARTITION BY matricula, categoria ORDER BY fecha),
+               fecha, valor
+        FROM calificaciones;
+        """,
+        "DROP TABLE calificaciones;",
+        "ALTER TABLE calificaciones_por_elemento RENAME TO calificaciones;",
+        "CREATE INDEX IF NOT EXISTS idx_calificaciones_categoria_matricula ON calificaciones (categoria, matricula);",
+    ]),
+
+    # Historial de cambios (aclaraciones de calificaciones y asistencia). Las tablas
+    # calificaciones y asistencia siguen siendo el valor VIGENTE de cada celda (una fila
+    # por llave primaria): la cuadrícula no cambia. Cada alta, cambio o baja se agrega
+    # además a una tabla de historial desde triggers, en la misma transacción que la
+    # escritura, sin importar qué DAO la haga. Solo se agregan filas: la depuración por
+    # antigüedad es la de Datos/historial.py.
+    # Los triggers BEFORE INSERT leen el valor anterior antes de que REPLACE lo borre
+    # (con recursive_triggers apagado, REPLACE no dispara los triggers DELETE); si la
+    # escritura falla, la fila del historial se revierte con ella. Guardar el mismo
+    # valor no agrega nada.
+    Migracion(7, "Historial de cambios de calificaciones y asistencia", [
+        """
+        CREATE TABLE IF NOT EXISTS historial_calificaciones (
+            cambio_id INTEGER PRIMARY KEY,
+            matricula TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            numero_item INTEGER NOT NULL,
+            valor_anterior REAL, -- NULL: alta de la nota
+            valor_nuevo REAL, -- NULL: baja de la nota
+            fecha TEXT, -- Fecha de captura de la nota nueva
+            momento TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+        );
+        """,
+        # Sin llave foránea: el historial sobrevive a la baja del alumno
+        """
+        CREATE INDEX IF NOT EXISTS idx_historial_calificaciones_celda
+        ON historial_calificaciones (matricula, categoria, numero_item, cambio_id);
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS historial_asistencia (
+            cambio_id INTEGER PRIMARY KEY,
+            matricula TEXT NOT NULL,
+            fecha TEXT NOT NULL,
+            estado_anterior TEXT,
+            estado_nuevo TEXT,
+            momento TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+        );
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_historial_asistencia_celda
+        ON historial_asistencia (matricula, fecha, cambio_id);
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_calificaciones_insertar BEFORE INSERT ON calificaciones BEGIN
+            INSERT INTO historial_calificaciones (matricula, categoria, numero_item, valor_anterior, valor_nuevo, fecha)
+            SELECT new.matricula, new.categoria, new.numero_item, anterior.valor, new.valor, new.fecha
+            FROM (SELECT (SELECT valor FROM calificaciones
+                          WHERE matricula = new.matricula AND categoria = new.categoria
+                            AND numero_item = new.numero_item) AS valor) anterior
+            WHERE anterior.valor IS NOT new.valor;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_calificaciones_actualizar AFTER UPDATE OF valor ON calificaciones
+        WHEN old.valor IS NOT new.valor BEGIN
+            INSERT INTO historial_calificaciones (matricula, categoria, numero_item, valor_anterior, valor_nuevo, fecha)
+            VALUES (new.matricula, new.categoria, new.numero_item, old.valor, new.valor, new.fecha);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_calificaciones_eliminar AFTER DELETE ON calificaciones BEGIN
+            INSERT INTO historial_calificaciones (matricula, categoria, numero_item, valor_anterior, valor_nuevo, fecha)
+            VALUES (old.matricula, old.categoria, old.numero_item, old.valor, NULL, old.fecha);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_asistencia_insertar BEFORE INSERT ON asistencia BEGIN
+            INSERT INTO historial_asistencia (matricula, fecha, estado_anterior, estado_nuevo)
+            SELECT new.matricula, new.fecha, anterior.estado, new.estado
+            FROM (SELECT (SELECT estado FROM asistencia
+                          WHERE matricula = new.matricula AND fecha = new.fecha) AS estado) anterior
+            WHERE anterior.estado IS NOT new.estado;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_asistencia_actualizar AFTER UPDATE OF estado ON asistencia
+        WHEN old.estado IS NOT new.estado BEGIN
+            INSERT INTO historial_asistencia (matricula, fecha, estado_anterior, estado_nuevo)
+            VALUES (new.matricula, new.fecha, old.estado, new.estado);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_asistencia_eliminar AFTER DELETE ON asistencia BEGIN
+            INSERT INTO historial_asistencia (matricula, fecha, estado_anterior, estado_nuevo)
+            VALUES (old.matricula, old.fecha, old.estado, NULL);
+        END;
+        """,
+        # Solo agregado: un cambio registrado no se puede modificar
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_calificaciones_inmutable BEFORE UPDATE ON historial_calificaciones BEGIN
+            SELECT RAISE(ABORT, 'El historial de calificaciones no se puede modificar');
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS historial_asistencia_inmutable BEFORE UPDATE ON historial_asistencia BEGIN
+            SELECT RAISE(ABORT, 'El historial de asistencia no se puede modificar');
+        END;
+        """,
+    ]),
+]
+
+
+def obtener_version(con):
+    return con.execute("PRAGMA user_version").fetchone()[0]
+
+
+def version_objetivo(migraciones=MIGRACIONES):
+    return migraciones[-1].version if migraciones else 0
+
+
+def aplicar_migraciones(con, migraciones=MIGRACIONES):
+    """
+    Aplica las migraciones pendientes sobre la conexión `con`.
+    Cada migración se ejecuta en su propia transacción junto con el cambio de
+    user_version: si falla, la base de datos queda en la versión anterior.
+    Retorna la lista de versiones aplicadas.
+    """
+    aplicadas = []
+    for migracion in migraciones:
+        if migracion.version <= obtener_version(con):
+            continue
+        try:
+            if migracion.en_transaccion:
+                # IMMEDIATE toma el bloqueo de escritura antes de volver a leer la versión:
+                # si otra instancia de la aplicación migró mientras tanto, no se repite.
+                con.execute("BEGIN IMMEDIATE")
+                if migracion.version <= obtener_version(con):
+                    con.commit()
+                    continue
+            for sentencia in migracion.sentencias:
+                con.execute(sentencia)
+            # PRAGMA no acepta parámetros; version es un entero controlado por el código
+            con.execute(f"PRAGMA user_version = {int(migracion.version)}")
+            con.commit()
+        except sqlite3.Error as e:
+            print(f"Error al aplicar la migración {migracion.version} ({migracion.descripcion}): {e}")
+            con.rollback()
+            raise
+        aplicadas.append(migracion.version)
+    return aplicadas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="directaula.db", help="Base de datos a migrar")
+    parser.add_argument("--solo-version", action="store_true", help="Solo muestra la versión, sin migrar")
+    args = parser.parse_args(argv)
+
+    con = sqlite3.connect(args.db)
+    try:
+        print(f"Versión actual del esquema: {obtener_version(con)} (objetivo: {version_objetivo()})")
+        if not args.solo_version:
+            aplicadas = aplicar_migraciones(con)
+            print(f"Migraciones aplicadas: {aplicadas or 'ninguna'}")
+    finally:
+        con.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+
+from Datos.conexion import conexiones, es_error_ocupada
+
+# ====================================================
+# UNIDAD DE TRABAJO (varias operaciones de DAO en una transacción)
+# ====================================================
+# Cada llamada a un DAO confirma su propia transacción. Las operaciones
+# compuestas (p. ej. guardar la ponderación y recalcular los promedios) se
+# envuelven en una UnidadDeTrabajo para que sean atómicas y se confirmen una
+# sola vez:
+#
+#     with UnidadDeTrabajo() as unidad:
+#         categoria_dao.guardar_categorias(...)
+#         promedio_dao.reemplazar_promedios_grupo(...)
+#     if not unidad.exitosa:
+#         return "Error: ..."
+#
+# Mientras la unidad está abierta, BaseDAO._ejecutar_en_transaccion ejecuta
+# cada operación dentro de un SAVEPOINT de la misma conexión, sin confirmar.
+# Si una operación falla (el DAO imprime el error y retorna False, como
+# siempre), se deshace solo esa operación y la unidad queda marcada como
+# fallida: al salir del bloque se deshace todo. Una excepción dentro del
+# bloque también deshace todo y se propaga.
+#
+# Las unidades pueden anidarse (un método de un gestor que abre una unidad
+# llamado desde otro que ya abrió una): la interna usa un SAVEPOINT y la
+# confirmación real ocurre solo al cerrar la más externa.
+
+_local = threading.local() # Pila de unidades abiertas por hilo y por archivo de base de datos
+
+
+def _pila(db_file):
+    pilas = getattr(_local, "pilas", None)
+    if pilas is None:
+        pilas = _local.pilas = {}
+    return pilas.setdefault(db_file, [])
+
+
+def unidad_actual(db_file=None):
+    """Unidad de trabajo abierta en este hilo para db_file, o None."""
+    pila = _pila(db_file or conexiones.get_db_file())
+    return pila[-1] if pila else None
+
+
+class UnidadDeTrabajo:
+    """Transacción compartida por varias llamadas a DAO del hilo actual (ver arriba)."""
+
+    def __init__(self, db_file=None):
+        self._db_file = db_file or conexiones.get_db_file()
+        self._con = None
+        self._savepoint = None # Nombre del SAVEPOINT si es una unidad anidada
+        self._raiz = self # Unidad más externa (la que confirma)
+        self._al_terminar = [] # Funciones a ejecutar tras confirmar o deshacer (solo en la raíz)
+        self.exitosa = True
+
+    def __enter__(self):
+        pila = _pila(self._db_file)
+        self._con = conexiones.obtener(self._db_file)
+        if pila:
+            self._raiz = pila[0]
+            self._savepoint = f"unidad_{len(pila)}"
+            self._con.execute(f"SAVEPOINT {self._savepoint}")
+        else:
+            self._iniciar()
+        pila.append(self)
+        return self
+
+    def _iniciar(self):
+        # IMMEDIATE toma el bloqueo de escritura al inicio: si otra instancia de la
+        # aplicación está escribiendo se espera (y reintenta) aquí, no a media unidad.
+        reintentos = conexiones.get_perfil().reintentos
+        for intento in range(reintentos + 1):
+            try:
+                self._con.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if not es_error_ocupada(e) or intento == reintentos:
+                    raise
+                conexiones.esperar_reintento(intento)
+
+    def al_terminar(self, funcion):
+        """Registra funcion() para después de confirmar o deshacer la unidad más externa."""
+        self._raiz._al_terminar.append(funcion)
+
+    def ejecutar(self, operacion, mensaje_error="Error al ejecutar consulta"):
+        """
+        Ejecuta operacion(cursor) dentro de la unidad (lo usa BaseDAO).
+        Retorna el resultado de la operación, o False si hubo un error.
+        """
+        cursor = self._con.cursor()
+        self._con.execute("SAVEPOINT operacion")
+        try:
+            resultado = operacion(cursor)
+            self._con.execute("RELEASE operacion")
+            return resultado
+        except sqlite3.Error as e:
+            self._con.execute("ROLLBACK TO operacion")
+            self._con.execute("RELEASE operacion")
+            print(f"{mensaje_error}: {e}")
+            self.exitosa = False
+            return False
+        finally:
+            cursor.close()
+
+    def __exit__(self, tipo, valor, traza):
+        _pila(self._db_file).pop()
+        fallida = tipo is not None or not self.exitosa
+        self.exitosa = not fallida
+
+        if self._savepoint is not None:
+            if fallida:
+                self._con.execute(f"ROLLBACK TO {self._savepoint}")
+            self._con.execute(f"RELEASE {self._savepoint}")
+            return False
+
+        try:
+            if fallida:
+                self._con.rollback()
+                return False
+            try:
+                self._con.commit()
+            except sqlite3.Error as e:
+                self._con.rollback()
+                print(f"Error al confirmar la transacción: {e}")
+                self.exitosa = False
+            return False
+        finally:
+            for funcion in self._al_terminar:
+                funcion()
@@ -0,0 +1,149 @@
+from itertools import groupby
+
+from Datos.dao import AsistenciaDAO, ReporteDAO
+
+# ====================================================
+# ANALÍTICA DE ASISTENCIA (CU4)
+# ====================================================
+# Indicadores por alumno y por fecha calculados con una sola consulta GROUP BY
+# por rango de fechas (ver AsistenciaDAO), no con una consulta por día.
+#
+# Reglas:
+#   - Días de clase: fechas del rango en las que se pasó lista al grupo.
+#   - Un día de clase sin registro para un alumno cuenta como Ausente (igual
+#     que en la ventana de asistencia).
+#   - Retardo cuenta como asistencia; Justificado no cuenta como asistencia
+#     ni como falta (se descuenta de los días de clase).
+#   - Tasa de asistencia = (presentes + retardos) / (días de clase - justificados)
+
+CATEGORIA_ASISTENCIA = "Asistencia" # Categoría de la ponderación que se calcula con estos datos
+UMBRAL_RIESGO = 0.8 # Alumnos por debajo del 80% de asistencia
+ESTADOS_ASISTIO = ("Asistencia", "Presente", "Retardo")
+FECHA_MINIMA = "0000-01-01"
+FECHA_MAXIMA = "9999-12-31"
+
+
+class ResumenAlumno:
+    """Totales de asistencia de un alumno en un rango de fechas."""
+
+    def __init__(self, matricula, nombre, presentes, retardos, ausentes, justificados, registros, dias_clase):
+        self.matricula = matricula
+        self.nombre = nombre
+        self.presentes = presentes
+        self.retardos = retardos
+        self.justificados = justificados
+        # Los días de clase sin registro se cuentan como faltas
+        self.ausencias = ausentes + max(dias_clase - registros, 0)
+        self.dias_clase = dias_clase
+
+    @property
+    def tasa(self):
+        """Fracción (0-1) de asistencia, o None si no hubo días de clase que contar."""
+        dias_validos = self.dias_clase - self.justificados
+        if dias_validos <= 0:
+            return None
+        return (self.presentes + self.retardos) / dias_validos
+
+    def __repr__(self):
+        return f"ResumenAlumno({self.matricula!r}, tasa={self.tasa}, ausencias={self.ausencias}, retardos={self.retardos})"
+
+
+class ResumenFecha:
+    """Totales del grupo en un día de clase."""
+
+    def __init__(self, fecha, presentes, retardos, ausentes, justificados, registros, total_alumnos):
+        self.fecha = fecha
+        self.presentes = presentes
+        self.retardos = retardos
+        self.justificados = justificados
+        self.ausencias = ausentes + max(total_alumnos - registros, 0)
+        self.total_alumnos = total_alumnos
+
+    def __repr__(self):
+        return f"ResumenFecha({self.fecha!r}, ausencias={self.ausencias}, retardos={self.retardos})"
+
+
+class Racha:
+    """Rachas de un alumno sobre los días de clase del rango."""
+
+    def __init__(self, actual_asistencia=0, mejor_asistencia=0, actual_faltas=0):
+        self.actual_asistencia = actual_asistencia # Días seguidos asistiendo hasta el último día de clase
+        self.mejor_asistencia = mejor_asistencia
+        self.actual_faltas = actual_faltas # Faltas seguidas hasta el último día de clase
+
+    def __repr__(self):
+        return (f"Racha(actual_asistencia={self.actual_asistencia}, mejor_asistencia={self.mejor_asistencia}, "
+                f"actual_faltas={self.actual_faltas})")
+
+
+def _rango(desde, hasta):
+    return desde or FECHA_MINIMA, hasta or FECHA_MAXIMA
+
+
+class AnaliticaAsistencia:
+    """Indicadores de asistencia de un grupo. Sin fechas se usa todo el historial."""
+
+    def __init__(self, grupo_id, asistencia_dao=None):
+        self._grupo_id = grupo_id
+        self._asistencia_dao = asistencia_dao or AsistenciaDAO()
+
+    def dias_clase(self, desde=None, hasta=None):
+        return self._asistencia_dao.obtener_fechas_clase(self._grupo_id, *_rango(desde, hasta))
+
+    def resumen_por_alumno(self, desde=None, hasta=None, matriculas=None):
+        """[ResumenAlumno, ...] de los alumnos del grupo (o solo de `matriculas`), ordenados por nombre."""
+        desde, hasta = _rango(desde, hasta)
+        dias = len(self._asistencia_dao.obtener_fechas_clase(self._grupo_id, desde, hasta))
+        return [
+            ResumenAlumno(*fila, dias_clase=dias)
+            for fila in self._asistencia_dao.obtener_resumen_por_alumno(self._grupo_id, desde, hasta, matriculas)
+        ]
+
+    def resumen_por_fecha(self, desde=None, hasta=None):
+        """[ResumenFecha, ...] de cada día de clase del rango (faltas y retardos por día)."""
+        total = ReporteDAO().contar_alumnos(self._grupo_id)
+        return [
+            ResumenFecha(*fila, total_alumnos=total)
+            for fila in self._asistencia_dao.obtener_resumen_por_fecha(self._grupo_id, *_rango(desde, hasta))
+        ]
+
+    def alumnos_en_riesgo(self, umbral=UMBRAL_RIESGO, desde=None, hasta=None):
+        """Alumnos con tasa de asistencia menor al umbral, del más bajo al más alto."""
+        en_riesgo = [r for r in self.resumen_por_alumno(desde, hasta) if r.tasa is not None and r.tasa < umbral]
+        return sorted(en_riesgo, key=lambda r: r.tasa)
+
+    def rachas(self, matriculas, desde=None, hasta=None):
+        """
+        {matricula: Racha} en una sola pasada sobre los registros del grupo
+        (ordenados por alumno y fecha). Justificado no rompe ni alarga la racha.
+        """
+        desde, hasta = _rango(desde, hasta)
+        fechas = self._asistencia_dao.obtener_fechas_clase(self._grupo_id, desde, hasta)
+        # Sin registros en todo el rango: todos los días de clase son faltas
+        rachas = {m: Racha(actual_faltas=len(fechas)) for m in matriculas}
+        registros = self._asistencia_dao.iterar_registros_grupo(self._grupo_id, desde, hasta)
+        for matricula, filas in groupby(registros, key=lambda f: f[0]):
+            estados = {fecha: estado for _, fecha, estado in filas}
+            racha = Racha()
+            for fecha in fechas:
+                estado = estados.get(fecha, "Ausente")
+                if estado in ESTADOS_ASISTIO:
+                    racha.actual_asistencia += 1
+                    racha.actual_faltas = 0
+                    racha.mejor_asistencia = max(racha.mejor_asistencia, racha.actual_asistencia)
+                elif estado != "Justificado":
+                    racha.actual_asistencia = 0
+                    racha.actual_faltas += 1
+            rachas[matricula] = racha
+        return rachas
+
+    def puntajes_asistencia(self, desde=None, hasta=None, matriculas=None):
+        """
+        {matricula: calificación 0-10} para la categoría "Asistencia" de la ponderación
+        (tasa de asistencia × 10). Los alumnos sin días de clase no reciben puntaje.
+        Con matriculas solo se leen esos alumnos (puede incluir a otros del grupo).
+        """
+        return {
+            r.matricula: round(r.tasa * 10, 2)
+            for r in self.resumen_por_alumno(desde, hasta, matriculas) if r.tasa is not None
+        }
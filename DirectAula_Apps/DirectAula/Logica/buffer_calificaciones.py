@@ -0,0 +1,117 @@
+import atexit
+import threading
+
+# ====================================================
+# ESCRITURA DIFERIDA DE CALIFICACIONES (CU5)
+# ====================================================
+# Cuando el docente captura una columna completa de notas, cada celda NO se
+# escribe en SQLite de inmediato: se acumula aquí, agrupada por
+# (matricula, categoria) (la última nota capturada gana), y se guarda todo junto
+# en una sola transacción con un solo recálculo de promedios.
+# La "categoría" es cualquier llave de la celda: las calificaciones usan
+# (categoria, numero_item) y la vista de asistencia por rango, la fecha.
+#
+# Red de seguridad: si la aplicación termina normalmente sin vaciar un buffer,
+# lo pendiente se guarda al salir con UN solo registro de atexit para todos los
+# buffers. Un buffer con ediciones pendientes se registra con una referencia
+# fuerte (aunque su gestor o su ventana se descarten sin cerrarlo, sigue vivo
+# hasta guardarse) y sale del registro en cuanto queda vacío, así que un buffer
+# ya guardado no mantiene vivo a nadie.
+# Límite: atexit no se ejecuta si el proceso muere de golpe (se mata, se cae
+# el intérprete o se va la luz); las ediciones que aún no se guardaron en ese
+# momento se pierden. Solo lo que ya se vació está a salvo en la base.
+
+_buffers_con_pendientes = set()
+_lock_registro = threading.Lock()
+
+
+def vaciar_todos():
+    """Guarda lo pendiente de todos los buffers (se ejecuta al salir de la aplicación)."""
+    with _lock_registro:
+        buffers = list(_buffers_con_pendientes)
+    for buffer in buffers:
+        buffer.vaciar()
+
+
+atexit.register(vaciar_todos)
+
+
+class BufferCalificaciones:
+    """
+    Acumula calificaciones pendientes y las entrega a `funcion_guardar` al vaciarse.
+    `funcion_guardar` recibe [(matricula, categoria, valor), ...] y retorna True si se guardó.
+    Es seguro usarlo desde el hilo de la interfaz (agregar) y el hilo de trabajo (vaciar).
+    """
+
+    def __init__(self, funcion_guardar):
+        self._funcion_guardar = funcion_guardar
+        self._pendientes = {}  # (matricula, categoria) -> valor
+        self._lock = threading.Lock()
+        self._lock_guardado = threading.Lock()  # Evita dos vaciados simultáneos
+        self._cerrado = False
+
+    def agregar(self, matricula, categoria, valor):
+        """
+        Registra una edición; si la celda ya tenía una pendiente, la reemplaza.
+        Retorna False (y no la registra) si el buffer ya empezó a cerrarse.
+        """
+        with self._lock:
+            if self._cerrado:
+                return False
+            if not self._pendientes:
+                self._registrar(True)
+            self._pendientes[(matricula, categoria)] = valor
+            return True
+
+    def _registrar(self, con_pendientes):
+        """Entra (o sale) del guardado al salir; se llama con self._lock tomado."""
+        with _lock_registro:
+            if con_pendientes:
+                _buffers_con_pendientes.add(self)
+            else:
+                _buffers_con_pendientes.discard(self)
+
+    def cantidad_pendientes(self):
+        with self._lock:
+            return len(self._pendientes)
+
+    def hay_pendientes(self):
+        return self.cantidad_pendientes() > 0
+
+    def vaciar(self):
+        """
+        Guarda todas las ediciones pendientes en una sola llamada.
+        Retorna el número de calificaciones guardadas, o False si el guardado falló
+        (en ese caso las ediciones vuelven al buffer para no perderse).
+        """
+        with self._lock_guardado:
+            with self._lock:
+                lote, self._pendientes = self._pendientes, {}
+            if not lote:
+                return 0
+
+            filas = [(matricula, categoria, valor) for (matricula, categoria), valor in lote.items()]
+            try:
+                guardado = self._funcion_guardar(filas)
+            except Exception as e:
+                print(f"Error al guardar las ediciones pendientes: {e}")
+                guardado = False
+
+            with self._lock:
+                if not guardado:
+                    # Las ediciones más nuevas (capturadas durante el guardado) tienen prioridad
+                    for clave, valor in lote.items():
+                        self._pendientes.setdefault(clave, valor)
+                elif not self._pendientes:
+                    # Todo guardado (y nada nuevo capturado mientras tanto)
+                    self._registrar(False)
+            return len(filas) if guardado else False
+
+    def cerrar(self):
+        """
+        Deja de aceptar ediciones y vacía el buffer (al cerrar la ventana).
+        Si el guardado falla, lo pendiente sigue registrado y se reintenta al salir.
+        """
+        with self._lock:
+            self._cerrado = True
+        return self.vaciar()
@@ -0,0 +1,62 @@
+import re
+
+from Datos.dao import AlumnoDAO
+
+# ====================================================
+# BÚSQUEDA GLOBAL DE ALUMNOS (todos los grupos y ciclos)
+# ====================================================
+# Encuentra a un alumno sin elegir antes el grupo. Usa el índice FTS5
+# `alumnos_fts` (Datos/migraciones.py, migración 5), que los triggers mantienen
+# sincronizado con la tabla `alumnos`.
+#
+# El texto del usuario se convierte en una consulta MATCH segura: cada palabra
+# se busca como prefijo ("mar" encuentra "María") y todas deben aparecer.
+# Las palabras de una sola letra se buscan completas: como prefijo coincidirían
+# con casi toda la escuela. Los acentos y mayúsculas no importan.
+
+LIMITE_RESULTADOS = 50
+_PALABRA = re.compile(r"\w+", re.UNICODE)
+
+
+def expresion_fts(texto):
+    """Consulta MATCH de FTS5 para el texto del usuario, o None si no tiene palabras."""
+    # Solo letras y dígitos entre comillas: los operadores de FTS5 (AND, OR, NEAR, *, ^, ")
+    # escritos por el usuario no pueden romper la consulta.
+    palabras = _PALABRA.findall(texto or "")
+    if not palabras:
+        return None
+    return " ".join(f'"{palabra}"*' if len(palabra) > 1 else f'"{palabra}"' for palabra in palabras)
+
+
+class ResultadoBusqueda:
+    """Un alumno encontrado, con su grupo y ciclo escolar."""
+
+    def __init__(self, matricula, nombre, email, grupo_id, grupo, ciclo_escolar):
+        self.matricula = matricula
+        self.nombre = nombre
+        self.email = email
+        self.grupo_id = grupo_id
+        self.grupo = grupo
+        self.ciclo_escolar = ciclo_escolar
+
+    def como_fila(self):
+        """Fila para la tabla de la ventana de búsqueda."""
+        return (self.matricula, self.nombre, self.email or "", self.grupo or "Sin grupo", self.ciclo_escolar or "")
+
+    def __repr__(self):
+        return f"ResultadoBusqueda({self.matricula!r}, {self.nombre!r}, grupo={self.grupo!r}, ciclo={self.ciclo_escolar!r})"
+
+
+class BusquedaGlobal:
+    """Servicio de búsqueda de alumnos en toda la escuela."""
+
+    def __init__(self, alumno_dao=None):
+        self._alumno_dao = alumno_dao or AlumnoDAO()
+
+    def buscar(self, texto, limite=LIMITE_RESULTADOS):
+        """Retorna [ResultadoBusqueda, ...] ordenados por relevancia ([] si el texto está vacío)."""
+        expresion = expresion_fts(texto)
+        if expresion is None:
+            return []
+        filas = self._alumno_dao.buscar_alumnos_global(expresion, limite) or []
+        return [ResultadoBusqueda(*fila) for fila in filas]
@@ -0,0 +1,379 @@
+"""
+Exportación de reportes (CU6: Generar Reportes) a CSV, XLSX o PDF.
+
+Reportes disponibles, de un grupo o de toda la escuela:
+  - alumnos:        roster del grupo
+  - asistencia:     matriz alumnos × fechas con el estado de cada día
+  - calificaciones: aportación ponderada por categoría y promedio final
+
+Las filas se leen de SQLite por bloques (ReporteDAO + fetchmany) y cada
+renglón del reporte se escribe en cuanto está completo, por lo que la
+memoria usada no depende del número de alumnos. XLSX requiere openpyxl
+(modo write_only); PDF usa QPdfWriter de PyQt5 (páginas horizontales con
+el encabezado repetido en cada página).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python -m Logica.exportador_reportes --db directaula.db --tipo asistencia --formato csv --salida asistencia.csv
+    python -m Logica.exportador_reportes --tipo calificaciones --formato pdf --grupo 1 --salida grupo1.pdf
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from itertools import groupby
+from operator import itemgetter
+
+from Datos.conexion import conexiones
+from Datos.dao import ReporteDAO
+from Logica.gestor_alumnos import GestorCalificaciones
+
+# openpyxl es opcional: sin él no se puede exportar a .xlsx
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+TIPOS_REPORTE = {
+    "alumnos": "Lista de Alumnos",
+    "asistencia": "Asistencia",
+    "calificaciones": "Calificaciones",
+}
+# En PDF la matriz de asistencia se parte en bloques de fechas para que quepa en la hoja
+FECHAS_POR_PAGINA_PDF = 15
+PASO_PROGRESO = 200 # Alumnos entre cada aviso de progreso
+
+
+# ====================================================
+# ESCRITORES (un renglón a la vez)
+# ====================================================
+
+class EscritorCSV:
+    """Todo el reporte en una sola tabla; las secciones extra se separan con una fila de título."""
+
+    def __init__(self, ruta):
+        # utf-8-sig para que Excel muestre bien los acentos
+        self._archivo = open(ruta, "w", newline="", encoding="utf-8-sig")
+        self._escritor = csv.writer(self._archivo)
+        self._secciones = 0
+
+    def seccion(self, titulo, encabezados, anchos=None):
+        if self._secciones:
+            self._escritor.writerow([])
+            self._escritor.writerow([titulo])
+        self._secciones += 1
+        self._escritor.writerow(encabezados)
+
+    def fila(self, valores):
+        self._escritor.writerow(valores)
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class EscritorXLSX:
+    """Una hoja por sección, escrita en modo write_only (las filas no se guardan en memoria)."""
+
+    def __init__(self, ruta):
+        if Workbook is None:
+            raise ValueError("Para exportar a .xlsx instale openpyxl (ver requirements.txt).")
+        self._ruta = ruta
+        self._libro = Workbook(write_only=True)
+        self._hoja = None
+        self._nombres = set()
+
+    def _nombre_hoja(self, titulo):
+        nombre = "".join(c for c in titulo if c not in '[]:*?/\\')[:31] or "Reporte"
+        base, n = nombre, 2
+        while nombre in self._nombres:
+            sufijo = f" ({n})"
+            nombre, n = base[:31 - len(sufijo)] + sufijo, n + 1
+        self._nombres.add(nombre)
+        return nombre
+
+    def seccion(self, titulo, encabezados, anchos=None):
+        self._hoja = self._libro.create_sheet(self._nombre_hoja(titulo))
+        self._hoja.append(encabezados)
+
+    def fila(self, valores):
+        self._hoja.append(valores)
+
+    def cerrar(self):
+        if self._hoja is None:
+            self._libro.create_sheet("Reporte")
+        self._libro.save(self._ruta)
+
+
+class EscritorPDF:
+    """Reporte paginado: cada sección empieza en una página nueva con su título y encabezados."""
+
+    MARGEN = 36 # puntos (media pulgada)
+    ALTO_FILA = 12
+
+    def __init__(self, ruta):
+        # Qt solo se importa si se pide PDF: el resto de la capa lógica no depende de la interfaz
+        from PyQt5.QtCore import QMarginsF
+        from PyQt5.QtGui import QFont, QGuiApplication, QPageLayout, QPageSize, QPainter, QPdfWriter
+
+        if QGuiApplication.instance() is None:
+            raise ValueError("Exportar a PDF requiere una QGuiApplication activa.")
+        self._pdf = QPdfWriter(ruta)
+        self._pdf.setResolution(72) # 1 unidad = 1 punto
+        self._pdf.setPageSize(QPageSize(QPageSize.Letter))
+        self._pdf.setPageOrientation(QPageLayout.Landscape)
+        self._pdf.setPageMargins(QMarginsF(self.MARGEN, self.MARGEN, self.MARGEN, self.MARGEN), QPageLayout.Point)
+        self._pdf.setTitle("DirectAula - Reporte")
+        self._painter = QPainter(self._pdf)
+        self._fuente_titulo = QFont("Helvetica", 12, QFont.Bold)
+        self._fuente_encabezado = QFont("Helvetica", 7, QFont.Bold)
+        self._fuente = QFont("Helvetica", 7)
+        self._ancho = self._pdf.width()
+        self._alto = self._pdf.height()
+        self._pagina = 0
+        self._y = 0
+        self._titulo = ""
+        self._encabezados = []
+        self._columnas = [] # [(x, ancho), ...]
+
+    def seccion(self, titulo, encabezados, anchos=None):
+        self._titulo = titulo
+        self._encabezados = [str(e) for e in encabezados]
+        anchos = anchos or [1] * len(encabezados)
+        escala = self._ancho / float(sum(anchos) or 1)
+        x, self._columnas = 0.0, []
+        for ancho in anchos:
+            self._columnas.append((x, ancho * escala))
+            x += ancho * escala
+        self._nueva_pagina()
+
+    def _nueva_pagina(self, continuacion=False):
+        if self._pagina:
+            self._pdf.newPage()
+        self._pagina += 1
+        self._pie_de_pagina()
+        self._painter.setFont(self._fuente_titulo)
+        titulo = self._titulo + (" (continuación)" if continuacion else "")
+        self._painter.drawText(0, 14, titulo)
+        self._y = 24
+        self._escribir_renglon(self._encabezados, self._fuente_encabezado)
+        self._painter.drawLine(0, int(self._y), int(self._ancho), int(self._y))
+        self._y += 2
+
+    def _pie_de_pagina(self):
+        from PyQt5.QtCore import QRectF, Qt
+
+        self._painter.setFont(self._fuente)
+        self._painter.drawText(QRectF(0, self._alto - self.ALTO_FILA, self._ancho, self.ALTO_FILA),
+                               Qt.AlignRight | Qt.AlignVCenter, f"DirectAula - Página {self._pagina}")
+
+    def _escribir_renglon(self, valores, fuente):
+        from PyQt5.QtCore import QRectF, Qt
+        from PyQt5.QtGui import QFontMetrics
+
+        self._painter.setFont(fuente)
+        metricas = QFontMetrics(fuente)
+        for (x, ancho), valor in zip(self._columnas, valores):
+            texto = metricas.elidedText("" if valor is None else str(valor), Qt.ElideRight, int(ancho) - 4)
+            self._painter.drawText(QRectF(x + 2, self._y, ancho - 4, self.ALTO_FILA), Qt.AlignLeft | Qt.AlignVCenter, texto)
+        self._y += self.ALTO_FILA
+
+    def fila(self, valores):
+        if self._y + self.ALTO_FILA > self._alto - self.ALTO_FILA * 2:
+            self._nueva_pagina(continuacion=True)
+        self._escribir_renglon(valores, self._fuente)
+
+    def cerrar(self):
+        if not self._pagina:
+            self.seccion("Reporte vacío", [])
+        self._painter.end()
+
+
+FORMATOS = {"csv": EscritorCSV, "xlsx": EscritorXLSX, "pdf": EscritorPDF}
+
+
+# ====================================================
+# EXPORTADOR
+# ====================================================
+
+class ExportadorReportes:
+    """Arma los renglones de cada reporte a partir de los cursores de ReporteDAO."""
+
+    def __init__(self, reporte_dao=None):
+        self._reporte_dao = reporte_dao or ReporteDAO()
+
+    def exportar(self, tipo, formato, ruta, grupo_id=None, al_progresar=None):
+        """
+        Exporta el reporte `tipo` del grupo (o de toda la escuela si grupo_id es None).
+        al_progresar(hechos, total) se llama cada cierto número de alumnos.
+        Retorna un mensaje "Éxito: ..." o "Error: ...".
+        """
+        if tipo not in TIPOS_REPORTE:
+            return f"Error: Tipo de reporte desconocido: {tipo}."
+        if formato not in FORMATOS:
+            return f"Error: Formato no soportado: {formato} (use csv, xlsx o pdf)."
+
+        try:
+            escritor = FORMATOS[formato](ruta)
+        except (OSError, ValueError) as e:
+            return f"Error: No se pudo crear el archivo. {e}"
+
+        try:
+            alumnos = getattr(self, f"_exportar_{tipo}")(escritor, grupo_id, formato == "pdf", al_progresar)
+        except OSError as e:
+            return f"Error: No se pudo escribir el reporte. {e}"
+        except sqlite3.Error as e:
+            return f"Error: No se pudo leer la base de datos; el reporte quedó incompleto. {e}"
+        finally:
+            escritor.cerrar()
+        return f"Éxito: Reporte de {TIPOS_REPORTE[tipo].lower()} exportado ({alumnos} alumnos) en {ruta}."
+
+    # --- Escritura común ---
+
+    def _escribir(self, escritor, titulo, encabezados, anchos, renglones, por_grupo, progreso):
+        """
+        renglones: iterable de (grupo, ciclo, valores). En PDF cada grupo va en su
+        propia sección; en CSV/XLSX el grupo y el ciclo son las primeras columnas.
+        Retorna el número de renglones escritos.
+        """
+        escritos = 0
+        if not por_grupo:
+            escritor.seccion(titulo, ["Grupo", "Ciclo"] + encabezados, [3, 3] + anchos)
+        grupo_actual = None
+        for grupo, ciclo, valores in renglones:
+            if por_grupo:
+                if (grupo, ciclo) != grupo_actual:
+                    grupo_actual = (grupo, ciclo)
+                    escritor.seccion(f"{titulo} - {grupo} ({ciclo})", encabezados, anchos)
+                escritor.fila(valores)
+            else:
+                escritor.fila([grupo, ciclo] + valores)
+            escritos += 1
+            progreso()
+        if por_grupo and grupo_actual is None:
+            escritor.seccion(f"{titulo} - sin alumnos", encabezados, anchos)
+        return escritos
+
+    def _contador_progreso(self, al_progresar, total):
+        hechos = 0
+
+        def avanzar():
+            nonlocal hechos
+            hechos += 1
+            if al_progresar and (hechos % PASO_PROGRESO == 0 or hechos == total):
+                al_progresar(hechos, total)
+        return avanzar
+
+    # --- Reportes ---
+
+    def _exportar_alumnos(self, escritor, grupo_id, por_grupo, al_progresar):
+        total = self._reporte_dao.contar_alumnos(grupo_id)
+        renglones = (
+            (grupo, ciclo, [matricula, nombre, contacto, email])
+            for grupo, ciclo, matricula, nombre, contacto, email in self._reporte_dao.iterar_roster(grupo_id)
+        )
+        return self._escribir(escritor, TIPOS_REPORTE["alumnos"], ["Matrícula", "Nombre Completo", "Contacto", "Email"],
+                              [3, 8, 4, 6], renglones, por_grupo, self._contador_progreso(al_progresar, total))
+
+    def _exportar_asistencia(self, escritor, grupo_id, por_grupo, al_progresar):
+        total = self._reporte_dao.contar_alumnos(grupo_id)
+        fechas = self._reporte_dao.obtener_fechas_asistencia(grupo_id)
+        # En PDF: un bloque de fechas por página; en CSV/XLSX todas las fechas en una sola tabla
+        paso = FECHAS_POR_PAGINA_PDF if por_grupo else max(len(fechas), 1)
+        bloques = [fechas[i:i + paso] for i in range(0, len(fechas), paso)] or [[]]
+        progreso = self._contador_progreso(al_progresar, total * len(bloques))
+
+        alumnos = 0
+        for bloque in bloques:
+            titulo = TIPOS_REPORTE["asistencia"]
+            if len(bloques) > 1:
+                titulo += f" {bloque[0]} a {bloque[-1]}"
+            # En PDF la fecha se abrevia a dd/mm (el año va en el título de la sección)
+            encabezados = ["Matrícula", "Nombre Completo"] + [f"{f[8:10]}/{f[5:7]}" if por_grupo else f for f in bloque]
+            anchos = [3, 7] + [1] * len(bloque)
+            filas = self._reporte_dao.iterar_asistencia(
+                grupo_id, bloque[0] if bloque else None, bloque[-1] if bloque else None
+            )
+            # Cada bloque de fechas tiene un renglón por alumno
+            alumnos = self._escribir(escritor, titulo, encabezados, anchos,
+                                     self._renglones_asistencia(filas, bloque, abreviar=por_grupo), por_grupo, progreso)
+        return alumnos
+
+    @staticmethod
+    def _renglones_asistencia(filas, fechas, abreviar):
+        """Pivotea (alumno, fecha, estado) a un renglón por alumno; solo vive un alumno a la vez."""
+        columna = {fecha: i for i, fecha in enumerate(fechas)}
+        for (grupo, ciclo, matricula, nombre), registros in groupby(filas, key=lambda f: f[:4]):
+            estados = [""] * len(fechas)
+            for *_, fecha, estado in registros:
+                i = columna.get(fecha)
+                if i is not None:
+                    estados[i] = estado[:1] if abreviar else estado
+            yield grupo, ciclo, [matricula, nombre] + estados
+
+    def _exportar_calificaciones(self, escritor, grupo_id, por_grupo, al_progresar):
+        total = self._reporte_dao.contar_alumnos(grupo_id)
+        categorias = self._reporte_dao.obtener_nombres_categorias(grupo_id)
+        sin_promedios = set(self._reporte_dao.obtener_grupos_sin_promedios(grupo_id))
+        encabezados = ["Matrícula", "Nombre Completo"] + categorias + ["Promedio Final"]
+        anchos = [3, 8] + [2] * len(categorias) + [2]
+        filas = self._reporte_dao.iterar_promedios(grupo_id)
+        return self._escribir(escritor, TIPOS_REPORTE["calificaciones"], encabezados, anchos,
+                              self._renglones_calificaciones(filas, categorias, sin_promedios),
+                              por_grupo, self._contador_progreso(al_progresar, total))
+
+    @staticmethod
+    def _renglones_calificaciones(filas, categorias, sin_promedios):
+        """
+        Los grupos de `sin_promedios` (bases anteriores a la tabla materializada) se
+        calculan en memoria al llegar a ellos, uno a la vez, y sin guardar nada:
+        exportar es solo lectura (ni la ponderación inicial ni los promedios se escriben).
+        """
+        columna = {categoria: i for i, categoria in enumerate(categorias)}
+        for grupo_id, filas_grupo in groupby(filas, key=itemgetter(0)):
+            calculados = None
+            if grupo_id in sin_promedios:
+                calculados = GestorCalificaciones(grupo_id).calcular_promedios_sin_guardar()
+            for (_, grupo, ciclo, matricula, nombre, promedio), registros in groupby(filas_grupo, key=lambda f: f[:6]):
+                subtotales = [""] * len(categorias)
+                if calculados is not None:
+                    # Como en la tabla materializada: las aportaciones en 0 no se guardan
+                    promedio = calculados.promedio_de(matricula) or 0
+                    registros = [(c, s) for c, s in calculados.subtotales_de(matricula).items() if s]
+                for *_, categoria, subtotal in registros:
+                    i = columna.get(categoria)
+                    if i is not None and subtotal is not None:
+                        subtotales[i] = round(subtotal, 2)
+                yield grupo, ciclo, [matricula, nombre] + subtotales + [round(promedio, 2)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="directaula.db", help="Base de datos")
+    parser.add_argument("--tipo", choices=sorted(TIPOS_REPORTE), required=True)
+    parser.add_argument("--formato", choices=sorted(FORMATOS), required=True)
+    parser.add_argument("--grupo", type=int, help="grupo_id (sin este argumento: toda la escuela)")
+    parser.add_argument("--salida", required=True, help="Archivo de salida")
+    args = parser.parse_args(argv)
+
+    app = None
+    if args.formato == "pdf":
+        # QPdfWriter necesita una aplicación de Qt; sin pantalla se usa la plataforma offscreen
+        from PyQt5.QtGui import QGuiApplication
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication.instance() or QGuiApplication([])
+
+    conexiones.configurar_db_file(args.db)
+    inicio = time.perf_counter()
+    mensaje = ExportadorReportes().exportar(
+        args.tipo, args.formato, args.salida, args.grupo,
+        al_progresar=lambda hechos, total: print(f"  {hechos}/{total}")
+    )
+    print(f"{mensaje} ({time.perf_counter() - inicio:.2f} s)")
+    conexiones.cerrar_todas()
+    del app
+    return 1 if mensaje.startswith("Error") else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
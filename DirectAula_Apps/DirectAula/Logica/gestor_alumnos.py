@@ -1,6 +1,13 @@
-from Datos.dao import AlumnoDAO, AsistenciaDAO, GrupoDAO, CategoriaEvaluacionDAO, CalificacionDAO
+from Datos.dao import AlumnoDAO, AsistenciaDAO, GrupoDAO, CategoriaEvaluacionDAO, CalificacionDAO, PromedioDAO, HistorialDAO
 from model import Alumno, Asistencia, Grupo, CategoriaEvaluacion, Calificacion
+from Logica.motor_calificaciones import calcular_promedios, puntaje_categoria
+from Logica.buffer_calificaciones import BufferCalificaciones
+from Logica.importador_alumnos import ImportadorAlumnos
+from Logica.analitica_asistencia import AnaliticaAsistencia, CATEGORIA_ASISTENCIA
+from Logica.matriz_asistencia import MatrizAsistencia, MAX_DIAS_RANGO
+from Datos.unidad_trabajo import UnidadDeTrabajo
 from datetime import date 
+import threading
 
 # ====================================================
 # 1. GESTOR GRUPOS (CU-1)
@@ -74,10 +81,8 @@ class GestorAlumnos:
 
     def _existe_matricula_en_grupo(self, matricula):
         """Verifica si la matrícula existe en el grupo (FE.2)."""
-        alumnos_grupo = self._alumno_dao.obtener_alumnos_por_grupo(self._grupo_actual_id)
-        # Esto es eficiente, ya que la validación se hace en la base de datos (dao.py)
-        # Aquí solo filtramos si la matrícula existe en el resultado.
-        return any(a[0] == matricula for a in alumnos_grupo)
+        # La validación se hace en la base de datos con la llave primaria (dao.py)
+        return self._alumno_dao.existe_matricula_en_grupo(matricula, self._grupo_actual_id)
 
     def agregar_nuevo_alumno(self, matricula, nombre, contacto, email):
         """Implementa la lógica del FA.1: Agregar nuevo alumno."""
@@ -95,6 +100,13 @@ class GestorAlumnos:
         else:
             return "Error: No se pudo guardar en la base de datos."
 
+    def importar_alumnos_desde_archivo(self, ruta_archivo):
+        """
+        Importación masiva desde CSV/XLSX (ver Logica/importador_alumnos.py).
+        Retorna un ResultadoImportacion con el mensaje y las filas rechazadas.
+        """
+        return ImportadorAlumnos(self._grupo_actual_id, self._alumno_dao).importar(ruta_archivo)
+
     def obtener_lista_alumnos(self):
         """Retorna la lista de alumnos del grupo (R)."""
         return self._alumno_dao.obtener_alumnos_por_grupo(self._grupo_actual_id)
@@ -127,38 +139,69 @@ class GestorAlumnos:
 class GestorAsistencia:
     """Gestiona el flujo de registro de asistencia."""
 
+    # BR.11: Estados posibles de un registro de asistencia
+    ESTADOS_VALIDOS = ("Asistencia", "Ausente", "Retardo", "Justificado")
+
     def __init__(self, grupo_actual_id):
         self._asistencia_dao = AsistenciaDAO()
         self._alumno_dao = AlumnoDAO() 
         self._grupo_actual_id = grupo_actual_id
+        self._gestor_calificaciones = None # Se crea al primer registro (ver _actualizar_promedios)
+        self._buffer = None # Cambios de la vista por rango pendientes de guardar (se crea al primer uso)
+        # La ventana agrega cambios y el hilo de trabajo cierra el buffer: _buffer se cambia con este candado
+        self._lock_buffer = threading.Lock()
+
+    def _actualizar_promedios(self, matriculas=None):
+        """
+        La asistencia alimenta la categoría "Asistencia" de la ponderación del grupo.
+        Con matriculas se actualizan solo esos alumnos; sin ellas (un día de clase
+        nuevo, que cambia el total de días y la tasa de todos) se actualiza todo el grupo.
+        """
+        if self._gestor_calificaciones is None:
+            self._gestor_calificaciones = GestorCalificaciones(self._grupo_actual_id)
+        if matriculas is None:
+            alumnos = self._alumno_dao.obtener_alumnos_por_grupo(self._grupo_actual_id) or []
+            matriculas = [fila[0] for fila in alumnos]
+        self._gestor_calificaciones.actualizar_promedios_asistencia(matriculas)
+
+    def _hay_fechas_nuevas(self, fechas):
+        """True si alguna fecha todavía no es día de clase del grupo (se consulta antes de escribir)."""
+        fechas = set(fechas)
+        existentes = self._asistencia_dao.obtener_fechas_clase(self._grupo_actual_id, min(fechas), max(fechas))
+        # Si la consulta falla retorna []: se hace el refresco completo
+        return not fechas.issubset(existentes)
 
     def registrar_asistencia_masiva(self, fecha=date.today().strftime("%Y-%m-%d")):
         """Implementa la lógica de 'poner asistencia a todos'."""
-        alumnos_data = self._alumno_dao.obtener_alumnos_por_grupo(self._grupo_actual_id)
-        matriculas = [a[0] for a in alumnos_data] 
-        registros_exitosos = 0
-        
-        for matricula in matriculas:
-            # BR.11: La asistencia se registra como Asistencia por defecto
-            asistencia = Asistencia(matricula, fecha, "Asistencia") 
-            if self._asistencia_dao.registrar_asistencia(asistencia):
-                registros_exitosos += 1
-                
-        if len(matriculas) == 0:
+        # BR.11: La asistencia se registra como Asistencia por defecto.
+        # Se marca a todo el grupo y se actualizan sus promedios en una sola transacción.
+        with UnidadDeTrabajo() as unidad:
+            registros = self._asistencia_dao.registrar_asistencia_grupo(self._grupo_actual_id, fecha, "Asistencia")
+            if registros:
+                self._actualizar_promedios()
+
+        if registros is False or not unidad.exitosa:
+            return "Error: No se pudo registrar la asistencia."
+        elif registros == 0:
             return "Advertencia: No hay alumnos en este grupo."
-        elif registros_exitosos > 0:
-            return "Éxito: Asistencia masiva registrada."
         else:
-            return "Error: No se pudo registrar la asistencia."
+            return f"Éxito: Asistencia masiva registrada ({registros} alumnos)."
 
     def actualizar_estado_asistencia(self, matricula, fecha, nuevo_estado):
         """Actualiza el estado de un solo alumno (para cambiar a Ausente/Retardo)."""
         # BR.11: Estado debe ser uno de los posibles valores
-        if nuevo_estado not in ["Asistencia", "Ausente", "Retardo", "Justificado"]:
+        if nuevo_estado not in self.ESTADOS_VALIDOS:
             return "Error: Estado de asistencia inválido."
         
         asistencia = Asistencia(matricula, fecha, nuevo_estado)
-        if self._asistencia_dao.registrar_asistencia(asistencia):
+        with UnidadDeTrabajo() as unidad:
+            fecha_nueva = self._hay_fechas_nuevas([fecha])
+            if self._asistencia_dao.registrar_asistencia(asistencia):
+                # En un día de clase ya registrado solo cambia la tasa de este alumno
+                self._actualizar_promedios(None if fecha_nueva else [matricula])
+            else:
+                unidad.exitosa = False
+        if unidad.exitosa:
             return "Éxito: Estado de asistencia actualizado."
         else:
             return "Error: No se pudo actualizar el estado en la base de datos."
@@ -167,6 +210,75 @@ class GestorAsistencia:
         """Retorna la lista de asistencia del día para la UI (R)."""
         return self._asistencia_dao.obtener_asistencia_del_dia(fecha, self._grupo_actual_id)
 
+    def obtener_historial_asistencia(self, matricula, fecha):
+        """Cambios del registro de un día: [(momento, estado_anterior, estado_nuevo), ...], el más reciente primero."""
+        return HistorialDAO().obtener_historial_asistencia(matricula, fecha)
+
+    # --- Vista por rango de fechas (alumnos × fechas) ---
+
+    def obtener_matriz_asistencia(self, desde, hasta):
+        """
+        Retorna la MatrizAsistencia del rango (una sola consulta), o un mensaje
+        "Error: ..." si el rango no es válido.
+        """
+        if desde > hasta:
+            desde, hasta = hasta, desde
+        if (date.fromisoformat(hasta) - date.fromisoformat(desde)).days >= MAX_DIAS_RANGO:
+            return f"Error: El rango no puede ser mayor a {MAX_DIAS_RANGO} días."
+        filas = self._asistencia_dao.obtener_asistencia_rango(self._grupo_actual_id, desde, hasta)
+        return MatrizAsistencia.desde_filas(filas, desde, hasta)
+
+    def _agregar_al_buffer(self, matricula, fecha, estado):
+        # cerrar() retira el buffer con el mismo candado: ningún cambio cae en un buffer ya cerrado
+        with self._lock_buffer:
+            if self._buffer is None:
+                self._buffer = BufferCalificaciones(self._guardar_lote_asistencia)
+            self._buffer.agregar(matricula, fecha, estado)
+
+    def agregar_estado_pendiente(self, matricula, fecha, estado):
+        """Deja un cambio de la vista por rango pendiente de guardar (el último cambio de la celda gana)."""
+        if estado not in self.ESTADOS_VALIDOS:
+            return "Error: Estado de asistencia inválido."
+        self._agregar_al_buffer(matricula, fecha, estado)
+        return "Estado pendiente de guardar."
+
+    def hay_estados_pendientes(self):
+        buffer = self._buffer
+        return buffer is not None and buffer.hay_pendientes()
+
+    def guardar_estados_pendientes(self):
+        """Guarda todos los cambios pendientes en una sola transacción."""
+        buffer = self._buffer
+        if buffer is None:
+            return "Éxito: No hay cambios de asistencia pendientes."
+        guardados = buffer.vaciar()
+        if guardados is False:
+            return "Error: No se pudieron guardar los cambios de asistencia."
+        return f"Éxito: {guardados} registros de asistencia guardados."
+
+    def cerrar(self):
+        """Guarda lo pendiente al cerrar la ventana de asistencia."""
+        # Se retira el buffer ANTES de guardarlo: la ventana puede reabrirse (ver
+        # Presentacion/cache_ventanas.py) y un cambio hecho mientras se guarda va a un buffer nuevo
+        with self._lock_buffer:
+            buffer, self._buffer = self._buffer, None
+        if buffer is None:
+            return "Éxito: No hay cambios de asistencia pendientes."
+        if buffer.cerrar() is False:
+            # Lo pendiente se reintenta al salir de la aplicación
+            return "Error: No se pudieron guardar los cambios de asistencia."
+        return "Éxito: Cambios de asistencia guardados."
+
+    def _guardar_lote_asistencia(self, lote):
+        """lote: [(matricula, fecha, estado), ...] ya validado y sin celdas repetidas."""
+        with UnidadDeTrabajo() as unidad:
+            fechas_nuevas = self._hay_fechas_nuevas(fecha for _, fecha, _ in lote)
+            if self._asistencia_dao.registrar_asistencias(lote):
+                self._actualizar_promedios(None if fechas_nuevas else sorted({m for m, _, _ in lote}))
+            else:
+                unidad.exitosa = False
+        return unidad.exitosa
+
 # ====================================================
 # 4. GESTOR CALIFICACIONES (CASO DE USO 3 y 5)
 # ====================================================
@@ -176,9 +288,14 @@ class GestorCalificaciones:
         # Cambiamos PonderacionDAO por CategoriaEvaluacionDAO
         self._categoria_dao = CategoriaEvaluacionDAO() 
         self._calificacion_dao = CalificacionDAO()
-        
-        # Aseguramos la ponderación inicial (BR.3)
-        self._categoria_dao.crear_ponderacion_inicial(grupo_id)
+        self._alumno_dao = AlumnoDAO()
+        self._promedio_dao = PromedioDAO()
+        self._buffer = None # Notas capturadas por celda pendientes de guardar (se crea al primer uso)
+        # La ventana agrega notas y el hilo de trabajo cierra el buffer: _buffer se cambia con este candado
+        self._lock_buffer = threading.Lock()
+        # Crear el gestor no consulta la base (las ventanas lo crean en el hilo de la
+        # interfaz): la ponderación inicial (BR.3) la crea obtener_categorias la primera
+        # vez que se lee la ponderación del grupo.
 
     # --- CU3: Ponderación Flexible ---
     
@@ -204,85 +321,270 @@ class GestorCalificaciones:
                 CategoriaEvaluacion(self._grupo_actual_id, nombre, float(peso), int(max_items))
             )
         
-        # Guardar en la base de datos
-        if self._categoria_dao.guardar_categorias(lista_modelos, self._grupo_actual_id):
-            # 6. Guarda la estructura y recalcula todos los promedios (BR.14)
-            self._recalcular_promedios() 
+        # Guardar en la base de datos (estructura y promedios en una sola transacción)
+        with UnidadDeTrabajo() as unidad:
+            if self._categoria_dao.guardar_categorias(lista_modelos, self._grupo_actual_id):
+                # 6. Guarda la estructura y recalcula todos los promedios (BR.14)
+                self._recalcular_promedios()
+            else:
+                unidad.exitosa = False
+        if unidad.exitosa:
             return "Estructura de evaluación guardada y promedios recalculados exitosamente."
         else:
             return "Error al intentar guardar la estructura de evaluación."
 
-    # --- Lógica de Recálculo (La parte más afectada) ---
-    # *Este método se vuelve más complejo por la naturaleza dinámica*
+    # --- Lógica de Recálculo ---
+
     def _recalcular_promedios(self):
-        """Calcula el promedio final de CADA alumno en el grupo usando la ponderación dinámica."""
-        
-        # 1. Obtener ponderación dinámica
-        categorias = self.obtener_categorias_evaluacion()
-        
-        # Diccionario de categorías para acceso rápido: {nombre: (peso, max_items)}
-        diccionario_ponderacion = {
-            c.get_nombre_categoria(): (c.get_peso_porcentual(), c.get_max_items())
-            for c in categorias
-        }
-        
-        # 2. Obtener TODAS las calificaciones del grupo
-        # NOTA: Ahora las calificaciones deben tener nombres que coincidan EXACTAMENTE 
+        """
+        Calcula el promedio final de CADA alumno en el grupo usando la ponderación dinámica
+        y lo guarda en la tabla materializada (refresco completo del grupo).
+        """
+        # 1. Obtener ponderación dinámica (la crea si el grupo aún no tiene)
+        resultado = self._calcular_promedios_grupo(self.obtener_categorias_evaluacion())
+        return self._promedio_dao.reemplazar_promedios_grupo(self._grupo_actual_id, resultado)
+
+    def calcular_promedios_sin_guardar(self):
+        """
+        Promedios del grupo (ResultadoPromedios) calculados en memoria, sin escribir
+        nada: ni la ponderación inicial ni la tabla materializada. Lo usa la exportación
+        de reportes para los grupos que aún no tienen promedios guardados.
+        """
+        return self._calcular_promedios_grupo(self._categoria_dao.obtener_categorias_sin_crear(self._grupo_actual_id))
+
+    def _calcular_promedios_grupo(self, categorias):
+        """Calcula (sin guardar) los promedios de todo el grupo con la ponderación `categorias`."""
+        # 2. Obtener TODAS las calificaciones y los alumnos del grupo (una consulta cada una)
+        # NOTA: Las calificaciones deben tener nombres que coincidan EXACTAMENTE
         # con los nombres de las categorías guardadas (Ej. "Examen Final" vs "Examen").
-        # Por simplicidad, asumiremos que solo se registran notas de categorías definidas.
-        calificaciones = self._calificacion_dao.obtener_todas_calificaciones_por_grupo(self._grupo_actual_id)
-        
-        # ... (El resto de la lógica de recálculo aquí. Se iteraría sobre las calificaciones
-        # y se agruparía por la clave de la categoría definida en el diccionario_ponderacion.)
-        # ...
-        
-        print(f"Recalculando promedios para grupo {self._grupo_actual_id} con {len(categorias)} categorías.")
-        return True
+        calificaciones = self._calificacion_dao.obtener_todas_calificaciones_por_grupo(self._grupo_actual_id) or []
+        calificaciones = self._agregar_puntajes_asistencia(categorias, calificaciones)
+        alumnos = self._alumno_dao.obtener_alumnos_por_grupo(self._grupo_actual_id) or []
+
+        # 3. Cálculo en una sola pasada (ver Logica/motor_calificaciones.py)
+        return calcular_promedios(categorias, calificaciones, [a[0] for a in alumnos])
+
+    def _agregar_puntajes_asistencia(self, categorias, calificaciones):
+        """
+        La categoría "Asistencia" de la ponderación se califica con la asistencia real
+        (Logica/analitica_asistencia.py), salvo para los alumnos a los que el docente
+        ya les capturó esa calificación a mano.
+        """
+        if not any(c.get_nombre_categoria() == CATEGORIA_ASISTENCIA for c in categorias):
+            return calificaciones
+        capturadas = {m for m, categoria, _ in calificaciones if categoria == CATEGORIA_ASISTENCIA}
+        puntajes = AnaliticaAsistencia(self._grupo_actual_id).puntajes_asistencia()
+        return list(calificaciones) + [
+            (m, CATEGORIA_ASISTENCIA, puntaje) for m, puntaje in puntajes.items() if m not in capturadas
+        ]
+
+    def actualizar_promedios_asistencia(self, matriculas):
+        """Recalcula la aportación de la categoría "Asistencia" tras registrar asistencia."""
+        return self._actualizar_promedios_celdas([(m, CATEGORIA_ASISTENCIA) for m in matriculas])
+
+    def _actualizar_promedio_alumno(self, matricula, categoria):
+        """Actualización incremental: solo la categoría modificada de un alumno (BR.15)."""
+        return self._actualizar_promedios_celdas([(matricula, categoria)])
+
+    def _actualizar_promedios_celdas(self, celdas):
+        """
+        Actualización incremental de varias celdas [(matricula, categoria), ...] a la vez:
+        se recalculan solo esas aportaciones y los promedios de esos alumnos (BR.15).
+        """
+        # Sin promedios materializados todavía, actualizar solo unas celdas dejaría
+        # al resto del grupo sin calcular: se hace el refresco completo.
+        if not self._promedio_dao.existen_promedios_grupo(self._grupo_actual_id):
+            return self._recalcular_promedios()
+
+        ponderacion = {cat.get_nombre_categoria(): cat for cat in self.obtener_categorias_evaluacion()}
+        # Las categorías fuera de la ponderación no aportan al promedio
+        celdas = {(m, c) for m, c in celdas if c in ponderacion}
+        if not celdas:
+            return True
+
+        if len(celdas) == 1:
+            (matricula, categoria), = celdas
+            valores_por_celda = {
+                (matricula, categoria): self._calificacion_dao.obtener_valores_alumno_categoria(matricula, categoria)
+            }
+        else:
+            # Un lote: una sola consulta del grupo en lugar de una por celda
+            valores_por_celda = {celda: [] for celda in celdas}
+            for fila in self._calificacion_dao.obtener_todas_calificaciones_por_grupo(self._grupo_actual_id) or []:
+                valores = valores_por_celda.get(fila[:2])
+                if valores is not None:
+                    valores.append(fila[2])
+
+        # Asistencia sin calificación capturada: se usa la asistencia registrada
+        sin_captura = [m for (m, c), v in valores_por_celda.items() if c == CATEGORIA_ASISTENCIA and not v]
+        if sin_captura:
+            # Solo se lee la asistencia de esos alumnos, no la de todo el grupo
+            puntajes = AnaliticaAsistencia(self._grupo_actual_id).puntajes_asistencia(matriculas=sin_captura)
+            for (matricula, categoria), valores in valores_por_celda.items():
+                if categoria == CATEGORIA_ASISTENCIA and not valores and matricula in puntajes:
+                    valores.append(puntajes[matricula])
+
+        subtotales = []
+        for (matricula, categoria), valores in valores_por_celda.items():
+            cat = ponderacion[categoria]
+            subtotal = cat.get_peso_porcentual() / 100.0 * puntaje_categoria(valores, cat.get_max_items())
+            subtotales.append((matricula, categoria, subtotal))
+        return self._promedio_dao.actualizar_subtotales(self._grupo_actual_id, subtotales)
+
+    def obtener_promedios_finales(self):
+        """Retorna [(matricula, nombre, promedio_final), ...] leyendo los promedios precalculados."""
+        # Bases de datos anteriores a la tabla materializada: se llena una sola vez
+        if not self._promedio_dao.existen_promedios_grupo(self._grupo_actual_id):
+            self._recalcular_promedios()
+        return self._promedio_dao.obtener_promedios_por_grupo(self._grupo_actual_id)
 
     # --- CU5: Registro de Calificaciones ---
     
-    def obtener_alumnos_con_calificaciones(self, categoria):
-        # Retorna: [(matricula, nombre, valor), ...]
-        return self._calificacion_dao.obtener_calificaciones_por_grupo_categoria(self._grupo_actual_id, categoria)
+    def obtener_alumnos_con_calificaciones(self, categoria, numero_item=1):
+        # Retorna: [(matricula, nombre, valor), ...] con la nota de un elemento de la categoría
+        return self._calificacion_dao.obtener_calificaciones_por_grupo_categoria(
+            self._grupo_actual_id, categoria, numero_item
+        )
+
+    def obtener_matriz_calificaciones(self, categoria):
+        """
+        Cuadrícula alumnos × elementos de una categoría (Tarea 1 ... Tarea N).
+        Retorna (numero_elementos, [(matricula, nombre, nota_1, ..., nota_N), ...]):
+        N es el max_items de la categoría (o el elemento más alto ya capturado, si es mayor)
+        y las celdas sin nota son None. Una consulta y una sola pasada sobre las filas.
+        """
+        maximo = next(
+            (c.max_items for c in self.obtener_categorias_evaluacion() if c.nombre_categoria == categoria), 1
+        )
+        filas = self._calificacion_dao.obtener_elementos_por_grupo_categoria(self._grupo_actual_id, categoria) or []
+        numero_elementos = max([max(int(maximo or 1), 1)] + [fila[2] for fila in filas if fila[2] is not None])
+
+        matriz = []
+        for matricula, nombre, numero_item, valor in filas:
+            if not matriz or matriz[-1][0] != matricula:
+                matriz.append([matricula, nombre] + [None] * numero_elementos)
+            if numero_item is not None:
+                matriz[-1][numero_item + 1] = valor
+        return numero_elementos, [tuple(fila) for fila in matriz]
+
+    def obtener_historial_calificacion(self, matricula, categoria, numero_item=1):
+        """
+        Cambios de una nota para atender aclaraciones:
+        [(momento, valor_anterior, valor_nuevo, fecha), ...], el más reciente primero.
+        valor_anterior None es la captura inicial; valor_nuevo None, una nota borrada.
+        """
+        return HistorialDAO().obtener_historial_calificacion(matricula, categoria, numero_item)
 
-    def registrar_calificacion(self, matricula, categoria, valor):
+    def _validar_calificacion(self, valor):
+        """Retorna (valor_num, None) o (None, mensaje_error)."""
         # FE.1: Validación de rangos (BR.13)
         try:
             valor_num = float(valor)
-        except ValueError:
-            return "Error: La calificación debe ser un valor numérico."
-            
+        except (TypeError, ValueError):
+            return None, "Error: La calificación debe ser un valor numérico."
+
         if not (0.0 <= valor_num <= 10.0):
-            return "Error (FE.1): La nota debe estar en la escala válida (0.0 a 10.0)."
+            return None, "Error (FE.1): La nota debe estar en la escala válida (0.0 a 10.0)."
+        return valor_num, None
+
+    def _validar_numero_item(self, numero_item):
+        """Retorna (numero_item, None) o (None, mensaje_error). Los elementos se numeran desde 1."""
+        try:
+            numero = int(numero_item)
+        except (TypeError, ValueError):
+            return None, "Error: El número de elemento debe ser un entero."
+        if numero < 1:
+            return None, "Error: El número de elemento debe ser 1 o mayor."
+        return numero, None
+
+    def registrar_calificacion(self, matricula, categoria, valor, numero_item=1):
+        valor_num, error = self._validar_calificacion(valor)
+        if error:
+            return error
+        numero_item, error = self._validar_numero_item(numero_item)
+        if error:
+            return error
             
         nueva_calificacion = Calificacion(
             matricula=matricula, categoria=categoria, valor=valor_num,
-            fecha=date.today().isoformat() # Usamos la fecha actual como identificador de registro
+            fecha=date.today().isoformat(), # Fecha de captura (la llave es el número de elemento)
+            numero_item=numero_item
         )
         
-        if self._calificacion_dao.registrar_calificacion(nueva_calificacion):
-            # 6. Calcula automáticamente el nuevo promedio final (BR.15)
-            self._recalcular_promedios() 
+        with UnidadDeTrabajo() as unidad:
+            if self._calificacion_dao.registrar_calificacion(nueva_calificacion):
+                # 6. Calcula automáticamente el nuevo promedio final (BR.15), solo de este alumno
+                self._actualizar_promedio_alumno(matricula, categoria)
+            else:
+                unidad.exitosa = False
+        if unidad.exitosa:
             return "Calificación registrada y promedio actualizado."
         else:
             return "Error al intentar registrar la calificación."
 
-    # --- Lógica de Recálculo ---
-    
-    def _recalcular_promedios(self):
-        """Calcula el promedio final de CADA alumno en el grupo usando la ponderación actual."""
-        # NOTA: Por simplicidad, esta función no guarda el resultado final, 
-        # solo simula el cálculo que se ejecutaría. Para guardar, se necesita 
-        # una tabla o campo extra en el modelo Alumno.
-        print(f"Recalculando promedios para grupo {self._grupo_actual_id}...")
-        
-        # 1. Obtener ponderación
-        asist_p, examen_p, part_p, tareas_p, total_tareas = self._ponderacion_dao.obtener_ponderacion(self._grupo_actual_id)
-        
-        # 2. Obtener TODAS las calificaciones del grupo
-        calificaciones = self._calificacion_dao.obtener_todas_calificaciones_por_grupo(self._grupo_actual_id)
-        
-        # ... (El cálculo complejo real está aquí, pero por ahora solo simulamos) ...
-        # (El cálculo del promedio final es la parte más compleja de la lógica)
-        
-        return True
\ No newline at end of file
+    # --- CU5: Captura por celdas con escritura diferida ---
+
+    def _agregar_al_buffer(self, matricula, celda, valor):
+        # Igual que en GestorAsistencia: cerrar() retira el buffer con el mismo candado
+        with self._lock_buffer:
+            if self._buffer is None:
+                self._buffer = BufferCalificaciones(self._guardar_lote_calificaciones)
+            self._buffer.agregar(matricula, celda, valor)
+
+    def agregar_calificacion_pendiente(self, matricula, categoria, valor, numero_item=1):
+        """
+        Valida la nota y la deja pendiente de guardar (ver Logica/buffer_calificaciones.py).
+        Si la misma celda (alumno, categoría, elemento) se edita varias veces antes de
+        guardar, solo se guarda la última.
+        """
+        valor_num, error = self._validar_calificacion(valor)
+        if error:
+            return error
+        numero_item, error = self._validar_numero_item(numero_item)
+        if error:
+            return error
+        self._agregar_al_buffer(matricula, (categoria, numero_item), valor_num)
+        return "Calificación pendiente de guardar."
+
+    def hay_calificaciones_pendientes(self):
+        buffer = self._buffer
+        return buffer is not None and buffer.hay_pendientes()
+
+    def guardar_calificaciones_pendientes(self):
+        """Guarda las notas pendientes en una sola transacción y recalcula una sola vez."""
+        buffer = self._buffer
+        if buffer is None:
+            return "Éxito: No hay calificaciones pendientes."
+        guardadas = buffer.vaciar()
+        if guardadas is False:
+            return "Error al intentar guardar las calificaciones pendientes."
+        return f"Éxito: {guardadas} calificaciones guardadas y promedios actualizados."
+
+    def cerrar(self):
+        """Guarda lo pendiente al cerrar la ventana de captura."""
+        # Igual que en GestorAsistencia.cerrar: se retira el buffer antes de guardarlo
+        with self._lock_buffer:
+            buffer, self._buffer = self._buffer, None
+        if buffer is None:
+            return "Éxito: No hay calificaciones pendientes."
+        if buffer.cerrar() is False:
+            # Lo pendiente se reintenta al salir de la aplicación
+            return "Error al intentar guardar las calificaciones pendientes."
+        return "Éxito: Calificaciones pendientes guardadas."
+
+    def _guardar_lote_calificaciones(self, lote):
+        """lote: [(matricula, (categoria, numero_item), valor), ...] ya validado y sin celdas repetidas."""
+        fecha = date.today().isoformat()
+        calificaciones = [
+            Calificacion(matricula, categoria, valor, fecha, numero_item)
+            for matricula, (categoria, numero_item), valor in lote
+        ]
+        # Notas y promedios en una sola transacción: si algo falla no queda nada a medias
+        # y el lote completo vuelve al buffer para reintentarse
+        with UnidadDeTrabajo() as unidad:
+            if self._calificacion_dao.registrar_calificaciones(calificaciones):
+                # Un solo recálculo por lote (BR.15)
+                self._actualizar_promedios_celdas([(c.matricula, c.categoria) for c in calificaciones])
+            else:
+                unidad.exitosa = False
+        return unidad.exitosa
@@ -0,0 +1,204 @@
+"""
+Importación masiva del roster de un grupo desde CSV o XLSX (CU2).
+
+El archivo se lee por bloques (no se carga completo en memoria), las
+reglas BR.4 y FE.2 se validan con consultas sobre una tabla temporal y los
+alumnos válidos se insertan en una sola transacción (ver
+AlumnoDAO.importar_alumnos). Las filas rechazadas se devuelven en un
+reporte con el número de fila del archivo y el motivo.
+
+Columnas: matricula, nombre_completo, datos_contacto, email. Si la primera
+fila tiene esos encabezados (se aceptan "Matrícula", "Nombre", "Contacto",
+etc.) se usan para ubicar las columnas; si no, se toman en ese orden.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python -m Logica.importador_alumnos --db directaula.db --grupo 1 roster.csv --reporte errores.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+import unicodedata
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO
+
+# openpyxl es opcional: sin él solo se importan archivos CSV
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
+
+TAMANO_BLOQUE = 1000
+COLUMNAS = ("matricula", "nombre_completo", "datos_contacto", "email")
+_SINONIMOS = {
+    "matricula": "matricula", "id": "matricula",
+    "nombre_completo": "nombre_completo", "nombre": "nombre_completo", "alumno": "nombre_completo",
+    "datos_contacto": "datos_contacto", "contacto": "datos_contacto", "telefono": "datos_contacto",
+    "email": "email", "correo": "email", "correo_electronico": "email",
+}
+MOTIVOS_ERROR = {
+    "BR.4": "Matrícula y Nombre son obligatorios (BR.4).",
+    "FE.2": "La matrícula ya existe en este grupo (FE.2).",
+    "OTRO_GRUPO": "La matrícula ya está registrada en otro grupo.",
+    "DUPLICADA": "La matrícula está repetida en el archivo.",
+}
+
+
+def _normalizar_encabezado(texto):
+    texto = unicodedata.normalize("NFKD", str(texto or "")).encode("ascii", "ignore").decode()
+    return texto.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _texto_celda(valor):
+    """Convierte una celda a texto (las matrículas numéricas de Excel llegan como 2023001.0)."""
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def _indices_columnas(primera_fila):
+    """Retorna (indices, tiene_encabezado): posición en el archivo de cada columna de COLUMNAS."""
+    encontrados = {}
+    for i, celda in enumerate(primera_fila):
+        columna = _SINONIMOS.get(_normalizar_encabezado(celda))
+        if columna and columna not in encontrados:
+            encontrados[columna] = i
+    if "matricula" in encontrados and "nombre_completo" in encontrados:
+        return [encontrados.get(c) for c in COLUMNAS], True
+    return list(range(len(COLUMNAS))), False
+
+
+def _filas_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8-sig") as f:
+        muestra = f.read(4096)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel # Archivo de una sola columna o vacío
+        yield from csv.reader(f, dialecto)
+
+
+def _filas_xlsx(ruta):
+    if load_workbook is None:
+        raise ValueError("Para importar archivos .xlsx instale openpyxl (ver requirements.txt).")
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        yield from libro.active.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def leer_bloques(ruta, tamano_bloque=TAMANO_BLOQUE, al_progresar=None):
+    """
+    Genera listas de hasta `tamano_bloque` filas (fila, matricula, nombre, contacto, email).
+    `fila` es el número de fila en el archivo (1 = primera fila), para el reporte de errores.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        filas = _filas_xlsx(ruta)
+    elif extension in (".csv", ".txt"):
+        filas = _filas_csv(ruta)
+    else:
+        raise ValueError(f"Formato no soportado: {extension or ruta} (use .csv o .xlsx).")
+
+    indices, bloque, leidas = None, [], 0
+    for numero, fila in enumerate(filas, start=1):
+        if indices is None:
+            indices, tiene_encabezado = _indices_columnas(fila)
+            if tiene_encabezado:
+                continue
+        # Las filas completamente vacías se ignoran (comunes al final de un Excel)
+        if not any(_texto_celda(c) for c in fila):
+            continue
+        bloque.append((numero,) + tuple(
+            _texto_celda(fila[i]) if i is not None and i < len(fila) else "" for i in indices
+        ))
+        if len(bloque) >= tamano_bloque:
+            leidas += len(bloque)
+            yield bloque
+            bloque = []
+            if al_progresar:
+                al_progresar(leidas)
+    if bloque:
+        yield bloque
+        if al_progresar:
+            al_progresar(leidas + len(bloque))
+
+
+class ResultadoImportacion:
+    """Resumen de una importación: alumnos importados y filas rechazadas con su motivo."""
+
+    def __init__(self, importados=0, errores=None, mensaje=""):
+        self.importados = importados
+        self.errores = errores or [] # [(fila, matricula, motivo), ...]
+        self.mensaje = mensaje
+
+    def guardar_reporte(self, ruta):
+        """Escribe el reporte de filas rechazadas en un CSV."""
+        with open(ruta, "w", newline="", encoding="utf-8-sig") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["fila", "matricula", "motivo"])
+            escritor.writerows(self.errores)
+
+
+class ImportadorAlumnos:
+    """Importa el roster de un archivo al grupo indicado."""
+
+    def __init__(self, grupo_id, alumno_dao=None):
+        self._grupo_id = grupo_id
+        self._alumno_dao = alumno_dao or AlumnoDAO()
+
+    def importar(self, ruta, al_progresar=None, tamano_bloque=TAMANO_BLOQUE):
+        try:
+            resultado = self._alumno_dao.importar_alumnos(
+                self._grupo_id, leer_bloques(ruta, tamano_bloque, al_progresar)
+            )
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            return ResultadoImportacion(mensaje=f"Error: No se pudo leer el archivo. {e}")
+
+        if resultado is False:
+            return ResultadoImportacion(mensaje="Error: No se pudo guardar la importación en la base de datos.")
+
+        importados, errores = resultado
+        errores = [(fila, matricula, MOTIVOS_ERROR[codigo]) for fila, matricula, codigo in errores]
+        if importados == 0 and not errores:
+            mensaje = "Advertencia: El archivo no contiene alumnos."
+        elif errores:
+            mensaje = f"Éxito: {importados} alumnos importados; {len(errores)} filas rechazadas."
+        else:
+            mensaje = f"Éxito: {importados} alumnos importados."
+        return ResultadoImportacion(importados, errores, mensaje)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archivo", help="Archivo .csv o .xlsx con el roster")
+    parser.add_argument("--grupo", type=int, required=True, help="grupo_id destino")
+    parser.add_argument("--db", default="directaula.db", help="Base de datos")
+    parser.add_argument("--reporte", help="CSV donde guardar las filas rechazadas")
+    args = parser.parse_args(argv)
+
+    conexiones.configurar_db_file(args.db)
+    inicio = time.perf_counter()
+    resultado = ImportadorAlumnos(args.grupo).importar(
+        args.archivo, al_progresar=lambda n: print(f"  {n} filas leídas...")
+    )
+    print(f"{resultado.mensaje} ({time.perf_counter() - inicio:.2f} s)")
+    for fila, matricula, motivo in resultado.errores[:20]:
+        print(f"  fila {fila} ({matricula or 'sin matrícula'}): {motivo}")
+    if len(resultado.errores) > 20:
+        print(f"  ... y {len(resultado.errores) - 20} más")
+    if args.reporte and resultado.errores:
+        resultado.guardar_reporte(args.reporte)
+        print(f"Reporte de errores guardado en {args.reporte}")
+    conexiones.cerrar_todas()
+    return 1 if resultado.mensaje.startswith("Error") else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import unicodedata
+
+# ====================================================
+# ÍNDICE DE BÚSQUEDA DEL ROSTER (AC-2)
+# ====================================================
+# Se construye una vez por carga del roster y cada búsqueda se resuelve en
+# memoria, sin consultar la base ni volver a normalizar los nombres.
+#
+# - Insensible a mayúsculas y acentos: "jose nunez" encuentra "José Núñez".
+# - Cada palabra de la búsqueda debe aparecer (como subcadena) en la matrícula,
+#   el nombre o el email del alumno.
+# - Las palabras de 3+ letras se buscan con un índice de trigramas; las más
+#   cortas recorren los textos ya normalizados.
+# - Búsqueda incremental: si la consulta solo agrega letras a la anterior (el
+#   docente sigue escribiendo), se filtra sobre el resultado anterior.
+
+SEPARADOR = "\x00" # No aparece en los datos: evita coincidencias entre columnas
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos ni diéresis (la ñ se compara como n)."""
+    texto = str(texto or "").casefold()
+    if texto.isascii():
+        return texto
+    return "".join(c for c in unicodedata.normalize("NFD", texto) if not unicodedata.combining(c))
+
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceBusqueda:
+    """Índice de trigramas sobre las columnas de texto de un roster."""
+
+    def __init__(self, filas, columnas=(0, 1, 3)):
+        # columnas: matrícula, nombre y email de las filas de AlumnoDAO.obtener_alumnos_por_grupo
+        self._textos = [
+            SEPARADOR.join(normalizar(fila[c]) for c in columnas if c < len(fila))
+            for fila in filas
+        ]
+        # trigrama -> [fila, ...] (las filas se agregan en orden, sin repetir)
+        self._publicaciones = publicaciones = {}
+        for i, texto in enumerate(self._textos):
+            for trigrama in _trigramas(texto):
+                lista = publicaciones.get(trigrama)
+                if lista is None:
+                    publicaciones[trigrama] = [i]
+                else:
+                    lista.append(i)
+        self._ultima = None # (consulta normalizada, resultado) de la búsqueda anterior
+
+    def __len__(self):
+        return len(self._textos)
+
+    def buscar(self, consulta):
+        """
+        Retorna el conjunto de filas que coinciden con la consulta,
+        o None si la consulta está vacía (se muestran todas).
+        """
+        normalizada = normalizar(consulta)
+        palabras = normalizada.split()
+        if not palabras:
+            self._ultima = None
+            return None
+
+        candidatas = None
+        if self._ultima is not None and normalizada.startswith(self._ultima[0]):
+            candidatas = self._ultima[1]
+
+        # Listas de trigramas de las palabras largas, de la más corta a la más larga
+        listas = []
+        for palabra in palabras:
+            if len(palabra) >= 3:
+                for trigrama in _trigramas(palabra):
+                    lista = self._publicaciones.get(trigrama)
+                    if lista is None:
+                        self._ultima = (normalizada, set())
+                        return set()
+                    listas.append(lista)
+        listas.sort(key=len)
+        if listas and (candidatas is None or len(listas[0]) < len(candidatas)):
+            candidatas = set(listas[0])
+            for lista in listas[1:]:
+                if not candidatas:
+                    break
+                candidatas.intersection_update(lista)
+
+        if candidatas is None:
+            candidatas = range(len(self._textos))
+        # Verificación final: los trigramas no garantizan el orden de las letras
+        textos = self._textos
+        resultado = {i for i in candidatas if all(p in textos[i] for p in palabras)}
+        self._ultima = (normalizada, resultado)
+        return resultado
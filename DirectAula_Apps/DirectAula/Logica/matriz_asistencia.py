@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+# ====================================================
+# MATRIZ DE ASISTENCIA POR RANGO DE FECHAS (CU4)
+# ====================================================
+# La vista por rango muestra alumnos × fechas (p. ej. un mes completo) con una
+# sola consulta (AsistenciaDAO.obtener_asistencia_rango). El pivote se guarda
+# en un bytearray de filas × columnas con un código por estado, en lugar de un
+# diccionario o una tupla por celda.
+
+MAX_DIAS_RANGO = 366 # Un ciclo escolar completo como máximo
+SIN_REGISTRO = 0 # Código de las celdas sin registro de asistencia
+
+
+def dias_habiles(desde, hasta):
+    """Fechas ISO de lunes a viernes entre `desde` y `hasta` (inclusive)."""
+    inicio, fin = date.fromisoformat(desde), date.fromisoformat(hasta)
+    return [
+        (inicio + timedelta(days=d)).isoformat()
+        for d in range((fin - inicio).days + 1)
+        if (inicio + timedelta(days=d)).weekday() < 5
+    ]
+
+
+class MatrizAsistencia:
+    """
+    Asistencia de un grupo en un rango: una fila por alumno y una columna por fecha.
+    Columnas: los días hábiles del rango más cualquier otra fecha que tenga registros.
+    """
+
+    def __init__(self, alumnos, fechas):
+        self.alumnos = alumnos # [(matricula, nombre), ...]
+        self.fechas = fechas # ['YYYY-MM-DD', ...] ordenadas
+        self._columna_fecha = {fecha: j for j, fecha in enumerate(fechas)}
+        self._fila_matricula = {matricula: i for i, (matricula, _) in enumerate(alumnos)}
+        self._estados = [None] # Código -> estado (el 0 es "sin registro")
+        self._codigo_estado = {}
+        self._celdas = bytearray(len(alumnos) * len(fechas))
+
+    @classmethod
+    def desde_filas(cls, filas, desde, hasta):
+        """Pivotea las filas (matricula, nombre, fecha, estado) de AsistenciaDAO.obtener_asistencia_rango."""
+        fechas = set(dias_habiles(desde, hasta))
+        fechas.update(fila[2] for fila in filas if fila[2] is not None)
+
+        alumnos = []
+        for matricula, nombre, _, _ in filas:
+            if not alumnos or alumnos[-1][0] != matricula:
+                alumnos.append((matricula, nombre))
+
+        matriz = cls(alumnos, sorted(fechas))
+        for matricula, _, fecha, estado in filas:
+            if fecha is not None:
+                matriz._asignar(matriz._fila_matricula[matricula], matriz._columna_fecha[fecha], estado)
+        return matriz
+
+    def _codigo(self, estado):
+        codigo = self._codigo_estado.get(estado)
+        if codigo is None:
+            codigo = len(self._estados)
+            self._estados.append(estado)
+            self._codigo_estado[estado] = codigo
+        return codigo
+
+    def _asignar(self, fila, columna, estado):
+        self._celdas[fila * len(self.fechas) + columna] = SIN_REGISTRO if estado is None else self._codigo(estado)
+
+    @property
+    def filas(self):
+        return len(self.alumnos)
+
+    @property
+    def columnas(self):
+        return len(self.fechas)
+
+    def estado(self, fila, columna):
+        """Estado de la celda, o None si ese día no hay registro para el alumno."""
+        return self._estados[self._celdas[fila * len(self.fechas) + columna]]
+
+    def cambiar_estado(self, fila, columna, estado):
+        """Cambia una celda y retorna (matricula, fecha) para guardarla."""
+        self._asignar(fila, columna, estado)
+        return self.alumnos[fila][0], self.fechas[columna]
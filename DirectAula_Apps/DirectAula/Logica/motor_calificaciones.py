@@ -0,0 +1,126 @@
+from array import array
+from itertools import compress
+from operator import gt, mul
+
+# ====================================================
+# MOTOR DE CÁLCULO DE PROMEDIOS FINALES (BR.14 / BR.15)
+# ====================================================
+# Calcula el promedio ponderado de TODOS los alumnos de un grupo en una sola pasada
+# sobre las calificaciones. Los resultados se guardan en arreglos compactos
+# (array('d')) indexados por [alumno][categoría] en lugar de objetos por celda.
+# La pasada solo suma y cuenta las notas de cada celda en una matriz plana
+# (alumno * ancho + categoría); el resto se hace con map() sobre la matriz
+# completa. Sin NumPy el costo queda en ~0.2 µs por nota (ver
+# benchmarks/bench_motor_calificaciones.py).
+
+
+def puntaje_categoria(valores, max_items):
+    """
+    Calificación (0-10) de un alumno en una categoría.
+    Para categorías de varios elementos (Tareas, Participación) se toman las
+    `max_items` mejores notas y se divide entre `max_items`: los elementos
+    no entregados cuentan como 0.
+    """
+    max_items = max(int(max_items or 1), 1)
+    if max_items == 1 and valores:
+        return max(valores)
+    if len(valores) > max_items:
+        # Pocas notas por celda: ordenar en C es más rápido que heapq.nlargest
+        valores = sorted(valores)[-max_items:]
+    return sum(valores) / max_items
+
+
+class ResultadoPromedios:
+    """Matriz matrícula × categoría con las aportaciones ponderadas y el promedio final."""
+
+    def __init__(self, matriculas, categorias, subtotales, finales):
+        self.matriculas = matriculas  # [matricula, ...] (orden de las filas)
+        self.categorias = categorias  # [nombre_categoria, ...] (orden de las columnas)
+        self.subtotales = subtotales  # [array('d'), ...] aportación ponderada por categoría
+        self.finales = finales  # array('d') promedio final (0-10) por alumno
+        self._indice = {m: i for i, m in enumerate(matriculas)}
+
+    def promedio_de(self, matricula):
+        i = self._indice.get(matricula)
+        return self.finales[i] if i is not None else None
+
+    def subtotales_de(self, matricula):
+        """Retorna {categoria: aportación ponderada} para un alumno."""
+        i = self._indice.get(matricula)
+        if i is None:
+            return {}
+        return dict(zip(self.categorias, self.subtotales[i]))
+
+    def como_diccionario(self):
+        """Retorna {matricula: promedio_final}."""
+        return dict(zip(self.matriculas, self.finales))
+
+
+def _sumar_celdas(calificaciones, inicio_alumno, columna, sumas, cuentas):
+    """Única pasada sobre las filas: suma y número de notas por celda (KeyError si falta una clave)."""
+    for matricula, categoria, valor in calificaciones:
+        k = inicio_alumno[matricula] + columna[categoria]
+        sumas[k] += valor
+        cuentas[k] += 1
+
+
+def calcular_promedios(categorias, calificaciones, matriculas=()):
+    """
+    Calcula el promedio final ponderado de cada alumno.
+
+    - categorias: lista de CategoriaEvaluacion (peso en %, max_items).
+    - calificaciones: filas (matricula, categoria, valor), p. ej. de
+      CalificacionDAO.obtener_todas_calificaciones_por_grupo.
+    - matriculas: alumnos del grupo; los que no tienen notas quedan con 0.
+
+    Las notas de categorías que ya no existen en la ponderación se ignoran.
+    """
+    nombres = [c.get_nombre_categoria() for c in categorias]
+    num_categorias = len(nombres)
+    ancho = num_categorias + 1 # Última columna: notas de categorías fuera de la ponderación
+    maximos = [max(int(c.get_max_items() or 1), 1) for c in categorias]
+    # Aportación de cada nota mientras la celda no pase de max_items: peso / max_items
+    factores = [c.get_peso_porcentual() / 100.0 / maximo for c, maximo in zip(categorias, maximos)] + [0.0]
+
+    lista_matriculas = list(matriculas)
+    # dict exactos (no subclases con __missing__): la búsqueda por fila es la parte más cara
+    inicio_alumno = {m: i * ancho for i, m in enumerate(lista_matriculas)}
+    columna = {nombre: j for j, nombre in enumerate(nombres)}
+    if not isinstance(calificaciones, (list, tuple)):
+        calificaciones = list(calificaciones) # Se puede recorrer más de una vez
+
+    # 1. Suma y número de notas de cada celda (matriz plana alumno * ancho + categoría)
+    sumas = [0.0] * (len(lista_matriculas) * ancho)
+    cuentas = [0] * len(sumas)
+    try:
+        _sumar_celdas(calificaciones, inicio_alumno, columna, sumas, cuentas)
+    except KeyError:
+        # Notas de alumnos fuera de `matriculas` (van al final) o de categorías que ya no
+        # están en la ponderación (a la última columna): se registran y se vuelve a sumar
+        for matricula, categoria, _ in calificaciones:
+            columna.setdefault(categoria, num_categorias)
+            if matricula not in inicio_alumno:
+                inicio_alumno[matricula] = len(lista_matriculas) * ancho
+                lista_matriculas.append(matricula)
+        sumas = [0.0] * (len(lista_matriculas) * ancho)
+        cuentas = [0] * len(sumas)
+        _sumar_celdas(calificaciones, inicio_alumno, columna, sumas, cuentas)
+
+    # 2. Celdas con más notas que max_items: solo cuentan las mejores (normalmente ninguna)
+    total_alumnos = len(lista_matriculas)
+    limites = (maximos + [len(cuentas) + 1]) * total_alumnos
+    excedidas = {k: [] for k in compress(range(len(cuentas)), map(gt, cuentas, limites))}
+    if excedidas:
+        for matricula, categoria, valor in calificaciones:
+            valores = excedidas.get(inicio_alumno[matricula] + columna[categoria])
+            if valores is not None:
+                valores.append(valor)
+        for k, valores in excedidas.items():
+            sumas[k] = max(valores) if limites[k] == 1 else sum(sorted(valores)[-limites[k]:])
+
+    # 3. Aportaciones ponderadas de toda la matriz y promedio final por alumno
+    aportaciones = array('d', map(mul, sumas, factores * total_alumnos))
+    subtotales = [aportaciones[k:k + num_categorias] for k in range(0, len(aportaciones), ancho)]
+    finales = array('d', map(sum, subtotales))
+
+    return ResultadoPromedios(lista_matriculas, nombres, subtotales, finales)
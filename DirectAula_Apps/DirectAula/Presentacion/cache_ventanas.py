@@ -0,0 +1,36 @@
+# presentacion/cache_ventanas.py
+# Ventanas reutilizables: cada clic en el menú muestra la ventana que ya existe
+# (p. ej. la de alumnos del grupo 3) en lugar de construirla de nuevo.
+
+from PyQt5.QtCore import Qt
+
+
+class CacheVentanas:
+    """
+    Ventanas ya construidas, por clave (p. ej. ("alumnos", grupo_id)).
+    Las ventanas cerradas con la X solo se ocultan (Qt no las destruye), así
+    que se pueden volver a mostrar. Al reabrirlas se llama a su método
+    recargar(), si lo tienen: los datos pudieron cambiar desde otra ventana.
+    """
+
+    def __init__(self):
+        self._ventanas = {}
+
+    def mostrar(self, clave, crear):
+        """Muestra la ventana de `clave`; si no existe la construye con crear()."""
+        ventana = self._ventanas.get(clave)
+        if ventana is None:
+            ventana = self._ventanas[clave] = crear()
+        elif ventana.isHidden() and hasattr(ventana, "recargar"):
+            ventana.recargar()
+        ventana.setWindowState(ventana.windowState() & ~Qt.WindowMinimized)
+        ventana.show()
+        ventana.raise_()
+        ventana.activateWindow()
+        return ventana
+
+    def obtener(self, clave):
+        return self._ventanas.get(clave)
+
+    def __len__(self):
+        return len(self._ventanas)
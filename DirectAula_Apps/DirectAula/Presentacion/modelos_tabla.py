@@ -0,0 +1,222 @@
+# presentacion/modelos_tabla.py
+# Modelos Qt (QAbstractTableModel) para las tablas grandes de las ventanas.
+# A diferencia de QTableWidget, no se crea un QTableWidgetItem por celda ni un
+# QComboBox por fila: la vista solo pide los datos de las filas visibles y los
+# cambios de una celda emiten dataChanged solo para esa celda.
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, pyqtSignal
+from PyQt5.QtWidgets import QComboBox, QStyledItemDelegate
+
+from Logica.indice_busqueda import IndiceBusqueda
+
+# Deben coincidir con GestorAsistencia.ESTADOS_VALIDOS (BR.11)
+ESTADOS_ASISTENCIA = ["Asistencia", "Ausente", "Retardo", "Justificado"]
+
+
+class ModeloTablaFilas(QAbstractTableModel):
+    """Modelo genérico de solo lectura sobre una lista de filas (tuplas del DAO)."""
+
+    # Se emite cuando el usuario edita una celda: (fila, columna, nuevo_valor)
+    celdaEditada = pyqtSignal(int, int, object)
+
+    def __init__(self, encabezados, columnas_editables=(), parent=None):
+        super().__init__(parent)
+        self._encabezados = list(encabezados)
+        self._editables = set(columnas_editables)
+        self._filas = []
+
+    # --- API usada por las ventanas ---
+
+    def cargar(self, filas, encabezados=None, columnas_editables=None):
+        """
+        Reemplaza todas las filas con un solo reset (sin crear objetos por celda).
+        Con `encabezados` / `columnas_editables` cambian también las columnas (p. ej. la
+        cuadrícula de elementos de otra categoría) en el mismo reset.
+        """
+        self.beginResetModel()
+        if encabezados is not None:
+            self._encabezados = list(encabezados)
+        if columnas_editables is not None:
+            self._editables = set(columnas_editables)
+        # Se guardan como listas para poder modificar una celda sin copiar la fila
+        self._filas = [list(f) for f in filas]
+        self.endResetModel()
+
+    def fila(self, row):
+        """Retorna los valores de la fila `row` (o None si no existe)."""
+        if 0 <= row < len(self._filas):
+            return self._filas[row]
+        return None
+
+    def valor(self, row, col):
+        fila = self.fila(row)
+        return fila[col] if fila is not None and col < len(fila) else None
+
+    def actualizar_celda(self, row, col, valor):
+        """Cambia UNA celda desde el código y notifica solo esa celda a la vista."""
+        if self.fila(row) is None:
+            return False
+        self._filas[row][col] = valor
+        indice = self.index(row, col)
+        self.dataChanged.emit(indice, indice, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._encabezados)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        valor = self._filas[index.row()][index.column()]
+        # Los valores nulos se muestran como cadena vacía
+        return "" if valor is None else str(valor)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal and section < len(self._encabezados):
+            return self._encabezados[section]
+        if orientation == Qt.Vertical:
+            return str(section + 1)
+        return None
+
+    def flags(self, index):
+        banderas = super().flags(index)
+        if index.isValid() and index.column() in self._editables:
+            banderas |= Qt.ItemIsEditable
+        return banderas
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or index.column() not in self._editables:
+            return False
+        if self._filas[index.row()][index.column()] == value:
+            return False
+        self._filas[index.row()][index.column()] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        self.celdaEditada.emit(index.row(), index.column(), value)
+        return True
+
+
+class ProxyBusqueda(QSortFilterProxyModel):
+    """
+    Filtra un ModeloTablaFilas con un IndiceBusqueda (Logica/indice_busqueda.py).
+    El índice se reconstruye solo cuando el modelo se recarga; cada búsqueda
+    únicamente consulta el índice, sin tocar la base de datos.
+    """
+
+    def __init__(self, modelo, columnas=(0, 1, 3), parent=None):
+        super().__init__(parent)
+        self._columnas = columnas
+        self._indice = IndiceBusqueda([], columnas)
+        self._consulta = ""
+        self._acepta = lambda fila: True # Sin búsqueda se muestran todas las filas
+        self.setSourceModel(modelo)
+        modelo.modelReset.connect(self._reindexar)
+
+    def _reindexar(self):
+        modelo = self.sourceModel()
+        self._indice = IndiceBusqueda([modelo.fila(i) for i in range(modelo.rowCount())], self._columnas)
+        self.buscar(self._consulta)
+
+    def buscar(self, consulta):
+        self._consulta = consulta
+        coincidencias = self._indice.buscar(consulta)
+        # filterAcceptsRow se llama una vez por fila: solo una consulta a un conjunto
+        self._acepta = (lambda fila: True) if coincidencias is None else coincidencias.__contains__
+        self.invalidateFilter()
+
+    def fila_origen(self, indice):
+        """Fila del modelo original que corresponde a un índice de la vista (-1 si no es válido)."""
+        return self.mapToSource(indice).row() if indice.isValid() else -1
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._acepta(source_row)
+
+
+class ModeloMatrizAsistencia(QAbstractTableModel):
+    """
+    Vista por rango de asistencia: Matrícula, Nombre y una columna por fecha.
+    Lee directamente de una MatrizAsistencia (Logica/matriz_asistencia.py), sin copiar celdas.
+    """
+
+    COLUMNAS_FIJAS = 2
+
+    # Se emite cuando el usuario edita una celda: (matricula, fecha, nuevo_estado)
+    estadoEditado = pyqtSignal(str, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matriz = None
+
+    def cargar(self, matriz):
+        self.beginResetModel()
+        self._matriz = matriz
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self._matriz is None else self._matriz.filas
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self._matriz is None else self.COLUMNAS_FIJAS + self._matriz.columnas
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        if index.column() < self.COLUMNAS_FIJAS:
+            return self._matriz.alumnos[index.row()][index.column()]
+        # Los días sin registro se muestran vacíos
+        return self._matriz.estado(index.row(), index.column() - self.COLUMNAS_FIJAS) or ""
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Vertical:
+            return str(section + 1) if role == Qt.DisplayRole else None
+        if section < self.COLUMNAS_FIJAS:
+            return ["Matrícula", "Nombre Completo"][section] if role == Qt.DisplayRole else None
+        # Al cambiar de modelo o de rango el encabezado puede pedir secciones que ya no existen
+        if self._matriz is None or section - self.COLUMNAS_FIJAS >= len(self._matriz.fechas):
+            return None
+        fecha = self._matriz.fechas[section - self.COLUMNAS_FIJAS]
+        if role == Qt.DisplayRole:
+            return f"{fecha[8:10]}/{fecha[5:7]}" # dd/mm
+        if role == Qt.ToolTipRole:
+            return fecha
+        return None
+
+    def flags(self, index):
+        banderas = super().flags(index)
+        if index.isValid() and index.column() >= self.COLUMNAS_FIJAS:
+            banderas |= Qt.ItemIsEditable
+        return banderas
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or index.column() < self.COLUMNAS_FIJAS:
+            return False
+        columna = index.column() - self.COLUMNAS_FIJAS
+        if self._matriz.estado(index.row(), columna) == value:
+            return False
+        matricula, fecha = self._matriz.cambiar_estado(index.row(), columna, value)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        self.estadoEditado.emit(matricula, fecha, value)
+        return True
+
+
+class DelegadoEstadoAsistencia(QStyledItemDelegate):
+    """Muestra un QComboBox de estados SOLO mientras se edita la celda (no uno por fila)."""
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.addItems(ESTADOS_ASISTENCIA)
+        # Confirmar en cuanto se elige un estado, sin esperar a que pierda el foco
+        combo.activated.connect(lambda _: self.commitData.emit(combo))
+        return combo
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
@@ -0,0 +1,181 @@
+# presentacion/tareas.py
+# Ejecución de las llamadas a la BLL/DAO fuera del hilo de la interfaz.
+# Las consultas a SQLite se ejecutan en un hilo de trabajo dedicado y los
+# resultados llegan a las ventanas mediante señales de Qt, por lo que la
+# ventana no se congela mientras el disco sincroniza.
+
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QProgressBar
+
+
+class SenalesTarea(QObject):
+    """Señales de una Tarea (QRunnable no puede emitir señales por sí mismo)."""
+    terminada = pyqtSignal(object)  # Resultado de la función
+    fallida = pyqtSignal(str)  # Mensaje de error
+    finalizada = pyqtSignal()  # Siempre al final (éxito o error), salvo si se canceló
+    cancelada = pyqtSignal()  # Se emite al llamar cancelar()
+    progreso = pyqtSignal(int, int)  # (hechos, total) para tareas largas (p. ej. exportar)
+
+
+class Tarea(QRunnable):
+    """Ejecuta funcion(*args, **kwargs) en el hilo de trabajo."""
+
+    def __init__(self, funcion, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # La referencia la conserva quien creó la tarea
+        self.senales = SenalesTarea()
+        self._funcion = funcion
+        self._args = args
+        self._kwargs = kwargs
+        self._cancelada = False
+
+    def cancelar(self):
+        """Si aún no empezó, no se ejecuta; si ya empezó, su resultado se descarta."""
+        if not self._cancelada:
+            self._cancelada = True
+            self.senales.cancelada.emit()
+
+    def esta_cancelada(self):
+        return self._cancelada
+
+    def run(self):
+        if self._cancelada:
+            return
+        try:
+            resultado = self._funcion(*self._args, **self._kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            if not self._cancelada:
+                self.senales.fallida.emit(f"Error: {e}")
+                self.senales.finalizada.emit()
+            return
+        if not self._cancelada:
+            self.senales.terminada.emit(resultado)
+            self.senales.finalizada.emit()
+
+
+class EjecutorTareas:
+    """
+    Cola de tareas de base de datos atendida por UN hilo de trabajo.
+    Con un solo hilo las escrituras se aplican en el mismo orden en que el
+    usuario las hizo (p. ej. guardar y luego recargar), y el hilo conserva
+    su conexión SQLite persistente (ver Datos/conexion.py).
+    """
+
+    def __init__(self, max_hilos=1):
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_hilos)
+        self._pool.setExpiryTimeout(-1)  # El hilo no se destruye: su conexión se reutiliza
+        self._tareas = set()
+
+    def ejecutar(self, funcion, *args, al_terminar=None, al_fallar=None, al_finalizar=None, al_progresar=None, **kwargs):
+        """
+        Encola funcion(*args, **kwargs). Retorna la Tarea (para poder cancelarla).
+        Si se indica al_progresar, la función recibe al_progresar=<callable(hechos, total)>
+        que emite la señal `progreso` desde el hilo de trabajo.
+        """
+        tarea = Tarea(funcion, *args, **kwargs)
+        if al_progresar:
+            tarea._kwargs["al_progresar"] = tarea.senales.progreso.emit
+            tarea.senales.progreso.connect(al_progresar)
+        # Se vuelve a comprobar la cancelación al entregar el resultado en el hilo de la
+        # interfaz: la tarea pudo cancelarse después de emitir pero antes de la entrega.
+        if al_terminar:
+            tarea.senales.terminada.connect(lambda r: None if tarea.esta_cancelada() else al_terminar(r))
+        if al_fallar:
+            tarea.senales.fallida.connect(lambda m: None if tarea.esta_cancelada() else al_fallar(m))
+        if al_finalizar:
+            tarea.senales.finalizada.connect(al_finalizar)
+        tarea.senales.finalizada.connect(lambda: self._tareas.discard(tarea))
+        tarea.senales.cancelada.connect(lambda: self._tareas.discard(tarea))
+        self._tareas.add(tarea)
+        self._pool.start(tarea)
+        return tarea
+
+    def cancelar(self, tarea):
+        """Cancela una tarea; si todavía está en la cola, se retira sin ejecutarse."""
+        if tarea is not None:
+            self._pool.tryTake(tarea)
+            tarea.cancelar()
+
+    def cancelar_todas(self):
+        for tarea in list(self._tareas):
+            self.cancelar(tarea)
+
+    def esperar(self, milisegundos=-1):
+        """Bloquea hasta que terminen las tareas en curso (al cerrar la aplicación)."""
+        return self._pool.waitForDone(milisegundos)
+
+
+_ejecutor = None
+
+
+def ejecutor_bd():
+    """Retorna el ejecutor compartido por todas las ventanas (se crea al primer uso)."""
+    global _ejecutor
+    if _ejecutor is None:
+        _ejecutor = EjecutorTareas()
+    return _ejecutor
+
+
+class GestorAsincrono:
+    """
+    Variante asíncrona de cualquier gestor de la BLL.
+    gestor_async.metodo(args, al_terminar=..., al_fallar=...) ejecuta
+    gestor.metodo(args) en el hilo de trabajo y retorna la Tarea.
+    """
+
+    def __init__(self, gestor, ejecutor=None):
+        self._gestor = gestor
+        self._ejecutor = ejecutor or ejecutor_bd()
+
+    def __getattr__(self, nombre):
+        metodo = getattr(self._gestor, nombre)
+        if not callable(metodo):
+            return metodo
+
+        def variante_asincrona(*args, al_terminar=None, al_fallar=None, al_finalizar=None, al_progresar=None, **kwargs):
+            return self._ejecutor.ejecutar(
+                metodo, *args, al_terminar=al_terminar, al_fallar=al_fallar, al_finalizar=al_finalizar,
+                al_progresar=al_progresar, **kwargs
+            )
+        return variante_asincrona
+
+
+class IndicadorCarga(QProgressBar):
+    """Barra de progreso indeterminada que se muestra mientras haya tareas pendientes."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setRange(0, 0)  # Modo "ocupado"
+        self.setTextVisible(False)
+        self.setMaximumHeight(6)
+        self._pendientes = set()
+        self.hide()
+
+    def seguir(self, tarea):
+        """Muestra el indicador hasta que la tarea termine, falle o se cancele."""
+        self._pendientes.add(tarea)
+        tarea.senales.finalizada.connect(lambda: self._quitar(tarea))
+        tarea.senales.cancelada.connect(lambda: self._quitar(tarea))
+        tarea.senales.progreso.connect(self._mostrar_progreso)
+        self.show()
+        return tarea
+
+    def _mostrar_progreso(self, hechos, total):
+        # Con un total conocido la barra deja de ser indeterminada
+        if total > 0:
+            self.setTextVisible(True)
+            self.setMaximumHeight(16777215)
+            self.setRange(0, total)
+            self.setValue(min(hechos, total))
+
+    def _quitar(self, tarea):
+        self._pendientes.discard(tarea)
+        if not self._pendientes:
+            self.hide()
+            self.setRange(0, 0)
+            self.setTextVisible(False)
+            self.setMaximumHeight(6)
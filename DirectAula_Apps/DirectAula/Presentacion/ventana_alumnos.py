@@ -1,12 +1,15 @@
 # Caso de uso 2
 import sys
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QTableWidget, 
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QTableView, 
     QPushButton, QMessageBox, QDialog, QFormLayout, QDialogButtonBox,
-    QLabel, QTableWidgetItem, QHeaderView, QStyleFactory
+    QLabel, QHeaderView, QStyleFactory, QAbstractItemView, QFileDialog
 )
 
 from Logica.gestor_alumnos import GestorAlumnos
+from Presentacion.cache_ventanas import CacheVentanas
+from Presentacion.modelos_tabla import ModeloTablaFilas, ProxyBusqueda
+from Presentacion.tareas import GestorAsincrono, IndicadorCarga, ejecutor_bd
 
 # ===============================================
 # CLASE DE DIÁLOGO PARA AGREGAR/EDITAR ALUMNO
@@ -74,6 +77,11 @@ class VentanaAlumnos(QWidget):
         self.setWindowTitle(f"DirectAula - Alumnos del grupo: {self._nombre_grupo}") 
         self.resize(750, 500)
         self.gestor = GestorAlumnos(self._grupo_id) 
+        # Lecturas y escrituras del roster se ejecutan en el hilo de trabajo (ver Presentacion/tareas.py)
+        self.gestor_async = GestorAsincrono(self.gestor)
+        self._tarea_carga = None
+        self._escrituras_en_curso = 0
+        self._ventanas = CacheVentanas() # El botón de reportes reutiliza su ventana
         
         # 💡 CORRECCIÓN: Pasar el argumento self._nombre_grupo
         self._inicializar_ui(self._nombre_grupo) 
@@ -87,6 +95,10 @@ class VentanaAlumnos(QWidget):
         lbl_titulo.setObjectName("titulo_principal")
         
         main_layout.addWidget(lbl_titulo)
+
+        # Indicador visible mientras se carga el roster en segundo plano
+        self.indicador_carga = IndicadorCarga(self)
+        main_layout.addWidget(self.indicador_carga)
         
         # --- SECCIÓN BÚSQUEDA Y ACCIONES ---
         
@@ -99,8 +111,9 @@ class VentanaAlumnos(QWidget):
         
         # 1. Campo de Búsqueda (AC-2)
         self.campo_busqueda = QLineEdit()
-        self.campo_busqueda.setPlaceholderText("Buscar por nombre o matrícula ")
-        self.campo_busqueda.textChanged.connect(self._cargar_datos) 
+        self.campo_busqueda.setPlaceholderText("Buscar por nombre, matrícula o email")
+        # Filtra en memoria con el índice del roster cargado (no vuelve a consultar la base)
+        self.campo_busqueda.textChanged.connect(self._filtrar) 
         top_bar_layout.addWidget(self.campo_busqueda, 1)
 
         # 2. Botones CRUD y Exportar
@@ -118,13 +131,18 @@ class VentanaAlumnos(QWidget):
         self.btn_eliminar.setObjectName("btn_eliminar")
         self.btn_eliminar.clicked.connect(self._eliminar_alumno_seleccionado)
         
+        self.btn_importar = QPushButton("📥 Importar")
+        self.btn_importar.setObjectName("btn_importar")
+        self.btn_importar.clicked.connect(self._importar_alumnos)
+
         self.btn_exportar = QPushButton("📊 Exportar")
         self.btn_exportar.setObjectName("btn_exportar")
-        self.btn_exportar.clicked.connect(lambda: QMessageBox.information(self, "Exportar", "Funcionalidad de exportar a Excel (UC-6) pendiente."))
+        self.btn_exportar.clicked.connect(self._abrir_reportes)
 
         top_bar_layout.addWidget(self.btn_agregar, 0)
         top_bar_layout.addWidget(self.btn_editar, 0)
         top_bar_layout.addWidget(self.btn_eliminar, 0)
+        top_bar_layout.addWidget(self.btn_importar, 0)
         top_bar_layout.addWidget(self.btn_exportar, 0)
 
         main_layout.addLayout(top_bar_layout)
@@ -136,46 +154,52 @@ class VentanaAlumnos(QWidget):
         self.lbl_subtitulo_lista.setProperty("class", "subtitulo") # Aplica el estilo #003366, negritas, 16px
         main_layout.addWidget(self.lbl_subtitulo_lista)
         
-        # 3. Tabla de alumnos (R)
-        self.tabla_alumnos = QTableWidget() 
-        self.tabla_alumnos.setColumnCount(4) 
-        self.tabla_alumnos.setHorizontalHeaderLabels(["Matrícula", "Nombre Completo", "Contacto", "Email"])
+        # 3. Tabla de alumnos (R): vista sobre un modelo, solo se dibujan las filas visibles
+        self.modelo_alumnos = ModeloTablaFilas(["Matrícula", "Nombre Completo", "Contacto", "Email"], parent=self)
+        # El proxy aplica la búsqueda (AC-2) sobre el índice construido al cargar el roster
+        self.proxy_busqueda = ProxyBusqueda(self.modelo_alumnos, parent=self)
+        self.tabla_alumnos = QTableView() 
+        self.tabla_alumnos.setModel(self.proxy_busqueda)
+        self.tabla_alumnos.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla_alumnos.setSelectionMode(QAbstractItemView.SingleSelection)
         self.tabla_alumnos.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch) 
+        # Altura fija de fila: la vista no tiene que medir cada fila
+        self.tabla_alumnos.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         main_layout.addWidget(self.tabla_alumnos)
 
         self.setLayout(main_layout)
 
+    def recargar(self):
+        """Vuelve a leer el roster al reabrir la ventana (ver Presentacion/cache_ventanas.py)."""
+        self._cargar_datos()
+
     def _cargar_datos(self):
-        """Muestra los datos obtenidos de la BLL en la tabla y aplica filtrado (AC-2)."""
-        datos = self.gestor.obtener_lista_alumnos()
-        
-        self.tabla_alumnos.setRowCount(0) 
-        busqueda_texto = self.campo_busqueda.text().lower()
-        
-        fila_indice = 0
-        for alumno_data in datos:
-            # alumno_data es: [matricula, nombre, contacto, email, grupo_id]
-            
-            # Filtrado rápido por matrícula o nombre (AC-2)
-            if busqueda_texto in alumno_data[0].lower() or busqueda_texto in alumno_data[1].lower():
-                
-                self.tabla_alumnos.insertRow(fila_indice)
-                
-                # Insertamos los 4 campos (Matrícula, Nombre, Contacto, Email)
-                for columna, valor in enumerate(alumno_data[:4]): 
-                    # Aseguramos que los valores nulos o None sean tratados como cadena vacía
-                    display_valor = str(valor) if valor is not None else "" 
-                    item = QTableWidgetItem(display_valor)
-                    self.tabla_alumnos.setItem(fila_indice, columna, item)
-                
-                fila_indice += 1
-    
-    # 💡 FUNCIÓN AUXILIAR CRUCIAL PARA CORREGIR EL ERROR DEL BOTÓN EDITAR
+        """Carga el roster de la BLL en la tabla (la búsqueda se aplica en memoria)."""
+        ejecutor_bd().cancelar(self._tarea_carga) # Solo importa la carga más reciente
+        self._tarea_carga = self.indicador_carga.seguir(self.gestor_async.obtener_lista_alumnos(
+            al_terminar=lambda datos: self._mostrar_datos(datos or []),
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_datos(self, datos):
+        # alumno_data es: [matricula, nombre, contacto, email]
+        # Un solo reset del modelo en lugar de un QTableWidgetItem por celda;
+        # el proxy reconstruye su índice de búsqueda y vuelve a aplicar el filtro actual.
+        self.modelo_alumnos.cargar(alumno_data[:4] for alumno_data in datos)
+
+    def _filtrar(self, texto):
+        """Filtrado por nombre, matrícula o email, sin acentos ni mayúsculas (AC-2)."""
+        self.proxy_busqueda.buscar(texto)
+
+    def _fila_seleccionada(self):
+        """Retorna la fila (del modelo, no de la vista filtrada) seleccionada, o -1 si no hay selección."""
+        return self.proxy_busqueda.fila_origen(self.tabla_alumnos.currentIndex())
+
     def _get_cell_text_safe(self, row, col):
         """Extrae el texto de una celda de la tabla de forma segura, manejando celdas vacías."""
-        item = self.tabla_alumnos.item(row, col)
-        # Si la celda es None (está vacía), retorna una cadena vacía en lugar de fallar al llamar .text()
-        return item.text() if item is not None else ""
+        valor = self.modelo_alumnos.valor(row, col)
+        # Si la celda es None (está vacía), retorna una cadena vacía
+        return str(valor) if valor is not None else ""
 
     def _mostrar_formulario(self, datos_alumno=None):
         """Función unificada para agregar o editar."""
@@ -189,20 +213,44 @@ class VentanaAlumnos(QWidget):
             if datos_alumno is None:
                 # Lógica Agregar
                 # 💡 LLAMAR CON 4 ARGUMENTOS
-                resultado_mensaje = self.gestor.agregar_nuevo_alumno(matricula, nombre, contacto, email)
+                operacion = self.gestor_async.agregar_nuevo_alumno
             else:
                 # Lógica Editar (la matrícula ya está definida en el diálogo)
                 # 💡 LLAMAR CON 4 ARGUMENTOS
-                resultado_mensaje = self.gestor.actualizar_datos_alumno(matricula, nombre, contacto, email)
-            if "Error" in resultado_mensaje:
-                QMessageBox.critical(self, "Error", resultado_mensaje)
-            else:
-                QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
-                self._cargar_datos()
+                operacion = self.gestor_async.actualizar_datos_alumno
+            self._seguir_escritura(operacion(
+                matricula, nombre, contacto, email,
+                al_terminar=lambda mensaje: self._escritura_terminada(mensaje, "Error"),
+                al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+            ))
+
+    def _seguir_escritura(self, tarea):
+        """Deshabilita los botones CRUD mientras la escritura corre en el hilo de trabajo."""
+        self._escrituras_en_curso += 1
+        self._habilitar_crud(False)
+        tarea.senales.finalizada.connect(self._escritura_finalizada)
+        tarea.senales.cancelada.connect(self._escritura_finalizada)
+        return self.indicador_carga.seguir(tarea)
+
+    def _escritura_finalizada(self):
+        self._escrituras_en_curso -= 1
+        if self._escrituras_en_curso == 0:
+            self._habilitar_crud(True)
+
+    def _habilitar_crud(self, habilitado):
+        for boton in (self.btn_agregar, self.btn_editar, self.btn_eliminar, self.btn_importar):
+            boton.setEnabled(habilitado)
+
+    def _escritura_terminada(self, resultado_mensaje, titulo_error):
+        if "Error" in resultado_mensaje:
+            QMessageBox.critical(self, titulo_error, resultado_mensaje)
+        else:
+            QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
+            self._cargar_datos()
 
     def _mostrar_formulario_editar(self):
         """CORREGIDO: Prepara los datos de la fila seleccionada (U) manejando errores."""
-        fila_seleccionada = self.tabla_alumnos.currentRow()
+        fila_seleccionada = self._fila_seleccionada()
         if fila_seleccionada < 0:
             QMessageBox.warning(self, "Advertencia", "Por favor, seleccione un alumno para editar.")
             return
@@ -219,24 +267,71 @@ class VentanaAlumnos(QWidget):
         
     def _eliminar_alumno_seleccionado(self):
         # ... (código de eliminación: no requiere cambios) ...
-        fila_seleccionada = self.tabla_alumnos.currentRow()
+        fila_seleccionada = self._fila_seleccionada()
         if fila_seleccionada < 0:
             QMessageBox.warning(self, "Advertencia", "Por favor, seleccione un alumno para eliminar.")
             return
-        matricula = self.tabla_alumnos.item(fila_seleccionada, 0).text()
+        matricula = self._get_cell_text_safe(fila_seleccionada, 0)
         
         confirmacion = QMessageBox.question(self, "Confirmar Eliminación",
             f"¿Está seguro de que desea eliminar permanentemente al alumno con Matrícula {matricula}? (BR.6)",
             QMessageBox.Yes | QMessageBox.No)
 
         if confirmacion == QMessageBox.Yes:
-            resultado_mensaje = self.gestor.eliminar_alumno(matricula)
-            
-            if "Error" in resultado_mensaje:
-                QMessageBox.critical(self, "Error de Eliminación", resultado_mensaje)
-            else:
-                QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
-                self._cargar_datos()
+            self._seguir_escritura(self.gestor_async.eliminar_alumno(
+                matricula,
+                al_terminar=lambda mensaje: self._escritura_terminada(mensaje, "Error de Eliminación"),
+                al_fallar=lambda mensaje: QMessageBox.critical(self, "Error de Eliminación", mensaje)
+            ))
+
+    def _abrir_reportes(self):
+        """Exportar (CU6): abre la ventana de reportes con este grupo seleccionado."""
+        # Se importa al primer uso: el exportador (CSV/Excel/PDF) no se carga solo para ver el roster
+        from Presentacion.ventana_reportes import VentanaReportes
+        self._ventanas.mostrar("reportes", lambda: VentanaReportes(grupo_id=self._grupo_id, tipo="alumnos"))
+
+    def _importar_alumnos(self):
+        """Importación masiva del roster desde un archivo CSV o Excel."""
+        ruta, _ = QFileDialog.getOpenFileName(
+            self, "Importar alumnos", "", "Roster (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if not ruta:
+            return
+        self._seguir_escritura(self.gestor_async.importar_alumnos_desde_archivo(
+            ruta,
+            al_terminar=self._importacion_terminada,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error de Importación", mensaje)
+        ))
+
+    def _importacion_terminada(self, resultado):
+        if resultado.mensaje.startswith("Error"):
+            QMessageBox.critical(self, "Error de Importación", resultado.mensaje)
+            return
+
+        dialogo = QMessageBox(self)
+        dialogo.setWindowTitle("Importación de Alumnos")
+        dialogo.setText(resultado.mensaje)
+        if resultado.errores:
+            dialogo.setIcon(QMessageBox.Warning)
+            dialogo.setInformativeText("Las filas rechazadas no se importaron. Vea el detalle o guarde el reporte.")
+            dialogo.setDetailedText("\n".join(
+                f"Fila {fila} ({matricula or 'sin matrícula'}): {motivo}" for fila, matricula, motivo in resultado.errores
+            ))
+            btn_reporte = dialogo.addButton("Guardar reporte...", QMessageBox.ActionRole)
+            dialogo.addButton(QMessageBox.Ok)
+            dialogo.exec_()
+            if dialogo.clickedButton() is btn_reporte:
+                ruta, _ = QFileDialog.getSaveFileName(self, "Guardar reporte", "errores_importacion.csv", "CSV (*.csv)")
+                if ruta:
+                    resultado.guardar_reporte(ruta)
+        else:
+            dialogo.setIcon(QMessageBox.Information)
+            dialogo.exec_()
+        self._cargar_datos()
+
+    def closeEvent(self, event):
+        ejecutor_bd().cancelar(self._tarea_carga)
+        super().closeEvent(event)
 
 
 # ===============================================
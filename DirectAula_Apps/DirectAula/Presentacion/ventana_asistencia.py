@@ -1,15 +1,20 @@
 
 import sys
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QPushButton, QMessageBox, QTableWidgetItem, QHeaderView, QDateEdit, 
-    QComboBox, QLabel, QGroupBox, QGridLayout 
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, 
+    QPushButton, QMessageBox, QHeaderView, QDateEdit, 
+    QLabel, QGroupBox, QGridLayout, QAbstractItemView, QCheckBox
 )
-from PyQt5.QtCore import QDate, Qt
+from PyQt5.QtCore import QDate, Qt, QTimer, QEvent
 # 💡 IMPORTACIÓN CORREGIDA: Asumiendo que GestorAsistencia está en logica/bll.py
 from Logica.gestor_alumnos import GestorAsistencia 
+from Presentacion.modelos_tabla import ModeloTablaFilas, ModeloMatrizAsistencia, DelegadoEstadoAsistencia
+from Presentacion.tareas import GestorAsincrono, IndicadorCarga, ejecutor_bd
 from datetime import date
 
+# Vista por rango: los cambios se guardan juntos tras esta pausa sin editar
+ESPERA_GUARDADO_MS = 400
+
 class VentanaAsistencia(QWidget):
     """Ventana para el Caso de Uso 4: Registrar Asistencia."""
 
@@ -22,6 +27,13 @@ class VentanaAsistencia(QWidget):
         
         # El gestor ahora solo necesita el grupo_id al ser instanciado
         self.gestor = GestorAsistencia(self._grupo_id) 
+        # Las llamadas a la BLL se ejecutan en el hilo de trabajo (ver Presentacion/tareas.py)
+        self.gestor_async = GestorAsincrono(self.gestor)
+        self._tarea_carga = None
+        self._temporizador_guardado = QTimer(self)
+        self._temporizador_guardado.setSingleShot(True)
+        self._temporizador_guardado.setInterval(ESPERA_GUARDADO_MS)
+        self._temporizador_guardado.timeout.connect(self._guardar_pendientes)
         self._inicializar_ui(nombre_grupo)
 
     def _inicializar_ui(self, nombre_grupo):
@@ -30,6 +42,10 @@ class VentanaAsistencia(QWidget):
         lbl_titulo = QLabel(f"Registro de Asistencia: {nombre_grupo}")
         lbl_titulo.setObjectName("titulo_principal")
         main_layout.addWidget(lbl_titulo)
+
+        # Indicador visible mientras se carga o guarda en segundo plano
+        self.indicador_carga = IndicadorCarga(self)
+        main_layout.addWidget(self.indicador_carga)
         
         # ----------------------------------------------------
         # SECCIÓN: CONTROL DE FECHA Y REGISTRO MASIVO
@@ -38,78 +54,166 @@ class VentanaAsistencia(QWidget):
         control_layout = QGridLayout(control_fecha_box)
 
         # 1. Selector de Fecha (QDateEdit)
-        lbl_fecha = QLabel("Seleccionar Fecha:")
+        self.lbl_fecha = QLabel("Seleccionar Fecha:")
         self.fecha_asistencia = QDateEdit()
         self.fecha_asistencia.setCalendarPopup(True) # Muestra el calendario al hacer clic
         self.fecha_asistencia.setDate(QDate.currentDate()) # Fecha de hoy por defecto
         # 💡 Conexión: Cuando la fecha cambia, recargar los datos
         self.fecha_asistencia.dateChanged.connect(self._cargar_datos) 
         
-        control_layout.addWidget(lbl_fecha, 0, 0)
+        control_layout.addWidget(self.lbl_fecha, 0, 0)
         control_layout.addWidget(self.fecha_asistencia, 0, 1)
 
+        # Vista por rango: alumnos × fechas (p. ej. revisar el mes completo)
+        self.chk_rango = QCheckBox("Ver rango de fechas")
+        self.chk_rango.toggled.connect(self._cambiar_modo)
+        self.lbl_fecha_fin = QLabel("Hasta:")
+        self.fecha_fin = QDateEdit()
+        self.fecha_fin.setCalendarPopup(True)
+        self.fecha_fin.setDate(QDate.currentDate())
+        self.fecha_fin.dateChanged.connect(self._cargar_datos)
+        self.lbl_fecha_fin.hide()
+        self.fecha_fin.hide()
+
+        control_layout.addWidget(self.chk_rango, 0, 2)
+        control_layout.addWidget(self.lbl_fecha_fin, 0, 3)
+        control_layout.addWidget(self.fecha_fin, 0, 4)
+
         # 2. Botón de Registro Masivo
         self.btn_masivo = QPushButton("Poner Asistencia a todos")
         self.btn_masivo.setObjectName("btn_agregar")
         self.btn_masivo.clicked.connect(self._registrar_asistencia_masiva)
         
-        control_layout.addWidget(self.btn_masivo, 1, 0, 1, 2) # Ocupa 2 columnas
+        control_layout.addWidget(self.btn_masivo, 1, 0, 1, 5) # Ocupa todas las columnas
         main_layout.addWidget(control_fecha_box)
         
         # ----------------------------------------------------
         # TABLA DE ASISTENCIA
         # ----------------------------------------------------
-        self.tabla_asistencia = QTableWidget()
-        self.tabla_asistencia.setColumnCount(3)
-        self.tabla_asistencia.setHorizontalHeaderLabels(["Matrícula", "Nombre Completo", "Estado"])
+        # Modelo + delegado: el QComboBox de estado solo existe mientras se edita una celda
+        self.modelo_asistencia = ModeloTablaFilas(
+            ["Matrícula", "Nombre Completo", "Estado"], columnas_editables=(2,), parent=self
+        )
+        # Conexión crucial: guarda el estado individual cuando el usuario lo cambia
+        self.modelo_asistencia.celdaEditada.connect(self._estado_editado)
+        self.modelo_matriz = ModeloMatrizAsistencia(self)
+        self.modelo_matriz.estadoEditado.connect(self._estado_matriz_editado)
+
+        self.tabla_asistencia = QTableView()
+        self.tabla_asistencia.setModel(self.modelo_asistencia)
+        # Solo las celdas de estado son editables, así que el delegado sirve para ambas vistas
+        self.tabla_asistencia.setItemDelegate(DelegadoEstadoAsistencia(self.tabla_asistencia))
+        # Un clic sobre el estado abre el combo directamente
+        self.tabla_asistencia.setEditTriggers(
+            QAbstractItemView.CurrentChanged | QAbstractItemView.SelectedClicked | QAbstractItemView.DoubleClicked
+        )
         self.tabla_asistencia.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabla_asistencia.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         main_layout.addWidget(self.tabla_asistencia)
 
         self.setLayout(main_layout)
         self._cargar_datos() # Carga los datos al iniciar con la fecha de hoy
         
+    def _cambiar_modo(self, por_rango):
+        """Alterna entre la vista de un día y la vista por rango (alumnos × fechas)."""
+        self._guardar_pendientes()
+        self.lbl_fecha.setText("Desde:" if por_rango else "Seleccionar Fecha:")
+        self.lbl_fecha_fin.setVisible(por_rango)
+        self.fecha_fin.setVisible(por_rango)
+        # El registro masivo es de un solo día
+        self.btn_masivo.setVisible(not por_rango)
+
+        encabezado = self.tabla_asistencia.horizontalHeader()
+        if por_rango:
+            self.tabla_asistencia.setModel(self.modelo_matriz)
+            encabezado.setSectionResizeMode(QHeaderView.Interactive)
+            encabezado.setDefaultSectionSize(90)
+            if self.fecha_asistencia.date() >= self.fecha_fin.date():
+                # Por defecto: del primer día del mes a la fecha final
+                fin = self.fecha_fin.date()
+                self.fecha_asistencia.blockSignals(True)
+                self.fecha_asistencia.setDate(QDate(fin.year(), fin.month(), 1))
+                self.fecha_asistencia.blockSignals(False)
+        else:
+            self.tabla_asistencia.setModel(self.modelo_asistencia)
+            encabezado.setSectionResizeMode(QHeaderView.Stretch)
+        self._cargar_datos()
+
+    def recargar(self):
+        """Vuelve a leer la asistencia al reabrir la ventana (ver Presentacion/cache_ventanas.py)."""
+        self._cargar_datos()
+
     def _cargar_datos(self):
         """Muestra los datos de asistencia del grupo para la fecha seleccionada."""
+        if self.chk_rango.isChecked():
+            return self._cargar_rango()
         # 1. Obtener la fecha seleccionada
         fecha = self.fecha_asistencia.date().toString("yyyy-MM-dd") 
-        
-        # 2. Obtener los datos del gestor
+
+        # Si el usuario cambia de fecha rápido, la carga anterior ya no sirve
+        ejecutor_bd().cancelar(self._tarea_carga)
+
+        # 2. Obtener los datos del gestor en segundo plano
         # Retorna: [(matricula, nombre, estado), ...]
-        datos = self.gestor.obtener_asistencia_para_ui(fecha)
-        
-        # 3. Configurar la tabla
-        self.tabla_asistencia.setRowCount(len(datos))
-        
-        # 4. Iterar y llenar la tabla (AQUÍ ESTÁ LA LÓGICA DE RELLENADO)
-        for fila_indice, alumno_data in enumerate(datos):
-            
-            # Columna 0: Matrícula (Solo Lectura)
-            item_matricula = QTableWidgetItem(alumno_data[0])
-            item_matricula.setFlags(item_matricula.flags() & ~Qt.ItemIsEditable) # Desactivar edición
-            self.tabla_asistencia.setItem(fila_indice, 0, item_matricula)
-            
-            # Columna 1: Nombre Completo (Solo Lectura)
-            item_nombre = QTableWidgetItem(alumno_data[1])
-            item_nombre.setFlags(item_nombre.flags() & ~Qt.ItemIsEditable) # Desactivar edición
-            self.tabla_asistencia.setItem(fila_indice, 1, item_nombre)
-            
-            # Columna 2: Estado (QComboBox para interactividad)
-            estado_combo = QComboBox()
-            estados = ["Presente", "Ausente", "Retardo", "Justificado"]
-            estado_combo.addItems(estados)
-            
-            # Seleccionar el estado actual (devuelto por el DAO: 'Presente', 'Ausente', etc.)
-            estado_combo.setCurrentText(alumno_data[2])
-            
-            # Conexión crucial: Llama a la función de guardado individual al cambiar el estado
-            # Usamos una lambda para capturar los valores específicos de esta fila (matrícula y fecha)
-            estado_combo.currentIndexChanged.connect(
-                lambda index, m=alumno_data[0], d=fecha, combo=estado_combo: 
-                    self._actualizar_asistencia_individual(m, d, combo.currentText())
-            )
-            
-            self.tabla_asistencia.setCellWidget(fila_indice, 2, estado_combo)
+        self._tarea_carga = self.indicador_carga.seguir(self.gestor_async.obtener_asistencia_para_ui(
+            fecha,
+            al_terminar=lambda datos: self._mostrar_datos(fecha, datos),
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_datos(self, fecha, datos):
+        # 3. Llenar la tabla con un solo reset del modelo (las columnas 0 y 1 son de solo lectura)
+        self._fecha_cargada = fecha
+        self.modelo_asistencia.cargar(datos)
+
+    def _cargar_rango(self):
+        """Carga la matriz alumnos × fechas del rango en una sola consulta."""
+        desde = self.fecha_asistencia.date().toString("yyyy-MM-dd")
+        hasta = self.fecha_fin.date().toString("yyyy-MM-dd")
+        ejecutor_bd().cancelar(self._tarea_carga)
+        # Los cambios pendientes se encolan antes que la carga, así la matriz ya los incluye
+        self._guardar_pendientes()
+        self._tarea_carga = self.indicador_carga.seguir(self.gestor_async.obtener_matriz_asistencia(
+            desde, hasta,
+            al_terminar=self._mostrar_matriz,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_matriz(self, matriz):
+        if isinstance(matriz, str):
+            QMessageBox.warning(self, "Rango inválido", matriz)
+            return
+        self.modelo_matriz.cargar(matriz)
+        self.tabla_asistencia.resizeColumnToContents(1)
+
+    def _estado_matriz_editado(self, matricula, fecha, nuevo_estado):
+        """Los cambios de la vista por rango se acumulan y se guardan juntos."""
+        resultado = self.gestor.agregar_estado_pendiente(matricula, fecha, nuevo_estado)
+        if "Error" in resultado:
+            QMessageBox.critical(self, "Error de Guardado", resultado)
+            return
+        self._temporizador_guardado.start()
+
+    def _guardar_pendientes(self):
+        """Encola el guardado de los cambios pendientes de la vista por rango (una transacción)."""
+        self._temporizador_guardado.stop()
+        if not self.gestor.hay_estados_pendientes():
+            return
+        self.indicador_carga.seguir(self.gestor_async.guardar_estados_pendientes(
+            al_terminar=self._estado_guardado,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error de Guardado", mensaje)
+        ))
 
+    def changeEvent(self, event):
+        # Al perder el foco la ventana se guarda lo pendiente
+        if event.type() == QEvent.ActivationChange and not self.isActiveWindow():
+            self._guardar_pendientes()
+        super().changeEvent(event)
+
+    def _estado_editado(self, fila, columna, nuevo_estado):
+        """Recibe el cambio de estado de una celda desde el modelo y lo guarda."""
+        matricula = self.modelo_asistencia.valor(fila, 0)
+        self._actualizar_asistencia_individual(matricula, self._fecha_cargada, nuevo_estado)
 
     def _registrar_asistencia_masiva(self):
         """Llama al BLL para marcar a todos como Presente y recarga la tabla."""
@@ -120,18 +224,41 @@ class VentanaAsistencia(QWidget):
             QMessageBox.Yes | QMessageBox.No)
 
         if confirmacion == QMessageBox.Yes:
-            resultado_mensaje = self.gestor.registrar_asistencia_masiva(fecha)
-            
-            if "Error" in resultado_mensaje:
-                QMessageBox.critical(self, "Error", resultado_mensaje)
-            else:
-                QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
-                self._cargar_datos() # ¡Recargar para ver los cambios reflejados!
+            self.btn_masivo.setEnabled(False)
+            self.indicador_carga.seguir(self.gestor_async.registrar_asistencia_masiva(
+                fecha,
+                al_terminar=self._asistencia_masiva_registrada,
+                al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje),
+                al_finalizar=lambda: self.btn_masivo.setEnabled(True)
+            ))
+
+    def _asistencia_masiva_registrada(self, resultado_mensaje):
+        if "Error" in resultado_mensaje:
+            QMessageBox.critical(self, "Error", resultado_mensaje)
+        else:
+            QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
+            self._cargar_datos() # ¡Recargar para ver los cambios reflejados!
 
     def _actualizar_asistencia_individual(self, matricula, fecha, nuevo_estado):
-        """Guarda el estado de un alumno individualmente (Activado por el ComboBox)."""
-        resultado_mensaje = self.gestor.actualizar_estado_asistencia(matricula, fecha, nuevo_estado)
-        
+        """Guarda el estado de un alumno individualmente (Activado por el delegado de estado)."""
+        self.indicador_carga.seguir(self.gestor_async.actualizar_estado_asistencia(
+            matricula, fecha, nuevo_estado,
+            al_terminar=self._estado_guardado,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error de Guardado", mensaje)
+        ))
+
+    def _estado_guardado(self, resultado_mensaje):
         if "Error" in resultado_mensaje:
+            # En la vista por rango los cambios siguen pendientes y se reintentan en el próximo guardado
             QMessageBox.critical(self, "Error de Guardado", resultado_mensaje)
-        # No se necesita recargar, el ComboBox ya muestra el cambio.
\ No newline at end of file
+        # No se necesita recargar, el modelo ya muestra el cambio en esa celda.
+
+    def closeEvent(self, event):
+        # Una carga pendiente ya no tiene dónde mostrarse; los guardados sí se completan.
+        ejecutor_bd().cancelar(self._tarea_carga)
+        self._temporizador_guardado.stop()
+        # Guarda los cambios pendientes en el hilo de trabajo. Si la aplicación se cierra
+        # normalmente antes, se guardan al salir; si el proceso muere de golpe, se pierden
+        # (ver Logica/buffer_calificaciones.py)
+        self.gestor_async.cerrar()
+        super().closeEvent(event)
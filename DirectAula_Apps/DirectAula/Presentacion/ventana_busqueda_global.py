@@ -0,0 +1,92 @@
+# presentacion/ventana_busqueda_global.py
+# Búsqueda de alumnos en todos los grupos y ciclos escolares (sin elegir grupo antes)
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QLineEdit, QTableView, QLabel, QMessageBox, QHeaderView, QAbstractItemView
+)
+from Logica.busqueda_global import BusquedaGlobal
+from Presentacion.cache_ventanas import CacheVentanas
+from Presentacion.modelos_tabla import ModeloTablaFilas
+from Presentacion.ventana_alumnos import VentanaAlumnos
+from Presentacion.tareas import GestorAsincrono, IndicadorCarga, ejecutor_bd
+
+
+class VentanaBusquedaGlobal(QWidget):
+    """Busca alumnos por nombre, matrícula o email en toda la escuela."""
+
+    def __init__(self, ventanas=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("DirectAula - Buscar Alumno")
+        self.resize(750, 450)
+        # Ventanas de alumnos por grupo; app.py pasa su caché para no duplicar las del menú
+        self._ventanas = ventanas if ventanas is not None else CacheVentanas()
+        # Las búsquedas se ejecutan en el hilo de trabajo (ver Presentacion/tareas.py)
+        self.busqueda_async = GestorAsincrono(BusquedaGlobal())
+        self._tarea_busqueda = None
+        self._resultados = []
+        self._inicializar_ui()
+
+    def _inicializar_ui(self):
+        layout = QVBoxLayout(self)
+
+        lbl_titulo = QLabel("Buscar Alumno en Todos los Grupos")
+        lbl_titulo.setObjectName("titulo_principal")
+        layout.addWidget(lbl_titulo)
+
+        self.indicador_carga = IndicadorCarga(self)
+        layout.addWidget(self.indicador_carga)
+
+        self.campo_busqueda = QLineEdit()
+        self.campo_busqueda.setPlaceholderText("Nombre, matrícula o email (p. ej. \"jose nunez\")")
+        self.campo_busqueda.textChanged.connect(self._buscar)
+        layout.addWidget(self.campo_busqueda)
+
+        self.lbl_resultados = QLabel("")
+        layout.addWidget(self.lbl_resultados)
+
+        self.modelo_resultados = ModeloTablaFilas(
+            ["Matrícula", "Nombre Completo", "Email", "Grupo", "Ciclo Escolar"], parent=self
+        )
+        self.tabla_resultados = QTableView()
+        self.tabla_resultados.setModel(self.modelo_resultados)
+        self.tabla_resultados.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla_resultados.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tabla_resultados.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla_resultados.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabla_resultados.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # Doble clic: abre el grupo del alumno con el alumno ya filtrado
+        self.tabla_resultados.doubleClicked.connect(self._abrir_grupo)
+        layout.addWidget(self.tabla_resultados)
+
+    def _buscar(self, texto):
+        # Solo importa la búsqueda más reciente
+        ejecutor_bd().cancelar(self._tarea_busqueda)
+        self._tarea_busqueda = self.indicador_carga.seguir(self.busqueda_async.buscar(
+            texto,
+            al_terminar=self._mostrar_resultados,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_resultados(self, resultados):
+        self._resultados = resultados
+        self.modelo_resultados.cargar(r.como_fila() for r in resultados)
+        if self.campo_busqueda.text().strip():
+            self.lbl_resultados.setText(f"{len(resultados)} alumno(s) encontrado(s).")
+        else:
+            self.lbl_resultados.setText("")
+
+    def _abrir_grupo(self, indice):
+        resultado = self._resultados[indice.row()]
+        if resultado.grupo_id is None:
+            QMessageBox.warning(self, "Advertencia", "El alumno no está asignado a ningún grupo.")
+            return
+        nombre_grupo = f"{resultado.grupo} ({resultado.ciclo_escolar})"
+        ventana = self._ventanas.mostrar(
+            ("alumnos", resultado.grupo_id),
+            lambda: VentanaAlumnos(grupo_id=resultado.grupo_id, nombre_grupo=nombre_grupo)
+        )
+        ventana.campo_busqueda.setText(resultado.matricula)
+
+    def closeEvent(self, event):
+        ejecutor_bd().cancelar(self._tarea_busqueda)
+        super().closeEvent(event)
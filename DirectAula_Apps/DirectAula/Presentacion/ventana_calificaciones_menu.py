@@ -2,8 +2,9 @@
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox
 from PyQt5.QtCore import Qt
-from Presentacion.ventana_ponderacion import VentanaPonderacion 
-from Presentacion.ventana_registro_calificaciones import VentanaRegistroCalificaciones 
+from Presentacion.cache_ventanas import CacheVentanas
+# Las ventanas de ponderación y captura se importan al primer clic (ver app.py)
+
 class VentanaCalificacionesMenu(QWidget):
     def __init__(self, grupo_id, nombre_grupo, parent=None):
         super().__init__(parent)
@@ -11,6 +12,7 @@ class VentanaCalificacionesMenu(QWidget):
         self._nombre_grupo = nombre_grupo
         self.setWindowTitle(f"Calificaciones - {nombre_grupo}")
         self.resize(500, 300)
+        self._ventanas = CacheVentanas()
         self._inicializar_ui()
         
     def _inicializar_ui(self):
@@ -34,9 +36,9 @@ class VentanaCalificacionesMenu(QWidget):
         layout.addWidget(btn_registro)
         
     def abrir_ponderacion(self):
-        self.ventana_ponderacion = VentanaPonderacion(self._grupo_id, self._nombre_grupo)
-        self.ventana_ponderacion.show()
+        from Presentacion.ventana_ponderacion import VentanaPonderacion
+        self._ventanas.mostrar("ponderacion", lambda: VentanaPonderacion(self._grupo_id, self._nombre_grupo))
 
     def abrir_registro(self):
-        self.ventana_registro = VentanaRegistroCalificaciones(self._grupo_id, self._nombre_grupo)
-        self.ventana_registro.show()
\ No newline at end of file
+        from Presentacion.ventana_registro_calificaciones import VentanaRegistroCalificaciones
+        self._ventanas.mostrar("registro", lambda: VentanaRegistroCalificaciones(self._grupo_id, self._nombre_grupo))
\ No newline at end of file
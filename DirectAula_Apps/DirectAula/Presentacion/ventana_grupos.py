@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (
     QLabel, QTableWidgetItem, QHeaderView
 )
 from Logica.gestor_alumnos import GestorGrupos 
+from Presentacion.tareas import GestorAsincrono, IndicadorCarga, ejecutor_bd
 
 # ===============================================
 # CLASE DE DIÁLOGO PARA AGREGAR/EDITAR GRUPO
@@ -57,6 +58,10 @@ class VentanaGrupos(QWidget):
         self.setWindowTitle("DirectAula - Administrar Grupos (CU-1)")
         self.resize(600, 400)
         self.gestor = GestorGrupos() 
+        # Lecturas y escrituras de grupos se ejecutan en el hilo de trabajo (ver Presentacion/tareas.py)
+        self.gestor_async = GestorAsincrono(self.gestor)
+        self._tarea_carga = None
+        self._escrituras_en_curso = 0
         self._inicializar_ui()
         self._cargar_datos()
 
@@ -67,6 +72,10 @@ class VentanaGrupos(QWidget):
         lbl_titulo = QLabel("DirectAula - Administración de Grupos")
         lbl_titulo.setObjectName("titulo_principal")
         main_layout.addWidget(lbl_titulo)
+
+        # Indicador visible mientras se carga o guarda en segundo plano
+        self.indicador_carga = IndicadorCarga(self)
+        main_layout.addWidget(self.indicador_carga)
         
         # Botones
         top_bar_layout = QHBoxLayout()
@@ -102,10 +111,19 @@ class VentanaGrupos(QWidget):
 
         self.setLayout(main_layout)
 
+    def recargar(self):
+        """Vuelve a leer los grupos al reabrir la ventana (ver Presentacion/cache_ventanas.py)."""
+        self._cargar_datos()
+
     def _cargar_datos(self):
         """Muestra los datos obtenidos de la BLL en la tabla."""
-        datos = self.gestor.obtener_lista_grupos() # [id, nombre, ciclo]
-        
+        ejecutor_bd().cancelar(self._tarea_carga) # Solo importa la carga más reciente
+        self._tarea_carga = self.indicador_carga.seguir(self.gestor_async.obtener_lista_grupos(
+            al_terminar=lambda datos: self._mostrar_datos(datos or []), # [id, nombre, ciclo]
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_datos(self, datos):
         self.tabla_grupos.setRowCount(0) 
         
         for fila_indice, grupo_data in enumerate(datos):
@@ -125,16 +143,43 @@ class VentanaGrupos(QWidget):
             
             if grupo_id is None:
                 # Lógica Agregar
-                resultado_mensaje = self.gestor.agregar_nuevo_grupo(nombre, ciclo) 
+                tarea = self.gestor_async.agregar_nuevo_grupo(
+                    nombre, ciclo,
+                    al_terminar=lambda mensaje: self._escritura_terminada(mensaje, "Error"),
+                    al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+                )
             else:
                 # Lógica Editar
-                resultado_mensaje = self.gestor.actualizar_datos_grupo(grupo_id, nombre, ciclo) 
-            
-            if "Error" in resultado_mensaje:
-                QMessageBox.critical(self, "Error", resultado_mensaje) 
-            else:
-                QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
-                self._cargar_datos() 
+                tarea = self.gestor_async.actualizar_datos_grupo(
+                    grupo_id, nombre, ciclo,
+                    al_terminar=lambda mensaje: self._escritura_terminada(mensaje, "Error"),
+                    al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+                )
+            self._seguir_escritura(tarea)
+
+    def _seguir_escritura(self, tarea):
+        """Deshabilita los botones mientras la escritura corre en el hilo de trabajo."""
+        self._escrituras_en_curso += 1
+        self._habilitar_botones(False)
+        tarea.senales.finalizada.connect(self._escritura_finalizada)
+        tarea.senales.cancelada.connect(self._escritura_finalizada)
+        return self.indicador_carga.seguir(tarea)
+
+    def _escritura_finalizada(self):
+        self._escrituras_en_curso -= 1
+        if self._escrituras_en_curso == 0:
+            self._habilitar_botones(True)
+
+    def _habilitar_botones(self, habilitado):
+        for boton in (self.btn_agregar, self.btn_editar, self.btn_eliminar):
+            boton.setEnabled(habilitado)
+
+    def _escritura_terminada(self, resultado_mensaje, titulo_error):
+        if "Error" in resultado_mensaje:
+            QMessageBox.critical(self, titulo_error, resultado_mensaje) 
+        else:
+            QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
+            self._cargar_datos() 
 
     def _mostrar_formulario_editar(self):
         """Prepara los datos de la fila seleccionada (U)."""
@@ -167,10 +212,13 @@ class VentanaGrupos(QWidget):
             QMessageBox.Yes | QMessageBox.No)
 
         if confirmacion == QMessageBox.Yes:
-            resultado_mensaje = self.gestor.eliminar_grupo(grupo_id)
-            
-            if "Error" in resultado_mensaje:
-                QMessageBox.critical(self, "Error de Eliminación", resultado_mensaje)
-            else:
-                QMessageBox.information(self, "Operación Exitosa", resultado_mensaje)
-                self._cargar_datos()
\ No newline at end of file
+            self._seguir_escritura(self.gestor_async.eliminar_grupo(
+                grupo_id,
+                al_terminar=lambda mensaje: self._escritura_terminada(mensaje, "Error de Eliminación"),
+                al_fallar=lambda mensaje: QMessageBox.critical(self, "Error de Eliminación", mensaje)
+            ))
+
+    def closeEvent(self, event):
+        # Una carga pendiente ya no tiene dónde mostrarse; las escrituras sí se completan
+        ejecutor_bd().cancelar(self._tarea_carga)
+        super().closeEvent(event)
\ No newline at end of file
@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from Logica.gestor_alumnos import GestorCalificaciones 
+from Presentacion.tareas import GestorAsincrono, IndicadorCarga, ejecutor_bd
 
 class VentanaPonderacion(QWidget):
     """Ventana para el Caso de Uso 3: Administrar Ponderación (Flexible)."""
@@ -13,6 +14,9 @@ class VentanaPonderacion(QWidget):
         self._grupo_id = grupo_id
         self._nombre_grupo = nombre_grupo
         self.gestor = GestorCalificaciones(grupo_id)
+        # Leer y guardar la estructura (que recalcula todo el grupo) se hace en el hilo de trabajo
+        self.gestor_async = GestorAsincrono(self.gestor)
+        self._tarea_carga = None
         self.setWindowTitle(f"Ponderación - {nombre_grupo}")
         self.resize(600, 500)
         self._inicializar_ui()
@@ -24,6 +28,10 @@ class VentanaPonderacion(QWidget):
         lbl_titulo = QLabel(f"Definir Categorías y Ponderación: {self._nombre_grupo}")
         lbl_titulo.setObjectName("titulo_principal")
         main_layout.addWidget(lbl_titulo)
+
+        # Indicador visible mientras se carga o guarda en segundo plano
+        self.indicador_carga = IndicadorCarga(self)
+        main_layout.addWidget(self.indicador_carga)
         
         # Tabla para categorías dinámicas
         self.tabla_ponderacion = QTableWidget()
@@ -59,17 +67,27 @@ class VentanaPonderacion(QWidget):
         btn_eliminar.clicked.connect(self._eliminar_fila)
         btn_layout.addWidget(btn_eliminar)
         
-        btn_guardar = QPushButton("Guardar Estructura")
-        btn_guardar.setObjectName("btn_agregar")
-        btn_guardar.clicked.connect(self._guardar_ponderacion)
-        btn_layout.addWidget(btn_guardar)
+        self.btn_guardar = QPushButton("Guardar Estructura")
+        self.btn_guardar.setObjectName("btn_agregar")
+        self.btn_guardar.clicked.connect(self._guardar_ponderacion)
+        btn_layout.addWidget(self.btn_guardar)
         
         main_layout.addLayout(btn_layout)
         self.setLayout(main_layout)
 
+    def recargar(self):
+        """Vuelve a leer la ponderación al reabrir la ventana (ver Presentacion/cache_ventanas.py)."""
+        self._cargar_datos()
+
     def _cargar_datos(self):
         """Carga las categorías existentes desde la BLL."""
-        categorias = self.gestor.obtener_categorias_evaluacion()
+        ejecutor_bd().cancelar(self._tarea_carga) # Solo importa la carga más reciente
+        self._tarea_carga = self.indicador_carga.seguir(self.gestor_async.obtener_categorias_evaluacion(
+            al_terminar=lambda categorias: self._mostrar_categorias(categorias or []),
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_categorias(self, categorias):
         self.tabla_ponderacion.setRowCount(len(categorias))
         
         self.tabla_ponderacion.blockSignals(True)
@@ -153,11 +171,23 @@ class VentanaPonderacion(QWidget):
         if alerta == QMessageBox.Cancel:
             return
             
-        # 6. Guardar en BLL
-        resultado = self.gestor.guardar_categorias_evaluacion(datos_a_guardar)
-        
+        # 6. Guardar en BLL (en segundo plano: incluye el recálculo de todo el grupo)
+        self.btn_guardar.setEnabled(False)
+        self.indicador_carga.seguir(self.gestor_async.guardar_categorias_evaluacion(
+            datos_a_guardar,
+            al_terminar=self._ponderacion_guardada,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error al Guardar", mensaje),
+            al_finalizar=lambda: self.btn_guardar.setEnabled(True)
+        ))
+
+    def _ponderacion_guardada(self, resultado):
         if "Error" in resultado:
             QMessageBox.critical(self, "Error al Guardar", resultado)
         else:
             QMessageBox.information(self, "Éxito", resultado)
-            self.close()
\ No newline at end of file
+            self.close()
+
+    def closeEvent(self, event):
+        # Una carga pendiente ya no tiene dónde mostrarse; el guardado sí se completa
+        ejecutor_bd().cancelar(self._tarea_carga)
+        super().closeEvent(event)
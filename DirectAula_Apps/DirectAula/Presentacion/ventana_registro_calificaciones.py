@@ -1,11 +1,16 @@
 
 
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QComboBox, 
-    QLabel, QPushButton, QMessageBox, QTableWidgetItem, QHeaderView
+    QWidget, QVBoxLayout, QTableView, QComboBox, 
+    QLabel, QPushButton, QMessageBox, QHeaderView
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QEvent, Qt, QTimer
 from Logica.gestor_alumnos import GestorCalificaciones 
+from Presentacion.modelos_tabla import ModeloTablaFilas
+from Presentacion.tareas import GestorAsincrono, IndicadorCarga, ejecutor_bd
+
+# Tiempo sin capturar notas tras el cual se guardan las pendientes (ms)
+ESPERA_GUARDADO_MS = 400
 
 class VentanaRegistroCalificaciones(QWidget):
     """Ventana para el Caso de Uso 5: Registrar Calificaciones."""
@@ -16,19 +21,23 @@ class VentanaRegistroCalificaciones(QWidget):
         self._nombre_grupo = nombre_grupo
         # Asegúrate de usar la importación correcta de GestorCalificaciones
         self.gestor = GestorCalificaciones(grupo_id) 
+        # Las llamadas a la BLL se ejecutan en el hilo de trabajo (ver Presentacion/tareas.py)
+        self.gestor_async = GestorAsincrono(self.gestor)
+        self._tarea_carga = None
+        # Las notas capturadas por celda se agrupan y se guardan juntas al dejar de
+        # escribir, al perder el foco, al cambiar de categoría o al cerrar la ventana.
+        self._temporizador_guardado = QTimer(self)
+        self._temporizador_guardado.setSingleShot(True)
+        self._temporizador_guardado.setInterval(ESPERA_GUARDADO_MS)
+        self._temporizador_guardado.timeout.connect(self._guardar_pendientes)
         self.setWindowTitle(f"Registro de Calificaciones - {nombre_grupo}")
         self.resize(800, 600)
         
-
-        self._categorias_activas = self._obtener_nombres_categorias() 
+        # Se llenan cuando el hilo de trabajo lee la ponderación (ver _cargar_categorias)
+        self._categorias_activas = []
         
         self._inicializar_ui()
-    
-    def _obtener_nombres_categorias(self):
-        """Obtiene dinámicamente los nombres de las categorías definidas en la ponderación."""
-        categorias = self.gestor.obtener_categorias_evaluacion()
-        # Devuelve solo los nombres
-        return [c.get_nombre_categoria() for c in categorias]
+        self._cargar_categorias(avisar_sin_categorias=True)
         
     def _inicializar_ui(self):
         main_layout = QVBoxLayout(self)
@@ -37,22 +46,18 @@ class VentanaRegistroCalificaciones(QWidget):
         lbl_titulo.setObjectName("titulo_principal")
         main_layout.addWidget(lbl_titulo)
 
+        # Indicador visible mientras se carga o guarda en segundo plano
+        self.indicador_carga = IndicadorCarga(self)
+        main_layout.addWidget(self.indicador_carga)
+
         # 1. Selector de Categoría
         selector_layout = QVBoxLayout()
         lbl_categoria = QLabel("Seleccionar Categoría:")
         self.combo_categoria = QComboBox()
-        
-        # Usamos las categorías activas (Ya inicializadas en __init__)
-        if not self._categorias_activas:
-            self.combo_categoria.addItem("No hay categorías definidas")
-            QMessageBox.warning(self, "Advertencia", "No hay categorías de evaluación definidas para este grupo. Vaya a Administrar Ponderación (CU3).")
-            # Deshabilitar el botón de guardar y la tabla si no hay categorías
-            self.btn_guardar = QPushButton("Guardar y Recalcular Promedios") 
-            self.btn_guardar.setEnabled(False) 
-        else:
-            self.combo_categoria.addItems(self._categorias_activas)
-            self.combo_categoria.setCurrentText(self._categorias_activas[0])
-            self.btn_guardar = QPushButton("Guardar y Recalcular Promedios") # Definir aquí también
+        self.combo_categoria.addItem("Cargando categorías...")
+        # Deshabilitado hasta que se lean las categorías (ver _mostrar_categorias)
+        self.btn_guardar = QPushButton("Guardar y Recalcular Promedios") 
+        self.btn_guardar.setEnabled(False) 
         
         # Conexión: Al cambiar categoría, recargar la tabla
         self.combo_categoria.currentIndexChanged.connect(self._cargar_datos)
@@ -63,13 +68,25 @@ class VentanaRegistroCalificaciones(QWidget):
         main_layout.addLayout(selector_layout) # Usar addLayout aquí
 
         # 2. Tabla de Calificaciones
-        self.tabla_calificaciones = QTableWidget()
-        self.tabla_calificaciones.setColumnCount(3)
-        self.tabla_calificaciones.setHorizontalHeaderLabels(["Matrícula", "Nombre Completo", "Calificación (0-10)"])
-        self.tabla_calificaciones.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Una columna editable por elemento de la categoría (Tarea 1 ... Tarea N, ver
+        # _encabezados_elementos); matrícula y nombre son de solo lectura
+        self.modelo_calificaciones = ModeloTablaFilas(
+            ["Matrícula", "Nombre Completo", "Calificación (0-10)"], columnas_editables=(2,), parent=self
+        )
         # Conexión principal: Al editar una celda, guardar automáticamente (FA.1)
-        self.tabla_calificaciones.cellChanged.connect(self._guardar_calificacion_celda) 
+        self.modelo_calificaciones.celdaEditada.connect(self._guardar_calificacion_celda) 
+
+        self.tabla_calificaciones = QTableView()
+        self.tabla_calificaciones.setModel(self.modelo_calificaciones)
+        self.tabla_calificaciones.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabla_calificaciones.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         main_layout.addWidget(self.tabla_calificaciones)
+
+        # 3. Historial de la celda seleccionada (aclaraciones: quién tenía qué nota y cuándo cambió)
+        self.btn_historial = QPushButton("Ver Historial de la Nota")
+        self.btn_historial.clicked.connect(self._mostrar_historial_celda)
+        self.btn_historial.setEnabled(False)
+        main_layout.addWidget(self.btn_historial)
         
         # 4. Botón Guardar 
         self.btn_guardar.setObjectName("btn_agregar")
@@ -77,85 +94,180 @@ class VentanaRegistroCalificaciones(QWidget):
         main_layout.addWidget(self.btn_guardar)
 
         self.setLayout(main_layout)
-        
-        # Llama a _cargar_datos después de que todos los widgets están definidos
-        if self._categorias_activas:
-            self._cargar_datos() 
 
 
+    def recargar(self):
+        """
+        Al reabrir la ventana (ver Presentacion/cache_ventanas.py) vuelve a leer las
+        categorías, que pudieron cambiar en la ponderación, y las notas.
+        """
+        self._cargar_categorias(avisar_sin_categorias=False)
+
+    def _cargar_categorias(self, avisar_sin_categorias):
+        """Lee en el hilo de trabajo los nombres de las categorías definidas en la ponderación."""
+        ejecutor_bd().cancelar(self._tarea_carga) # La tabla se vuelve a cargar con las categorías
+        self._tarea_carga = self.indicador_carga.seguir(self.gestor_async.obtener_categorias_evaluacion(
+            al_terminar=lambda categorias: self._mostrar_categorias(
+                [c.get_nombre_categoria() for c in categorias or []], avisar_sin_categorias
+            ),
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_categorias(self, categorias, avisar_sin_categorias):
+        if categorias != self._categorias_activas or not categorias:
+            anterior = self.combo_categoria.currentText()
+            self._categorias_activas = categorias
+            self.combo_categoria.blockSignals(True)
+            self.combo_categoria.clear()
+            self.combo_categoria.addItems(categorias or ["No hay categorías definidas"])
+            if anterior in categorias:
+                self.combo_categoria.setCurrentText(anterior)
+            self.combo_categoria.blockSignals(False)
+            # Deshabilitar el botón de guardar y la tabla si no hay categorías
+            self.btn_guardar.setEnabled(bool(categorias))
+            self.btn_historial.setEnabled(bool(categorias))
+        if not categorias and avisar_sin_categorias:
+            QMessageBox.warning(self, "Advertencia", "No hay categorías de evaluación definidas para este grupo. Vaya a Administrar Ponderación (CU3).")
+        if self._categorias_activas:
+            self._cargar_datos()
+        else:
+            self.modelo_calificaciones.cargar([])
+
     def _cargar_datos(self):
         """Muestra la lista de estudiantes con notas existentes para la categoría seleccionada."""
+        ejecutor_bd().cancelar(self._tarea_carga) # La carga de otra categoría ya no sirve
+        # Las notas pendientes se encolan antes de la carga: la tabla recargada ya las incluye
+        self._guardar_pendientes()
+
         # Verificar que el combo_categoria no esté vacío antes de llamar currentText
         if not self.combo_categoria.currentText():
-            self.tabla_calificaciones.setRowCount(0)
+            self.modelo_calificaciones.cargar([])
             return
 
         categoria_seleccionada = self.combo_categoria.currentText()
-        # Retorna: [(matricula, nombre, valor), ...]
-        datos = self.gestor.obtener_alumnos_con_calificaciones(categoria_seleccionada)
-        
-        self.tabla_calificaciones.setRowCount(len(datos))
-        
-        self.tabla_calificaciones.blockSignals(True) # Bloquear para evitar guardado al cargar
-        
-        for fila_indice, alumno_data in enumerate(datos):
-            matricula, nombre, valor_db = alumno_data
-            
-            # Columna 0 y 1: Datos del alumno (Solo Lectura)
-            item_matricula = QTableWidgetItem(matricula)
-            item_matricula.setFlags(item_matricula.flags() & ~Qt.ItemIsEditable) 
-            self.tabla_calificaciones.setItem(fila_indice, 0, item_matricula)
-            
-            item_nombre = QTableWidgetItem(nombre)
-            item_nombre.setFlags(item_nombre.flags() & ~Qt.ItemIsEditable) 
-            self.tabla_calificaciones.setItem(fila_indice, 1, item_nombre)
-            
-            # Columna 2: Calificación (Editable)
-            valor_str = str(valor_db) if valor_db is not None else ""
-            self.tabla_calificaciones.setItem(fila_indice, 2, QTableWidgetItem(valor_str))
-            
-        self.tabla_calificaciones.blockSignals(False) 
-
-    # El método _guardar_calificacion_celda se mantiene igual que la última versión que te envié.
-    def _guardar_calificacion_celda(self, row, column):
-        """Guarda la calificación en la BLL y recalcula el promedio al cambiar una celda."""
-        if column != 2 or not self._categorias_activas:
+        # Retorna: (N, [(matricula, nombre, nota_1, ..., nota_N), ...])
+        self._tarea_carga = self.indicador_carga.seguir(self.gestor_async.obtener_matriz_calificaciones(
+            categoria_seleccionada,
+            al_terminar=self._mostrar_matriz,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    def _mostrar_matriz(self, resultado):
+        numero_elementos, filas = resultado
+        # Un solo reset del modelo (filas y columnas); cargar datos no dispara celdaEditada (no se guarda al cargar)
+        self.modelo_calificaciones.cargar(
+            filas,
+            encabezados=["Matrícula", "Nombre Completo"] + self._encabezados_elementos(numero_elementos),
+            columnas_editables=range(2, 2 + numero_elementos)
+        )
+
+    @staticmethod
+    def _encabezados_elementos(numero_elementos):
+        if numero_elementos == 1:
+            return ["Calificación (0-10)"]
+        return [f"Elemento {i}" for i in range(1, numero_elementos + 1)]
+
+    def _guardar_calificacion_celda(self, row, column, nuevo_valor=None):
+        """Valida la nota de la celda editada y la deja pendiente de guardar (FA.1)."""
+        if column < 2 or not self._categorias_activas:
             return
 
-        matricula = self.tabla_calificaciones.item(row, 0).text()
+        matricula = self.modelo_calificaciones.valor(row, 0)
         categoria = self.combo_categoria.currentText()
-        
-        self.tabla_calificaciones.blockSignals(True) # Evitar recursión
-        
-        try:
-            nuevo_valor_str = self.tabla_calificaciones.item(row, 2).text().strip()
-            
-            # BR.18: Si el campo está vacío, la calificación se considera nula y no se registra (o se elimina si existía).
-            if not nuevo_valor_str:
-                print("Campo vacío. No se registra la calificación.")
-                self.tabla_calificaciones.blockSignals(False)
-                return
-
-            # Llama al gestor, que valida el rango 0-10 (BR.13)
-            resultado_mensaje = self.gestor.registrar_calificacion(matricula, categoria, nuevo_valor_str)
-            
-            if "Error" in resultado_mensaje:
-                QMessageBox.critical(self, "Error de Validación", resultado_mensaje)
-                # No recargamos para no interrumpir el flujo de edición, pero la BLL no guarda el valor.
+        numero_item = column - 1 # La columna 2 es el elemento 1
+        nuevo_valor_str = str(self.modelo_calificaciones.valor(row, column) or "").strip()
+
+        # BR.18: Si el campo está vacío, la calificación se considera nula y no se registra (o se elimina si existía).
+        if not nuevo_valor_str:
+            print("Campo vacío. No se registra la calificación.")
+            return
+
+        # La BLL valida el rango 0-10 (BR.13) sin tocar la base de datos
+        resultado_mensaje = self.gestor.agregar_calificacion_pendiente(matricula, categoria, nuevo_valor_str, numero_item)
+        if "Error" in resultado_mensaje:
+            QMessageBox.critical(self, "Error de Validación", resultado_mensaje)
+            # No recargamos para no interrumpir el flujo de edición, pero la BLL no guarda el valor.
+            return
+        # Cada edición reinicia la espera: una columna capturada de corrido se guarda una sola vez
+        self._temporizador_guardado.start()
+
+    def _mostrar_historial_celda(self):
+        """Muestra los cambios de la nota seleccionada, del más reciente al más antiguo."""
+        indice = self.tabla_calificaciones.currentIndex()
+        if not indice.isValid() or indice.column() < 2:
+            QMessageBox.warning(self, "Advertencia", "Seleccione la celda de una calificación.")
+            return
+        # Lo pendiente se encola antes: la consulta del historial ya lo incluye
+        self._guardar_pendientes()
+        matricula = self.modelo_calificaciones.valor(indice.row(), 0)
+        nombre = self.modelo_calificaciones.valor(indice.row(), 1)
+        encabezado = self.modelo_calificaciones.headerData(indice.column(), Qt.Horizontal)
+        titulo = f"{nombre} - {self.combo_categoria.currentText()} ({encabezado})"
+        self.indicador_carga.seguir(self.gestor_async.obtener_historial_calificacion(
+            matricula, self.combo_categoria.currentText(), indice.column() - 1,
+            al_terminar=lambda cambios: QMessageBox.information(self, "Historial", self._texto_historial(titulo, cambios)),
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        ))
+
+    @staticmethod
+    def _texto_historial(titulo, cambios):
+        if not cambios:
+            return f"{titulo}\n\nSin cambios registrados."
+        lineas = []
+        for momento, anterior, nuevo, _ in cambios:
+            if anterior is None:
+                lineas.append(f"{momento[:19]}  capturada: {nuevo}")
+            elif nuevo is None:
+                lineas.append(f"{momento[:19]}  borrada (era {anterior})")
             else:
-                print(resultado_mensaje)
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error de Entrada", f"Error inesperado al guardar la nota: {e}")
-            
-        finally:
-            self.tabla_calificaciones.blockSignals(False)
+                lineas.append(f"{momento[:19]}  {anterior} → {nuevo}")
+        return f"{titulo}\n\n" + "\n".join(lineas)
+
+    def _guardar_pendientes(self):
+        """Encola el guardado de todas las notas pendientes (una transacción y un recálculo)."""
+        self._temporizador_guardado.stop()
+        if not self.gestor.hay_calificaciones_pendientes():
+            return
+        self.indicador_carga.seguir(self.gestor_async.guardar_calificaciones_pendientes(
+            al_terminar=self._calificacion_guardada,
+            al_fallar=lambda mensaje: QMessageBox.critical(
+                self, "Error de Entrada", f"Error inesperado al guardar las notas: {mensaje}")
+        ))
+
+    def _calificacion_guardada(self, resultado_mensaje):
+        if "Error" in resultado_mensaje:
+            # Las notas siguen pendientes en la BLL y se reintentan en el próximo guardado
+            QMessageBox.critical(self, "Error al Guardar", resultado_mensaje)
+        else:
+            print(resultado_mensaje)
+
+    def changeEvent(self, event):
+        # Al perder el foco la ventana (cambiar a otra ventana) se guarda lo pendiente
+        if event.type() == QEvent.ActivationChange and not self.isActiveWindow():
+            self._guardar_pendientes()
+        super().changeEvent(event)
 
     def _guardar_todo_manual(self):
         """Función para el botón 'Guardar'. Llama a la BLL para asegurar el recálculo."""
         if self._categorias_activas:
             # Llama al método que fuerza el recálculo basado en la nueva ponderación
-            self.gestor._recalcular_promedios() 
-            QMessageBox.information(self, "Éxito", "Todos los promedios han sido actualizados y el registro es automático por celda.")
+            self.btn_guardar.setEnabled(False)
+            self._guardar_pendientes()
+            self.indicador_carga.seguir(self.gestor_async._recalcular_promedios(
+                al_terminar=lambda _: QMessageBox.information(
+                    self, "Éxito", "Todos los promedios han sido actualizados y el registro es automático por celda."),
+                al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje),
+                al_finalizar=lambda: self.btn_guardar.setEnabled(True)
+            ))
         else:
-            QMessageBox.warning(self, "Advertencia", "No se puede guardar, no hay categorías definidas.")
\ No newline at end of file
+            QMessageBox.warning(self, "Advertencia", "No se puede guardar, no hay categorías definidas.")
+
+    def closeEvent(self, event):
+        # Una carga pendiente ya no tiene dónde mostrarse; los guardados sí se completan.
+        ejecutor_bd().cancelar(self._tarea_carga)
+        self._temporizador_guardado.stop()
+        # Guarda las notas pendientes en el hilo de trabajo. Si la aplicación se cierra
+        # normalmente antes, se guardan al salir; si el proceso muere de golpe, se pierden
+        # (ver Logica/buffer_calificaciones.py)
+        self.gestor_async.cerrar()
+        super().closeEvent(event)
@@ -0,0 +1,144 @@
+# presentacion/ventana_reportes.py
+# Caso de uso 6: Generar Reportes (exportar a CSV, Excel o PDF)
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QFormLayout, QComboBox, QLabel, QPushButton, QMessageBox, QFileDialog
+)
+from Logica.gestor_alumnos import GestorGrupos
+from Logica.exportador_reportes import ExportadorReportes, TIPOS_REPORTE
+from Presentacion.tareas import GestorAsincrono, IndicadorCarga, ejecutor_bd
+
+FORMATOS_ARCHIVO = {
+    "csv": ("CSV", "CSV (*.csv)"),
+    "xlsx": ("Excel", "Excel (*.xlsx)"),
+    "pdf": ("PDF", "PDF (*.pdf)"),
+}
+
+
+class VentanaReportes(QWidget):
+    """Exporta el roster, la asistencia o las calificaciones de un grupo o de toda la escuela."""
+
+    def __init__(self, grupo_id=None, tipo="alumnos", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("DirectAula - Generar Reportes")
+        self.resize(450, 250)
+        # La carga de grupos y la exportación se ejecutan en el hilo de trabajo (ver Presentacion/tareas.py)
+        self.grupos_async = GestorAsincrono(GestorGrupos())
+        self.exportador_async = GestorAsincrono(ExportadorReportes())
+        self._tarea_carga = None
+        self._grupo_pendiente = None  # Grupo a elegir cuando llegue la lista
+        self._tarea_exportacion = None
+        self._inicializar_ui()
+        self._cargar_grupos(grupo_id)
+        self.combo_tipo.setCurrentIndex(max(self.combo_tipo.findData(tipo), 0))
+
+    def _inicializar_ui(self):
+        layout = QVBoxLayout(self)
+
+        lbl_titulo = QLabel("Generar Reportes")
+        lbl_titulo.setObjectName("titulo_principal")
+        layout.addWidget(lbl_titulo)
+
+        formulario = QFormLayout()
+        self.combo_tipo = QComboBox()
+        for clave, nombre in TIPOS_REPORTE.items():
+            self.combo_tipo.addItem(nombre, clave)
+        formulario.addRow("Reporte", self.combo_tipo)
+
+        self.combo_grupo = QComboBox()
+        formulario.addRow("Grupo", self.combo_grupo)
+
+        self.combo_formato = QComboBox()
+        for clave, (nombre, _) in FORMATOS_ARCHIVO.items():
+            self.combo_formato.addItem(nombre, clave)
+        formulario.addRow("Formato", self.combo_formato)
+        layout.addLayout(formulario)
+
+        # Barra de progreso: avanza conforme se escriben los alumnos
+        self.indicador_carga = IndicadorCarga(self)
+        layout.addWidget(self.indicador_carga)
+
+        self.btn_exportar = QPushButton("📊 Exportar")
+        self.btn_exportar.setObjectName("btn_exportar")
+        self.btn_exportar.clicked.connect(self._exportar)
+        layout.addWidget(self.btn_exportar)
+
+    def recargar(self):
+        """Vuelve a leer los grupos al reabrir la ventana (ver Presentacion/cache_ventanas.py)."""
+        # Si se cerró antes de que llegara la lista, se conserva el grupo que se iba a elegir
+        cargando = self._tarea_carga is not None
+        self._cargar_grupos(self._grupo_pendiente if cargando else self.combo_grupo.currentData())
+
+    def _cargar_grupos(self, grupo_id):
+        ejecutor_bd().cancelar(self._tarea_carga) # Solo importa la carga más reciente
+        self._grupo_pendiente = grupo_id
+        # Mientras llega la lista el grupo elegido aún no está en el combo: no se puede exportar
+        self.combo_grupo.setEnabled(False)
+        tarea = self.grupos_async.obtener_lista_grupos(
+            al_terminar=lambda grupos: self._mostrar_grupos(grupos or [], grupo_id), # [id, nombre, ciclo]
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje),
+            al_finalizar=lambda: self._carga_finalizada(tarea)
+        )
+        self._tarea_carga = self.indicador_carga.seguir(tarea)
+        self._actualizar_exportar()
+
+    def _mostrar_grupos(self, grupos, grupo_id):
+        self.combo_grupo.clear()
+        self.combo_grupo.addItem("Toda la escuela", None)
+        for id_grupo, nombre, ciclo in grupos:
+            self.combo_grupo.addItem(f"{nombre} ({ciclo})", id_grupo)
+        indice = self.combo_grupo.findData(grupo_id)
+        self.combo_grupo.setCurrentIndex(max(indice, 0))
+
+    def _carga_finalizada(self, tarea):
+        if tarea is not self._tarea_carga: # Una carga reemplazada por otra más reciente
+            return
+        self._tarea_carga = None
+        self.combo_grupo.setEnabled(True)
+        self._actualizar_exportar()
+
+    def _actualizar_exportar(self):
+        self.btn_exportar.setEnabled(self._tarea_carga is None and self._tarea_exportacion is None)
+
+    def _exportar(self):
+        tipo = self.combo_tipo.currentData()
+        formato = self.combo_formato.currentData()
+        grupo_id = self.combo_grupo.currentData()
+        nombre_sugerido = f"{tipo}_{'escuela' if grupo_id is None else f'grupo_{grupo_id}'}.{formato}"
+        ruta, _ = QFileDialog.getSaveFileName(
+            self, "Guardar reporte", nombre_sugerido, FORMATOS_ARCHIVO[formato][1]
+        )
+        if not ruta:
+            return
+        if not ruta.lower().endswith("." + formato):
+            ruta += "." + formato
+
+        tarea = self.exportador_async.exportar(
+            tipo, formato, ruta, grupo_id,
+            al_progresar=lambda hechos, total: self.indicador_carga.setFormat(f"{hechos} / {total} alumnos"),
+            al_terminar=self._exportacion_terminada,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error al Exportar", mensaje),
+            al_finalizar=lambda: self._exportacion_finalizada(tarea)
+        )
+        # Cancelada al cerrar la ventana no emite `finalizada`; al reabrirla el botón debe estar activo
+        tarea.senales.cancelada.connect(lambda: self._exportacion_finalizada(tarea))
+        self._tarea_exportacion = self.indicador_carga.seguir(tarea)
+        self._actualizar_exportar()
+
+    def _exportacion_finalizada(self, tarea):
+        if tarea is self._tarea_exportacion:
+            self._tarea_exportacion = None
+            self._actualizar_exportar()
+
+    def _exportacion_terminada(self, resultado_mensaje):
+        if resultado_mensaje.startswith("Error"):
+            QMessageBox.critical(self, "Error al Exportar", resultado_mensaje)
+        else:
+            QMessageBox.information(self, "Reporte Generado", resultado_mensaje)
+
+    def closeEvent(self, event):
+        # Si la exportación ya empezó, termina en segundo plano; si no, se descarta.
+        # Una carga de grupos pendiente ya no tiene dónde mostrarse.
+        ejecutor_bd().cancelar(self._tarea_exportacion)
+        ejecutor_bd().cancelar(self._tarea_carga)
+        super().closeEvent(event)
@@ -4,18 +4,17 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QLabel, QStyleFactory, QDialog
 )
 from PyQt5.QtCore import Qt
-# Importaciones Modulares:
-from Presentacion.ventana_grupos import VentanaGrupos 
-from Presentacion.ventana_calificaciones_menu import VentanaCalificacionesMenu
-from Presentacion.ventana_alumnos import VentanaAlumnos 
-from Presentacion.ventana_asistencia import VentanaAsistencia
-from Presentacion.seleccion_grupo import SeleccionGrupo
+from Presentacion.cache_ventanas import CacheVentanas
+# Las ventanas (y con ellas la BLL y los DAO) se importan al primer clic en su
+# botón: el menú aparece sin cargar módulos ni abrir la base de datos.
+# Ver benchmarks/bench_arranque.py.
 
 class VentanaMenuPrincipal(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("DirectAula - Sistema de Gestión")
         self.resize(400, 300)
+        self._ventanas = CacheVentanas() # Cada botón reutiliza su ventana en lugar de recrearla
         
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -39,6 +38,12 @@ class VentanaMenuPrincipal(QMainWindow):
         btn_alumnos.setObjectName("btn_exportar") 
         layout.addWidget(btn_alumnos)
 
+        # Búsqueda de un alumno en todos los grupos y ciclos (sin elegir grupo)
+        btn_buscar = QPushButton("Buscar Alumno")
+        btn_buscar.clicked.connect(self.abrir_ventana_busqueda)
+        btn_buscar.setObjectName("btn_exportar") 
+        layout.addWidget(btn_buscar)
+
         # 3. Botón CU4: Registrar Asistencia
         btn_asistencia = QPushButton("Registrar Asistencia")
         btn_asistencia.clicked.connect(self.abrir_ventana_asistencia)
@@ -51,45 +56,67 @@ class VentanaMenuPrincipal(QMainWindow):
         btn_calificaciones.setObjectName("btn_exportar") 
         layout.addWidget(btn_calificaciones)
 
+        # 5. Botón CU6: Generar Reportes
+        btn_reportes = QPushButton("Generar Reportes")
+        btn_reportes.clicked.connect(self.abrir_ventana_reportes)
+        btn_reportes.setObjectName("btn_exportar") 
+        layout.addWidget(btn_reportes)
+
+    def _seleccionar_grupo(self, titulo_accion):
+        """Muestra el diálogo de selección de grupo. Retorna (grupo_id, nombre_grupo) o None."""
+        from Presentacion.seleccion_grupo import SeleccionGrupo
+        dialogo = SeleccionGrupo(titulo_accion, self)
+        if dialogo.exec_() == QDialog.Accepted:
+            return dialogo.get_grupo_id(), dialogo.combo_grupos.currentText()
+        return None
+
     def abrir_ventana_grupos(self):
         """Lanza la ventana del Caso de Uso 1."""
-        self.ventana_grupos = VentanaGrupos() 
-        self.ventana_grupos.show()
-    
+        from Presentacion.ventana_grupos import VentanaGrupos
+        self._ventanas.mostrar("grupos", VentanaGrupos)
 
     def abrir_ventana_alumnos(self):
         """Lanza el diálogo de selección y luego la ventana de Alumnos (CU2)."""
-        dialogo = SeleccionGrupo("Administrar Alumnos", self)
-        if dialogo.exec_() == QDialog.Accepted:
-            grupo_id = dialogo.get_grupo_id()
-            nombre_grupo = dialogo.combo_grupos.currentText()
+        seleccion = self._seleccionar_grupo("Administrar Alumnos")
+        if seleccion:
+            from Presentacion.ventana_alumnos import VentanaAlumnos
+            grupo_id, nombre_grupo = seleccion
             # 💡 Pasamos el ID del grupo y su nombre a la ventana de alumnos
-            self.ventana_alumnos = VentanaAlumnos(grupo_id=grupo_id, nombre_grupo=nombre_grupo) 
-            self.ventana_alumnos.show()
+            self._ventanas.mostrar(("alumnos", grupo_id), lambda: VentanaAlumnos(grupo_id=grupo_id, nombre_grupo=nombre_grupo))
         
+    def abrir_ventana_busqueda(self):
+        """Lanza la búsqueda global de alumnos (todos los grupos)."""
+        from Presentacion.ventana_busqueda_global import VentanaBusquedaGlobal
+        # La búsqueda abre los grupos en las mismas ventanas que el menú
+        self._ventanas.mostrar("busqueda", lambda: VentanaBusquedaGlobal(ventanas=self._ventanas))
+
     def abrir_ventana_asistencia(self):
         """Lanza el diálogo de selección y luego la ventana de Asistencia (CU4)."""
-        dialogo = SeleccionGrupo("Registrar Asistencia", self)
-        if dialogo.exec_() == QDialog.Accepted:
-            grupo_id = dialogo.get_grupo_id()
-            nombre_grupo = dialogo.combo_grupos.currentText()
+        seleccion = self._seleccionar_grupo("Registrar Asistencia")
+        if seleccion:
+            from Presentacion.ventana_asistencia import VentanaAsistencia
+            grupo_id, nombre_grupo = seleccion
             # 💡 Pasamos el ID del grupo y su nombre a la ventana de asistencia
-            self.ventana_asistencia = VentanaAsistencia(grupo_id=grupo_id, nombre_grupo=nombre_grupo) 
-            self.ventana_asistencia.show()
+            self._ventanas.mostrar(("asistencia", grupo_id), lambda: VentanaAsistencia(grupo_id=grupo_id, nombre_grupo=nombre_grupo))
     
     def abrir_ventana_calificaciones(self):
         """Lanza el diálogo de selección y luego la ventana del menú de Calificaciones."""
-        dialogo = SeleccionGrupo("Gestión de Calificaciones", self)
-        if dialogo.exec_() == QDialog.Accepted:
-            grupo_id = dialogo.get_grupo_id()
-            nombre_grupo = dialogo.combo_grupos.currentText()
-            self.ventana_calificaciones = VentanaCalificacionesMenu(grupo_id=grupo_id, nombre_grupo=nombre_grupo)
-            self.ventana_calificaciones.show()
+        seleccion = self._seleccionar_grupo("Gestión de Calificaciones")
+        if seleccion:
+            from Presentacion.ventana_calificaciones_menu import VentanaCalificacionesMenu
+            grupo_id, nombre_grupo = seleccion
+            self._ventanas.mostrar(("calificaciones", grupo_id), lambda: VentanaCalificacionesMenu(grupo_id=grupo_id, nombre_grupo=nombre_grupo))
 
+    def abrir_ventana_reportes(self):
+        """Lanza la ventana del Caso de Uso 6 (grupo o toda la escuela se eligen ahí)."""
+        from Presentacion.ventana_reportes import VentanaReportes
+        self._ventanas.mostrar("reportes", VentanaReportes)
 
-if __name__ == '__main__':
+
+def crear_aplicacion(argv):
+    """Crea la QApplication con el estilo Fusion y style.css (también la usa el benchmark de arranque)."""
     QApplication.setStyle(QStyleFactory.create('Fusion')) 
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
     
     # 💡 CÓDIGO CORREGIDO PARA ENCONTRAR style.css SIEMPRE:
     # 1. Obtiene la ruta del archivo actual (app.py)
@@ -103,7 +130,19 @@ if __name__ == '__main__':
         print(f"Éxito: style.css cargado desde: {ruta_css}")
     except FileNotFoundError:
         print(f"Advertencia: El archivo style.css no fue encontrado en la ruta: {ruta_css}")
-        
+    return app
+
+
+if __name__ == '__main__':
+    app = crear_aplicacion(sys.argv)
     ventana_principal = VentanaMenuPrincipal()
     ventana_principal.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    codigo_salida = app.exec_()
+    # Solo se importan aquí: el arranque no necesita la capa de datos
+    from Presentacion.tareas import ejecutor_bd
+    from Datos.conexion import conexiones
+    from Datos.historial import compactar_historial
+    ejecutor_bd().esperar() # Termina los guardados pendientes antes de cerrar
+    compactar_historial() # Según la PoliticaHistorial configurada (la predeterminada conserva todo)
+    conexiones.cerrar_todas() # Cierra las conexiones persistentes de SQLite
+    sys.exit(codigo_salida)
\ No newline at end of file
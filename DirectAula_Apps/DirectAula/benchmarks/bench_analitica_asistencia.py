@@ -0,0 +1,80 @@
+"""
+Benchmark de la analítica de asistencia (Logica/analitica_asistencia.py).
+
+Llena una base temporal con varios grupos y un semestre de asistencia, y mide
+las consultas de semestre completo de un grupo: resumen por alumno, resumen
+por fecha, alumnos en riesgo y rachas. Cada una debe tardar milisegundos.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_analitica_asistencia.py --alumnos 2000 --grupos 50 --dias 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, GrupoDAO
+from Logica.analitica_asistencia import AnaliticaAsistencia
+from model import Grupo
+
+ESTADOS = ("Asistencia", "Asistencia", "Asistencia", "Ausente", "Retardo", "Justificado")
+
+
+def poblar(db_file, alumnos, grupos, dias):
+    conexiones.configurar_db_file(db_file)
+    for g in range(grupos):
+        GrupoDAO().crear_grupo(Grupo(None, f"Grupo {g + 1}", "2025-2026"))
+    dao = AlumnoDAO()
+    dao.ejecutar_queries_multiples(
+        "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', ?)",
+        [(f"E{i:06d}", f"Alumno {i:06d}", i % grupos + 1) for i in range(alumnos)]
+    )
+    for d in range(dias):
+        fecha = (date(2025, 8, 25) + timedelta(days=d)).isoformat()
+        dao.ejecutar_queries_multiples(
+            "INSERT INTO asistencia (matricula, fecha, estado) VALUES (?, ?, ?)",
+            [(f"E{i:06d}", fecha, ESTADOS[(i * 7 + d) % len(ESTADOS)]) for i in range(alumnos)]
+        )
+
+
+def medir(funcion, repeticiones=5):
+    """Mejor tiempo en milisegundos de `repeticiones` ejecuciones."""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = (time.perf_counter() - inicio) * 1000
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return round(mejor, 2)
+
+
+def ejecutar(alumnos, grupos, dias):
+    with tempfile.TemporaryDirectory() as carpeta:
+        poblar(os.path.join(carpeta, "analitica.db"), alumnos, grupos, dias)
+        analitica = AnaliticaAsistencia(1)
+        matriculas = [r.matricula for r in analitica.resumen_por_alumno()]
+        resultado = {
+            "alumnos_grupo": len(matriculas),
+            "registros_totales": alumnos * dias,
+            "resumen_por_alumno_ms": medir(analitica.resumen_por_alumno),
+            "resumen_por_fecha_ms": medir(analitica.resumen_por_fecha),
+            "alumnos_en_riesgo_ms": medir(analitica.alumnos_en_riesgo),
+            "rachas_ms": medir(lambda: analitica.rachas(matriculas)),
+            "puntajes_asistencia_ms": medir(analitica.puntajes_asistencia),
+        }
+        conexiones.cerrar_todas()
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=2000, help="Alumnos de toda la escuela")
+    parser.add_argument("--grupos", type=int, default=50)
+    parser.add_argument("--dias", type=int, default=100, help="Días de clase del semestre")
+    args = parser.parse_args()
+    print(ejecutar(args.alumnos, args.grupos, args.dias))
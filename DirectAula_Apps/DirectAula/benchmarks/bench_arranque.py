@@ -0,0 +1,142 @@
+"""
+Benchmark del arranque en frío de app.py: tiempo hasta que el menú principal se pinta.
+
+Cada medición es un proceso nuevo de Python (intérprete, imports de PyQt5 y de
+la aplicación, QApplication con style.css y el primer pintado del menú),
+medido desde el proceso padre. Se compara contra un presupuesto (300 ms por
+omisión): si la mediana lo excede, el proceso termina con código 1.
+
+Una ejecución aparte con `python -X importtime` lista los módulos más costosos
+y comprueba que el arranque no importe la BLL ni los DAO (Logica.*, Datos.*):
+las ventanas se importan al primer clic (ver app.py). Con --ansioso se mide
+además el arranque importando todas las ventanas, como antes.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_arranque.py --repeticiones 10 --presupuesto-ms 300
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que el menú no necesita: se importan al abrir cada ventana
+PREFIJOS_DIFERIDOS = ("Logica.", "Datos.", "Presentacion.ventana_", "Presentacion.seleccion_grupo")
+
+VENTANAS = ["ventana_grupos", "ventana_calificaciones_menu", "ventana_ponderacion",
+            "ventana_registro_calificaciones", "ventana_alumnos", "ventana_asistencia",
+            "seleccion_grupo", "ventana_reportes", "ventana_busqueda_global"]
+
+# Proceso hijo: arranca como app.py y avisa por stdout cuando el menú se pinta
+# (sin importar nada extra, para no contarlo en -X importtime)
+_HIJO = """
+import sys
+sys.path.insert(0, {raiz!r})
+if {ansioso!r}:
+    import importlib
+    for nombre in {ventanas!r}:
+        importlib.import_module("Presentacion." + nombre)
+import app
+from PyQt5.QtCore import QEvent, QObject
+
+class AvisoPintado(QObject):
+    def eventFilter(self, objeto, evento):
+        if evento.type() == QEvent.Paint:
+            print("MENU_VISIBLE", flush=True)
+            aplicacion.quit()
+        return False
+
+aplicacion = app.crear_aplicacion([])
+ventana = app.VentanaMenuPrincipal()
+aviso = AvisoPintado()
+ventana.installEventFilter(aviso)
+ventana.show()
+aplicacion.exec_()
+print("MODULOS " + repr(sorted(m for m in sys.modules if m.split(".")[0] in ("Logica", "Datos", "Presentacion"))))
+"""
+
+
+def arrancar(ansioso=False, importtime=False):
+    """Arranca un proceso hijo. Retorna (ms hasta el menú visible, módulos de la app, líneas de importtime)."""
+    entorno = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    comando = [sys.executable] + (["-X", "importtime"] if importtime else []) + [
+        "-c", _HIJO.format(raiz=RAIZ_APP, ansioso=ansioso, ventanas=VENTANAS)
+    ]
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(comando, cwd=RAIZ_APP, env=entorno, text=True,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    visible = None
+    modulos = []
+    for linea in proceso.stdout:
+        if linea.startswith("MENU_VISIBLE") and visible is None:
+            visible = (time.perf_counter() - inicio) * 1000
+        elif linea.startswith("MODULOS "):
+            modulos = ast.literal_eval(linea[len("MODULOS "):])
+    _, errores = proceso.communicate()
+    if visible is None:
+        raise RuntimeError(f"El menú no llegó a pintarse:\n{errores}")
+    return visible, modulos, errores.splitlines()
+
+
+def leer_importtime(lineas):
+    """[(ms acumulados, ms propios, módulo), ...] de la salida de -X importtime."""
+    modulos = []
+    for linea in lineas:
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos.append((int(acumulado) / 1000, int(propio) / 1000, nombre.rstrip()))
+    return modulos
+
+
+def ejecutar(repeticiones=10, presupuesto_ms=300, ansioso=False):
+    tiempos = sorted(arrancar()[0] for _ in range(repeticiones))
+    _, modulos, lineas = arrancar(importtime=True)
+    importaciones = leer_importtime(lineas)
+    # Solo los módulos de primer nivel (sin sangría) suman el costo total de importar
+    primer_nivel = [(acumulado, nombre.strip()) for acumulado, _, nombre in importaciones
+                    if not nombre.startswith("  ")]
+    resultado = {
+        "menu_visible_ms": {
+            "mediana": round(statistics.median(tiempos), 1),
+            "min": round(tiempos[0], 1),
+            "max": round(tiempos[-1], 1),
+            "repeticiones": repeticiones,
+        },
+        "presupuesto_ms": presupuesto_ms,
+        "importaciones_ms": round(sum(acumulado for acumulado, _ in primer_nivel), 1),
+        # Por tiempo propio: app.py acumula casi todo, pero el costo real está en PyQt5
+        "mas_costosas": [{"modulo": nombre.strip(), "propio_ms": round(propio, 1), "acumulado_ms": round(acumulado, 1)}
+                         for acumulado, propio, nombre in sorted(importaciones, key=lambda m: -m[1])[:8]],
+        "modulos_app": modulos,
+        "importados_antes_de_tiempo": [m for m in modulos if m.startswith(PREFIJOS_DIFERIDOS)],
+    }
+    if ansioso:
+        tiempos_ansioso = sorted(arrancar(ansioso=True)[0] for _ in range(repeticiones))
+        resultado["menu_visible_importando_todo_ms"] = round(statistics.median(tiempos_ansioso), 1)
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--presupuesto-ms", type=float, default=300)
+    parser.add_argument("--ansioso", action="store_true", help="Mide también importando todas las ventanas")
+    args = parser.parse_args()
+
+    resultado = ejecutar(args.repeticiones, args.presupuesto_ms, args.ansioso)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    fallas = []
+    if resultado["menu_visible_ms"]["mediana"] > args.presupuesto_ms:
+        fallas.append(f"el menú tardó {resultado['menu_visible_ms']['mediana']} ms (presupuesto {args.presupuesto_ms} ms)")
+    if resultado["importados_antes_de_tiempo"]:
+        fallas.append(f"el arranque importó {', '.join(resultado['importados_antes_de_tiempo'])}")
+    if fallas:
+        print("FALLA: " + "; ".join(fallas))
+        sys.exit(1)
+    print("OK: arranque dentro del presupuesto.")
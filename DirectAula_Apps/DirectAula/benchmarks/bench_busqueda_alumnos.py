@@ -0,0 +1,88 @@
+"""
+Benchmark de la búsqueda del roster (Logica/indice_busqueda.py + ProxyBusqueda).
+
+Genera un roster sintético con nombres acentuados, construye el índice una vez
+y mide cada búsqueda en el índice y el filtrado completo del QSortFilterProxyModel
+(sin base de datos). También comprueba la búsqueda insensible a acentos.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_busqueda_alumnos.py --alumnos 1000 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Logica.indice_busqueda import IndiceBusqueda
+
+NOMBRES = ["José", "María", "Begoña", "Raúl", "Inés", "Jesús", "Sofía", "Ángel", "Lucía", "Iñaki"]
+APELLIDOS = ["Núñez", "Pérez", "Gómez", "Ibáñez", "Martínez", "Rodríguez", "Muñoz", "López", "Suárez", "Peña"]
+CONSULTAS = ["j", "jo", "jose", "nunez", "jose nunez", "E0042", "ibanez maria", "@escuela", "zzz"]
+
+
+def generar_roster(alumnos):
+    return [
+        (f"E{i:06d}", f"{NOMBRES[i % 10]} {APELLIDOS[(i // 10) % 10]} {APELLIDOS[(i // 100) % 10]}", "",
+         f"alumno{i}@escuela.mx")
+        for i in range(alumnos)
+    ]
+
+
+def medir(funcion, repeticiones=20, preparar=None):
+    """Mejor tiempo en milisegundos (preparar() se ejecuta antes de cada repetición, fuera del tiempo)."""
+    mejor = None
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        duracion = (time.perf_counter() - inicio) * 1000
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return round(mejor, 3)
+
+
+def ejecutar(alumnos, con_proxy=True):
+    roster = generar_roster(alumnos)
+    inicio = time.perf_counter()
+    indice = IndiceBusqueda(roster)
+    construccion = round((time.perf_counter() - inicio) * 1000, 1)
+
+    assert len(indice.buscar("jose nunez")) == len(indice.buscar("JOSÉ NÚÑEZ")) > 0, "búsqueda sensible a acentos"
+    resultado = {"alumnos": alumnos, "construccion_indice_ms": construccion,
+                 # buscar("") reinicia la búsqueda incremental: cada consulta se mide desde cero
+                 "indice_ms": {c: medir(lambda: indice.buscar(c), preparar=lambda: indice.buscar(""))
+                               for c in CONSULTAS},
+                 # Escribir "jose nunez" letra por letra (cada tecla filtra sobre el resultado anterior)
+                 "teclas_jose_nunez_ms": medir(lambda: [indice.buscar("jose nunez"[:n]) for n in range(11)])}
+
+    if con_proxy:
+        from Presentacion.modelos_tabla import ModeloTablaFilas, ProxyBusqueda
+        modelo = ModeloTablaFilas(["Matrícula", "Nombre Completo", "Contacto", "Email"])
+        proxy = ProxyBusqueda(modelo)
+        modelo.cargar(roster)
+        # rowCount() obliga al proxy a recalcular su mapeo de filas (lo hace de forma perezosa)
+        resultado["proxy_ms"] = {
+            c: medir(lambda: (proxy.buscar(c), proxy.rowCount()), repeticiones=5,
+                     preparar=lambda: (proxy.buscar(""), proxy.rowCount()))
+            for c in CONSULTAS
+        }
+        proxy.buscar("jose nunez")
+        resultado["filas_visibles_jose_nunez"] = proxy.rowCount()
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--sin-proxy", action="store_true", help="Solo mide el índice (sin PyQt5)")
+    args = parser.parse_args()
+
+    app = None
+    if not args.sin_proxy:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication([])
+    for n in args.alumnos:
+        print(ejecutar(n, con_proxy=not args.sin_proxy))
@@ -0,0 +1,85 @@
+"""
+Benchmark de la búsqueda global de alumnos (Logica/busqueda_global.py, FTS5).
+
+Llena una base temporal con N alumnos repartidos en grupos de varios ciclos
+escolares y mide cada búsqueda (mejor de varias ejecuciones). El objetivo es
+responder en menos de 10 ms. También comprueba que los triggers mantienen el
+índice al día al crear, renombrar y eliminar alumnos.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_busqueda_global.py --alumnos 40000 --ciclos 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, GrupoDAO
+from Logica.busqueda_global import BusquedaGlobal
+from model import Alumno, Grupo
+
+NOMBRES = ["José", "María", "Begoña", "Raúl", "Inés", "Jesús", "Sofía", "Ángel", "Lucía", "Iñaki",
+           "Carlos", "Fernanda", "Diego", "Valeria", "Emilio", "Ximena", "Rodrigo", "Paola", "Andrés", "Camila"]
+APELLIDOS = ["Núñez", "Pérez", "Gómez", "Ibáñez", "Martínez", "Rodríguez", "Muñoz", "López", "Suárez", "Peña",
+             "Hernández", "García", "Ramírez", "Torres", "Flores", "Rivera", "Cruz", "Morales", "Ortiz", "Vázquez"]
+CONSULTAS = ["jose nunez", "mar", "e", "E012345", "ibanez sofia", "garcia", "alumno123@", "zz", "rodrigo ortiz vazquez"]
+
+
+def poblar(db_file, alumnos, ciclos, grupos_por_ciclo=20):
+    conexiones.configurar_db_file(db_file)
+    for c in range(ciclos):
+        for g in range(grupos_por_ciclo):
+            GrupoDAO().crear_grupo(Grupo(None, f"{g // 4 + 1}°{'ABCD'[g % 4]}", f"{2015 + c}-{2016 + c}"))
+    total_grupos = ciclos * grupos_por_ciclo
+    AlumnoDAO().ejecutar_queries_multiples(
+        "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', ?, ?)",
+        [(f"E{i:06d}", f"{NOMBRES[i % 20]} {APELLIDOS[(i // 20) % 20]} {APELLIDOS[(i // 400) % 20]}",
+          f"alumno{i}@escuela.mx", i % total_grupos + 1)
+         for i in range(alumnos)]
+    )
+
+
+def verificar_triggers(busqueda):
+    dao = AlumnoDAO()
+    dao.crear_alumno(Alumno("T00001", "Zacarías Úrsula Quintero", "", "zq@escuela.mx"), 1)
+    assert [r.matricula for r in busqueda.buscar("zacarias quintero")] == ["T00001"], "el INSERT no se indexó"
+    dao.actualizar_alumno(Alumno("T00001", "Zacarías Yáñez", "", "zq@escuela.mx"))
+    assert not busqueda.buscar("quintero") and busqueda.buscar("yanez"), "el UPDATE no actualizó el índice"
+    dao.eliminar_alumno("T00001")
+    assert not busqueda.buscar("zacarias"), "el DELETE no quitó al alumno del índice"
+
+
+def medir(funcion, repeticiones=10):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = (time.perf_counter() - inicio) * 1000
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return round(mejor, 2)
+
+
+def ejecutar(alumnos, ciclos):
+    with tempfile.TemporaryDirectory() as carpeta:
+        inicio = time.perf_counter()
+        poblar(os.path.join(carpeta, "busqueda.db"), alumnos, ciclos)
+        carga = time.perf_counter() - inicio
+        busqueda = BusquedaGlobal()
+        tiempos = {c: medir(lambda: busqueda.buscar(c)) for c in CONSULTAS}
+        ejemplo = busqueda.buscar("jose nunez", limite=3)
+        verificar_triggers(busqueda)
+        conexiones.cerrar_todas()
+    return {"alumnos": alumnos, "ciclos": ciclos, "carga_s": round(carga, 2), "busqueda_ms": tiempos,
+            "maximo_ms": max(tiempos.values()), "ejemplo": ejemplo, "triggers": "ok"}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=40000)
+    parser.add_argument("--ciclos", type=int, default=10)
+    args = parser.parse_args()
+    print(ejecutar(args.alumnos, args.ciclos))
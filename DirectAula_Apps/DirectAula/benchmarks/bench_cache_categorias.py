@@ -0,0 +1,225 @@
+"""
+Benchmark de la caché de ponderaciones (Datos/cache_categorias.py) y de la
+ponderación inicial en una sola sentencia (BR.3).
+
+Cuenta las sentencias SQL (y las transacciones) que llegan a SQLite en las
+operaciones que leen la ponderación, con el comportamiento anterior y el actual:
+  - anterior: sin caché, y cada GestorCalificaciones ejecutaba al crearse cuatro
+    INSERT OR IGNORE de la ponderación inicial, cada uno en su transacción.
+  - actual: crear el gestor no consulta la base; la ponderación se lee una vez
+    por grupo y la inicial solo se crea si el grupo no tiene categorías, con un
+    INSERT ... SELECT.
+Escenarios: abrir el registro de calificaciones (gestor + nombres de las
+categorías + cuadrícula), recalcular los promedios del grupo y un grupo nuevo
+(sin categorías). Además comprueba que guardar la ponderación, eliminar el
+grupo y la ponderación inicial invalidan la caché, que la ponderación
+inicial ya no agrega de nuevo las categorías base que el docente quitó, y que
+una ponderación guardada por otro proceso (otra instancia de la aplicación) se
+ve en la siguiente lectura (PRAGMA data_version).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_cache_categorias.py --alumnos 40 --repeticiones 200
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from Datos.cache_categorias import cache_categorias
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, CategoriaEvaluacionDAO, GrupoDAO
+from Logica.gestor_alumnos import GestorCalificaciones
+from model import Grupo
+
+PREFIJOS_SENTENCIA = ("SELECT", "INSERT", "REPLACE", "UPDATE", "DELETE", "WITH")
+
+
+class ContadorSentencias:
+    """Cuenta, con set_trace_callback, lo que ejecuta la conexión del hilo actual."""
+
+    def __init__(self):
+        self.sentencias = 0
+        self.transacciones = 0
+        conexiones.obtener().set_trace_callback(self._registrar)
+
+    def _registrar(self, sentencia):
+        palabra = sentencia.lstrip().split(" ", 1)[0].upper()
+        if palabra in PREFIJOS_SENTENCIA:
+            self.sentencias += 1
+        elif palabra == "BEGIN":
+            self.transacciones += 1
+
+    def reiniciar(self):
+        self.sentencias = self.transacciones = 0
+
+    def detener(self):
+        conexiones.obtener().set_trace_callback(None)
+
+
+def sembrar_anterior(grupo_id):
+    """La ponderación inicial como era antes: un INSERT OR IGNORE (y una transacción) por categoría."""
+    dao = CategoriaEvaluacionDAO()
+    query = "INSERT OR IGNORE INTO categorias_evaluacion (grupo_id, nombre_categoria, peso_porcentual, max_items) VALUES (?, ?, ?, ?)"
+    for categoria in dao.CATEGORIAS_BASE:
+        dao.ejecutar_query(query, (grupo_id, *categoria))
+
+
+def abrir_registro(anterior):
+    if anterior:
+        cache_categorias.limpiar()
+        sembrar_anterior(1)
+    gestor = GestorCalificaciones(1)
+    if anterior:
+        cache_categorias.limpiar()
+    nombres = [c.get_nombre_categoria() for c in gestor.obtener_categorias_evaluacion()]
+    if anterior:
+        cache_categorias.limpiar()
+    gestor.obtener_matriz_calificaciones(nombres[-1])
+
+
+def recalcular(gestor, anterior):
+    if anterior:
+        cache_categorias.limpiar()
+    gestor._recalcular_promedios()
+
+
+def medir(funcion, contador, repeticiones):
+    """(mediana en ms, sentencias por operación, transacciones por operación)."""
+    funcion() # Calienta la caché (la primera apertura del día siempre consulta)
+    tiempos = []
+    contador.reiniciar()
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "sentencias": round(contador.sentencias / repeticiones, 1),
+        "transacciones": round(contador.transacciones / repeticiones, 1),
+    }
+
+
+def medir_grupo_nuevo(contador, anterior):
+    GrupoDAO().crear_grupo(Grupo(None, f"Nuevo {'anterior' if anterior else 'actual'}", "2025-2026"))
+    grupo_id = GrupoDAO().buscar_grupo_por_nombre_ciclo(f"Nuevo {'anterior' if anterior else 'actual'}", "2025-2026")
+    contador.reiniciar()
+    if anterior:
+        sembrar_anterior(grupo_id)
+        CategoriaEvaluacionDAO()._leer_categorias(grupo_id)
+    else:
+        GestorCalificaciones(grupo_id).obtener_categorias_evaluacion()
+    return {"sentencias": contador.sentencias, "transacciones": contador.transacciones}
+
+
+def verificar_invalidacion():
+    dao = CategoriaEvaluacionDAO()
+    GrupoDAO().crear_grupo(Grupo(None, "Invalidación", "2025-2026"))
+    grupo_id = GrupoDAO().buscar_grupo_por_nombre_ciclo("Invalidación", "2025-2026")
+    gestor = GestorCalificaciones(grupo_id)
+    assert len(gestor.obtener_categorias_evaluacion()) == 4, "no se creó la ponderación inicial"
+
+    gestor.guardar_categorias_evaluacion([("Examen Final", 60, 1), ("Tareas", 40, 8)])
+    nombres = sorted(c.nombre_categoria for c in dao.obtener_categorias(grupo_id))
+    assert nombres == ["Examen Final", "Tareas"], "guardar_categorias no invalidó el grupo"
+
+    # Antes, cada gestor nuevo volvía a agregar Asistencia y Participación (suma > 100%)
+    cache_categorias.limpiar()
+    GestorCalificaciones(grupo_id).obtener_categorias_evaluacion()
+    assert len(dao.obtener_categorias(grupo_id)) == 2, "la ponderación inicial modificó una personalizada"
+    assert dao.crear_ponderacion_inicial(grupo_id) == 0
+
+    dao.ejecutar_query("DELETE FROM categorias_evaluacion WHERE grupo_id = ?", (grupo_id,))
+    cache_categorias.invalidar_grupo(dao._db_file, grupo_id)
+    assert len(dao.obtener_categorias(grupo_id)) == 4, "un grupo sin categorías no recibió la ponderación inicial"
+
+    dao.obtener_categorias(grupo_id)
+    en_cache = cache_categorias.estadisticas()["grupos_en_cache"]
+    GrupoDAO().eliminar_grupo(grupo_id)
+    assert cache_categorias.estadisticas()["grupos_en_cache"] == en_cache - 1, "eliminar_grupo no invalidó el grupo"
+
+
+def _guardar_en_otro_proceso(db_file, grupo_id):
+    """Otra instancia de la aplicación guarda una ponderación nueva para el grupo."""
+    conexiones.configurar_db_file(db_file)
+    GestorCalificaciones(grupo_id).guardar_categorias_evaluacion([("Proyecto", 100, 1)])
+    conexiones.cerrar_todas()
+
+
+def verificar_dos_procesos():
+    dao = CategoriaEvaluacionDAO()
+    GrupoDAO().crear_grupo(Grupo(None, "Dos procesos", "2025-2026"))
+    grupo_id = GrupoDAO().buscar_grupo_por_nombre_ciclo("Dos procesos", "2025-2026")
+    assert len(dao.obtener_categorias(grupo_id)) == 4 # Crea la ponderación inicial (e invalida el grupo)
+    dao.obtener_categorias(grupo_id)
+    aciertos = cache_categorias.aciertos
+    assert len(dao.obtener_categorias(grupo_id)) == 4 and cache_categorias.aciertos == aciertos + 1
+
+    # spawn: el proceso hijo abre sus propias conexiones (no hereda las de este)
+    proceso = multiprocessing.get_context("spawn").Process(
+        target=_guardar_en_otro_proceso, args=(dao._db_file, grupo_id)
+    )
+    proceso.start()
+    proceso.join()
+    assert proceso.exitcode == 0, "falló el proceso que guarda la ponderación"
+
+    nombres = [c.nombre_categoria for c in dao.obtener_categorias(grupo_id)]
+    assert nombres == ["Proyecto"], "la ponderación guardada por otro proceso no se ve"
+    aciertos = cache_categorias.aciertos
+    dao.obtener_categorias(grupo_id)
+    assert cache_categorias.aciertos == aciertos + 1, "sin cambios externos la lectura debía salir de la caché"
+
+
+def ejecutar(alumnos=40, repeticiones=200):
+    with tempfile.TemporaryDirectory() as carpeta:
+        conexiones.configurar_db_file(os.path.join(carpeta, "categorias.db"))
+        cache_categorias.limpiar()
+        GrupoDAO().crear_grupo(Grupo(None, "Grupo 1", "2025-2026"))
+        AlumnoDAO().ejecutar_queries_multiples(
+            "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', 1)",
+            [(f"C{i:05d}", f"Alumno {i:05d}") for i in range(alumnos)]
+        )
+        gestor = GestorCalificaciones(1)
+        contador = ContadorSentencias()
+
+        resultado = {"alumnos_grupo": alumnos, "repeticiones": repeticiones}
+        for forma in ("anterior", "actual"):
+            anterior = forma == "anterior"
+            resultado[forma] = {
+                "abrir_registro": medir(lambda: abrir_registro(anterior), contador, repeticiones),
+                "recalcular_promedios": medir(lambda: recalcular(gestor, anterior), contador, repeticiones),
+                "grupo_nuevo": medir_grupo_nuevo(contador, anterior),
+            }
+        contador.detener()
+
+        cache_categorias.reiniciar_estadisticas()
+        for _ in range(repeticiones):
+            abrir_registro(False)
+        resultado["estadisticas_cache"] = cache_categorias.estadisticas()
+
+        verificar_invalidacion()
+        resultado["invalidacion"] = "ok"
+        verificar_dos_procesos()
+        resultado["dos_procesos"] = "ok"
+        gestor.cerrar()
+        conexiones.cerrar_todas()
+
+    resultado["sentencias_evitadas"] = {
+        escenario: round(resultado["anterior"][escenario]["sentencias"] - resultado["actual"][escenario]["sentencias"], 1)
+        for escenario in ("abrir_registro", "recalcular_promedios", "grupo_nuevo")
+    }
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=40, help="Alumnos del grupo")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(ejecutar(args.alumnos, args.repeticiones), indent=2, ensure_ascii=False))
@@ -0,0 +1,123 @@
+"""
+Benchmark de la caché de rosters (Datos/cache_roster.py).
+
+Mide N lecturas del roster de un grupo con la caché y consultando SQLite cada
+vez, y comprueba que crear, actualizar, eliminar e importar alumnos invalidan
+solo el grupo afectado (la siguiente lectura ve el cambio). También comprueba
+que los cambios hechos por otro proceso sobre la misma base (otra instancia de
+la aplicación) se ven en la siguiente lectura (PRAGMA data_version).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_cache_roster.py --alumnos 40 --lecturas 5000
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.cache_roster import cache_roster
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, GrupoDAO
+from model import Alumno, Grupo
+
+
+def verificar_invalidacion(dao):
+    """Cada escritura debe verse en la siguiente lectura; el otro grupo sigue en caché."""
+    dao.obtener_alumnos_por_grupo(1)
+    dao.obtener_alumnos_por_grupo(2)
+
+    dao.crear_alumno(Alumno("N0001", "Alumno Nuevo", "", ""), 1)
+    assert "N0001" in [f[0] for f in dao.obtener_alumnos_por_grupo(1)], "crear_alumno no invalidó el grupo"
+
+    dao.actualizar_alumno(Alumno("N0001", "Alumno Renombrado", "", ""))
+    assert ("N0001", "Alumno Renombrado") in [f[:2] for f in dao.obtener_alumnos_por_grupo(1)], \
+        "actualizar_alumno no invalidó el grupo"
+
+    aciertos = cache_roster.aciertos
+    dao.obtener_alumnos_por_grupo(2)
+    assert cache_roster.aciertos == aciertos + 1, "una escritura del grupo 1 invalidó el grupo 2"
+
+    dao.eliminar_alumno("N0001")
+    assert "N0001" not in [f[0] for f in dao.obtener_alumnos_por_grupo(1)], "eliminar_alumno no invalidó el grupo"
+    assert dao.existe_matricula_en_grupo("N0001", 1) is False
+
+    dao.importar_alumnos(1, [[(1, "N0002", "Alumno Importado", "", "")]])
+    assert "N0002" in [f[0] for f in dao.obtener_alumnos_por_grupo(1)], "importar_alumnos no invalidó el grupo"
+
+
+def _escribir_en_otro_proceso(db_file):
+    """Otra instancia de la aplicación: agrega un alumno al grupo 1 y renombra uno del grupo 2."""
+    dao = AlumnoDAO(db_file)
+    dao.crear_alumno(Alumno("P0001", "Alumno de Otro Proceso", "", ""), 1)
+    dao.ejecutar_query("UPDATE alumnos SET nombre_completo = 'Renombrado por Otro Proceso' WHERE matricula = 'E000001'")
+    conexiones.cerrar_todas()
+
+
+def verificar_dos_procesos(dao):
+    """Lo escrito por otro proceso se ve en la siguiente lectura; sin cambios se sigue usando la caché."""
+    dao.obtener_alumnos_por_grupo(1)
+    dao.obtener_alumnos_por_grupo(2)
+    assert dao.existe_matricula_en_grupo("P0001", 1) is False
+
+    # spawn: el proceso hijo abre sus propias conexiones (no hereda las de este)
+    proceso = multiprocessing.get_context("spawn").Process(target=_escribir_en_otro_proceso, args=(dao._db_file,))
+    proceso.start()
+    proceso.join()
+    assert proceso.exitcode == 0, "falló el proceso que escribe"
+
+    assert dao.existe_matricula_en_grupo("P0001", 1) is True, "existe_matricula_en_grupo usó un roster viejo"
+    assert "P0001" in [f[0] for f in dao.obtener_alumnos_por_grupo(1)], "el alumno del otro proceso no se ve"
+    assert ("E000001", "Renombrado por Otro Proceso") in [f[:2] for f in dao.obtener_alumnos_por_grupo(2)], \
+        "el cambio del otro proceso en el grupo 2 no se ve"
+
+    aciertos = cache_roster.aciertos
+    dao.obtener_alumnos_por_grupo(1)
+    assert cache_roster.aciertos == aciertos + 1, "sin cambios externos la lectura debía salir de la caché"
+
+
+def ejecutar(alumnos, lecturas):
+    with tempfile.TemporaryDirectory() as carpeta:
+        conexiones.configurar_db_file(os.path.join(carpeta, "cache.db"))
+        cache_roster.limpiar()
+        for g in range(2):
+            GrupoDAO().crear_grupo(Grupo(None, f"Grupo {g + 1}", "2025-2026"))
+        dao = AlumnoDAO()
+        dao.ejecutar_queries_multiples(
+            "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', ?)",
+            [(f"E{i:06d}", f"Alumno {i:06d}", i % 2 + 1) for i in range(alumnos * 2)]
+        )
+
+        inicio = time.perf_counter()
+        for _ in range(lecturas):
+            dao.ejecutar_query(
+                "SELECT matricula, nombre_completo, datos_contacto, email FROM alumnos WHERE grupo_id = ? ORDER BY nombre_completo",
+                (1,)
+            )
+        sin_cache = time.perf_counter() - inicio
+
+        cache_roster.reiniciar_estadisticas()
+        inicio = time.perf_counter()
+        for _ in range(lecturas):
+            dao.obtener_alumnos_por_grupo(1)
+        con_cache = time.perf_counter() - inicio
+        estadisticas = cache_roster.estadisticas()
+
+        verificar_invalidacion(dao)
+        verificar_dos_procesos(dao)
+        conexiones.cerrar_todas()
+    return {"alumnos_grupo": alumnos, "lecturas": lecturas,
+            "sin_cache_ms": round(sin_cache * 1000, 1), "con_cache_ms": round(con_cache * 1000, 1),
+            "aceleracion": round(sin_cache / con_cache, 1), "estadisticas": estadisticas,
+            "invalidacion": "ok", "dos_procesos": "ok"}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=40, help="Alumnos por grupo")
+    parser.add_argument("--lecturas", type=int, default=5000)
+    args = parser.parse_args()
+    print(ejecutar(args.alumnos, args.lecturas))
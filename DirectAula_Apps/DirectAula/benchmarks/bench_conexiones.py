@@ -0,0 +1,101 @@
+"""
+Benchmark: conexión persistente por hilo vs. conexión por consulta (comportamiento anterior).
+
+Mide operaciones/segundo de AsistenciaDAO.registrar_asistencia y
+CalificacionDAO.registrar_calificacion sobre una base de datos temporal.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_conexiones.py --operaciones 500
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, AsistenciaDAO, CalificacionDAO, GrupoDAO
+from Datos.migraciones import MIGRACIONES
+from model import Alumno, Calificacion, Grupo
+
+
+class _ConexionPorConsulta:
+    """Reproduce el BaseDAO original: DDL en cada constructor y un sqlite3.connect por consulta."""
+
+    def __init__(self, db_file=None):
+        self._db_file = db_file
+        # El BaseDAO original ejecutaba todo el DDL, una conexión por sentencia, en cada constructor
+        for migracion in MIGRACIONES:
+            for sentencia in migracion.sentencias:
+                self.ejecutar_query(sentencia)
+
+    def _conectar(self):
+        con = sqlite3.connect(self._db_file)
+        con.execute("PRAGMA foreign_keys = ON;")
+        return con
+
+    def _desconectar(self, con):
+        con.close()
+
+
+class AsistenciaDAOAnterior(_ConexionPorConsulta, AsistenciaDAO):
+    pass
+
+
+class CalificacionDAOAnterior(_ConexionPorConsulta, CalificacionDAO):
+    pass
+
+
+def _preparar_base(db_file, num_alumnos):
+    GrupoDAO(db_file).crear_grupo(Grupo(None, "Bench", "2025-2026"))
+    alumno_dao = AlumnoDAO(db_file)
+    matriculas = [f"B{i:06d}" for i in range(num_alumnos)]
+    for matricula in matriculas:
+        alumno_dao.crear_alumno(Alumno(matricula, f"Alumno {matricula}", "", ""), 1)
+    return matriculas
+
+
+def _medir(funcion, operaciones):
+    inicio = time.perf_counter()
+    for i in range(operaciones):
+        funcion(i)
+    return operaciones / (time.perf_counter() - inicio)
+
+
+def ejecutar(operaciones=300, num_alumnos=50):
+    resultados = {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        db_file = os.path.join(carpeta, "bench.db")
+        matriculas = _preparar_base(db_file, num_alumnos)
+
+        escenarios = {
+            "registrar_asistencia": (
+                lambda dao: (lambda i: dao.registrar_asistencia(matriculas[i % num_alumnos], f"2025-01-{i % 28 + 1:02d}", "Asistencia")),
+                AsistenciaDAOAnterior, AsistenciaDAO,
+            ),
+            "registrar_calificacion": (
+                lambda dao: (lambda i: dao.registrar_calificacion(Calificacion(matriculas[i % num_alumnos], "Tareas", float(i % 11), f"2025-02-{i % 28 + 1:02d}"))),
+                CalificacionDAOAnterior, CalificacionDAO,
+            ),
+        }
+        for nombre, (operacion, clase_anterior, clase_nueva) in escenarios.items():
+            # "Antes": cada clic construía un DAO nuevo y cada consulta abría su conexión.
+            antes = _medir(lambda i: operacion(clase_anterior(db_file))(i), operaciones)
+            despues = _medir(lambda i: operacion(clase_nueva(db_file))(i), operaciones)
+            resultados[nombre] = {"antes_ops_s": round(antes, 1), "despues_ops_s": round(despues, 1),
+                                  "mejora_x": round(despues / antes, 2)}
+        conexiones.cerrar_todas()
+    return resultados
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operaciones", type=int, default=300)
+    parser.add_argument("--alumnos", type=int, default=50)
+    args = parser.parse_args()
+
+    for nombre, r in ejecutar(args.operaciones, args.alumnos).items():
+        print(f"{nombre:<24} antes: {r['antes_ops_s']:>9.1f} ops/s   después: {r['despues_ops_s']:>9.1f} ops/s   ({r['mejora_x']}x)")
@@ -0,0 +1,98 @@
+"""
+Benchmark de la exportación de reportes (Logica/exportador_reportes.py).
+
+Llena una base temporal con N alumnos repartidos en varios grupos y D días de
+asistencia, exporta la matriz de asistencia de toda la escuela y mide el tiempo
+y el pico de memoria de Python (tracemalloc). Al duplicar N el pico debe
+mantenerse prácticamente igual: las filas se escriben conforme se leen.
+También comprueba que exportar no escribe en la base (p. ej. el reporte de
+calificaciones de grupos sin ponderación ni promedios guardados).
+
+Esos grupos se calculan en memoria uno a la vez, así que en el reporte de
+calificaciones el pico depende del tamaño del grupo más grande: para verlo
+constante fije el tamaño con --alumnos-por-grupo (por omisión hay 10 grupos).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_exportacion.py --alumnos 5000 10000 --dias 60 --formato csv
+    python benchmarks/bench_exportacion.py --alumnos 2000 4000 --tipo calificaciones --alumnos-por-grupo 40
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, GrupoDAO
+from Logica.exportador_reportes import ExportadorReportes
+from model import Grupo
+
+ESTADOS = ("Asistencia", "Ausente", "Retardo", "Justificado")
+
+
+def poblar(db_file, alumnos, dias, grupos=10):
+    conexiones.configurar_db_file(db_file)
+    for g in range(grupos):
+        GrupoDAO().crear_grupo(Grupo(None, f"Grupo {g + 1}", "2025-2026"))
+    dao = AlumnoDAO()
+    dao.ejecutar_queries_multiples(
+        "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', ?)",
+        [(f"E{i:06d}", f"Alumno {i:06d}", i % grupos + 1) for i in range(alumnos)]
+    )
+    fechas = [(date(2025, 9, 1) + timedelta(days=d)).isoformat() for d in range(dias)]
+    for fecha in fechas:
+        dao.ejecutar_queries_multiples(
+            "INSERT INTO asistencia (matricula, fecha, estado) VALUES (?, ?, ?)",
+            [(f"E{i:06d}", fecha, ESTADOS[(i + len(fecha)) % 4]) for i in range(alumnos)]
+        )
+
+
+def _conteo_tablas(db_file):
+    """Filas de las tablas que una exportación no debe tocar."""
+    with sqlite3.connect(db_file) as con:
+        return [con.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+                for tabla in ("categorias_evaluacion", "promedios_finales", "promedios_categoria")]
+
+
+def ejecutar(alumnos, dias=60, formato="csv", tipo="asistencia", alumnos_por_grupo=None):
+    grupos = -(-alumnos // alumnos_por_grupo) if alumnos_por_grupo else 10
+    with tempfile.TemporaryDirectory() as carpeta:
+        db_file = os.path.join(carpeta, "exportacion.db")
+        poblar(db_file, alumnos, dias, grupos)
+        antes = _conteo_tablas(db_file)
+        salida = os.path.join(carpeta, f"reporte.{formato}")
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        mensaje = ExportadorReportes().exportar(tipo, formato, salida)
+        duracion = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        tamano = os.path.getsize(salida)
+        conexiones.cerrar_todas()
+        sin_escrituras = _conteo_tablas(db_file) == antes
+    return {"alumnos": alumnos, "grupos": grupos, "dias": dias, "formato": formato, "segundos": round(duracion, 2),
+            "pico_memoria_kb": pico // 1024, "archivo_kb": tamano // 1024, "ok": mensaje.startswith("Éxito"),
+            "sin_escrituras": sin_escrituras}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, nargs="+", default=[5000, 10000])
+    parser.add_argument("--dias", type=int, default=60)
+    parser.add_argument("--formato", choices=["csv", "xlsx", "pdf"], default="csv")
+    parser.add_argument("--tipo", choices=["alumnos", "asistencia", "calificaciones"], default="asistencia")
+    parser.add_argument("--alumnos-por-grupo", type=int, default=None)
+    args = parser.parse_args()
+
+    app = None
+    if args.formato == "pdf":
+        from PyQt5.QtGui import QGuiApplication
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication([])
+    for n in args.alumnos:
+        print(ejecutar(n, args.dias, args.formato, args.tipo, args.alumnos_por_grupo))
@@ -0,0 +1,69 @@
+"""
+Benchmark de la importación masiva del roster (Logica/importador_alumnos.py).
+
+Genera un CSV con N alumnos (con algunas filas inválidas a propósito) y lo
+importa a un grupo de una base de datos temporal. Se compara con el flujo
+anterior: agregar_nuevo_alumno fila por fila.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_importacion_alumnos.py --filas 10000
+    python benchmarks/bench_importacion_alumnos.py --filas 2000 --comparar
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import conexiones
+from Datos.dao import GrupoDAO
+from Logica.gestor_alumnos import GestorAlumnos
+from model import Grupo
+
+
+def generar_csv(ruta, filas):
+    """Escribe `filas` alumnos; 1 de cada 100 sin nombre y 1 de cada 250 con matrícula repetida."""
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["Matrícula", "Nombre Completo", "Contacto", "Email"])
+        for i in range(filas):
+            matricula = f"A{(i - 1 if i % 250 == 249 else i):06d}"
+            nombre = "" if i % 100 == 99 else f"Alumno {i:06d}"
+            escritor.writerow([matricula, nombre, f"55{i:08d}", f"alumno{i}@escuela.mx"])
+
+
+def ejecutar(filas=10000, comparar=False):
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_csv = os.path.join(carpeta, "roster.csv")
+        generar_csv(ruta_csv, filas)
+        conexiones.configurar_db_file(os.path.join(carpeta, "importacion.db"))
+        GrupoDAO().crear_grupo(Grupo(None, "Importación", "2025-2026"))
+        GrupoDAO().crear_grupo(Grupo(None, "Fila por fila", "2025-2026"))
+
+        inicio = time.perf_counter()
+        resultado = GestorAlumnos(1).importar_alumnos_desde_archivo(ruta_csv)
+        r = {"filas": filas, "importados": resultado.importados, "rechazados": len(resultado.errores),
+             "importacion_s": round(time.perf_counter() - inicio, 3)}
+
+        if comparar:
+            gestor = GestorAlumnos(2)
+            with open(ruta_csv, newline="", encoding="utf-8") as f:
+                lector = csv.reader(f)
+                next(lector)
+                inicio = time.perf_counter()
+                for matricula, nombre, contacto, email in lector:
+                    gestor.agregar_nuevo_alumno("B" + matricula, nombre, contacto, email)
+            r["fila_por_fila_s"] = round(time.perf_counter() - inicio, 3)
+        conexiones.cerrar_todas()
+    return r
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10000)
+    parser.add_argument("--comparar", action="store_true", help="Mide también el alta fila por fila")
+    args = parser.parse_args()
+    print(ejecutar(args.filas, args.comparar))
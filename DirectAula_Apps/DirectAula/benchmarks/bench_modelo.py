@@ -0,0 +1,153 @@
+"""
+Benchmark de las entidades de model.py al cargar y guardar muchas filas.
+
+Compara, sobre un grupo de 100 000 alumnos y 100 000 calificaciones:
+  - tuplas: filas de sqlite3 tal cual (lo que ya devolvían las consultas).
+  - clase_anterior: las entidades como eran antes (clase con __dict__ y
+    getters), construidas fila por fila después de la consulta.
+  - entidades: las NamedTuple actuales, construidas por la row_factory del DAO
+    (Datos/dao.py: fabrica_filas).
+Memoria: bytes retenidos por fila (tracemalloc) y, sin contar los valores
+(cadenas iguales en las tres formas), los del contenedor de cada fila.
+Tiempo: mediana en ms. En Python 3.11+ una clase con __dict__ guarda sus
+atributos en línea mientras nadie lea __dict__, así que la diferencia es
+menor que en versiones anteriores.
+Escritura: registrar_calificaciones recibiendo las entidades tal cual contra
+convertir antes cada objeto a una tupla de parámetros con sus getters.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_modelo.py --filas 100000
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, CalificacionDAO, GrupoDAO, fabrica_filas
+from model import Alumno, Calificacion, Grupo
+
+CONSULTA_ALUMNOS = "SELECT matricula, nombre_completo, datos_contacto, email FROM alumnos WHERE grupo_id = ?"
+
+
+class AlumnoAnterior:
+    """Alumno como estaba definido antes en model.py (referencia de comparación)."""
+
+    def __init__(self, matricula, nombre_completo, datos_contacto, email):
+        self._matricula = matricula
+        self._nombre_completo = nombre_completo
+        self._datos_contacto = datos_contacto
+        self._email = email
+        self._grupo_id = None
+
+
+class CalificacionAnterior:
+    """Calificacion como estaba definida antes en model.py (referencia de comparación)."""
+
+    def __init__(self, matricula, categoria, valor, fecha=None):
+        self._matricula = matricula
+        self._categoria = categoria
+        self._valor = valor
+        self._fecha = fecha
+
+    def get_matricula(self): return self._matricula
+    def get_categoria(self): return self._categoria
+    def get_valor(self): return self._valor
+    def get_fecha(self): return self._fecha
+
+
+def preparar(filas):
+    GrupoDAO().crear_grupo(Grupo(None, "Modelo", "2025-2026"))
+    bloque = [(i, f"M{i:06d}", f"Alumno {i:06d}", "", f"m{i}@escuela.mx") for i in range(filas)]
+    AlumnoDAO().importar_alumnos(1, [bloque])
+
+
+def cargar(forma):
+    dao = AlumnoDAO()
+    if forma == "tuplas":
+        return dao.ejecutar_query(CONSULTA_ALUMNOS, (1,))
+    if forma == "clase_anterior":
+        return [AlumnoAnterior(*fila) for fila in dao.ejecutar_query(CONSULTA_ALUMNOS, (1,))]
+    return dao.ejecutar_query(CONSULTA_ALUMNOS, (1,), fabrica_filas(Alumno))
+
+
+def medir_carga(forma, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect() # Que la basura de la forma anterior no se cobre en esta
+        inicio = time.perf_counter()
+        filas = cargar(forma)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        del filas
+    # Memoria en una pasada aparte: tracemalloc hace más lento a Python
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    filas = cargar(forma)
+    retenidos, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    bytes_por_fila = (retenidos - antes) / len(filas)
+    # Los valores son las mismas cadenas en todas las formas; se leen de las filas crudas
+    valores = sum(sys.getsizeof(v) for fila in cargar("tuplas") for v in fila) / len(filas)
+    return {
+        "mediana_ms": round(statistics.median(tiempos), 1),
+        "bytes_por_fila": round(bytes_por_fila),
+        "contenedor_bytes_por_fila": round(bytes_por_fila - valores),
+    }
+
+
+def medir_escritura(filas, repeticiones):
+    dao = CalificacionDAO()
+    query_anterior = "REPLACE INTO calificaciones (matricula, categoria, fecha, valor) VALUES (?, ?, ?, ?)"
+    anteriores = [CalificacionAnterior(f"M{i:06d}", "Tareas", 8.5, "2025-03-01") for i in range(filas)]
+    entidades = [Calificacion(f"M{i:06d}", "Tareas", 8.5, "2025-03-01") for i in range(filas)]
+
+    def guardar_anterior():
+        params_list = [(c.get_matricula(), c.get_categoria(), c.get_fecha(), c.get_valor()) for c in anteriores]
+        return dao.ejecutar_queries_multiples(query_anterior, params_list)
+
+    resultado = {}
+    for nombre, guardar in (("tuplas_desde_getters", guardar_anterior),
+                            ("entidades", lambda: dao.registrar_calificaciones(entidades))):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            if not guardar():
+                raise RuntimeError(f"Falló el guardado ({nombre})")
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        resultado[nombre] = round(statistics.median(tiempos), 1)
+    return resultado
+
+
+def ejecutar(filas=100_000, repeticiones=5):
+    with tempfile.TemporaryDirectory() as carpeta:
+        conexiones.configurar_db_file(os.path.join(carpeta, "modelo.db"))
+        preparar(filas)
+        resultado = {
+            "filas": filas,
+            "carga_alumnos": {forma: medir_carga(forma, repeticiones)
+                              for forma in ("tuplas", "clase_anterior", "entidades")},
+            "guardar_calificaciones_ms": medir_escritura(filas, repeticiones),
+        }
+        conexiones.cerrar_todas()
+    resultado["python"] = sys.version.split()[0]
+    for medida in ("bytes_por_fila", "contenedor_bytes_por_fila"):
+        anterior = resultado["carga_alumnos"]["clase_anterior"][medida]
+        actual = resultado["carga_alumnos"]["entidades"][medida]
+        resultado[f"{medida}_vs_anterior"] = round(actual / anterior, 2)
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(ejecutar(args.filas, args.repeticiones), indent=2, ensure_ascii=False))
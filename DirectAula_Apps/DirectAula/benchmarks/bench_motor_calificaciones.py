@@ -0,0 +1,80 @@
+"""
+Benchmark: escalado del motor de promedios finales (Logica/motor_calificaciones.py).
+
+Genera calificaciones sintéticas en memoria (alumnos × categorías × elementos)
+y mide el tiempo de calcular_promedios para cada escala. Las escalas con
+presupuesto (miles de alumnos × decenas de categorías) deben quedar por debajo
+de él; si no, el script termina con código 1. La de 5000x36 (~470 mil notas)
+no tiene presupuesto: sin NumPy la pasada cuesta ~0.2 µs por nota.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_motor_calificaciones.py
+    python benchmarks/bench_motor_calificaciones.py --escala 5000x40
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Logica.motor_calificaciones import calcular_promedios
+from model import CategoriaEvaluacion
+
+ESCALAS_PREDETERMINADAS = ["100x4", "1000x12", "2000x24", "5000x36"]
+PRESUPUESTOS_MS = {"1000x12": 25, "2000x24": 60} # Mediana máxima aceptada
+
+
+def generar_datos(num_alumnos, num_categorias, semilla=2025):
+    """Genera categorías (1 de cada 4 con varios elementos) y sus calificaciones."""
+    azar = random.Random(semilla)
+    peso = 100.0 / num_categorias
+    categorias = [
+        CategoriaEvaluacion(1, f"Categoria {j}", peso, 10 if j % 4 == 0 else 1)
+        for j in range(num_categorias)
+    ]
+    matriculas = [f"A{i:06d}" for i in range(num_alumnos)]
+    calificaciones = []
+    for matricula in matriculas:
+        for cat in categorias:
+            # Algunas tareas quedan sin entregar
+            entregadas = azar.randint(cat.get_max_items() // 2, cat.get_max_items()) if cat.get_max_items() > 1 else 1
+            for _ in range(entregadas):
+                calificaciones.append((matricula, cat.get_nombre_categoria(), round(azar.uniform(5, 10), 1)))
+    return categorias, calificaciones, matriculas
+
+
+def ejecutar(escalas=ESCALAS_PREDETERMINADAS, repeticiones=5):
+    resultados = []
+    for escala in escalas:
+        num_alumnos, num_categorias = (int(x) for x in escala.split("x"))
+        categorias, calificaciones, matriculas = generar_datos(num_alumnos, num_categorias)
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            calcular_promedios(categorias, calificaciones, matriculas)
+            tiempos.append(time.perf_counter() - inicio)
+        resultados.append({
+            "alumnos": num_alumnos, "categorias": num_categorias, "filas": len(calificaciones),
+            "ms_mediana": round(sorted(tiempos)[len(tiempos) // 2] * 1000, 2),
+            "presupuesto_ms": PRESUPUESTOS_MS.get(escala),
+        })
+    return resultados
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escala", action="append", help="ALUMNOSxCATEGORIAS (se puede repetir)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    excedidos = 0
+    for r in ejecutar(args.escala or ESCALAS_PREDETERMINADAS, args.repeticiones):
+        presupuesto = r["presupuesto_ms"]
+        nota = "" if presupuesto is None else f" (presupuesto {presupuesto} ms)"
+        if presupuesto is not None and r["ms_mediana"] > presupuesto:
+            excedidos += 1
+            nota += " EXCEDIDO"
+        print(f"{r['alumnos']:>6} alumnos × {r['categorias']:>3} categorías ({r['filas']:>8} notas): {r['ms_mediana']:>8.2f} ms{nota}")
+    sys.exit(1 if excedidos else 0)
@@ -0,0 +1,264 @@
+"""
+Benchmark sin pantalla de las ventanas con tablas (Presentacion/).
+
+Abre cada ventana con QT_QPA_PLATFORM=offscreen sobre un grupo generado
+(benchmarks/generador_escuela.py) y mide, como lo vería el docente:
+  - primer_pintado: de crear la ventana al primer pintado de la tabla (con o
+    sin datos, según termine antes la consulta o el pintado).
+  - tabla_completa: de crear la ventana a pintar la tabla con TODAS las filas
+    cargadas (incluye la consulta en el hilo de trabajo y el reset del modelo).
+  - recorrido: pintar la tabla de principio a fin, página por página.
+y, en una pasada aparte (tracemalloc hace más lento a Python), la memoria de
+la ventana ya llena: bytes de Python (tracemalloc) y de todo el proceso (RSS,
+Linux; aproximado: incluye la caché de páginas de SQLite que llenan las
+consultas y el proceso reutiliza memoria liberada). Con dos o más
+tamaños de grupo se reporta además la memoria por fila: la pendiente entre el
+grupo más chico y el más grande, sin el costo fijo de la ventana.
+
+Ventanas: alumnos (VentanaAlumnos), asistencia del día y por rango de un mes
+(VentanaAsistencia) y calificaciones (VentanaRegistroCalificaciones).
+El resultado es JSON comparable con benchmarks/suite.py (--comparar).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/bench_ventanas.py --alumnos 40 500 2000 --salida ventanas.json
+    python benchmarks/bench_ventanas.py --alumnos 40 500 2000 --comparar ventanas.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from PyQt5.QtCore import QDate, QEvent, QEventLoop, QObject, qInstallMessageHandler
+from PyQt5.QtWidgets import QApplication, QStyleFactory
+
+from Datos.cache_categorias import cache_categorias
+from Datos.cache_roster import cache_roster
+from Datos.conexion import conexiones
+from Presentacion.tareas import ejecutor_bd
+from benchmarks.generador_escuela import SEMILLA, EscalaEscuela, fechas_clase, generar_escuela
+from benchmarks.suite import commit_actual, comparar, resumir_tiempos
+
+LIMITE_ESPERA_S = 60
+
+
+
+def _filtrar_mensajes_qt(tipo, contexto, mensaje):
+    # El plugin offscreen avisa en cada ventana que no soporta propagateSizeHints()
+    if "propagateSizeHints" not in mensaje:
+        sys.stderr.write(mensaje + "\n")
+
+
+qInstallMessageHandler(_filtrar_mensajes_qt)
+
+
+class RegistroPintado(QObject):
+    """Guarda el instante de cada pintado de un widget (filtro de eventos)."""
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.pintados = []
+        widget.installEventFilter(self)
+
+    def eventFilter(self, objeto, evento):
+        if evento.type() == QEvent.Paint:
+            self.pintados.append(time.perf_counter())
+        return False
+
+    def pintado_despues_de(self, instante):
+        return any(t > instante for t in self.pintados)
+
+
+def esperar(condicion, descripcion):
+    """Procesa eventos de Qt hasta que condicion() sea verdadera."""
+    limite = time.perf_counter() + LIMITE_ESPERA_S
+    app = QApplication.instance()
+    while not condicion():
+        if time.perf_counter() > limite:
+            raise TimeoutError(f"Tiempo agotado esperando: {descripcion}")
+        app.processEvents(QEventLoop.AllEvents, 5)
+
+
+def rss_bytes():
+    """Memoria residente del proceso (solo Linux; None en otros sistemas)."""
+    try:
+        with open("/proc/self/statm") as archivo:
+            return int(archivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _vista_ventanas(fecha_datos):
+    """{nombre: (crear(grupo_id), tabla(ventana), preparar(ventana) o None)}"""
+    from Presentacion.ventana_alumnos import VentanaAlumnos
+    from Presentacion.ventana_asistencia import VentanaAsistencia
+    from Presentacion.ventana_registro_calificaciones import VentanaRegistroCalificaciones
+
+    def rango_mes(ventana):
+        # Del primer día del mes de la última fecha con datos a esa fecha (como en la ventana)
+        ventana.fecha_fin.setDate(QDate.fromString(fecha_datos, "yyyy-MM-dd"))
+        ventana.chk_rango.setChecked(True)
+
+    return {
+        "alumnos": (lambda g: VentanaAlumnos(g, "Benchmark"), lambda v: v.tabla_alumnos, None),
+        "asistencia_dia": (lambda g: VentanaAsistencia(g, "Benchmark"), lambda v: v.tabla_asistencia, None),
+        "asistencia_mes": (lambda g: VentanaAsistencia(g, "Benchmark"), lambda v: v.tabla_asistencia, rango_mes),
+        "calificaciones": (lambda g: VentanaRegistroCalificaciones(g, "Benchmark"),
+                           lambda v: v.tabla_calificaciones, None),
+    }
+
+
+def _abrir(crear, tabla_de, preparar, filas):
+    """
+    Abre la ventana y espera a que pinte la tabla llena.
+    Retorna (ventana, tabla, primer_pintado_ms, tabla_completa_ms).
+    """
+    # Cada apertura consulta la base, como la primera del día
+    cache_roster.limpiar()
+    cache_categorias.limpiar()
+    inicio = time.perf_counter()
+    ventana = crear(1)
+    tabla = tabla_de(ventana)
+    pintado = RegistroPintado(tabla.viewport())
+    ventana.show()
+    cargas = []
+    tabla.model().modelReset.connect(lambda: cargas.append(time.perf_counter()))
+    esperar(lambda: pintado.pintados, "primer pintado")
+    primer_pintado = (pintado.pintados[0] - inicio) * 1000
+    esperar(lambda: tabla.model().rowCount() >= filas, "carga de la tabla")
+    if preparar is not None:
+        # La vista por rango se mide desde que el docente la activa
+        inicio = time.perf_counter()
+        preparar(ventana)
+        tabla.model().modelReset.connect(lambda: cargas.append(time.perf_counter()))
+        esperar(lambda: tabla.model().columnCount() > 3 and tabla.model().rowCount() >= filas, "carga del rango")
+    # El pintado puede ocurrir en la misma vuelta de eventos que el reset: se busca
+    # el primero posterior al último reset del modelo
+    cargada = cargas[-1]
+    esperar(lambda: pintado.pintado_despues_de(cargada), "pintado con datos")
+    return ventana, tabla, primer_pintado, (min(t for t in pintado.pintados if t > cargada) - inicio) * 1000
+
+
+def _recorrer(tabla):
+    """Pinta la tabla completa página por página (ms)."""
+    barra = tabla.verticalScrollBar()
+    inicio = time.perf_counter()
+    for valor in range(barra.minimum(), barra.maximum() + barra.pageStep(), max(1, barra.pageStep())):
+        barra.setValue(valor)
+        tabla.viewport().repaint() # Pintado síncrono
+    return (time.perf_counter() - inicio) * 1000
+
+
+def _cerrar(ventana):
+    ventana.close()
+    ventana.deleteLater()
+    ejecutor_bd().esperar() # Termina los guardados de closeEvent
+    QApplication.instance().processEvents()
+
+
+def medir_tiempos(crear, tabla_de, preparar, filas, repeticiones):
+    medidas = {"primer_pintado": [], "tabla_completa": [], "recorrido": []}
+    for _ in range(repeticiones):
+        ventana, tabla, primer_pintado, completa = _abrir(crear, tabla_de, preparar, filas)
+        medidas["primer_pintado"].append(primer_pintado)
+        medidas["tabla_completa"].append(completa)
+        medidas["recorrido"].append(_recorrer(tabla))
+        _cerrar(ventana)
+    return {nombre: resumir_tiempos(tiempos) for nombre, tiempos in medidas.items()}
+
+
+def medir_memoria(crear, tabla_de, preparar, filas):
+    """Bytes que ocupa la ventana llena (Python con tracemalloc y RSS del proceso)."""
+    QApplication.instance().processEvents()
+    rss_antes = rss_bytes()
+    tracemalloc.start()
+    ventana, _, _, _ = _abrir(crear, tabla_de, preparar, filas)
+    python_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_despues = rss_bytes()
+    _cerrar(ventana)
+    return {"python_bytes": python_bytes, "rss_bytes": rss_despues - rss_antes if rss_antes is not None else None}
+
+
+def memoria_por_fila(medidas):
+    """Pendiente {python, rss} en bytes por fila entre el tamaño menor y el mayor de {filas: medida}."""
+    if len(medidas) < 2:
+        return None
+    menor, mayor = min(medidas), max(medidas)
+    return {
+        clave: round((medidas[mayor][f"{clave}_bytes"] - medidas[menor][f"{clave}_bytes"]) / (mayor - menor))
+        if medidas[mayor][f"{clave}_bytes"] is not None else None
+        for clave in ("python", "rss")
+    }
+
+
+def ejecutar(tamanos, repeticiones=5, ventanas=None, semilla=SEMILLA):
+    app = QApplication.instance() or QApplication([])
+    # Mismo estilo que app.py: la hoja de estilos cambia el costo de pintar
+    app.setStyle(QStyleFactory.create('Fusion'))
+    with open(os.path.join(RAIZ_APP, 'style.css'), encoding="utf-8") as archivo:
+        app.setStyleSheet(archivo.read())
+
+    escenarios, memoria = {}, {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        for alumnos in tamanos:
+            # Un grupo por tamaño: cada ventana abre el grupo 1 de su propia base
+            escala = EscalaEscuela(grupos=1, alumnos_por_grupo=alumnos, dias_asistencia=60)
+            generar_escuela(os.path.join(carpeta, f"ventanas_{alumnos}.db"), escala, semilla)
+            fecha_datos = fechas_clase(escala.dias_asistencia)[-1]
+            for nombre, (crear, tabla_de, preparar) in _vista_ventanas(fecha_datos).items():
+                if ventanas and nombre not in ventanas:
+                    continue
+                clave = f"{nombre}_{alumnos}"
+                for metrica, medida in medir_tiempos(crear, tabla_de, preparar, alumnos, repeticiones).items():
+                    escenarios[f"{clave}.{metrica}"] = medida
+                memoria.setdefault(nombre, {})[alumnos] = medir_memoria(crear, tabla_de, preparar, alumnos)
+            conexiones.cerrar_todas()
+    for medidas in memoria.values():
+        medidas["por_fila"] = memoria_por_fila(medidas)
+
+    return {
+        "commit": commit_actual(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "plataforma": QApplication.platformName(),
+        "escala": "ventanas-" + "-".join(str(t) for t in tamanos),
+        "semilla": semilla,
+        "escenarios": escenarios,
+        "memoria": memoria,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, nargs="+", default=[40, 500, 2000], help="Alumnos del grupo")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--ventanas", nargs="+", help="Solo estas ventanas (alumnos, asistencia_dia, ...)")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por omisión se imprime)")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=1.5)
+    args = parser.parse_args()
+
+    resultado = ejecutar(args.alumnos, args.repeticiones, args.ventanas)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        lineas, regresiones = comparar(resultado, base, args.tolerancia)
+        print("\n".join(lineas))
+        if regresiones:
+            print(f"{len(regresiones)} medida(s) con regresión: {', '.join(regresiones)}")
+            sys.exit(1)
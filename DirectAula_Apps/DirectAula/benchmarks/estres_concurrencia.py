@@ -0,0 +1,135 @@
+"""
+Prueba de estrés: varios procesos escribiendo asistencia y calificaciones a la vez
+sobre la MISMA base de datos (como dos o más instancias de DirectAula en el laboratorio).
+
+Cada proceso usa los DAO reales con el perfil de almacenamiento configurado
+(WAL + busy_timeout + reintentos). Al final se verifica que ninguna escritura
+se haya perdido y que ninguna operación haya fallado por "database is locked".
+Además, dentro de un solo proceso, dos hilos usan a la vez el MISMO DAO (como la
+ventana y el hilo de trabajo de Presentacion/tareas.py con un mismo gestor).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/estres_concurrencia.py --procesos 4 --operaciones 200
+    python benchmarks/estres_concurrencia.py --perfil compatible
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import PERFIL_COMPATIBLE, PERFIL_PREDETERMINADO, conexiones
+from Datos.dao import AlumnoDAO, AsistenciaDAO, CalificacionDAO, GrupoDAO
+from model import Alumno, Calificacion, Grupo
+
+PERFILES = {"wal": PERFIL_PREDETERMINADO, "compatible": PERFIL_COMPATIBLE}
+
+
+def _trabajador(db_file, perfil, indice, operaciones, alumnos, cola):
+    conexiones.configurar_perfil(PERFILES[perfil])
+    asistencia_dao = AsistenciaDAO(db_file)
+    calificacion_dao = CalificacionDAO(db_file)
+    fallos = 0
+    inicio = time.perf_counter()
+    for i in range(operaciones):
+        matricula = f"E{(indice * operaciones + i) % alumnos:05d}"
+        # Cada proceso escribe claves propias (categoría = proceso, un elemento por operación)
+        # para poder verificar el total
+        fecha = f"2025-{indice + 1:02d}-{i % 28 + 1:02d}"
+        if not asistencia_dao.registrar_asistencia(matricula, fecha, "Asistencia"):
+            fallos += 1
+        if not calificacion_dao.registrar_calificacion(Calificacion(matricula, f"Proceso {indice}", 9.0, fecha, i + 1)):
+            fallos += 1
+        # Lectura concurrente, como la ventana de asistencia abierta en otra instancia
+        asistencia_dao.obtener_asistencia_del_dia(fecha, 1)
+    cola.put((indice, fallos, time.perf_counter() - inicio))
+    conexiones.cerrar_todas()
+
+
+def _dao_compartido_entre_hilos(db_file, operaciones, alumnos):
+    """Un hilo escribe y otro lee con las MISMAS instancias de DAO. Retorna las operaciones fallidas."""
+    alumno_dao = AlumnoDAO(db_file)
+    calificacion_dao = CalificacionDAO(db_file)
+    fallos = []
+
+    def escribir():
+        for i in range(operaciones):
+            calificacion = Calificacion(f"E{i % alumnos:05d}", "Hilos", 8.0, "2025-03-01", i // alumnos + 1)
+            if not calificacion_dao.registrar_calificacion(calificacion):
+                fallos.append(i)
+        conexiones.cerrar_hilo_actual()
+
+    def leer():
+        for i in range(operaciones):
+            if alumno_dao.ejecutar_query("SELECT matricula FROM alumnos WHERE grupo_id = ?", (1,)) is False:
+                fallos.append(i)
+            if calificacion_dao.obtener_calificaciones_por_grupo_categoria(1, "Hilos") is False:
+                fallos.append(i)
+        conexiones.cerrar_hilo_actual()
+
+    hilos = [threading.Thread(target=escribir), threading.Thread(target=leer)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    guardadas = calificacion_dao.ejecutar_query("SELECT COUNT(*) FROM calificaciones WHERE categoria = 'Hilos'")[0][0]
+    return len(fallos) + (operaciones - guardadas)
+
+
+def ejecutar(procesos=4, operaciones=200, alumnos=100, perfil="wal"):
+    with tempfile.TemporaryDirectory() as carpeta:
+        db_file = os.path.join(carpeta, "estres.db")
+        conexiones.configurar_perfil(PERFILES[perfil])
+        GrupoDAO(db_file).crear_grupo(Grupo(None, "Estrés", "2025-2026"))
+        AlumnoDAO(db_file).ejecutar_queries_multiples(
+            "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', 1)",
+            [(f"E{i:05d}", f"Alumno {i}") for i in range(alumnos)]
+        )
+        conexiones.cerrar_todas()
+
+        cola = multiprocessing.Queue()
+        trabajadores = [
+            multiprocessing.Process(target=_trabajador, args=(db_file, perfil, i, operaciones, alumnos, cola))
+            for i in range(procesos)
+        ]
+        inicio = time.perf_counter()
+        for t in trabajadores:
+            t.start()
+        resultados = [cola.get() for _ in trabajadores]
+        for t in trabajadores:
+            t.join()
+        duracion = time.perf_counter() - inicio
+
+        # Verificación: cada escritura exitosa debe estar en la base
+        dao = CalificacionDAO(db_file)
+        total_calificaciones = dao.ejecutar_query("SELECT COUNT(*) FROM calificaciones")[0][0]
+        fallos_hilos = _dao_compartido_entre_hilos(db_file, operaciones, alumnos)
+        conexiones.cerrar_todas()
+
+    fallos = sum(r[1] for r in resultados)
+    return {
+        "perfil": perfil, "procesos": procesos, "operaciones_por_proceso": operaciones,
+        "fallos": fallos, "calificaciones_esperadas": procesos * operaciones,
+        "calificaciones_guardadas": total_calificaciones,
+        "escrituras_por_s": round(2 * procesos * operaciones / duracion, 1),
+        "fallos_dao_compartido_entre_hilos": fallos_hilos,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--operaciones", type=int, default=200)
+    parser.add_argument("--perfil", choices=sorted(PERFILES), default="wal")
+    args = parser.parse_args()
+
+    r = ejecutar(args.procesos, args.operaciones, perfil=args.perfil)
+    print(r)
+    correcto = (r["fallos"] == 0 and r["calificaciones_guardadas"] == r["calificaciones_esperadas"]
+                and r["fallos_dao_compartido_entre_hilos"] == 0)
+    print("OK: sin escrituras perdidas ni bloqueos." if correcto else "FALLO: hubo escrituras perdidas o bloqueadas.")
+    sys.exit(0 if correcto else 1)
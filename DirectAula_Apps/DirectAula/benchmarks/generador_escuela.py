@@ -0,0 +1,135 @@
+"""
+Generador determinista de una escuela sintética para benchmarks.
+
+Crea una base compatible con directaula.db (las mismas migraciones que usa la
+aplicación) con N grupos, alumnos por grupo, días hábiles de asistencia y
+calificaciones por categoría. Con la misma escala y semilla produce siempre
+los mismos datos, de modo que los resultados de distintos commits se pueden
+comparar (ver benchmarks/suite.py).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/generador_escuela.py escuela_demo.db --grupos 10 --alumnos 40 --dias 60 --calificaciones 3
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, GrupoDAO
+from Logica.gestor_alumnos import GestorCalificaciones
+from Logica.matriz_asistencia import dias_habiles
+from model import Grupo
+
+SEMILLA = 2025
+INICIO_CICLO = date(2025, 8, 25) # Lunes
+
+NOMBRES = ["José", "María", "Begoña", "Raúl", "Inés", "Jesús", "Sofía", "Ángel", "Lucía", "Iñaki",
+           "Carlos", "Fernanda", "Diego", "Valeria", "Emilio", "Ximena", "Rodrigo", "Paola", "Andrés", "Camila"]
+APELLIDOS = ["Núñez", "Pérez", "Gómez", "Ibáñez", "Martínez", "Rodríguez", "Muñoz", "López", "Suárez", "Peña",
+             "Hernández", "García", "Ramírez", "Torres", "Flores", "Rivera", "Cruz", "Morales", "Ortiz", "Vázquez"]
+# La misma ponderación que CategoriaEvaluacionDAO.CATEGORIAS_BASE
+CATEGORIAS = [("Asistencia", 10.0, 1), ("Examen Final", 40.0, 1), ("Participación", 10.0, 5), ("Tareas", 40.0, 10)]
+# Pesos de cada estado al generar la asistencia (la mayoría asiste)
+ESTADOS = [("Asistencia", 80), ("Ausente", 8), ("Retardo", 8), ("Justificado", 4)]
+
+
+class EscalaEscuela:
+    """Tamaño de la escuela generada."""
+
+    def __init__(self, grupos=10, alumnos_por_grupo=40, dias_asistencia=60, calificaciones_por_categoria=3):
+        self.grupos = grupos
+        self.alumnos_por_grupo = alumnos_por_grupo
+        self.dias_asistencia = dias_asistencia
+        self.calificaciones_por_categoria = calificaciones_por_categoria
+
+    def como_dict(self):
+        return dict(vars(self))
+
+
+def fechas_clase(dias):
+    """Los primeros `dias` días hábiles del ciclo (fechas ISO)."""
+    # 7 días naturales alcanzan para 5 hábiles
+    fin = INICIO_CICLO + timedelta(days=dias * 7 // 5 + 7)
+    return dias_habiles(INICIO_CICLO.isoformat(), fin.isoformat())[:dias]
+
+
+def matricula(grupo, alumno):
+    return f"G{grupo:03d}A{alumno:04d}"
+
+
+def generar_escuela(db_file, escala=None, semilla=SEMILLA):
+    """
+    Llena db_file (que no debe existir) y lo deja como la base predeterminada.
+    Retorna un resumen con la escala y el número de filas generadas.
+    """
+    if os.path.exists(db_file):
+        raise FileExistsError(f"La base {db_file} ya existe; el generador solo crea bases nuevas.")
+    escala = escala or EscalaEscuela()
+    azar = random.Random(semilla)
+    conexiones.configurar_db_file(db_file)
+    alumno_dao = AlumnoDAO()
+    fechas = fechas_clase(escala.dias_asistencia)
+    estados, pesos = zip(*ESTADOS)
+    resumen = {"alumnos": 0, "asistencias": 0, "calificaciones": 0}
+
+    for g in range(1, escala.grupos + 1):
+        GrupoDAO().crear_grupo(Grupo(None, f"{(g - 1) // 4 + 1}°{'ABCD'[(g - 1) % 4]}", "2025-2026"))
+        alumnos = [
+            (matricula(g, a), f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}",
+             f"55{azar.randrange(10 ** 8):08d}", f"{matricula(g, a).lower()}@escuela.mx", g)
+            for a in range(escala.alumnos_por_grupo)
+        ]
+        alumno_dao.ejecutar_queries_multiples(
+            "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, ?, ?, ?)",
+            alumnos
+        )
+        asistencias = [
+            (fila[0], fecha, estado)
+            for fila in alumnos
+            for fecha, estado in zip(fechas, azar.choices(estados, pesos, k=len(fechas)))
+        ]
+        alumno_dao.ejecutar_queries_multiples(
+            "INSERT INTO asistencia (matricula, fecha, estado) VALUES (?, ?, ?)", asistencias
+        )
+        # La asistencia se califica con los registros; las demás categorías con notas
+        # (el elemento i se captura en la semana i)
+        calificaciones = [
+            (fila[0], nombre, i + 1, (INICIO_CICLO + timedelta(weeks=i)).isoformat(), round(azar.uniform(5, 10), 1))
+            for fila in alumnos
+            for nombre, _, max_items in CATEGORIAS[1:]
+            for i in range(min(escala.calificaciones_por_categoria, max_items))
+        ]
+        alumno_dao.ejecutar_queries_multiples(
+            "INSERT INTO calificaciones (matricula, categoria, numero_item, fecha, valor) VALUES (?, ?, ?, ?, ?)",
+            calificaciones
+        )
+        # Guarda la ponderación y calcula los promedios como lo hace la aplicación
+        GestorCalificaciones(g).guardar_categorias_evaluacion(CATEGORIAS)
+        resumen["alumnos"] += len(alumnos)
+        resumen["asistencias"] += len(asistencias)
+        resumen["calificaciones"] += len(calificaciones)
+
+    return {"escala": escala.como_dict(), "semilla": semilla, **resumen}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("db_file", help="Ruta de la base a crear (no debe existir)")
+    parser.add_argument("--grupos", type=int, default=10)
+    parser.add_argument("--alumnos", type=int, default=40, help="Alumnos por grupo")
+    parser.add_argument("--dias", type=int, default=60, help="Días hábiles de asistencia")
+    parser.add_argument("--calificaciones", type=int, default=3, help="Calificaciones por categoría")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resumen = generar_escuela(
+        args.db_file, EscalaEscuela(args.grupos, args.alumnos, args.dias, args.calificaciones), args.semilla
+    )
+    conexiones.cerrar_todas()
+    print({**resumen, "segundos": round(time.perf_counter() - inicio, 2)})
@@ -0,0 +1,226 @@
+"""
+Suite de benchmarks del camino de datos (gestores de Logica/gestor_alumnos.py).
+
+Genera una escuela sintética determinista (benchmarks/generador_escuela.py) en
+una base temporal y mide cada escenario: mediana, mínimo y p95 en milisegundos.
+Los resultados se escriben en JSON con el commit, la escala y la semilla, de
+modo que dos ejecuciones (p. ej. antes y después de un cambio) se pueden
+comparar con --comparar: si la mediana de algún escenario empeora más que la
+tolerancia, el proceso termina con código 1.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/suite.py --escala mediana --salida base.json
+    python benchmarks/suite.py --escala mediana --salida actual.json --comparar base.json
+    python benchmarks/suite.py --escenarios roster_frio asistencia_masiva
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from Datos.cache_roster import cache_roster
+from Datos.conexion import conexiones
+from Logica.gestor_alumnos import GestorAlumnos, GestorAsistencia, GestorCalificaciones
+from benchmarks.generador_escuela import CATEGORIAS, SEMILLA, EscalaEscuela, fechas_clase, generar_escuela
+
+VERSION_FORMATO = 1
+
+ESCALAS = {
+    "pequena": EscalaEscuela(grupos=4, alumnos_por_grupo=25, dias_asistencia=20, calificaciones_por_categoria=2),
+    "mediana": EscalaEscuela(grupos=20, alumnos_por_grupo=40, dias_asistencia=60, calificaciones_por_categoria=3),
+    "grande": EscalaEscuela(grupos=60, alumnos_por_grupo=45, dias_asistencia=180, calificaciones_por_categoria=5),
+}
+
+
+class Escenario:
+    """
+    Una operación medida. `funcion()` es lo que se cronometra; `antes()` (opcional)
+    prepara cada repetición fuera del tiempo medido.
+    """
+
+    def __init__(self, nombre, funcion, antes=None, repeticiones=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.antes = antes
+        self.repeticiones = repeticiones
+
+    def medir(self, repeticiones):
+        repeticiones = self.repeticiones or repeticiones
+        resultado = self._ejecutar_una_vez() # Calentamiento (no se cuenta) y verificación
+        if isinstance(resultado, str) and resultado.startswith("Error"):
+            raise RuntimeError(f"El escenario {self.nombre} falló: {resultado}")
+        tiempos = []
+        for _ in range(repeticiones):
+            if self.antes is not None:
+                self.antes()
+            inicio = time.perf_counter()
+            self.funcion()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return resumir_tiempos(tiempos)
+
+    def _ejecutar_una_vez(self):
+        if self.antes is not None:
+            self.antes()
+        return self.funcion()
+
+
+def resumir_tiempos(tiempos):
+    """Mediana, mínimo y p95 (ms) de una lista de tiempos en milisegundos."""
+    tiempos = sorted(tiempos)
+    return {
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "min_ms": round(tiempos[0], 3),
+        "p95_ms": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        "repeticiones": len(tiempos),
+    }
+
+
+def crear_escenarios(escala):
+    """Escenarios sobre el grupo 1 de una escuela generada con `escala`."""
+    grupo_id = 1
+    fechas = fechas_clase(escala.dias_asistencia)
+    ultima_fecha = date.fromisoformat(fechas[-1])
+    alumnos = GestorAlumnos(grupo_id)
+    asistencia = GestorAsistencia(grupo_id)
+    calificaciones = GestorCalificaciones(grupo_id)
+    matriculas = [fila[0] for fila in alumnos.obtener_lista_alumnos()]
+
+    # Cada asistencia masiva registra un día nuevo, como al pasar lista cada mañana
+    dias_nuevos = ((ultima_fecha + timedelta(days=d)).isoformat() for d in itertools.count(1))
+    # Rotan alumnos, estados y notas para que cada repetición escriba algo distinto
+    celdas = itertools.cycle(matriculas)
+    estados = itertools.cycle(GestorAsistencia.ESTADOS_VALIDOS)
+    notas = itertools.cycle(["6.5", "7", "8.5", "9", "10"])
+
+    def llenar_buffer():
+        nota = next(notas)
+        for matricula in matriculas:
+            calificaciones.agregar_calificacion_pendiente(matricula, "Tareas", nota)
+
+    return [
+        Escenario("roster_frio", alumnos.obtener_lista_alumnos, antes=cache_roster.limpiar),
+        Escenario("roster_cache", alumnos.obtener_lista_alumnos),
+        Escenario("asistencia_para_ui", lambda: asistencia.obtener_asistencia_para_ui(fechas[-1])),
+        Escenario("asistencia_masiva", lambda: asistencia.registrar_asistencia_masiva(next(dias_nuevos))),
+        Escenario("estado_asistencia", lambda: asistencia.actualizar_estado_asistencia(
+            next(celdas), ultima_fecha.isoformat(), next(estados))),
+        Escenario("matriz_asistencia_20_dias", lambda: asistencia.obtener_matriz_asistencia(fechas[0], fechas[:20][-1])),
+        Escenario("registrar_calificacion", lambda: calificaciones.registrar_calificacion(
+            next(celdas), "Examen Final", next(notas))),
+        Escenario("lote_calificaciones_grupo", calificaciones.guardar_calificaciones_pendientes, antes=llenar_buffer),
+        Escenario("guardar_categorias_evaluacion", lambda: calificaciones.guardar_categorias_evaluacion(CATEGORIAS)),
+        Escenario("calificaciones_categoria", lambda: calificaciones.obtener_alumnos_con_calificaciones("Tareas")),
+        Escenario("promedios_finales", calificaciones.obtener_promedios_finales),
+    ], (asistencia, calificaciones)
+
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ_APP, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(nombre_escala, repeticiones=30, semilla=SEMILLA, solo=None):
+    escala = ESCALAS[nombre_escala]
+    with tempfile.TemporaryDirectory() as carpeta:
+        inicio = time.perf_counter()
+        generacion = generar_escuela(os.path.join(carpeta, "escuela.db"), escala, semilla)
+        segundos_generacion = time.perf_counter() - inicio
+
+        escenarios, gestores = crear_escenarios(escala)
+        resultados = {}
+        for escenario in escenarios:
+            if solo and escenario.nombre not in solo:
+                continue
+            resultados[escenario.nombre] = escenario.medir(repeticiones)
+        for gestor in gestores:
+            gestor.cerrar()
+        conexiones.cerrar_todas()
+
+    return {
+        "version_formato": VERSION_FORMATO,
+        "commit": commit_actual(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "escala": nombre_escala,
+        "dimensiones": generacion["escala"],
+        "semilla": semilla,
+        "filas": {clave: generacion[clave] for clave in ("alumnos", "asistencias", "calificaciones")},
+        "generacion_s": round(segundos_generacion, 2),
+        "escenarios": resultados,
+    }
+
+
+def comparar(actual, base, tolerancia=1.5, minimo_ms=0.5, metrica="mediana_ms"):
+    """
+    Compara una métrica (mediana por omisión) de dos resultados. Retorna (lineas, regresiones):
+    una línea por escenario y los nombres de los que empeoraron más que la tolerancia
+    (y más que minimo_ms, para no reportar ruido de microsegundos).
+    """
+    lineas, regresiones = [], []
+    if (actual["escala"], actual["semilla"]) != (base["escala"], base["semilla"]):
+        lineas.append("Advertencia: las ejecuciones usan distinta escala o semilla; la comparación no es válida.")
+    for nombre, medida in actual["escenarios"].items():
+        anterior = base["escenarios"].get(nombre)
+        if anterior is None:
+            lineas.append(f"{nombre:32} {medida[metrica]:>10.3f} ms  (nuevo)")
+            continue
+        razon = medida[metrica] / anterior[metrica] if anterior[metrica] else float("inf")
+        empeoro = razon > tolerancia and medida[metrica] - anterior[metrica] > minimo_ms
+        if empeoro:
+            regresiones.append(nombre)
+        lineas.append(
+            f"{nombre:32} {anterior[metrica]:>10.3f} -> {medida[metrica]:>10.3f} ms  "
+            f"x{razon:.2f}{'  REGRESIÓN' if empeoro else ''}"
+        )
+    return lineas, regresiones
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="mediana")
+    parser.add_argument("--repeticiones", type=int, default=30)
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--escenarios", nargs="+", help="Solo estos escenarios (por nombre)")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por omisión se imprime)")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=1.5,
+                        help="Razón (actual / anterior) que cuenta como regresión")
+    parser.add_argument("--minimo-ms", type=float, default=0.5,
+                        help="Diferencia mínima en ms para contar como regresión (ruido)")
+    parser.add_argument("--metrica", choices=["mediana_ms", "min_ms", "p95_ms"], default="mediana_ms")
+    args = parser.parse_args()
+
+    resultado = ejecutar(args.escala, args.repeticiones, args.semilla, args.escenarios)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        lineas, regresiones = comparar(resultado, base, args.tolerancia, args.minimo_ms, args.metrica)
+        print(f"Comparación contra {base.get('commit')} ({args.comparar}):")
+        print("\n".join(lineas))
+        if regresiones:
+            print(f"{len(regresiones)} escenario(s) con regresión: {', '.join(regresiones)}")
+            sys.exit(1)
@@ -0,0 +1,221 @@
+"""
+Verificación de la escritura diferida de calificaciones (Logica/buffer_calificaciones.py).
+
+Comprueba que ninguna nota capturada se pierda:
+  1. Capturas concurrentes mientras otro hilo guarda el buffer una y otra vez
+     (como la ventana capturando mientras el hilo de trabajo guarda).
+  2. Un guardado que falla: las notas vuelven al buffer sin pisar las más nuevas.
+  3. Un proceso que termina SIN guardar explícitamente: las notas se guardan al salir (atexit).
+  4. Capturas mientras otro hilo cierra el buffer una y otra vez (la ventana se
+     cierra y se reabre mientras se sigue capturando).
+  5. Un gestor descartado (sin cerrar, con todo ya guardado) no queda vivo hasta la
+     salida por el registro para guardar al salir.
+  6. Un gestor descartado y recolectado CON notas pendientes (sin cerrar ni guardar):
+     el registro lo mantiene vivo y las notas se guardan al salir.
+Además se compara el promedio incremental con un recálculo completo del grupo.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/verificar_buffer_calificaciones.py --alumnos 200 --rondas 20
+"""
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, GrupoDAO
+from Logica.buffer_calificaciones import BufferCalificaciones
+from Logica.gestor_alumnos import GestorCalificaciones
+from model import Grupo
+
+CATEGORIAS = ["Examen Final", "Tareas", "Participación", "Asistencia"]
+
+# Proceso hijo de la prueba 3: captura notas y termina sin llamar a guardar
+_HIJO = """
+import sys
+sys.path.insert(0, {raiz!r})
+from Datos.conexion import conexiones
+from Logica.gestor_alumnos import GestorCalificaciones
+conexiones.configurar_db_file({db!r})
+gestor = GestorCalificaciones(1)
+for i in range({alumnos}):
+    gestor.agregar_calificacion_pendiente(f"E{{i:05d}}", {categoria!r}, 7.5)
+if {descartar!r}:
+    import gc
+    del gestor
+    gc.collect()
+sys.exit(0)
+"""
+
+
+def _preparar_db(db_file, alumnos):
+    conexiones.configurar_db_file(db_file)
+    GrupoDAO().crear_grupo(Grupo(None, "Buffer", "2025-2026"))
+    AlumnoDAO().ejecutar_queries_multiples(
+        "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', 1)",
+        [(f"E{i:05d}", f"Alumno {i:05d}") for i in range(alumnos)]
+    )
+
+
+def _notas_guardadas(gestor, categoria):
+    return {m: v for m, _, v in gestor.obtener_alumnos_con_calificaciones(categoria) if v is not None}
+
+
+def prueba_concurrente(gestor, alumnos, rondas):
+    """La última nota capturada de cada celda debe ser la guardada."""
+    esperado = {}
+    terminado = threading.Event()
+    vaciados = []
+
+    def guardar_en_bucle():
+        while not terminado.is_set():
+            vaciados.append(gestor.guardar_calificaciones_pendientes())
+            time.sleep(0.001)
+
+    hilo = threading.Thread(target=guardar_en_bucle)
+    hilo.start()
+    for ronda in range(rondas):
+        for i in range(alumnos):
+            matricula = f"E{i:05d}"
+            categoria = CATEGORIAS[(i + ronda) % len(CATEGORIAS)]
+            valor = round((i * 7 + ronda) % 101 / 10.0, 1)
+            gestor.agregar_calificacion_pendiente(matricula, categoria, valor)
+            esperado[(matricula, categoria)] = valor
+    terminado.set()
+    hilo.join()
+    gestor.guardar_calificaciones_pendientes()
+
+    perdidas = 0
+    for categoria in CATEGORIAS:
+        guardadas = _notas_guardadas(gestor, categoria)
+        for (matricula, cat), valor in esperado.items():
+            if cat == categoria and guardadas.get(matricula) != valor:
+                perdidas += 1
+    return {"ediciones": alumnos * rondas, "celdas": len(esperado),
+            "guardados": sum(1 for v in vaciados if "Éxito" in v), "perdidas": perdidas}
+
+
+def prueba_fallo():
+    """Un guardado fallido devuelve las notas al buffer; las más nuevas tienen prioridad."""
+    guardado = {}
+    intentos = []
+
+    def guardar(filas):
+        intentos.append(len(filas))
+        if len(intentos) == 1:
+            # Mientras falla el primer guardado, llega una nota más nueva para la misma celda
+            buffer.agregar("E00000", "Tareas", 9.0)
+            return False
+        guardado.update({(m, c): v for m, c, v in filas})
+        return True
+
+    buffer = BufferCalificaciones(guardar)
+    buffer.agregar("E00000", "Tareas", 5.0)
+    buffer.agregar("E00001", "Tareas", 6.0)
+    primero = buffer.vaciar()
+    segundo = buffer.cerrar()
+    correcto = (primero is False and segundo == 2
+                and guardado == {("E00000", "Tareas"): 9.0, ("E00001", "Tareas"): 6.0})
+    return {"primer_guardado": primero, "segundo_guardado": segundo, "correcto": correcto}
+
+
+def prueba_salida(db_file, alumnos, categoria="Examen Final", descartar=False):
+    """
+    Las notas pendientes de un proceso que termina sin guardar llegan a la base
+    (con descartar=True, aunque el gestor ya se haya descartado y recolectado).
+    """
+    codigo = _HIJO.format(raiz=RAIZ_APP, db=db_file, alumnos=alumnos, categoria=categoria, descartar=descartar)
+    subprocess.run([sys.executable, "-c", codigo], check=True, cwd=RAIZ_APP)
+    guardadas = _notas_guardadas(GestorCalificaciones(1), categoria)
+    return {"esperadas": alumnos, "guardadas": sum(1 for v in guardadas.values() if v == 7.5)}
+
+
+def prueba_cerrar_concurrente(gestor, alumnos, rondas):
+    """Lo capturado mientras otro hilo cierra el buffer va al buffer nuevo: nada se pierde."""
+    esperado = {}
+    terminado = threading.Event()
+
+    def cerrar_en_bucle():
+        while not terminado.is_set():
+            gestor.cerrar()
+            time.sleep(0.0005)
+
+    hilo = threading.Thread(target=cerrar_en_bucle)
+    hilo.start()
+    for ronda in range(rondas):
+        for i in range(alumnos):
+            valor = round((i * 3 + ronda) % 101 / 10.0, 1)
+            gestor.agregar_calificacion_pendiente(f"E{i:05d}", "Tareas", valor, numero_item=2)
+            esperado[f"E{i:05d}"] = valor
+    terminado.set()
+    hilo.join()
+    gestor.cerrar()
+    guardadas = {m: v for m, _, v in gestor.obtener_alumnos_con_calificaciones("Tareas", 2) if v is not None}
+    return {"ediciones": alumnos * rondas,
+            "perdidas": sum(1 for m, v in esperado.items() if guardadas.get(m) != v)}
+
+
+def prueba_sin_referencias():
+    """El registro para guardar al salir no mantiene vivo a un gestor descartado."""
+    gestor = GestorCalificaciones(1)
+    gestor.agregar_calificacion_pendiente("E00000", "Examen Final", 8.0)
+    gestor.guardar_calificaciones_pendientes()
+    referencia = weakref.ref(gestor)
+    del gestor
+    gc.collect()
+    return referencia() is None
+
+
+def promedios_consistentes(gestor):
+    """El promedio mantenido de forma incremental debe coincidir con un recálculo completo."""
+    incrementales = {m: p for m, _, p in gestor.obtener_promedios_finales()}
+    gestor._recalcular_promedios()
+    completos = {m: p for m, _, p in gestor.obtener_promedios_finales()}
+    return all(abs(incrementales[m] - completos[m]) < 1e-9 for m in completos)
+
+
+def ejecutar(alumnos=200, rondas=20):
+    with tempfile.TemporaryDirectory() as carpeta:
+        db_file = os.path.join(carpeta, "buffer.db")
+        _preparar_db(db_file, alumnos)
+        gestor = GestorCalificaciones(1)
+        gestor.obtener_promedios_finales() # Llena la tabla materializada
+
+        concurrente = prueba_concurrente(gestor, alumnos, rondas)
+        consistentes = promedios_consistentes(gestor)
+        cerrar_concurrente = prueba_cerrar_concurrente(gestor, alumnos, rondas)
+        liberado = prueba_sin_referencias()
+        fallo = prueba_fallo()
+        conexiones.cerrar_todas()
+        salida = prueba_salida(db_file, alumnos)
+        conexiones.cerrar_todas()
+        salida_descartado = prueba_salida(db_file, alumnos, "Participación", descartar=True)
+        conexiones.cerrar_todas()
+
+    return {"concurrente": concurrente, "promedios_consistentes": consistentes,
+            "fallo": fallo, "salida": salida, "salida_descartado": salida_descartado,
+            "cerrar_concurrente": cerrar_concurrente, "gestor_liberado": liberado}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=200)
+    parser.add_argument("--rondas", type=int, default=20)
+    args = parser.parse_args()
+
+    r = ejecutar(args.alumnos, args.rondas)
+    print(r)
+    correcto = (r["concurrente"]["perdidas"] == 0 and r["promedios_consistentes"]
+                and r["fallo"]["correcto"] and r["salida"]["guardadas"] == r["salida"]["esperadas"]
+                and r["salida_descartado"]["guardadas"] == r["salida_descartado"]["esperadas"]
+                and r["cerrar_concurrente"]["perdidas"] == 0 and r["gestor_liberado"])
+    print("OK: ninguna calificación perdida." if correcto else "FALLO: se perdieron calificaciones.")
+    sys.exit(0 if correcto else 1)
@@ -0,0 +1,194 @@
+"""
+Verificación de las calificaciones por elemento (migración 6, numero_item).
+
+  1. Migración: una base en la versión 5 con varias notas del mismo alumno y
+     categoría en fechas distintas queda con un elemento por fecha (1, 2, 3...).
+  2. Captura: volver a capturar un elemento otro día lo reemplaza (sin duplicar
+     filas en la lista de la categoría) y cada elemento se guarda por separado.
+  3. Promedios: con elementos de más (por encima de max_items) y elementos sin
+     entregar, los promedios guardados coinciden con un cálculo de referencia en
+     Python sobre TODAS las notas (las max_items mejores, las faltantes cuentan 0).
+  4. Cuadrícula: obtener_matriz_calificaciones tiene una columna por elemento.
+y mide, a escala, el recálculo completo del grupo y la cuadrícula de una
+categoría. Compara además las dos formas de elegir las max_items mejores notas:
+en la pasada única de Logica/motor_calificaciones.py (la que usa la aplicación)
+o en SQL con ROW_NUMBER() (trae menos filas, pero ordena todas las notas).
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/verificar_calificaciones_elementos.py --alumnos 2000 --elementos 20
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, CalificacionDAO, GrupoDAO
+from Datos.migraciones import MIGRACIONES, aplicar_migraciones
+from Logica.gestor_alumnos import GestorCalificaciones
+from Logica.motor_calificaciones import calcular_promedios, puntaje_categoria
+from model import Grupo
+
+# Las max_items mejores notas de cada (alumno, categoría), elegidas en SQL (solo para comparar)
+MEJORES_EN_SQL = """
+    SELECT matricula, categoria, valor
+    FROM (
+        SELECT C.matricula, C.categoria, C.valor, E.max_items,
+               ROW_NUMBER() OVER (PARTITION BY C.matricula, C.categoria ORDER BY C.valor DESC) AS posicion
+        FROM alumnos A
+        JOIN calificaciones C ON C.matricula = A.matricula
+        JOIN categorias_evaluacion E ON E.grupo_id = A.grupo_id AND E.nombre_categoria = C.categoria
+        WHERE A.grupo_id = ?
+    )
+    WHERE posicion <= MAX(max_items, 1)
+"""
+
+# Sin "Asistencia": se califica con la asistencia registrada, no con notas
+CATEGORIAS = [("Examen Final", 30.0, 1), ("Participación", 20.0, 5), ("Tareas", 30.0, 10), ("Prácticas", 20.0, 8)]
+
+
+def prueba_migracion(carpeta):
+    db_file = os.path.join(carpeta, "version5.db")
+    con = sqlite3.connect(db_file)
+    aplicar_migraciones(con, MIGRACIONES[:5])
+    con.execute("INSERT INTO grupos (nombre, ciclo_escolar) VALUES ('Migración', '2024-2025')")
+    con.execute("INSERT INTO alumnos VALUES ('M0001', 'Alumno Migrado', '', '', 1)")
+    con.executemany(
+        "INSERT INTO calificaciones (matricula, categoria, fecha, valor) VALUES ('M0001', ?, ?, ?)",
+        [("Tareas", "2024-09-20", 7.0), ("Tareas", "2024-09-06", 9.0), ("Tareas", "2024-09-13", 8.0),
+         ("Examen Final", "2025-01-15", 6.5)]
+    )
+    con.commit()
+    aplicar_migraciones(con)
+    filas = con.execute(
+        "SELECT categoria, numero_item, fecha, valor FROM calificaciones ORDER BY categoria, numero_item"
+    ).fetchall()
+    con.close()
+    esperado = [("Examen Final", 1, "2025-01-15", 6.5), ("Tareas", 1, "2024-09-06", 9.0),
+                ("Tareas", 2, "2024-09-13", 8.0), ("Tareas", 3, "2024-09-20", 7.0)]
+    return filas == esperado
+
+
+def preparar(alumnos, elementos, semilla):
+    """Grupo con notas al azar: algunos elementos sin entregar y algunos por encima de max_items."""
+    azar = random.Random(semilla)
+    GrupoDAO().crear_grupo(Grupo(None, "Elementos", "2025-2026"))
+    AlumnoDAO().ejecutar_queries_multiples(
+        "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', 1)",
+        [(f"E{i:05d}", f"Alumno {i:05d}") for i in range(alumnos)]
+    )
+    notas = []
+    for i in range(alumnos):
+        for nombre, _, max_items in CATEGORIAS:
+            limite = elementos if max_items > 1 else 1
+            for numero in range(1, limite + 1):
+                if azar.random() < 0.85: # ~15% de elementos sin entregar
+                    notas.append((f"E{i:05d}", nombre, numero, "2025-03-01", round(azar.uniform(4, 10), 1)))
+    CalificacionDAO().ejecutar_queries_multiples(
+        "INSERT INTO calificaciones (matricula, categoria, numero_item, fecha, valor) VALUES (?, ?, ?, ?, ?)", notas
+    )
+    gestor = GestorCalificaciones(1)
+    gestor.guardar_categorias_evaluacion(CATEGORIAS)
+    return gestor, notas
+
+
+def promedios_referencia(notas):
+    """{matricula: promedio} en Python puro sobre todas las notas."""
+    por_celda = {}
+    for matricula, categoria, _, _, valor in notas:
+        por_celda.setdefault((matricula, categoria), []).append(valor)
+    promedios = {}
+    for nombre, peso, max_items in CATEGORIAS:
+        for (matricula, categoria), valores in por_celda.items():
+            if categoria == nombre:
+                promedios[matricula] = promedios.get(matricula, 0.0) + peso / 100.0 * puntaje_categoria(valores, max_items)
+    return promedios
+
+
+def prueba_promedios(gestor, notas):
+    referencia = promedios_referencia(notas)
+    guardados = {m: p for m, _, p in gestor.obtener_promedios_finales()}
+    return all(abs(guardados[m] - referencia.get(m, 0.0)) < 1e-9 for m in guardados)
+
+
+def prueba_captura(gestor):
+    dao = CalificacionDAO()
+    # Mismo elemento capturado dos días distintos: una sola nota (la última)
+    gestor.registrar_calificacion("E00000", "Examen Final", 5.0)
+    dao.ejecutar_query("UPDATE calificaciones SET fecha = '2025-01-01' WHERE matricula = 'E00000' AND categoria = 'Examen Final'")
+    gestor.registrar_calificacion("E00000", "Examen Final", 9.5)
+    examen = [f for f in gestor.obtener_alumnos_con_calificaciones("Examen Final") if f[0] == "E00000"]
+    # Elementos distintos de la misma categoría se guardan por separado (con escritura diferida)
+    gestor.agregar_calificacion_pendiente("E00001", "Tareas", 10, numero_item=3)
+    gestor.agregar_calificacion_pendiente("E00001", "Tareas", 0, numero_item=4)
+    gestor.guardar_calificaciones_pendientes()
+    _, matriz = gestor.obtener_matriz_calificaciones("Tareas")
+    fila = next(f for f in matriz if f[0] == "E00001")
+    invalido = gestor.registrar_calificacion("E00001", "Tareas", 8, numero_item=0)
+    return examen == [("E00000", "Alumno 00000", 9.5)] and fila[4:6] == (10.0, 0.0) and invalido.startswith("Error")
+
+
+def prueba_matriz(gestor, alumnos, elementos):
+    numero, matriz = gestor.obtener_matriz_calificaciones("Tareas")
+    unico, examen = gestor.obtener_matriz_calificaciones("Examen Final")
+    return (numero == max(10, elementos) and len(matriz) == alumnos and all(len(f) == 2 + numero for f in matriz)
+            and unico == 1 and len(examen) == alumnos)
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return round(statistics.median(tiempos), 1)
+
+
+def ejecutar(alumnos=2000, elementos=20, repeticiones=5, semilla=7):
+    with tempfile.TemporaryDirectory() as carpeta:
+        migracion = prueba_migracion(carpeta)
+        conexiones.configurar_db_file(os.path.join(carpeta, "elementos.db"))
+        gestor, notas = preparar(alumnos, elementos, semilla)
+        resultado = {
+            "alumnos": alumnos, "elementos_por_categoria": elementos, "notas": len(notas),
+            "migracion": migracion,
+            "promedios": prueba_promedios(gestor, notas),
+            "matriz": prueba_matriz(gestor, alumnos, elementos),
+        }
+        # La captura modifica notas: se verifica después de comparar los promedios
+        resultado["captura"] = prueba_captura(gestor)
+
+        dao = CalificacionDAO()
+        categorias = gestor.obtener_categorias_evaluacion()
+        resultado["seleccion_mejores_ms"] = {
+            "pasada_python": medir(lambda: calcular_promedios(
+                categorias, dao.obtener_todas_calificaciones_por_grupo(1)), repeticiones),
+            "row_number_sql": medir(lambda: calcular_promedios(
+                categorias, dao.ejecutar_query(MEJORES_EN_SQL, (1,))), repeticiones),
+        }
+        resultado["recalculo_grupo_ms"] = medir(gestor._recalcular_promedios, repeticiones)
+        resultado["matriz_tareas_ms"] = medir(lambda: gestor.obtener_matriz_calificaciones("Tareas"), repeticiones)
+        gestor.cerrar()
+        conexiones.cerrar_todas()
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=2000)
+    parser.add_argument("--elementos", type=int, default=20, help="Elementos capturados por categoría múltiple")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    r = ejecutar(args.alumnos, args.elementos, args.repeticiones)
+    print(r)
+    correcto = all(r[clave] for clave in ("migracion", "promedios", "matriz", "captura"))
+    print("OK: calificaciones por elemento correctas." if correcto else "FALLO: revisar las pruebas en False.")
+    sys.exit(0 if correcto else 1)
@@ -0,0 +1,217 @@
+"""
+Verificación del historial de cambios (migración 7, Datos/historial.py).
+
+  1. Calificaciones: la captura, cada cambio (suelto, por lote con escritura
+     diferida o con UPDATE directo) y la baja del alumno quedan en el historial;
+     guardar el mismo valor no agrega nada.
+  2. Atomicidad: una escritura que falla o una UnidadDeTrabajo deshecha no deja
+     cambios en el historial.
+  3. Solo agregado: un cambio registrado no se puede modificar.
+  4. Asistencia: pasar lista al grupo y corregir un estado queda en el historial.
+  5. Compactación: --max-cambios conserva los N más recientes de cada celda y
+     --dias borra los cambios antiguos; los valores vigentes no cambian.
+y mide, a escala, el costo de los triggers al guardar un lote de notas (contra
+la misma base sin triggers) y que la cuadrícula de notas se lee igual de rápido
+con un historial varias veces más grande que la tabla de notas vigentes.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/verificar_historial.py --alumnos 2000 --rondas 5
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, CalificacionDAO, GrupoDAO, HistorialDAO
+from Datos.historial import PoliticaHistorial, compactar_historial
+from Datos.unidad_trabajo import UnidadDeTrabajo
+from Logica.gestor_alumnos import GestorAsistencia, GestorCalificaciones
+from model import Alumno, Calificacion, Grupo
+
+CATEGORIAS = [("Examen Final", 40.0, 1), ("Tareas", 60.0, 10)]
+
+
+def _valores(cambios):
+    """[(valor_anterior, valor_nuevo), ...] del más antiguo al más reciente."""
+    return [(anterior, nuevo) for _, anterior, nuevo, _ in reversed(cambios)]
+
+
+def prueba_calificaciones(gestor):
+    historial = HistorialDAO()
+    gestor.registrar_calificacion("H0001", "Examen Final", 6.0)
+    gestor.registrar_calificacion("H0001", "Examen Final", 6.0) # Mismo valor: sin cambio
+    gestor.registrar_calificacion("H0001", "Examen Final", 8.5)
+    gestor.agregar_calificacion_pendiente("H0001", "Examen Final", 9)
+    gestor.guardar_calificaciones_pendientes()
+    CalificacionDAO().ejecutar_query(
+        "UPDATE calificaciones SET valor = 7.0 WHERE matricula = 'H0001' AND categoria = 'Examen Final'"
+    )
+    examen = _valores(gestor.obtener_historial_calificacion("H0001", "Examen Final"))
+    # Cada elemento tiene su propio historial
+    gestor.registrar_calificacion("H0001", "Tareas", 10, numero_item=2)
+    tarea = _valores(gestor.obtener_historial_calificacion("H0001", "Tareas", 2))
+    # La baja del alumno queda registrada y el historial sobrevive
+    gestor.registrar_calificacion("H0002", "Examen Final", 5.0)
+    AlumnoDAO().eliminar_alumno("H0002")
+    baja = _valores(historial.obtener_historial_calificacion("H0002", "Examen Final"))
+    return (examen == [(None, 6.0), (6.0, 8.5), (8.5, 9.0), (9.0, 7.0)]
+            and tarea == [(None, 10.0)] and baja == [(None, 5.0), (5.0, None)])
+
+
+def prueba_atomicidad(gestor):
+    dao = CalificacionDAO()
+    antes = len(gestor.obtener_historial_calificacion("H0003", "Examen Final"))
+    # numero_item 0 viola el CHECK de la tabla: la escritura y su historial se deshacen
+    fallida = dao.registrar_calificacion(Calificacion("H0003", "Examen Final", 4.0, None, 0))
+    with UnidadDeTrabajo() as unidad:
+        dao.registrar_calificacion(Calificacion("H0003", "Examen Final", 3.0))
+        unidad.exitosa = False
+    despues = len(gestor.obtener_historial_calificacion("H0003", "Examen Final"))
+    return fallida is False and antes == despues == 0
+
+
+def prueba_solo_agregado():
+    resultado = HistorialDAO().ejecutar_query("UPDATE historial_calificaciones SET valor_nuevo = 10")
+    return resultado is False
+
+
+def prueba_asistencia(gestor_asistencia):
+    gestor_asistencia.registrar_asistencia_masiva("2025-03-03")
+    gestor_asistencia.registrar_asistencia_masiva("2025-03-03") # Mismo estado: sin cambio
+    gestor_asistencia.actualizar_estado_asistencia("H0004", "2025-03-03", "Retardo")
+    cambios = gestor_asistencia.obtener_historial_asistencia("H0004", "2025-03-03")
+    return [(anterior, nuevo) for _, anterior, nuevo in reversed(cambios)] == [(None, "Asistencia"), ("Asistencia", "Retardo")]
+
+
+def prueba_compactacion(gestor):
+    historial = HistorialDAO()
+    for valor in (1, 2, 3, 4, 5):
+        gestor.registrar_calificacion("H0005", "Tareas", valor, numero_item=1)
+    vigente = gestor.obtener_alumnos_con_calificaciones("Tareas")
+    # Un cambio de hace tres años (la inserción directa sí está permitida)
+    historial.ejecutar_query(
+        "INSERT INTO historial_calificaciones (matricula, categoria, numero_item, valor_anterior, valor_nuevo, momento) "
+        "VALUES ('H0006', 'Tareas', 1, NULL, 6.0, strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime', '-1095 days'))"
+    )
+    por_celda = compactar_historial(PoliticaHistorial(max_cambios_por_celda=2))
+    conservados = _valores(gestor.obtener_historial_calificacion("H0005", "Tareas", 1))
+    por_dias = compactar_historial(PoliticaHistorial(dias_retencion=365))
+    antiguo = gestor.obtener_historial_calificacion("H0006", "Tareas", 1)
+    return (conservados == [(3.0, 4.0), (4.0, 5.0)] and por_celda["calificaciones"] >= 3
+            and por_dias["calificaciones"] == 1 and antiguo == []
+            and compactar_historial(PoliticaHistorial()) is None
+            and gestor.obtener_alumnos_con_calificaciones("Tareas") == vigente)
+
+
+def preparar_pruebas(carpeta):
+    conexiones.configurar_db_file(os.path.join(carpeta, "pruebas.db"))
+    GrupoDAO().crear_grupo(Grupo(None, "Historial", "2025-2026"))
+    for i in range(1, 7):
+        AlumnoDAO().crear_alumno(Alumno(f"H{i:04d}", f"Alumno {i}", "", ""), 1)
+    gestor = GestorCalificaciones(1)
+    gestor.guardar_categorias_evaluacion(CATEGORIAS)
+    return gestor
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return round(statistics.median(tiempos), 1)
+
+
+def medir_escala(carpeta, alumnos, rondas, repeticiones, con_triggers):
+    """Guarda `rondas` lotes de notas (todas cambian) y lee la cuadrícula de Tareas."""
+    nombre = "con_historial" if con_triggers else "sin_historial"
+    conexiones.configurar_db_file(os.path.join(carpeta, f"{nombre}.db"))
+    dao = CalificacionDAO()
+    if not con_triggers:
+        for (trigger,) in dao.ejecutar_query("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'historial_%'"):
+            dao.ejecutar_query(f"DROP TRIGGER {trigger}")
+    GrupoDAO().crear_grupo(Grupo(None, "Escala", "2025-2026"))
+    AlumnoDAO().ejecutar_queries_multiples(
+        "INSERT INTO alumnos (matricula, nombre_completo, datos_contacto, email, grupo_id) VALUES (?, ?, '', '', 1)",
+        [(f"S{i:05d}", f"Alumno {i:05d}") for i in range(alumnos)]
+    )
+    gestor = GestorCalificaciones(1)
+    gestor.guardar_categorias_evaluacion(CATEGORIAS)
+    azar = random.Random(11)
+
+    def lote():
+        return [Calificacion(f"S{i:05d}", "Tareas", round(azar.uniform(0, 10), 1), "2025-03-01", numero)
+                for i in range(alumnos) for numero in range(1, 11)]
+
+    lotes = [lote() for _ in range(rondas)]
+    grid_inicial = medir(lambda: gestor.obtener_matriz_calificaciones("Tareas"), repeticiones)
+    tiempos_lote = []
+    for calificaciones in lotes:
+        inicio = time.perf_counter()
+        if not dao.registrar_calificaciones(calificaciones):
+            raise RuntimeError("Falló el guardado del lote")
+        tiempos_lote.append((time.perf_counter() - inicio) * 1000)
+    resultado = {
+        "guardar_lote_ms": round(statistics.median(tiempos_lote), 1),
+        "notas_por_lote": len(lotes[0]),
+        "cuadricula_ms": medir(lambda: gestor.obtener_matriz_calificaciones("Tareas"), repeticiones),
+        "cuadricula_sin_notas_ms": grid_inicial,
+    }
+    if con_triggers:
+        historial = HistorialDAO()
+        resultado["cambios_en_historial"] = historial.ejecutar_query("SELECT COUNT(*) FROM historial_calificaciones")[0][0]
+        resultado["historial_celda_ms"] = medir(
+            lambda: historial.obtener_historial_calificacion(f"S{alumnos // 2:05d}", "Tareas", 5), repeticiones
+        )
+        inicio = time.perf_counter()
+        resultado["compactados"] = compactar_historial(PoliticaHistorial(max_cambios_por_celda=2))["calificaciones"]
+        resultado["compactar_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+    gestor.cerrar()
+    return resultado
+
+
+def ejecutar(alumnos=2000, rondas=5, repeticiones=5):
+    with tempfile.TemporaryDirectory() as carpeta:
+        gestor = preparar_pruebas(carpeta)
+        resultado = {
+            "calificaciones": prueba_calificaciones(gestor),
+            "atomicidad": prueba_atomicidad(gestor),
+            "solo_agregado": prueba_solo_agregado(),
+            "asistencia": prueba_asistencia(GestorAsistencia(1)),
+            "compactacion": prueba_compactacion(gestor),
+        }
+        gestor.cerrar()
+        conexiones.cerrar_todas()
+
+        resultado["escala"] = {
+            "alumnos": alumnos, "rondas": rondas,
+            "sin_historial": medir_escala(carpeta, alumnos, rondas, repeticiones, con_triggers=False),
+            "con_historial": medir_escala(carpeta, alumnos, rondas, repeticiones, con_triggers=True),
+        }
+        conexiones.cerrar_todas()
+    escala = resultado["escala"]
+    escala["costo_escritura"] = round(
+        escala["con_historial"]["guardar_lote_ms"] / escala["sin_historial"]["guardar_lote_ms"], 2
+    )
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=2000)
+    parser.add_argument("--rondas", type=int, default=5, help="Lotes de notas guardados (cada uno cambia todas)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    r = ejecutar(args.alumnos, args.rondas, args.repeticiones)
+    print(r)
+    correcto = all(r[clave] for clave in ("calificaciones", "atomicidad", "solo_agregado", "asistencia", "compactacion"))
+    print("OK: historial correcto." if correcto else "FALLO: revisar las pruebas en False.")
+    sys.exit(0 if correcto else 1)
@@ -0,0 +1,115 @@
+"""
+Verificación de la actualización de promedios al registrar asistencia (GestorAsistencia).
+
+Un cambio en un día de clase ya registrado solo recalcula la aportación de
+"Asistencia" de los alumnos modificados; un día de clase nuevo (que cambia el
+total de días de todos) recalcula el grupo completo. Tras cada tipo de cambio
+los promedios guardados deben ser iguales a un refresco completo del grupo:
+  1. Un estado suelto en un día ya registrado.
+  2. Un lote de la vista por rango (escritura diferida) en días ya registrados.
+  3. Un estado suelto en un día nuevo (solo ese alumno tiene registro ese día).
+  4. Un lote de la vista por rango que incluye un día nuevo.
+  5. Pasar lista a todo el grupo en un día nuevo.
+Además mide un estado suelto contra el refresco completo de antes.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/verificar_promedios_asistencia.py --alumnos 45 --dias 180
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_APP)
+
+from Datos.conexion import conexiones
+from Datos.dao import PromedioDAO
+from Logica.gestor_alumnos import GestorAlumnos, GestorAsistencia, GestorCalificaciones
+from benchmarks.generador_escuela import EscalaEscuela, fechas_clase, generar_escuela
+
+
+def _coincide_con_refresco(gestor_calificaciones):
+    """
+    Compara los promedios guardados con los de un refresco completo del grupo
+    (sin el ruido de punto flotante: la suma de subtotales cambia de orden).
+    """
+    dao = PromedioDAO()
+    incrementales = dao.obtener_promedios_por_grupo(1)
+    gestor_calificaciones._recalcular_promedios()
+    completos = dao.obtener_promedios_por_grupo(1)
+    return len(incrementales) == len(completos) and all(
+        a[:2] == b[:2] and abs(a[2] - b[2]) < 1e-9 for a, b in zip(incrementales, completos)
+    )
+
+
+def ejecutar(alumnos=45, dias=180, repeticiones=50):
+    with tempfile.TemporaryDirectory() as carpeta:
+        generar_escuela(os.path.join(carpeta, "asistencia.db"),
+                        EscalaEscuela(grupos=2, alumnos_por_grupo=alumnos, dias_asistencia=dias))
+        asistencia = GestorAsistencia(1)
+        calificaciones = GestorCalificaciones(1)
+        calificaciones._recalcular_promedios()
+        matriculas = [fila[0] for fila in GestorAlumnos(1).obtener_lista_alumnos()]
+        fechas = fechas_clase(dias)
+        ultima = date.fromisoformat(fechas[-1])
+        nuevas = [(ultima + timedelta(days=d)).isoformat() for d in (1, 2, 3)]
+        resultado = {}
+
+        asistencia.actualizar_estado_asistencia(matriculas[0], fechas[-1], "Ausente")
+        resultado["estado_dia_registrado"] = _coincide_con_refresco(calificaciones)
+
+        for i, matricula in enumerate(matriculas[:5]):
+            asistencia.agregar_estado_pendiente(matricula, fechas[-1 - i], "Justificado")
+        asistencia.guardar_estados_pendientes()
+        resultado["lote_dias_registrados"] = _coincide_con_refresco(calificaciones)
+
+        asistencia.actualizar_estado_asistencia(matriculas[1], nuevas[0], "Asistencia")
+        resultado["estado_dia_nuevo"] = _coincide_con_refresco(calificaciones)
+
+        asistencia.agregar_estado_pendiente(matriculas[2], fechas[-1], "Retardo")
+        asistencia.agregar_estado_pendiente(matriculas[3], nuevas[1], "Ausente")
+        asistencia.guardar_estados_pendientes()
+        resultado["lote_con_dia_nuevo"] = _coincide_con_refresco(calificaciones)
+
+        asistencia.registrar_asistencia_masiva(nuevas[2])
+        resultado["asistencia_masiva"] = _coincide_con_refresco(calificaciones)
+
+        def medir(funcion):
+            tiempos = []
+            for i in range(repeticiones):
+                inicio = time.perf_counter()
+                funcion(matriculas[i % len(matriculas)], ("Retardo", "Ausente")[i % 2])
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            return round(statistics.median(tiempos), 2)
+
+        def refresco_completo(matricula, estado):
+            # Como antes: la escritura y el recálculo de "Asistencia" de todo el grupo
+            asistencia._asistencia_dao.registrar_asistencia(matricula, fechas[-1], estado)
+            asistencia._actualizar_promedios()
+
+        resultado["estado_suelto_ms"] = {
+            "grupo_completo": medir(refresco_completo),
+            "solo_alumno": medir(lambda m, e: asistencia.actualizar_estado_asistencia(m, fechas[-1], e)),
+        }
+        asistencia.cerrar()
+        calificaciones.cerrar()
+        conexiones.cerrar_todas()
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=45)
+    parser.add_argument("--dias", type=int, default=180, help="Días de clase con asistencia generada")
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    r = ejecutar(args.alumnos, args.dias, args.repeticiones)
+    print(r)
+    correcto = all(valor for clave, valor in r.items() if clave != "estado_suelto_ms")
+    print("OK: promedios iguales al refresco completo." if correcto else "FALLO: revisar las pruebas en False.")
+    sys.exit(0 if correcto else 1)
@@ -0,0 +1,151 @@
+"""
+Verificación de la unidad de trabajo (Datos/unidad_trabajo.py).
+
+Comprueba que:
+  1. Una unidad con una operación fallida no deja nada escrito (ni lo anterior al fallo).
+  2. Una excepción dentro de la unidad deshace todo y se propaga.
+  3. Una unidad anidada que falla se deshace sola; la externa confirma lo suyo.
+  4. Una operación compuesta de un gestor (nota + promedio) es atómica: si el
+     promedio no se puede guardar, la nota tampoco queda guardada.
+  5. La caché de rosters se invalida al confirmar: una lectura de otro hilo
+     durante la unidad no deja un roster viejo en la caché.
+Además cuenta los COMMIT y compara el tiempo de N escrituras sueltas contra
+las mismas N dentro de una unidad.
+
+Uso (desde DirectAula_Apps/DirectAula):
+    python benchmarks/verificar_unidad_trabajo.py --escrituras 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Datos.conexion import conexiones
+from Datos.dao import AlumnoDAO, CalificacionDAO, GrupoDAO
+from Datos.unidad_trabajo import UnidadDeTrabajo
+from Logica.gestor_alumnos import GestorCalificaciones
+from model import Alumno, Calificacion, Grupo
+
+
+def _preparar_db(db_file):
+    conexiones.configurar_db_file(db_file)
+    GrupoDAO().crear_grupo(Grupo(None, "Unidad", "2025-2026"))
+    AlumnoDAO().crear_alumno(Alumno("U00000", "Alumno Base", "", ""), 1)
+
+
+def _grupos():
+    return [nombre for _, nombre, _ in GrupoDAO().obtener_grupos()]
+
+
+def prueba_fallo_operacion():
+    with UnidadDeTrabajo() as unidad:
+        GrupoDAO().crear_grupo(Grupo(None, "Fallo", "2025-2026"))
+        # Matrícula repetida: el DAO imprime el error y retorna False
+        AlumnoDAO().crear_alumno(Alumno("U00000", "Repetido", "", ""), 1)
+    assert not unidad.exitosa, "la unidad debía quedar fallida"
+    assert "Fallo" not in _grupos(), "el grupo creado antes del fallo quedó guardado"
+
+
+def prueba_excepcion():
+    try:
+        with UnidadDeTrabajo():
+            GrupoDAO().crear_grupo(Grupo(None, "Excepcion", "2025-2026"))
+            raise RuntimeError("fallo de la lógica")
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("la excepción no se propagó")
+    assert "Excepcion" not in _grupos(), "la excepción no deshizo la unidad"
+
+
+def prueba_anidada():
+    with UnidadDeTrabajo() as externa:
+        GrupoDAO().crear_grupo(Grupo(None, "Externa", "2025-2026"))
+        with UnidadDeTrabajo() as interna:
+            GrupoDAO().crear_grupo(Grupo(None, "Interna", "2025-2026"))
+            AlumnoDAO().crear_alumno(Alumno("U00000", "Repetido", "", ""), 1)
+    assert not interna.exitosa and externa.exitosa, "solo la unidad interna debía fallar"
+    grupos = _grupos()
+    assert "Externa" in grupos and "Interna" not in grupos, "la unidad anidada no se deshizo sola"
+
+
+def prueba_gestor_atomico():
+    gestor = GestorCalificaciones(1)
+    gestor.guardar_categorias_evaluacion([("Examen Final", 100, 1)])
+    con = conexiones.obtener()
+    # Sin la tabla de promedios, el recálculo falla después de guardar la nota
+    con.execute("ALTER TABLE promedios_finales RENAME TO promedios_tmp")
+    try:
+        resultado = gestor.registrar_calificacion("U00000", "Examen Final", "9")
+    finally:
+        con.execute("ALTER TABLE promedios_tmp RENAME TO promedios_finales")
+    assert resultado.startswith("Error"), f"el gestor reportó éxito: {resultado}"
+    assert not CalificacionDAO().obtener_valores_alumno_categoria("U00000", "Examen Final"), "la nota quedó guardada sin su promedio"
+
+
+def prueba_cache_roster():
+    dao = AlumnoDAO()
+    dao.obtener_alumnos_por_grupo(1) # Llena la caché
+    with UnidadDeTrabajo():
+        dao.crear_alumno(Alumno("U00001", "Alumno Nuevo", "", ""), 1)
+        # Otro hilo lee (y guarda en caché) el roster confirmado mientras la unidad sigue abierta
+        lector = threading.Thread(target=lambda: AlumnoDAO().obtener_alumnos_por_grupo(1))
+        lector.start()
+        lector.join()
+    matriculas = [fila[0] for fila in dao.obtener_alumnos_por_grupo(1)]
+    assert "U00001" in matriculas, "la caché conservó el roster anterior a la unidad"
+
+
+def medir_commits(escrituras):
+    con = conexiones.obtener()
+    commits = []
+    con.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+    dao = CalificacionDAO()
+
+    def escribir(prefijo):
+        for i in range(escrituras):
+            dao.registrar_calificacion(Calificacion("U00000", f"{prefijo}{i}", 8.0, "2025-01-01"))
+
+    inicio = time.perf_counter()
+    escribir("Suelta")
+    sueltas = time.perf_counter() - inicio
+    commits_sueltas = len(commits)
+
+    commits.clear()
+    inicio = time.perf_counter()
+    with UnidadDeTrabajo():
+        escribir("Unidad")
+    unidad = time.perf_counter() - inicio
+    commits_unidad = len(commits)
+    con.set_trace_callback(None)
+
+    assert commits_unidad == 1, f"la unidad confirmó {commits_unidad} veces"
+    return {"escrituras": escrituras,
+            "sueltas": {"commits": commits_sueltas, "s": round(sueltas, 3)},
+            "unidad": {"commits": commits_unidad, "s": round(unidad, 3)},
+            "aceleracion": round(sueltas / unidad, 1)}
+
+
+def ejecutar(escrituras):
+    with tempfile.TemporaryDirectory() as carpeta:
+        _preparar_db(os.path.join(carpeta, "unidad.db"))
+        prueba_fallo_operacion()
+        prueba_excepcion()
+        prueba_anidada()
+        prueba_gestor_atomico()
+        prueba_cache_roster()
+        resultado = medir_commits(escrituras)
+        conexiones.cerrar_todas()
+    resultado["pruebas"] = "ok"
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escrituras", type=int, default=500)
+    args = parser.parse_args()
+    print(ejecutar(args.escrituras))
@@ -1,101 +1,90 @@
-
 # model.py
-class Alumno:
+# Las entidades son tuplas con nombre (NamedTuple): sin __dict__ por instancia,
+# inmutables y con el mismo orden de campos que las columnas de su tabla, de modo
+# que los DAO las construyen directo de las filas de sqlite3 (row_factory) y las
+# pasan a executemany sin convertirlas a tuplas. También se pueden leer por
+# posición, como las filas que ya usaban las ventanas (fila[0], fila[1], ...).
+# Para "modificar" una entidad se crea otra: alumno._replace(email=...).
+from typing import NamedTuple
+
+
+class Alumno(NamedTuple):
     """Representa un estudiante dentro de un grupo."""
-    
-    def __init__(self, matricula, nombre_completo, datos_contacto, email):
-        self._matricula = matricula
-        self._nombre_completo = nombre_completo
-        self._datos_contacto = datos_contacto
-        self._email = email 
-        self._grupo_id = None #Referencia al grupo al que pertenece
+    matricula: str
+    nombre_completo: str
+    datos_contacto: str
+    email: str
 
     def get_matricula(self):
-        return self._matricula
+        return self.matricula
 
-    def get_nombre_completo(self): 
-        return self._nombre_completo 
+    def get_nombre_completo(self):
+        return self.nombre_completo
 
     def get_datos_contacto(self):
-        return self._datos_contacto
-        
-    def get_email(self):
-        return self._email
-    # Setters
-    def set_nombre_completo(self, nombre_completo):
-        self._nombre_completo = nombre_completo
-        
-    def set_datos_contacto(self, contacto):
-        self._datos_contacto = contacto
+        return self.datos_contacto
 
-    def set_email(self, email):
-        self._email = email
+    def get_email(self):
+        return self.email
 
     # Método para validación interna (BR.4)
     def es_valido(self):
-        return bool(self._matricula) and bool(self._nombre_completo)
-    
-class Asistencia:
+        return bool(self.matricula) and bool(self.nombre_completo)
+
+class Asistencia(NamedTuple):
     """Representa el registro de asistencia para un alumno en una fecha dada."""
-    def __init__(self, matricula, fecha, estado="Presente"):
-        self._matricula = matricula
-        self._fecha = fecha
-        self._estado = estado
-        
+    matricula: str
+    fecha: str
+    estado: str = "Presente"
+
     def get_matricula(self):
-        return self._matricula
+        return self.matricula
 
     def get_fecha(self):
-        return self._fecha
+        return self.fecha
 
     def get_estado(self):
-        return self._estado
-    
-    def set_estado(self, estado):
-        self._estado = estado
+        return self.estado
 
-class Grupo:
+class Grupo(NamedTuple):
     """Representa un Grupo (o curso) académico."""
     # Nota: Usaremos el id como clave primaria interna, y el nombre/ciclo para BR.1
-    def __init__(self, grupo_id, nombre, ciclo_escolar):
-        self._grupo_id = grupo_id # Usado internamente para referencias
-        self._nombre = nombre
-        self._ciclo_escolar = ciclo_escolar
+    grupo_id: int # None al crearlo: lo asigna la base de datos
+    nombre: str
+    ciclo_escolar: str
 
     def get_id(self):
-        return self._grupo_id
+        return self.grupo_id
 
     def get_nombre(self):
-        return self._nombre
-    
+        return self.nombre
+
     def get_ciclo(self):
-        return self._ciclo_escolar
+        return self.ciclo_escolar
 
-class CategoriaEvaluacion:
+class CategoriaEvaluacion(NamedTuple):
     """Representa una categoría de evaluación (ponderación) flexible para un grupo."""
-    
-    def __init__(self, grupo_id, nombre_categoria, peso_porcentual, max_items=1):
-        self._grupo_id = grupo_id
-        self._nombre_categoria = nombre_categoria # Ej: "Proyecto Final", "Cuestionario 1", "Tareas"
-        self._peso_porcentual = peso_porcentual
-        self._max_items = max_items # Útil para tareas/participaciones (Total de Tareas)
+    grupo_id: int
+    nombre_categoria: str # Ej: "Proyecto Final", "Cuestionario 1", "Tareas"
+    peso_porcentual: float
+    max_items: int = 1 # Útil para tareas/participaciones (Total de Tareas)
 
-    def get_grupo_id(self): return self._grupo_id
-    def get_nombre_categoria(self): return self._nombre_categoria
-    def get_peso_porcentual(self): return self._peso_porcentual
-    def get_max_items(self): return self._max_items
+    def get_grupo_id(self): return self.grupo_id
+    def get_nombre_categoria(self): return self.nombre_categoria
+    def get_peso_porcentual(self): return self.peso_porcentual
+    def get_max_items(self): return self.max_items
 
 
-class Calificacion:
+class Calificacion(NamedTuple):
     """Representa la nota específica de un alumno en una categoría (CU5)."""
-    
-    def __init__(self, matricula, categoria, valor, fecha=None):
-        self._matricula = matricula
-        self._categoria = categoria # Ej: 'Examen', 'Tarea_1', 'Participacion'
-        self._valor = valor
-        self._fecha = fecha 
-
-    def get_matricula(self): return self._matricula
-    def get_categoria(self): return self._categoria
-    def get_valor(self): return self._valor
-    def get_fecha(self): return self._fecha
\ No newline at end of file
+    matricula: str
+    categoria: str # Ej: 'Examen Final', 'Tareas', 'Participación'
+    valor: float
+    fecha: str = None # None: la fecha de hoy al guardarla (fecha de captura)
+    numero_item: int = 1 # Elemento de la categoría (Tarea 1, Tarea 2, ...); 1 si solo tiene uno
+
+    def get_matricula(self): return self.matricula
+    def get_categoria(self): return self.categoria
+    def get_valor(self): return self.valor
+    def get_fecha(self): return self.fecha
+    def get_numero_item(self): return self.numero_item